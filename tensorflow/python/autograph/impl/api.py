@@ -51,6 +51,7 @@ from tensorflow.python.autograph.impl import conversion
 from tensorflow.python.autograph.lang import special_functions
 from tensorflow.python.autograph.operators import py_builtins
 from tensorflow.python.autograph.pyct import anno
+from tensorflow.python.autograph.pyct import cache
 from tensorflow.python.autograph.pyct import cfg
 from tensorflow.python.autograph.pyct import error_utils
 from tensorflow.python.autograph.pyct import errors
@@ -63,6 +64,7 @@ from tensorflow.python.autograph.pyct.static_analysis import reaching_definition
 from tensorflow.python.autograph.utils import ag_logging as logging
 from tensorflow.python.eager import function
 from tensorflow.python.framework import errors_impl
+from tensorflow.python.framework import versions
 from tensorflow.python.util import tf_decorator
 from tensorflow.python.util import tf_inspect
 from tensorflow.python.util import tf_stack
@@ -73,6 +75,16 @@ def is_autograph_strict_conversion_mode():
   return int(os.environ.get('AUTOGRAPH_STRICT_CONVERSION', '0')) > 0
 
 
+def autograph_cache_directory():
+  """Returns the directory of the persistent cache of converted code, if any.
+
+  Set with the `AUTOGRAPH_CACHE_DIR` environment variable. When set, the code
+  generated by AutoGraph is persisted to that directory and reused by later
+  processes that convert the same functions.
+  """
+  return os.environ.get('AUTOGRAPH_CACHE_DIR') or None
+
+
 #
 # Error handling
 #
@@ -225,6 +237,10 @@ class PyToTF(transpiler.PyToPy):
 
     self._extra_locals = {'ag__': ag_internal}
 
+    cache_directory = autograph_cache_directory()
+    if cache_directory is not None:
+      self.set_persistent_cache(cache.PersistentCache(cache_directory))
+
   def get_transformed_name(self, node):
     return 'tf__' + super(PyToTF, self).get_transformed_name(node)
 
@@ -234,6 +250,15 @@ class PyToTF(transpiler.PyToPy):
   def get_caching_key(self, ctx):
     return ctx.options
 
+  def get_persistent_caching_key(self, ctx):
+    # The conversion depends on the converters, hence on the TF build.
+    options = ctx.options
+    return '{}/{}/{}'.format(
+        versions.__version__, versions.__git_version__,
+        (options.recursive, options.user_requested,
+         options.internal_convert_user_code,
+         sorted(f.value for f in options.optional_features)))
+
   def initial_analysis(self, node, ctx):
     graphs = cfg.build(node)
     node = qual_names.resolve(node)
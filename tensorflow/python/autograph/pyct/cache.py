@@ -18,7 +18,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import hashlib
 import inspect
+import json
+import os
+import tempfile
 import weakref
 
 
@@ -95,3 +99,50 @@ class UnboundInstanceCache(_TransformedFnCache):
     return entity
 
 
+class PersistentCache(object):
+  """A cache of JSON-serializable values, persisted in a directory.
+
+  Each entry is stored in its own file, named after a hash of its key. The
+  cache is best-effort: missing, corrupt or unreadable entries are treated as
+  cache misses, and failures to write an entry are ignored.
+  """
+
+  __slots__ = ('directory',)
+
+  def __init__(self, directory):
+    self.directory = directory
+
+  def _path(self, key):
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return os.path.join(self.directory, digest + '.json')
+
+  def get(self, key):
+    """Returns the value stored for `key`, or None if there is none."""
+    try:
+      with open(self._path(key), encoding='utf-8') as f:
+        entry = json.load(f)
+    except (IOError, OSError, ValueError):
+      return None
+    # Guards against hash collisions.
+    if not isinstance(entry, dict) or entry.get('key') != key:
+      return None
+    return entry.get('value')
+
+  def put(self, key, value):
+    """Stores `value` for `key`, replacing any existing value."""
+    try:
+      os.makedirs(self.directory, exist_ok=True)
+      # Written to a temporary file first, so that concurrent readers never see
+      # a partial entry.
+      fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+    except (IOError, OSError):
+      return
+    try:
+      with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'value': value}, f)
+      os.replace(tmp_path, self._path(key))
+    except (IOError, OSError):
+      try:
+        os.remove(tmp_path)
+      except OSError:
+        pass
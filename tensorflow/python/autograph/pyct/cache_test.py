@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+
 from tensorflow.python.autograph.pyct import cache
 from tensorflow.python.platform import test
 
@@ -74,6 +76,30 @@ class CacheTest(test.TestCase):
     self.assertIs(c[o2.method][1], dummy)
     self.assertEqual(len(c), 1)
 
+  def test_persistent_cache(self):
+    directory = os.path.join(self.get_temp_dir(), 'persistent_cache')
+    c = cache.PersistentCache(directory)
+
+    self.assertIsNone(c.get('key'))
+
+    c.put('key', {'a': [1, 'b']})
+    self.assertEqual(c.get('key'), {'a': [1, 'b']})
+    self.assertEqual(
+        cache.PersistentCache(directory).get('key'), {'a': [1, 'b']})
+    self.assertIsNone(c.get('other_key'))
+
+    c.put('key', 2)
+    self.assertEqual(c.get('key'), 2)
+    self.assertLen(os.listdir(directory), 1)
+
+  def test_persistent_cache_corrupt_entry(self):
+    c = cache.PersistentCache(self.get_temp_dir())
+    c.put('key', 1)
+    with open(c._path('key'), 'w') as f:
+      f.write('{"key": "ke')
+
+    self.assertIsNone(c.get('key'))
+
 
 if __name__ == '__main__':
   test.main()
@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import inspect
+import json
 import threading
 import types
 
@@ -144,6 +145,29 @@ def _wrap_into_factory(nodes, entity_name, inner_factory_name,
       outer_factory_name=outer_factory_name)
 
 
+def _global_names(code):
+  """Returns the names read by `code` and its nested code objects."""
+  names = set(code.co_names)
+  for const in code.co_consts:
+    if isinstance(const, types.CodeType):
+      names.update(_global_names(const))
+  return names
+
+
+def _namespace_value_key(value):
+  """Returns a string which identifies `value` across processes."""
+  if isinstance(value, types.ModuleType):
+    return 'module {}'.format(value.__name__)
+  module = getattr(value, '__module__', None)
+  qualname = getattr(value, '__qualname__', None)
+  if isinstance(module, str) and isinstance(qualname, str):
+    # Functions and classes.
+    return '{} {}.{}'.format(type(value).__name__, module, qualname)
+  # Other objects are only identified by their type.
+  return 'instance {}.{}'.format(
+      type(value).__module__, type(value).__qualname__)
+
+
 class _PythonFnFactory(object):
   """Helper object that wraps a Python function factory."""
 
@@ -162,6 +186,8 @@ class _PythonFnFactory(object):
 
     self._unbound_factory = None
     self.module = None
+    self.source = None
+    self.outer_factory_name = None
     self.source_map = None
 
   def create(self,
@@ -180,13 +206,38 @@ class _PythonFnFactory(object):
                                outer_factory_name, self._freevars,
                                self._extra_locals.keys(), future_features)
 
-    module, _, source_map = loader.load_ast(
+    module, source, source_map = loader.load_ast(
         nodes, include_source_map=True)
     outer_factory = getattr(module, outer_factory_name)
     self._unbound_factory = outer_factory()
     self.module = module
+    self.source = source
+    self.outer_factory_name = outer_factory_name
     self.source_map = source_map
 
+  def load(self, source, outer_factory_name, source_map):
+    """Initializes a function from the output of a previous `create`.
+
+    Args:
+      source: Text, the `source` of the factory which was created.
+      outer_factory_name: Text, the `outer_factory_name` of that factory.
+      source_map: Dict[int, origin_info.OriginInfo], the `source_map` of that
+        factory, keyed by line number.
+    """
+    if self._unbound_factory is not None:
+      raise ValueError('double initialization; create a new object instead')
+
+    module, file_name = loader.load_source(source, delete_on_exit=True)
+    outer_factory = getattr(module, outer_factory_name)
+    self._unbound_factory = outer_factory()
+    self.module = module
+    self.source = source
+    self.outer_factory_name = outer_factory_name
+    self.source_map = {
+        origin_info.LineLocation(file_name, lineno): origin
+        for lineno, origin in source_map.items()
+    }
+
   def instantiate(self,
                   globals_,
                   closure,
@@ -398,6 +449,20 @@ class PyToPy(GenericTranspiler):
   def __init__(self):
     self._cache_lock = threading.RLock()
     self._cache = cache.CodeObjectCache()
+    self._persistent_cache = None
+
+  def set_persistent_cache(self, persistent_cache):
+    """Sets the cache in which the transformed code is persisted.
+
+    The persistent cache is consulted for functions which are not in the
+    in-memory cache, and is only used if `get_persistent_caching_key` is
+    implemented.
+
+    Args:
+      persistent_cache: A `cache.PersistentCache`, or None to disable
+        persistence.
+    """
+    self._persistent_cache = persistent_cache
 
   def get_extra_locals(self):
     """Returns extra static local variables to be made to transformed code.
@@ -427,6 +492,89 @@ class PyToPy(GenericTranspiler):
     """
     raise NotImplementedError('subclasses must override this')
 
+  def get_persistent_caching_key(self, user_context):
+    """Returns a key to use for caching across processes.
+
+    Subclasses may override this. The default returns None, which disables
+    the persistent cache.
+
+    Unlike the key returned by `get_caching_key`, this key must be a string
+    that identifies the transformation across processes, i.e. it must account
+    for everything that affects the output of `transform_ast`, other than the
+    source code of the function and its namespace.
+
+    Args:
+      user_context: The context object which was passed to `transform`.
+
+    Returns:
+      Optional[Text]
+    """
+    del user_context
+    return None
+
+  def _persistent_key(self, fn, user_context):
+    """Returns the key of `fn` in the persistent cache, or None."""
+    if self._persistent_cache is None or inspect_utils.islambda(fn):
+      # Lambdas are parsed from their whole source line, which may contain
+      # several of them.
+      return None
+    caching_key = self.get_persistent_caching_key(user_context)
+    if caching_key is None:
+      return None
+    try:
+      source = inspect_utils.getimmediatesource(fn)
+    except (IOError, OSError, TypeError):
+      return None
+    code = fn.__code__
+    # The names in the namespace of the function affect the names of the
+    # symbols created by the transformation, and the values of the names it
+    # reads may affect the transformation itself (e.g. they are resolved to
+    # find directives).
+    namespace = inspect_utils.getnamespace(fn)
+    read_names = sorted(
+        (_global_names(code) | set(code.co_freevars)) & set(namespace))
+    return json.dumps([
+        caching_key,
+        source,
+        code.co_filename,
+        code.co_firstlineno,
+        code.co_freevars,
+        sorted(namespace),
+        [(name, _namespace_value_key(namespace[name])) for name in read_names],
+        sorted(self.get_extra_locals()),
+    ])
+
+  def _load_persistent_factory(self, fn, persistent_key):
+    """Loads the factory for `fn` from the persistent cache, if it's there."""
+    entry = self._persistent_cache.get(persistent_key)
+    if entry is None:
+      return None
+    source_map = {
+        lineno: origin_info.OriginInfo(
+            origin_info.Location(*loc), function_name, source_code_line,
+            comment)
+        for lineno, loc, function_name, source_code_line, comment in
+        entry['source_map']
+    }
+    factory = _PythonFnFactory(
+        entry['name'], fn.__code__.co_freevars, self.get_extra_locals())
+    factory.load(entry['source'], entry['outer_factory_name'], source_map)
+    logging.log(1, 'Loaded %s from the persistent cache', fn)
+    return factory
+
+  def _store_persistent_factory(self, persistent_key, factory):
+    source_map = [
+        (line_loc.lineno, tuple(origin.loc), origin.function_name,
+         origin.source_code_line, origin.comment)
+        for line_loc, origin in factory.source_map.items()
+    ]
+    self._persistent_cache.put(persistent_key, {
+        'name': factory._name,  # pylint:disable=protected-access
+        'source': factory.source,
+        'outer_factory_name': factory.outer_factory_name,
+        'source_map': source_map,
+    })
+
   def _cached_factory(self, fn, cache_subkey):
     cached_factory = self._cache[fn][cache_subkey]
     logging.log(3, 'Cache hit for %s subkey %s: %s', fn, cache_subkey,
@@ -466,29 +614,14 @@ class PyToPy(GenericTranspiler):
 
         else:
           logging.log(1, '%s is not cached for subkey %s', fn, cache_subkey)
-          # TODO(mdan): Confusing overloading pattern. Fix.
-          nodes, ctx = super(PyToPy, self).transform_function(fn, user_context)
-
-          if isinstance(nodes, gast.Lambda):
-            nodes = gast.Assign(
-                targets=[
-                    gast.Name(
-                        ctx.info.name,
-                        ctx=gast.Store(),
-                        annotation=None,
-                        type_comment=None)
-                ],
-                value=nodes)
-          else:
-            nodes.name = ctx.info.name
-
-          if logging.has_verbosity(2):
-            logging.log(2, 'Transformed %s:\n\n%s\n', fn, parser.unparse(nodes))
-
-          factory = _PythonFnFactory(
-              ctx.info.name, fn.__code__.co_freevars, self.get_extra_locals())
-          factory.create(
-              nodes, ctx.namer, future_features=ctx.info.future_features)
+          persistent_key = self._persistent_key(fn, user_context)
+          factory = None
+          if persistent_key is not None:
+            factory = self._load_persistent_factory(fn, persistent_key)
+          if factory is None:
+            factory = self._create_factory(fn, user_context)
+            if persistent_key is not None:
+              self._store_persistent_factory(persistent_key, factory)
           self._cache[fn][cache_subkey] = factory
 
     transformed_fn = factory.instantiate(
@@ -497,3 +630,30 @@ class PyToPy(GenericTranspiler):
         defaults=fn.__defaults__,
         kwdefaults=getattr(fn, '__kwdefaults__', None))
     return transformed_fn, factory.module, factory.source_map
+
+  def _create_factory(self, fn, user_context):
+    """Transforms `fn` and loads the result into a new `_PythonFnFactory`."""
+    # TODO(mdan): Confusing overloading pattern. Fix.
+    nodes, ctx = super(PyToPy, self).transform_function(fn, user_context)
+
+    if isinstance(nodes, gast.Lambda):
+      nodes = gast.Assign(
+          targets=[
+              gast.Name(
+                  ctx.info.name,
+                  ctx=gast.Store(),
+                  annotation=None,
+                  type_comment=None)
+          ],
+          value=nodes)
+    else:
+      nodes.name = ctx.info.name
+
+    if logging.has_verbosity(2):
+      logging.log(2, 'Transformed %s:\n\n%s\n', fn, parser.unparse(nodes))
+
+    factory = _PythonFnFactory(
+        ctx.info.name, fn.__code__.co_freevars, self.get_extra_locals())
+    factory.create(
+        nodes, ctx.namer, future_features=ctx.info.future_features)
+    return factory
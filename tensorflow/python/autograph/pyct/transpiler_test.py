@@ -18,10 +18,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
 import threading
 
 import gast
 
+from tensorflow.python.autograph.pyct import cache
 from tensorflow.python.autograph.pyct import transformer
 from tensorflow.python.autograph.pyct import transpiler
 from tensorflow.python.platform import test
@@ -48,6 +50,21 @@ class TestTranspiler(transpiler.PyToPy):
     return FlipSignTransformer(ctx).visit(node)
 
 
+class PersistentTestTranspiler(TestTranspiler):
+
+  def __init__(self):
+    super(PersistentTestTranspiler, self).__init__()
+    self.transform_ast_count = 0
+
+  def get_persistent_caching_key(self, ctx):
+    del ctx
+    return 'test'
+
+  def transform_ast(self, node, ctx):
+    self.transform_ast_count += 1
+    return super(PersistentTestTranspiler, self).transform_ast(node, ctx)
+
+
 global_var_for_test_global = 1
 global_var_for_test_namespace_collisions = object()
 
@@ -225,6 +242,74 @@ class PyToPyTest(test.TestCase):
     f, _, _ = tr.transform(test_fn, None)
     self.assertEqual(f(), 0)
 
+  def test_persistent_cache(self):
+    b = 1
+
+    def f(a):
+      return a + b
+
+    persistent_cache = cache.PersistentCache(
+        os.path.join(self.get_temp_dir(), 'persistent_cache'))
+
+    tr = PersistentTestTranspiler()
+    tr.set_persistent_cache(persistent_cache)
+    f1, _, source_map1 = tr.transform(f, None)
+    self.assertEqual(tr.transform_ast_count, 1)
+
+    # A new transpiler, as if in a new process.
+    tr = PersistentTestTranspiler()
+    tr.set_persistent_cache(persistent_cache)
+    f2, module, source_map2 = tr.transform(f, None)
+    self.assertEqual(tr.transform_ast_count, 0)
+    self.assertEqual(f1(1), f2(1))
+    b = 2
+    self.assertEqual(f2(1), -1)
+
+    self.assertEqual(sorted(source_map1.values()),
+                     sorted(source_map2.values()))
+    self.assertTrue(all(loc.filename == module.__file__ for loc in source_map2))
+
+  def test_persistent_cache_keyed_by_namespace_values(self):
+
+    def g():
+      return 1
+
+    def h():
+      return 2
+
+    callee = g
+
+    def f():
+      return callee()
+
+    directory = os.path.join(self.get_temp_dir(), 'persistent_cache')
+
+    def transform_ast_count():
+      # A new transpiler, as if in a new process.
+      tr = PersistentTestTranspiler()
+      tr.set_persistent_cache(cache.PersistentCache(directory))
+      tr.transform(f, None)
+      return tr.transform_ast_count
+
+    self.assertEqual(transform_ast_count(), 1)
+    callee = h
+    self.assertEqual(transform_ast_count(), 1)
+    callee = g
+    self.assertEqual(transform_ast_count(), 0)
+
+  def test_persistent_cache_requires_persistent_caching_key(self):
+
+    def f(a):
+      return a + 1
+
+    directory = os.path.join(self.get_temp_dir(), 'persistent_cache')
+    tr = TestTranspiler()
+    tr.set_persistent_cache(cache.PersistentCache(directory))
+    f, _, _ = tr.transform(f, None)
+
+    self.assertEqual(f(1), 0)
+    self.assertFalse(os.path.exists(directory))
+
   def test_namespace_collisions_avoided(self):
 
     class TestClass(object):
@@ -13,6 +13,9 @@ See the License for the specific language governing permissions and
 limitations under the License.
 ==============================================================================*/
 
+#include <string>
+#include <vector>
+
 #include "absl/strings/string_view.h"
 #include "pybind11/pybind11.h"
 #include "pybind11/pytypes.h"
@@ -36,7 +39,9 @@ PYBIND11_MODULE(_pywrap_events_writer, m) {
            [](tensorflow::EventsWriter& self, const std::string& event_str) {
              self.WriteSerializedEvent(event_str);
            })
-      .def("Flush", [](tensorflow::EventsWriter& self) { return self.Flush(); })
+      // Flushing syncs the file, so let other threads run meanwhile.
+      .def("Flush", [](tensorflow::EventsWriter& self) { return self.Flush(); },
+           py::call_guard<py::gil_scoped_release>())
       .def("Close", [](tensorflow::EventsWriter& self) { return self.Close(); })
       .def("WriteEvent",
            [](tensorflow::EventsWriter& self, const py::object obj) {
@@ -44,5 +49,21 @@ PYBIND11_MODULE(_pywrap_events_writer, m) {
              tensorflow::CheckProtoType(obj, "tensorflow.Event");
              self.WriteSerializedEvent(
                  obj.attr("SerializeToString")().cast<std::string>());
+           })
+      .def("WriteEvents",
+           [](tensorflow::EventsWriter& self, const py::list& events) {
+             // Serializes all the events first, then writes them without
+             // holding the GIL.
+             std::vector<std::string> event_strs;
+             event_strs.reserve(events.size());
+             for (const py::handle& obj : events) {
+               tensorflow::CheckProtoType(obj, "tensorflow.Event");
+               event_strs.push_back(
+                   obj.attr("SerializeToString")().cast<std::string>());
+             }
+             py::gil_scoped_release release;
+             for (const std::string& event_str : event_strs) {
+               self.WriteSerializedEvent(event_str);
+             }
            });
 };
@@ -19,9 +19,11 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import json
 import os
 import threading
 
+import numpy as np
 import six
 
 from tensorflow.core.protobuf import debug_event_pb2
@@ -52,6 +54,7 @@ class DebugEventsReader(object):
   _GRAPHS_SUFFIX = ".graphs"
   _EXECUTION_SUFFIX = ".execution"
   _GRAPH_EXECUTION_TRACES_SUFFIX = ".graph_execution_traces"
+  _GRAPH_EXECUTION_TRACES_INDEX_SUFFIX = ".graph_execution_traces_index"
 
   def __init__(self, dump_root):
     if not file_io.is_directory(dump_root):
@@ -77,6 +80,8 @@ class DebugEventsReader(object):
         compat.as_bytes(prefix + self._GRAPH_EXECUTION_TRACES_SUFFIX)
         for prefix in prefixes
     ]
+    self._graph_execution_traces_index_path = (
+        prefixes[0] + self._GRAPH_EXECUTION_TRACES_INDEX_SUFFIX)
     self._readers = dict()  # A map from file path to reader.
     # A map from file path to current reading offset.
     self._reader_offsets = dict()
@@ -290,6 +295,36 @@ class DebugEventsReader(object):
         for path in self._graph_execution_traces_paths
     ]
 
+  def graph_execution_traces_paths(self):
+    """Get the paths of the .graph_execution_traces files, one per file set."""
+    return list(self._graph_execution_traces_paths)
+
+  def graph_execution_traces_index_path(self):
+    """Get the path at which an index of the graph execution traces is kept."""
+    return self._graph_execution_traces_index_path
+
+  def graph_execution_traces_offsets(self):
+    """Get the offsets up to which the .graph_execution_traces files are read.
+
+    Returns:
+      A list of offsets, one for each path of `graph_execution_traces_paths()`.
+    """
+    return [self._reader_offsets.get(path, 0)
+            for path in self._graph_execution_traces_paths]
+
+  def seek_graph_execution_traces(self, offsets):
+    """Set the offsets from which `graph_execution_traces_iterators()` read.
+
+    Args:
+      offsets: A list of offsets, one for each path of
+        `graph_execution_traces_paths()`. Each must be the offset of a record,
+        or the end of the file.
+    """
+    for path, offset in zip(self._graph_execution_traces_paths, offsets):
+      self._get_reader(path)
+      with self._reader_read_locks[path]:
+        self._reader_offsets[path] = offset
+
   def read_graph_execution_traces_event(self, locator):
     """Read DebugEvent at given offset from given .graph_execution_traces file.
 
@@ -914,6 +949,187 @@ def _execution_from_debug_event_proto(debug_event, locator):
       debug_tensor_values=_tuple_or_none(debug_tensor_values))
 
 
+# Record of `_GraphExecutionTraceIndex`. Strings are stored as indices into
+# tables of the distinct values of the field.
+_TRACE_INDEX_DTYPE = np.dtype([
+    ("wall_time", "<f8"),
+    ("offset", "<i8"),
+    ("file_index", "<i4"),
+    ("op_type", "<i4"),
+    ("op_name", "<i4"),
+    ("output_slot", "<i4"),
+    ("graph_id", "<i4"),
+])
+_TRACE_INDEX_STRING_FIELDS = ("op_type", "op_name", "graph_id")
+_TRACE_INDEX_VERSION = 1
+
+
+class _GraphExecutionTraceIndex(object):
+  """Columnar store of the digests of graph execution traces.
+
+  Instead of a `GraphExecutionTraceDigest` object per trace, holds a
+  fixed-size record per trace in NumPy arrays, so that ranges of traces can be
+  selected by op type or graph without going through all the digests.
+
+  The records can be saved to a file, which is memory-mapped when loaded back.
+  Records added later are kept in memory until the next `save()`, which
+  appends them to the file.
+  """
+
+  _INITIAL_CAPACITY = 1024
+
+  def __init__(self):
+    # Records loaded from a file.
+    self._mapped = np.zeros([0], dtype=_TRACE_INDEX_DTYPE)
+    # Records added since, in a buffer that grows geometrically.
+    self._added = np.zeros([self._INITIAL_CAPACITY], dtype=_TRACE_INDEX_DTYPE)
+    self._num_added = 0
+    self._strings = {field: [] for field in _TRACE_INDEX_STRING_FIELDS}
+    self._string_ids = {field: {} for field in _TRACE_INDEX_STRING_FIELDS}
+
+  def __len__(self):
+    return len(self._mapped) + self._num_added
+
+  def _intern(self, field, value):
+    string_ids = self._string_ids[field]
+    string_id = string_ids.get(value)
+    if string_id is None:
+      string_id = string_ids[value] = len(self._strings[field])
+      self._strings[field].append(value)
+    return string_id
+
+  def append(self, digest):
+    """Adds the record of a `GraphExecutionTraceDigest`."""
+    if self._num_added == len(self._added):
+      added = np.zeros([2 * len(self._added)], dtype=_TRACE_INDEX_DTYPE)
+      added[:self._num_added] = self._added
+      self._added = added
+    file_index, offset = digest.locator
+    self._added[self._num_added] = (
+        digest.wall_time, offset, file_index,
+        self._intern("op_type", digest.op_type),
+        self._intern("op_name", digest.op_name), digest.output_slot,
+        self._intern("graph_id", digest.graph_id))
+    self._num_added += 1
+
+  def _segments(self):
+    """Yields `(start_index, records)` of the loaded and added records."""
+    yield 0, self._mapped
+    yield len(self._mapped), self._added[:self._num_added]
+
+  def select(self, begin=None, end=None, op_type=None, graph_id=None):
+    """Gets the indices of the traces in `[begin, end)` matching the filters.
+
+    Args:
+      begin: Optional beginning index. Negative indices are supported.
+      end: Optional ending index. Negative indices are supported.
+      op_type: Optional op type that the traces must have.
+      graph_id: Optional ID of the graph immediately enclosing the traces.
+
+    Returns:
+      The indices as an int64 `np.ndarray`, in increasing order.
+    """
+    begin, end, _ = slice(begin, end).indices(len(self))
+    if op_type is None and graph_id is None:
+      return np.arange(begin, max(begin, end), dtype=np.int64)
+    filters = []
+    for field, value in (("op_type", op_type), ("graph_id", graph_id)):
+      if value is not None:
+        if value not in self._string_ids[field]:
+          return np.zeros([0], dtype=np.int64)
+        filters.append((field, self._string_ids[field][value]))
+    indices = []
+    for start, records in self._segments():
+      lo = max(begin - start, 0)
+      hi = min(end - start, len(records))
+      if lo >= hi:
+        continue
+      records = records[lo:hi]
+      mask = np.ones([hi - lo], dtype=np.bool_)
+      for field, string_id in filters:
+        mask &= records[field] == string_id
+      indices.append(np.flatnonzero(mask) + (start + lo))
+    if not indices:
+      return np.zeros([0], dtype=np.int64)
+    return np.concatenate(indices)
+
+  def digest(self, index):
+    """Gets the `GraphExecutionTraceDigest` of the trace at `index`."""
+    if index < len(self._mapped):
+      record = self._mapped[index]
+    else:
+      record = self._added[index - len(self._mapped)]
+    return GraphExecutionTraceDigest(
+        float(record["wall_time"]),
+        (int(record["file_index"]), int(record["offset"])),
+        self._strings["op_type"][record["op_type"]],
+        self._strings["op_name"][record["op_name"]],
+        int(record["output_slot"]),
+        self._strings["graph_id"][record["graph_id"]])
+
+  def _map(self, path, num_records):
+    if num_records:
+      return np.memmap(
+          path, dtype=_TRACE_INDEX_DTYPE, mode="r", shape=(num_records,))
+    else:
+      return np.zeros([0], dtype=_TRACE_INDEX_DTYPE)
+
+  def save(self, path, metadata):
+    """Saves the records to the file at `path`.
+
+    Only the records added since the index was loaded or last saved are
+    written to the file. The string tables and `metadata` are written to a
+    JSON file at `path + ".json"`, which is replaced last, so that an
+    interrupted save leaves the previous index valid.
+
+    Args:
+      path: Local path of the file to save the records to.
+      metadata: A JSON-serializable dict saved along with the records.
+    """
+    mode = "r+b" if os.path.exists(path) else "wb"
+    with open(path, mode) as f:
+      f.seek(len(self._mapped) * _TRACE_INDEX_DTYPE.itemsize)
+      f.write(self._added[:self._num_added].tobytes())
+      f.truncate()
+    contents = dict(metadata)
+    contents.update(
+        version=_TRACE_INDEX_VERSION, num_records=len(self),
+        strings=self._strings)
+    file_io.atomic_write_string_to_file(path + ".json", json.dumps(contents))
+    mapped = self._map(path, len(self))
+    # Never let concurrent readers see more records than there are.
+    self._num_added = 0
+    self._mapped = mapped
+    self._added = np.zeros([self._INITIAL_CAPACITY], dtype=_TRACE_INDEX_DTYPE)
+
+  @classmethod
+  def load(cls, path):
+    """Loads the index saved at `path`.
+
+    Args:
+      path: Local path the index was saved to.
+
+    Returns:
+      A tuple of the index and the metadata saved with it, or `(None, None)`
+      if there is no valid index at `path`.
+    """
+    try:
+      with open(path + ".json", "r") as f:
+        contents = json.load(f)
+      if contents.pop("version", None) != _TRACE_INDEX_VERSION:
+        return None, None
+      index = cls()
+      index._mapped = index._map(path, contents.pop("num_records"))  # pylint: disable=protected-access
+      strings = contents.pop("strings")
+      for field in _TRACE_INDEX_STRING_FIELDS:
+        index._strings[field] = strings[field]  # pylint: disable=protected-access
+        index._string_ids[field] = {  # pylint: disable=protected-access
+            value: i for i, value in enumerate(strings[field])}
+    except (IOError, OSError, KeyError, ValueError):
+      return None, None
+    return index, contents
+
+
 class DebugDataReader(object):
   """A reader that reads structured debugging data in the tfdbg v2 format.
 
@@ -926,9 +1142,22 @@ class DebugDataReader(object):
       from the last-successful reading positions in the files.
     - This object can be used as a context manager. Its `__exit__()` call
       closes the file readers cleanly.
+    - The digests of the graph execution traces are kept in a compact columnar
+      index. With `persist_index=True`, the index is saved in the dump root
+      and memory-mapped by later readers of the same dump, which then only
+      read the traces written since. Traces covered by a loaded index are not
+      passed to monitors, so the index is not loaded when monitors are added.
   """
 
-  def __init__(self, dump_root):
+  def __init__(self, dump_root, persist_index=False):
+    """Creates a DebugDataReader.
+
+    Args:
+      dump_root: Path to the directory of the tfdbg v2 DebugEvent file set(s).
+      persist_index: Whether to save the index of the graph execution traces
+        to, and load it from, the dump root, which must then be a local
+        writable directory.
+    """
     self._reader = DebugEventsReader(dump_root)
 
     # TODO(cais): Implement pagination for memory constraints.
@@ -947,8 +1176,9 @@ class DebugDataReader(object):
     # A dict mapping id to DebuggedGraph objects.
     self._graph_by_id = dict()
     self._graph_op_digests = []
-    # TODO(cais): Implement pagination for memory constraints.
-    self._graph_execution_trace_digests = []
+    self._graph_execution_trace_index = _GraphExecutionTraceIndex()
+    self._persist_index = persist_index
+    self._persisted_index_loaded = False
 
     self._monitors = []
 
@@ -1034,10 +1264,16 @@ class DebugDataReader(object):
 
   def _load_graph_execution_traces(self):
     """Incrementally load the .graph_execution_traces file."""
+    if self._persist_index and not self._persisted_index_loaded:
+      self._persisted_index_loaded = True
+      if not self._monitors:
+        self._load_persisted_index()
+    index = self._graph_execution_trace_index
+    num_traces = len(index)
     for i, traces_iter in enumerate(
         self._reader.graph_execution_traces_iterators()):
       for debug_event, offset in traces_iter:
-        self._graph_execution_trace_digests.append(
+        index.append(
             self._graph_execution_trace_digest_from_debug_event_proto(
                 debug_event, (i, offset)))
         if self._monitors:
@@ -1046,8 +1282,39 @@ class DebugDataReader(object):
                   debug_event, (i, offset)))
           for monitor in self._monitors:
             monitor.on_graph_execution_trace(
-                len(self._graph_execution_trace_digests) - 1,
-                graph_execution_trace)
+                len(index) - 1, graph_execution_trace)
+    if self._persist_index and len(index) > num_traces:
+      index.save(self._reader.graph_execution_traces_index_path(),
+                 self._index_metadata())
+
+  def _index_metadata(self):
+    """Metadata that identifies the traces covered by the persisted index."""
+    return {
+        "tfdbg_run_id": self._reader.tfdbg_run_id(),
+        "file_names": [
+            os.path.basename(compat.as_str(path))
+            for path in self._reader.graph_execution_traces_paths()
+        ],
+        "file_offsets": self._reader.graph_execution_traces_offsets(),
+    }
+
+  def _load_persisted_index(self):
+    """Loads the persisted index of graph execution traces, if it is valid."""
+    index, metadata = _GraphExecutionTraceIndex.load(
+        self._reader.graph_execution_traces_index_path())
+    if index is None:
+      return
+    expected_metadata = self._index_metadata()
+    if (metadata.get("tfdbg_run_id") != expected_metadata["tfdbg_run_id"] or
+        metadata.get("file_names") != expected_metadata["file_names"]):
+      return
+    file_offsets = metadata["file_offsets"]
+    for path, offset in zip(self._reader.graph_execution_traces_paths(),
+                            file_offsets):
+      if file_io.stat(path).length < offset:
+        return
+    self._graph_execution_trace_index = index
+    self._reader.seek_graph_execution_traces(file_offsets)
 
   def _graph_execution_trace_digest_from_debug_event_proto(
       self, debug_event, locator):
@@ -1194,9 +1461,12 @@ class DebugDataReader(object):
     else:
       return self._graph_op_digests
 
-  def graph_execution_traces(self, digest=False, begin=None, end=None):
+  def graph_execution_traces(self, digest=False, begin=None, end=None,
+                             op_type=None, graph_id=None):
     """Get all the intra-graph execution tensor traces read so far.
 
+    Only the traces in the requested range which match the filters are read.
+
     Args:
       digest: Whether the results will be returned in the more light-weight
         digest form.
@@ -1204,16 +1474,22 @@ class DebugDataReader(object):
         Python-style negative indices are supported.
       end: Optional ending index for the requested traces or their digests.
         Python-style negative indices are supported.
+      op_type: Optional op type to filter the traces with.
+      graph_id: Optional ID of the immediately-enclosing graph to filter the
+        traces with.
 
     Returns:
       If `digest`: a `list` of `GraphExecutionTraceDigest` objects.
       Else: a `list` of `GraphExecutionTrace` objects.
     """
-    digests = self._graph_execution_trace_digests
+    index = self._graph_execution_trace_index
     if begin is not None or end is not None:
       begin = begin or 0
-      end = end or len(digests)
-      digests = digests[begin:end]
+      end = end or len(index)
+    digests = [
+        index.digest(i) for i in index.select(
+            begin, end, op_type=op_type, graph_id=graph_id)
+    ]
     if digest:
       return digests
     else:
@@ -1221,7 +1497,7 @@ class DebugDataReader(object):
 
   def num_graph_execution_traces(self):
     """Get the number of graph execution traces read so far."""
-    return len(self._graph_execution_trace_digests)
+    return len(self._graph_execution_trace_index)
 
   def executions(self, digest=False, begin=None, end=None):
     """Get `Execution`s or `ExecutionDigest`s this reader has read so far.
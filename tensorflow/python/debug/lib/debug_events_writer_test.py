@@ -35,6 +35,7 @@ from tensorflow.python.framework import ops
 from tensorflow.python.framework import test_util
 from tensorflow.python.framework import versions
 from tensorflow.python.platform import googletest
+from tensorflow.python.platform import test
 
 
 class DebugEventsWriterTest(dumping_callback_test_lib.DumpingCallbackTestBase,
@@ -598,6 +599,112 @@ class DebugEventsWriterTest(dumping_callback_test_lib.DumpingCallbackTestBase,
     self.assertEqual(traces[0].op_name, "Op_%d" % expected_begin)
     self.assertEqual(traces[-1].op_name, "Op_%d" % (expected_end - 1))
 
+  def _writeTracesOfTwoGraphs(self, writer, num_traces):
+    for i in range(num_traces):
+      graph_id = "graph%d" % (i % 2)
+      trace = debug_event_pb2.GraphExecutionTrace(
+          op_name="Op_%d" % (i % 3), tfdbg_context_id=graph_id)
+      writer.WriteGraphExecutionTrace(trace)
+    writer.FlushNonExecutionFiles()
+    writer.FlushExecutionFiles()
+
+  def _createWriterWithTwoGraphs(self):
+    writer = debug_events_writer.DebugEventsWriter(
+        self.dump_root, self.tfdbg_run_id, circular_buffer_size=-1)
+    for graph_id in ("graph0", "graph1"):
+      writer.WriteDebuggedGraph(debug_event_pb2.DebuggedGraph(
+          graph_id=graph_id, graph_name=graph_id))
+      for i in range(3):
+        writer.WriteGraphOpCreation(debug_event_pb2.GraphOpCreation(
+            op_type="OpType%d" % i, op_name="Op_%d" % i, graph_id=graph_id))
+    return writer
+
+  def testFilteringGraphExecutionTraces(self):
+    writer = self._createWriterWithTwoGraphs()
+    self._writeTracesOfTwoGraphs(writer, 12)
+    writer.Close()
+
+    with debug_events_reader.DebugDataReader(self.dump_root) as reader:
+      reader.update()
+      digests = reader.graph_execution_traces(digest=True, op_type="OpType1")
+      self.assertEqual(["Op_1"] * 4, [digest.op_name for digest in digests])
+      digests = reader.graph_execution_traces(
+          digest=True, begin=2, end=-2, graph_id="graph1")
+      self.assertEqual(["Op_0", "Op_2", "Op_1", "Op_0"],
+                       [digest.op_name for digest in digests])
+      self.assertEqual(["graph1"] * 4,
+                       [digest.graph_id for digest in digests])
+      traces = reader.graph_execution_traces(op_type="OpType2",
+                                             graph_id="graph0")
+      self.assertEqual(["Op_2", "Op_2"], [trace.op_name for trace in traces])
+      self.assertEqual([("graph0",)] * 2,
+                       [trace.graph_ids for trace in traces])
+      self.assertEqual(
+          [], reader.graph_execution_traces(op_type="NonexistentOp"))
+
+  def testPersistedGraphExecutionTraceIndex(self):
+    writer = self._createWriterWithTwoGraphs()
+    self._writeTracesOfTwoGraphs(writer, 10)
+
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      reader.update()
+      expected_digests = [digest.to_json() for digest in
+                          reader.graph_execution_traces(digest=True)]
+    self.assertLen(expected_digests, 10)
+    self.assertLen(glob.glob(os.path.join(
+        self.dump_root, "*.graph_execution_traces_index*")), 2)
+
+    # Traces covered by the index are not read again, only new traces are.
+    self._writeTracesOfTwoGraphs(writer, 4)
+    writer.Close()
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      with test.mock.patch.object(
+          reader, "_lookup_op_type",
+          wraps=reader._lookup_op_type) as lookup_op_type:
+        reader.update()
+      self.assertEqual(4, lookup_op_type.call_count)
+      digests = reader.graph_execution_traces(digest=True)
+      self.assertEqual(expected_digests,
+                       [digest.to_json() for digest in digests[:10]])
+      self.assertEqual(["Op_0", "Op_1", "Op_2", "Op_0"],
+                       [digest.op_name for digest in digests[10:]])
+      self.assertEqual(
+          "Op_2", reader.read_graph_execution_trace(digests[12]).op_name)
+      self.assertLen(
+          reader.graph_execution_traces(digest=True, graph_id="graph0"), 7)
+
+    # The index saved by the second reader covers all the traces.
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      with test.mock.patch.object(
+          reader, "_lookup_op_type",
+          wraps=reader._lookup_op_type) as lookup_op_type:
+        reader.update()
+      self.assertEqual(0, lookup_op_type.call_count)
+      self.assertEqual(14, reader.num_graph_execution_traces())
+
+  def testInvalidGraphExecutionTraceIndexIsRebuilt(self):
+    writer = self._createWriterWithTwoGraphs()
+    self._writeTracesOfTwoGraphs(writer, 6)
+    writer.Close()
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      reader.update()
+    index_path, = glob.glob(
+        os.path.join(self.dump_root, "*.graph_execution_traces_index"))
+    with open(index_path, "wb"):
+      pass  # Truncate the records of the index.
+
+    with debug_events_reader.DebugDataReader(
+        self.dump_root, persist_index=True) as reader:
+      reader.update()
+      self.assertEqual(
+          ["Op_%d" % (i % 3) for i in range(6)],
+          [d.op_name for d in reader.graph_execution_traces(digest=True)])
+    self.assertEqual(6 * 36, os.path.getsize(index_path))
+
 
 class MultiSetReaderTest(dumping_callback_test_lib.DumpingCallbackTestBase):
   """Test for DebugDataReader for multiple file sets under a dump root."""
@@ -96,6 +96,49 @@ SHARED_RENDEZVOUS_ATTRIBUTE_NAME = "shared_rendezvous"
 _graph_building_time_counter = monitoring.Counter(
     "/tensorflow/core/tf_function/graph_building_time_usecs",
     "Time for tf.function to build a graph (us).")
+_function_cache_hits_counter = monitoring.Counter(
+    "/tensorflow/core/tf_function/cache_hits",
+    "Number of tf.function calls served by a previously traced function.")
+_function_cache_misses_counter = monitoring.Counter(
+    "/tensorflow/core/tf_function/cache_misses",
+    "Number of tf.function calls which required a trace.")
+_function_retraces_counter = monitoring.Counter(
+    "/tensorflow/core/tf_function/retraces",
+    "Number of tf.function traces for a calling context which had already "
+    "been traced, e.g. because of new input shapes.")
+_function_cache_evictions_counter = monitoring.Counter(
+    "/tensorflow/core/tf_function/cache_evictions",
+    "Number of traced functions evicted from tf.function caches.")
+
+# Default limits of `FunctionCache`s, see `set_function_cache_limits`.
+_function_cache_max_entries = None
+_function_cache_max_bytes = None
+
+
+def set_function_cache_limits(max_entries=None, max_bytes=None):
+  """Sets the default size limits of the trace caches of `Function`s.
+
+  By default, a `Function` keeps every `ConcreteFunction` it has traced. With
+  limits set, the least recently used functions are evicted from the cache once
+  a limit is exceeded, and are retraced if they are needed again. The limits
+  apply to each `Function` separately, and are checked whenever a new function
+  is traced.
+
+  Args:
+    max_entries: The maximum number of traced functions kept by each
+      `Function`, or `None` for no limit.
+    max_bytes: The maximum total size, in bytes, of the `FunctionDef`s of the
+      traced functions kept by each `Function`, or `None` for no limit.
+
+  Raises:
+    ValueError: If a limit is not positive.
+  """
+  global _function_cache_max_entries, _function_cache_max_bytes
+  for name, value in (("max_entries", max_entries), ("max_bytes", max_bytes)):
+    if value is not None and value <= 0:
+      raise ValueError("%s must be positive or None, got %r." % (name, value))
+  _function_cache_max_entries = max_entries
+  _function_cache_max_bytes = max_bytes
 
 
 def _make_input_signature_hashable(elem):
@@ -1536,6 +1579,8 @@ class ConcreteFunction(object):
         isinstance(structured_outputs, (list, tuple)) and structured_outputs and
         all(isinstance(o, np_arrays.ndarray) for o in structured_outputs))
     self._ndarray_singleton = isinstance(structured_outputs, np_arrays.ndarray)
+    # Compiled `structured_outputs`, used to pack the results of each call.
+    self._structured_outputs_plan = None
 
     # function_spec defines the structured signature.
     self._set_function_spec(function_spec)
@@ -2191,17 +2236,23 @@ class ConcreteFunction(object):
       elif self._ndarray_singleton:
         return np_arrays.tensor_to_ndarray(result[0])
 
+    # `structured_outputs` may be replaced after construction (e.g. when
+    # loading a SavedModel), in which case the plan is rebuilt.
+    structured_outputs = self._func_graph.structured_outputs
+    plan = self._structured_outputs_plan
+    if plan is None or plan.structure is not structured_outputs:
+      plan = nest.StructurePlan(structured_outputs, expand_composites=True)
+      self._structured_outputs_plan = plan
+
     # Replace outputs with results, skipping over any 'None' values.
-    outputs_list = nest.flatten(
-        self._func_graph.structured_outputs, expand_composites=True)
+    outputs_list = plan.flatten(structured_outputs)
     j = 0
     for i, o in enumerate(outputs_list):
       if o is not None:
         custom_gradient.copy_handle_data(self.outputs[j], result[j])
         outputs_list[i] = result[j]
         j += 1
-    ret = nest.pack_sequence_as(self._func_graph.structured_outputs,
-                                outputs_list, expand_composites=True)
+    ret = plan.pack(outputs_list)
     return ret
 
   @property
@@ -2496,6 +2547,7 @@ class FunctionSpec(object):
     }
     if input_signature is None:
       self._input_signature = None
+      self._input_signature_plan = None
     else:
       if set(fullargspec.kwonlyargs) - set(fullargspec.kwonlydefaults or ()):
         raise ValueError("Cannot define a TensorFlow function from a Python "
@@ -2507,8 +2559,10 @@ class FunctionSpec(object):
                         "list, received " + str(type(input_signature)))
 
       self._input_signature = tuple(input_signature)
-      self._flat_input_signature = tuple(nest.flatten(input_signature,
-                                                      expand_composites=True))
+      self._input_signature_plan = nest.StructurePlan(
+          self._input_signature, expand_composites=True)
+      self._flat_input_signature = tuple(
+          self._input_signature_plan.flatten(self._input_signature))
 
   @property
   def fullargspec(self):
@@ -2730,7 +2784,8 @@ class FunctionSpec(object):
     else:
       assert not kwargs
       inputs, flat_inputs, filtered_flat_inputs = _convert_inputs_to_signature(
-          inputs, self._input_signature, self._flat_input_signature)
+          inputs, self._input_signature, self._flat_input_signature,
+          self._input_signature_plan)
       return inputs, {}, flat_inputs, filtered_flat_inputs
 
 
@@ -2794,7 +2849,8 @@ def _convert_numpy_inputs(inputs):
     return inputs, flat_inputs, filtered_flat_inputs
 
 
-def _convert_inputs_to_signature(inputs, input_signature, flat_input_signature):
+def _convert_inputs_to_signature(inputs, input_signature, flat_input_signature,
+                                 input_signature_plan=None):
   """Convert inputs to pass into a function with an explicit signature."""
 
   def format_error_message(inputs, input_signature):
@@ -2835,10 +2891,10 @@ def _convert_inputs_to_signature(inputs, input_signature, flat_input_signature):
                      format_error_message(inputs, input_signature))
 
   if need_packing:
-    inputs = nest.pack_sequence_as(
-        structure=input_signature,
-        flat_sequence=flatten_inputs,
-        expand_composites=True)
+    if input_signature_plan is None:
+      input_signature_plan = nest.StructurePlan(
+          input_signature, expand_composites=True)
+    inputs = input_signature_plan.pack(flatten_inputs)
 
   flat_inputs = nest.flatten(inputs, expand_composites=True)
 
@@ -2850,14 +2906,21 @@ def _convert_inputs_to_signature(inputs, input_signature, flat_input_signature):
 
 class FunctionCache(object):
   """A lightweight container for cached functions.
+
+  The cache is unbounded unless `max_entries` or `max_bytes` is set, here or
+  through `set_function_cache_limits`. Bounded caches evict their least
+  recently used functions, and, while `max_bytes` is set, count the size of
+  each function as the size of its `FunctionDef`. Unbounded caches do not
+  track the usage order of their functions.
   """
 
   __slots__ = [
       "missed", "primary", "arg_relaxed_specs", "arg_relaxed",
-      "_garbage_collectors"
+      "_garbage_collectors", "_max_entries", "_max_bytes", "_usage",
+      "_counts_bytes", "total_bytes"
   ]
 
-  def __init__(self):
+  def __init__(self, max_entries=None, max_bytes=None):
     # The set of functions that have been missed; entries are CacheKey with
     # input_signature `None` (e.g. a "call context key")
     self.missed = set()
@@ -2876,6 +2939,99 @@ class FunctionCache(object):
         _FunctionGarbageCollector(self.primary),
         _FunctionGarbageCollector(self.arg_relaxed),
         _FunctionGarbageCollector(self.arg_relaxed_specs)]
+    self._max_entries = max_entries
+    self._max_bytes = max_bytes
+    # Maps `(cache, key)` pairs of the cached functions to their size, from the
+    # least to the most recently used. Only maintained for bounded caches, and
+    # sizes are only computed while `max_bytes` is set (they are 0 otherwise).
+    self._usage = collections.OrderedDict()
+    self._counts_bytes = False
+    self.total_bytes = 0
+
+  @property
+  def max_entries(self):
+    if self._max_entries is not None:
+      return self._max_entries
+    return _function_cache_max_entries
+
+  @property
+  def max_bytes(self):
+    if self._max_bytes is not None:
+      return self._max_bytes
+    return _function_cache_max_bytes
+
+  def lookup(self, cache, key):
+    """Returns the function for `key` in `cache`, or None if there is none.
+
+    Args:
+      cache: `self.primary` or `self.arg_relaxed`.
+      key: A `CacheKey`.
+    """
+    function = cache.get(key, None)
+    if function is not None and self._usage:
+      usage_key = (cache is self.arg_relaxed, key)
+      if usage_key in self._usage:
+        self._usage.move_to_end(usage_key)
+    return function
+
+  def record_hit(self):
+    """Counts a call served by this cache."""
+    _function_cache_hits_counter.get_cell().increase_by(1)
+
+  def add(self, cache, key, function):
+    """Adds `function` to `cache`, evicting functions if over the limits.
+
+    Args:
+      cache: `self.primary` or `self.arg_relaxed`.
+      key: A `CacheKey`.
+      function: The `ConcreteFunction` traced for `key`.
+    """
+    cache[key] = function
+    max_entries = self.max_entries
+    max_bytes = self.max_bytes
+    if max_entries is None and max_bytes is None:
+      if self._usage:
+        # The limits were removed.
+        self._usage.clear()
+        self.total_bytes = 0
+      return
+    counts_bytes = max_bytes is not None
+    if not self._usage:
+      # The limits were set after functions were cached; account for those.
+      for is_relaxed, functions in ((False, self.primary),
+                                    (True, self.arg_relaxed)):
+        for cached_key in functions:
+          self._usage[(is_relaxed, cached_key)] = 0
+      self._counts_bytes = False
+    if counts_bytes != self._counts_bytes:
+      # `max_bytes` was set or removed; recompute the sizes in place, which
+      # keeps the usage order.
+      self.total_bytes = 0
+      for is_relaxed, cached_key in list(self._usage):
+        size = 0
+        if counts_bytes:
+          functions = self.arg_relaxed if is_relaxed else self.primary
+          size = functions[cached_key].function_def.ByteSize()
+        self._usage[(is_relaxed, cached_key)] = size
+        self.total_bytes += size
+      self._counts_bytes = counts_bytes
+    usage_key = (cache is self.arg_relaxed, key)
+    self.total_bytes -= self._usage.pop(usage_key, 0)
+    size = function.function_def.ByteSize() if counts_bytes else 0
+    self._usage[usage_key] = size
+    self.total_bytes += size
+    # The function just added is never evicted.
+    while len(self._usage) > 1 and (
+        (max_entries is not None and len(self._usage) > max_entries) or
+        (max_bytes is not None and self.total_bytes > max_bytes)):
+      (is_relaxed, evicted_key), evicted_size = self._usage.popitem(last=False)
+      self.total_bytes -= evicted_size
+      if is_relaxed:
+        del self.arg_relaxed[evicted_key]
+        self.arg_relaxed_specs.pop(evicted_key, None)
+      else:
+        del self.primary[evicted_key]
+      _function_cache_evictions_counter.get_cell().increase_by(1)
 
   def all_values(self):
     """A set of all `ConcreteFunction` instances held by this cache."""
@@ -3270,14 +3426,18 @@ class Function(object):
     arg_specs = [_type_spec_for(x) for x in flat_no_comp]
     relaxed_arg_specs = self._function_cache.arg_relaxed_specs.get(
         rank_only_cache_key, None)
-    relaxed_arg_function = self._function_cache.arg_relaxed.get(
-        rank_only_cache_key, None)
+    relaxed_arg_function = self._function_cache.lookup(
+        self._function_cache.arg_relaxed, rank_only_cache_key)
 
     if (relaxed_arg_function is not None
         and all(_is_type_subset(x, y) for (x, y) in
                 zip(relaxed_arg_specs, arg_specs))):
+      self._function_cache.record_hit()
       return relaxed_arg_function, filtered_flat_args
 
+    _function_cache_misses_counter.get_cell().increase_by(1)
+    _function_retraces_counter.get_cell().increase_by(1)
+
     if relaxed_arg_specs is None:
       relaxed_arg_specs = arg_specs
     else:
@@ -3307,7 +3467,8 @@ class Function(object):
 
     graph_function = self._create_graph_function(
         args, kwargs, override_flat_arg_shapes=relaxed_arg_shapes)
-    self._function_cache.arg_relaxed[rank_only_cache_key] = graph_function
+    self._function_cache.add(
+        self._function_cache.arg_relaxed, rank_only_cache_key, graph_function)
 
     return (graph_function, [
         t for t in nest.flatten((args, kwargs), expand_composites=True)
@@ -3354,8 +3515,10 @@ class Function(object):
           "Arguments supplied to `defun`-generated functions must be"
           " hashable.  Original error: %s" % e)
 
-    graph_function = self._function_cache.primary.get(cache_key, None)
+    graph_function = self._function_cache.lookup(
+        self._function_cache.primary, cache_key)
     if graph_function is not None:
+      self._function_cache.record_hit()
       return graph_function, filtered_flat_args
 
     with monitoring.MonitoredTimer(_graph_building_time_counter.get_cell()):
@@ -3386,9 +3549,13 @@ class Function(object):
             return self._define_function_with_shape_relaxation(
                 args, kwargs, flat_args, filtered_flat_args, cache_key_context)
 
+          _function_cache_misses_counter.get_cell().increase_by(1)
+          if call_context_key in self._function_cache.missed:
+            _function_retraces_counter.get_cell().increase_by(1)
           self._function_cache.missed.add(call_context_key)
           graph_function = self._create_graph_function(args, kwargs)
-          self._function_cache.primary[cache_key] = graph_function
+          self._function_cache.add(
+              self._function_cache.primary, cache_key, graph_function)
 
           return graph_function, filtered_flat_args
 
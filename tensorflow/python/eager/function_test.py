@@ -390,6 +390,94 @@ class FunctionTest(test.TestCase, parameterized.TestCase):
     self.assertTrue(unknown_dim[0])
     self.assertLen(total_function_cache(func), 2)
 
+  def testFunctionCacheMaxEntries(self):
+    function.set_function_cache_limits(max_entries=2)
+    self.addCleanup(function.set_function_cache_limits)
+    trace_count = [0]
+
+    @function.defun
+    def func(a):
+      trace_count[0] += 1
+      return a + 1
+
+    evictions = function._function_cache_evictions_counter.get_cell()
+    hits = function._function_cache_hits_counter.get_cell()
+    retraces = function._function_retraces_counter.get_cell()
+    initial_evictions = evictions.value()
+    initial_hits = hits.value()
+    initial_retraces = retraces.value()
+
+    func(constant_op.constant([1.0]))
+    func(constant_op.constant([1.0, 2.0]))
+    func(constant_op.constant([1.0]))  # Hit; [1.0, 2.0] is now the LRU entry.
+    self.assertEqual(2, trace_count[0])
+    self.assertEqual(1, hits.value() - initial_hits)
+    self.assertEqual(0, evictions.value() - initial_evictions)
+
+    func(constant_op.constant([1.0, 2.0, 3.0]))
+    self.assertEqual(3, trace_count[0])
+    self.assertLen(total_function_cache(func), 2)
+    self.assertEqual(1, evictions.value() - initial_evictions)
+
+    func(constant_op.constant([1.0]))
+    self.assertEqual(3, trace_count[0])
+    func(constant_op.constant([1.0, 2.0]))
+    self.assertEqual(4, trace_count[0])
+    self.assertLen(total_function_cache(func), 2)
+    self.assertEqual(2, evictions.value() - initial_evictions)
+    self.assertEqual(3, retraces.value() - initial_retraces)
+    # Function sizes are only computed when `max_bytes` is set.
+    self.assertEqual(0, func._function_cache.total_bytes)
+
+  def testUnboundedFunctionCacheCounters(self):
+
+    @function.defun
+    def func(a):
+      return a + 1
+
+    hits = function._function_cache_hits_counter.get_cell()
+    misses = function._function_cache_misses_counter.get_cell()
+    retraces = function._function_retraces_counter.get_cell()
+    evictions = function._function_cache_evictions_counter.get_cell()
+    initial_hits = hits.value()
+    initial_misses = misses.value()
+    initial_retraces = retraces.value()
+    initial_evictions = evictions.value()
+    func(constant_op.constant([1.0]))
+    func(constant_op.constant([1.0]))
+    func(constant_op.constant([1.0, 2.0]))
+    func(constant_op.constant([1.0, 2.0]))
+    func(constant_op.constant([1.0]))
+    self.assertEqual(3, hits.value() - initial_hits)
+    self.assertEqual(2, misses.value() - initial_misses)
+    self.assertEqual(1, retraces.value() - initial_retraces)
+    self.assertEqual(0, evictions.value() - initial_evictions)
+    self.assertEmpty(func._function_cache._usage)
+    self.assertEqual(0, func._function_cache.total_bytes)
+
+  def testFunctionCacheMaxBytes(self):
+
+    @function.defun(experimental_relax_shapes=True)
+    def func(a):
+      return a + 1
+
+    func(constant_op.constant([1.0]))
+    cache = func._function_cache
+    one_function_bytes = cache.primary[
+        list(cache.primary)[0]].function_def.ByteSize()
+    function.set_function_cache_limits(max_bytes=one_function_bytes)
+    self.addCleanup(function.set_function_cache_limits)
+
+    # The relaxed function evicts the first one, and is never evicted itself.
+    func(constant_op.constant([1.0, 2.0]))
+    self.assertEmpty(cache.primary)
+    self.assertLen(cache.arg_relaxed, 1)
+    self.assertLen(cache.arg_relaxed_specs, 1)
+    self.assertGreater(cache.total_bytes, 0)
+
+    with self.assertRaisesRegex(ValueError, 'max_entries must be positive'):
+      function.set_function_cache_limits(max_entries=0)
+
   def testInputShapeRelaxationOnInstanceMethod(self):
     # Test that experimental_relax_shapes is passed during
     # instance method bounding.
@@ -879,6 +879,37 @@ class _SessionConverterData(_ConverterData):
             numpy=tensor_value, dtype=node.attr["dtype"].type, index=None)
 
 
+class _CheckpointConverterData(_ConverterData):
+  """Container for checkpoint-based conversion data.
+
+  The values of the variables are not read: every converted variable becomes a
+  `Const` with an empty value of the right dtype, whose content is left to be
+  filled in from the checkpoint by the caller. This lets the structure of large
+  models be converted without holding their weights in memory.
+  """
+
+  def __init__(self,
+               graph_def,
+               output_node_names,
+               variable_names_allowlist=None,
+               variable_names_denylist=None):
+    graph_def = graph_util.extract_sub_graph(graph_def, output_node_names)
+    super(_CheckpointConverterData, self).__init__(
+        graph_def,
+        variable_names_allowlist=variable_names_allowlist,
+        variable_names_denylist=variable_names_denylist)
+
+    for node in self.graph_def.node:
+      if node.op in ["Variable", "VariableV2", "VarHandleOp"]:
+        if not self._should_convert(node.name):
+          continue
+        dtype = dtypes.as_dtype(node.attr["dtype"].type)
+        self._tensor_data[node.name] = _TensorData(
+            numpy=np.zeros([0], dtype=dtype.as_numpy_dtype),
+            dtype=node.attr["dtype"].type,
+            index=None)
+
+
 def disable_lower_using_switch_merge(graph_def):
   """Set '_lower_using_switch_merge' attributes to False.
 
@@ -1119,6 +1150,39 @@ def convert_variables_to_constants_v2_as_graph(func,
   return frozen_func, output_graph_def
 
 
+def convert_variables_to_constants_from_checkpoint_graph(
+    graph_def,
+    output_node_names,
+    variable_names_allowlist=None,
+    variable_names_denylist=None):
+  """Replaces all the variables in a graph with constants without values.
+
+  This function works like convert_variables_to_constants_from_session_graph,
+  but does not need the values of the variables: the returned `Const` nodes
+  have the dtype of their variable and an empty `value`, which the caller fills
+  in, typically from a checkpoint, one variable at a time.
+
+  Args:
+    graph_def: A GraphDef to convert.
+    output_node_names: List of name strings for the result nodes of the graph.
+    variable_names_allowlist: The set of variable names to convert (by default,
+      all variables are converted).
+    variable_names_denylist: The set of variable names to omit converting to
+      constants.
+
+  Returns:
+    A tuple of the converted GraphDef and of the sorted list of the names of the
+    converted variables.
+  """
+  converter_data = _CheckpointConverterData(
+      graph_def=graph_def,
+      output_node_names=output_node_names,
+      variable_names_allowlist=variable_names_allowlist,
+      variable_names_denylist=variable_names_denylist)
+  graph_def, _ = _replace_variables_by_constants(converter_data=converter_data)
+  return graph_def, sorted(converter_data.tensor_data)
+
+
 def convert_variables_to_constants_from_session_graph(
     session,
     graph_def,
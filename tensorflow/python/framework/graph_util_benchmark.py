@@ -0,0 +1,109 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+r"""Benchmarks for the `GraphDef` transforms of `graph_util`.
+
+To run the benchmarks:
+  bazel run -c opt graph_util_benchmark -- --benchmarks=.
+
+To run a subset of benchmarks using --benchmarks flag.
+--benchmarks: the list of benchmarks to run. The specified value is interpreted
+as a regular expression and any benchmark whose name contains a partial match
+to the regular expression is executed.
+e.g. --benchmarks=".*Extract.*" will run the subgraph extraction benchmarks.
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+from tensorflow.core.framework import graph_pb2
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import graph_util
+from tensorflow.python.platform import test
+from tensorflow.python.tools import strip_unused_lib
+
+_NUM_NODES = 500000
+# Every node of the chain takes the previous one as input, and every
+# `_FAN_IN`th node also reads a node `_FAN_IN` steps back, so that the graph
+# is not just a list.
+_FAN_IN = 10
+
+
+def run_benchmark(func, num_iters):
+  start = time.time()
+  for _ in range(num_iters):
+    func()
+  end = time.time()
+  return end - start
+
+
+def _make_graph_def(num_nodes):
+  """Returns a chain of nodes interleaved with CheckNumerics and Identity."""
+  graph_def = graph_pb2.GraphDef()
+  node = graph_def.node.add(name="n0", op="Placeholder")
+  for i in range(1, num_nodes):
+    if i % 3 == 1:
+      op = "CheckNumerics"
+    elif i % 3 == 2:
+      op = "Identity"
+    else:
+      op = "Add"
+    node = graph_def.node.add(name="n%d" % i, op=op)
+    node.input.append("n%d" % (i - 1))
+    if op == "Add":
+      node.input.append("n%d:0" % max(i - _FAN_IN, 0))
+  return graph_def
+
+
+class GraphUtilBenchmarks(test.Benchmark):
+  """Benchmarks for transforms on large `GraphDef`s."""
+
+  def _run_and_report(self, func, num_iters, num_nodes):
+    total_time = run_benchmark(func, num_iters)
+    mean_us = total_time * 1e6 / num_iters
+    self.report_benchmark(
+        iters=num_iters,
+        wall_time=mean_us,
+        extras={
+            "nodes_per_sec":
+                float("{0:.3f}".format(num_nodes * num_iters / total_time)),
+        })
+
+  def benchmarkExtractSubGraph(self):
+    graph_def = _make_graph_def(_NUM_NODES)
+    dest_nodes = [graph_def.node[-1].name]
+    self._run_and_report(
+        lambda: graph_util.extract_sub_graph(graph_def, dest_nodes), 3,
+        _NUM_NODES)
+
+  def benchmarkRemoveTrainingNodes(self):
+    graph_def = _make_graph_def(_NUM_NODES)
+    self._run_and_report(
+        lambda: graph_util.remove_training_nodes(graph_def), 3, _NUM_NODES)
+
+  def benchmarkStripUnused(self):
+    graph_def = _make_graph_def(_NUM_NODES)
+    input_node_names = ["n%d" % (_NUM_NODES // 2)]
+    output_node_names = [graph_def.node[-1].name]
+    self._run_and_report(
+        lambda: strip_unused_lib.strip_unused(  # pylint: disable=g-long-lambda
+            graph_def, input_node_names, output_node_names,
+            dtypes.float32.as_datatype_enum), 3, _NUM_NODES)
+
+
+if __name__ == "__main__":
+  test.main()
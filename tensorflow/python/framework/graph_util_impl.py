@@ -18,8 +18,7 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-import copy
-import re
+import collections
 
 import six
 
@@ -167,10 +166,9 @@ def _bfs_for_reachable_nodes(target_nodes, name_to_input_name):
   """Breadth first search for reachable nodes from target nodes."""
   nodes_to_keep = set()
   # Breadth first search to find all the nodes that we should keep.
-  next_to_visit = target_nodes[:]
+  next_to_visit = collections.deque(target_nodes)
   while next_to_visit:
-    node = next_to_visit[0]
-    del next_to_visit[0]
+    node = next_to_visit.popleft()
     if node in nodes_to_keep:
       # Already visited this node.
       continue
@@ -180,6 +178,125 @@ def _bfs_for_reachable_nodes(target_nodes, name_to_input_name):
   return nodes_to_keep
 
 
+class _GraphDefIndex(object):
+  """Index of the nodes and edges of a `GraphDef`.
+
+  The index is built in linear time, with one pass to number the nodes and one
+  pass to resolve their inputs, so that graph transforms can look nodes up and
+  walk edges without building their own maps. Nodes are identified by their
+  position in `graph_def.node`. If several nodes have the same name, the name
+  refers to the last of them.
+
+  Attributes:
+    nodes: List of the `NodeDef`s of the graph.
+    name_to_index: Dict from node name to position in `nodes`.
+    name_to_node: Dict from node name to `NodeDef`.
+    inputs: List with, for every node, the positions of the nodes it takes as
+      inputs (data and control inputs, and with `colocation_edges`, the nodes
+      it is colocated with), once per edge.
+    consumers: List with, for every node, the positions of the nodes that take
+      it as an input, once per edge.
+    missing_inputs: List of `(position, input)` pairs of inputs that do not
+      name a node of the graph.
+    duplicate_names: List of the names of more than one node.
+  """
+
+  def __init__(self, graph_def, colocation_edges=False):
+    self.nodes = list(graph_def.node)
+    self.name_to_index = {}
+    self.name_to_node = {}
+    self.duplicate_names = []
+    for i, node in enumerate(self.nodes):
+      name = _node_name(node.name)
+      if name in self.name_to_index:
+        self.duplicate_names.append(name)
+      self.name_to_index[name] = i
+      self.name_to_node[name] = node
+
+    self.inputs = []
+    self.consumers = [[] for _ in self.nodes]
+    self.missing_inputs = []
+    name_to_index = self.name_to_index
+    for i, node in enumerate(self.nodes):
+      input_names = list(node.input)
+      if colocation_edges and "_class" in node.attr:
+        input_names.extend(
+            _get_colocated_node_name(colocated_node_name)
+            for colocated_node_name in node.attr["_class"].list.s)
+      node_inputs = []
+      for input_name in input_names:
+        j = name_to_index.get(_node_name(input_name))
+        if j is None:
+          self.missing_inputs.append((i, input_name))
+        else:
+          node_inputs.append(j)
+          self.consumers[j].append(i)
+      self.inputs.append(node_inputs)
+
+  def reachable(self, dest_nodes, stop_nodes=()):
+    """Returns the positions of the nodes `dest_nodes` depend on, in order.
+
+    Args:
+      dest_nodes: Names of the nodes to start from. They must be in the graph.
+      stop_nodes: Names of nodes whose inputs are not followed.
+
+    Returns:
+      Sorted list of the positions of `dest_nodes` and of all the nodes they
+      can be reached from.
+    """
+    stop = set(self.name_to_index[n] for n in stop_nodes
+               if n in self.name_to_index)
+    visited = [False] * len(self.nodes)
+    next_to_visit = collections.deque(
+        self.name_to_index[n] for n in dest_nodes)
+    while next_to_visit:
+      i = next_to_visit.popleft()
+      if visited[i]:
+        continue
+      visited[i] = True
+      if i not in stop:
+        next_to_visit.extend(self.inputs[i])
+    return [i for i, v in enumerate(visited) if v]
+
+  def assert_inputs_are_present(self, positions):
+    """Checks that the nodes at `positions` have no missing inputs.
+
+    Args:
+      positions: Positions of the nodes to check.
+
+    Raises:
+      KeyError: With the name of the first missing input found.
+    """
+    if not self.missing_inputs:
+      return
+    positions = set(positions)
+    for i, input_name in self.missing_inputs:
+      if i in positions:
+        raise KeyError(_node_name(input_name))
+
+  def topological_order(self):
+    """Returns the positions of the nodes in topological order.
+
+    Nodes that are part of cycles (such as the loops of `tf.while_loop`) and
+    the nodes that depend on them come last, in their original order.
+    """
+    num_inputs = [len(node_inputs) for node_inputs in self.inputs]
+    ready = collections.deque(
+        i for i, count in enumerate(num_inputs) if not count)
+    order = []
+    while ready:
+      i = ready.popleft()
+      order.append(i)
+      for j in self.consumers[i]:
+        num_inputs[j] -= 1
+        if not num_inputs[j]:
+          ready.append(j)
+    if len(order) < len(self.nodes):
+      ordered = set(order)
+      order.extend(i for i in range(len(self.nodes)) if i not in ordered)
+    return order
+
+
 @deprecation.deprecated(
     date=None,
     instructions="Use `tf.compat.v1.graph_util.extract_sub_graph`")
@@ -195,6 +312,8 @@ def extract_sub_graph(graph_def, dest_nodes):
 
   Raises:
     TypeError: If 'graph_def' is not a graph_pb2.GraphDef proto.
+    KeyError: If a node of the sub-graph has an input which is not in
+      'graph_def'.
   """
 
   if not isinstance(graph_def, graph_pb2.GraphDef):
@@ -203,18 +322,15 @@ def extract_sub_graph(graph_def, dest_nodes):
   if isinstance(dest_nodes, six.string_types):
     raise TypeError("dest_nodes must be a list.")
 
-  name_to_input_name, name_to_node, name_to_seq_num = _extract_graph_summary(
-      graph_def)
-  _assert_nodes_are_present(name_to_node, dest_nodes)
+  index = _GraphDefIndex(graph_def, colocation_edges=True)
+  _assert_nodes_are_present(index.name_to_node, dest_nodes)
 
-  nodes_to_keep = _bfs_for_reachable_nodes(dest_nodes, name_to_input_name)
+  nodes_to_keep = index.reachable(dest_nodes)
+  index.assert_inputs_are_present(nodes_to_keep)
 
-  nodes_to_keep_list = sorted(
-      list(nodes_to_keep), key=lambda n: name_to_seq_num[n])
-  # Now construct the output GraphDef
+  # Now construct the output GraphDef. `extend` copies the nodes.
   out = graph_pb2.GraphDef()
-  for n in nodes_to_keep_list:
-    out.node.extend([copy.deepcopy(name_to_node[n])])
+  out.node.extend([index.nodes[i] for i in nodes_to_keep])
   out.library.CopyFrom(graph_def.library)
   out.versions.CopyFrom(graph_def.versions)
 
@@ -307,70 +423,63 @@ def remove_training_nodes(input_graph, protected_nodes=None):
   Returns:
     A list of nodes with the unnecessary ones removed.
   """
-  if not protected_nodes:
-    protected_nodes = []
+  protected_nodes = set(protected_nodes or [])
+
+  def strip_control(input_name):
+    return input_name[1:] if input_name.startswith("^") else input_name
 
   types_to_remove = {"CheckNumerics": True}
 
   input_nodes = input_graph.node
-  names_to_remove = {}
-  for node in input_nodes:
-    if node.op in types_to_remove and node.name not in protected_nodes:
-      names_to_remove[node.name] = True
+  names_to_remove = set(
+      node.name for node in input_nodes
+      if node.op in types_to_remove and node.name not in protected_nodes)
 
+  # The remaining nodes, with their inputs after removal. Nodes are only
+  # copied once, into the output graph.
   nodes_after_removal = []
   for node in input_nodes:
     if node.name in names_to_remove:
       continue
-    new_node = node_def_pb2.NodeDef()
-    new_node.CopyFrom(node)
-    input_before_removal = node.input
-    del new_node.input[:]
-    for full_input_name in input_before_removal:
-      input_name = re.sub(r"^\^", "", full_input_name)
-      if input_name in names_to_remove:
-        continue
-      new_node.input.append(full_input_name)
-    nodes_after_removal.append(new_node)
+    inputs = [
+        full_input_name for full_input_name in node.input
+        if strip_control(full_input_name) not in names_to_remove
+    ]
+    nodes_after_removal.append((node, inputs))
 
   types_to_splice = {"Identity": True}
   control_input_names = set()
   node_names_with_control_input = set()
-  for node in nodes_after_removal:
-    for node_input in node.input:
+  for node, inputs in nodes_after_removal:
+    for node_input in inputs:
       if "^" in node_input:
         control_input_names.add(node_input.replace("^", ""))
         node_names_with_control_input.add(node.name)
 
   names_to_splice = {}
-  for node in nodes_after_removal:
+  for node, inputs in nodes_after_removal:
     if node.op in types_to_splice and node.name not in protected_nodes:
       # We don't want to remove nodes that have control edge inputs, because
       # they might be involved in subtle dependency issues that removing them
       # will jeopardize.
       if node.name not in node_names_with_control_input:
-        names_to_splice[node.name] = node.input[0]
+        names_to_splice[node.name] = inputs[0]
 
   # We also don't want to remove nodes which are used as control edge inputs.
   names_to_splice = {name: value for name, value in names_to_splice.items()
                      if name not in control_input_names}
 
-  nodes_after_splicing = []
-  for node in nodes_after_removal:
+  output_graph = graph_pb2.GraphDef()
+  for node, inputs in nodes_after_removal:
     if node.name in names_to_splice:
       continue
-    new_node = node_def_pb2.NodeDef()
+    new_node = output_graph.node.add()
     new_node.CopyFrom(node)
-    input_before_removal = node.input
     del new_node.input[:]
-    for full_input_name in input_before_removal:
-      input_name = re.sub(r"^\^", "", full_input_name)
+    for full_input_name in inputs:
+      input_name = strip_control(full_input_name)
       while input_name in names_to_splice:
         full_input_name = names_to_splice[input_name]
-        input_name = re.sub(r"^\^", "", full_input_name)
+        input_name = strip_control(full_input_name)
       new_node.input.append(full_input_name)
-    nodes_after_splicing.append(new_node)
-
-  output_graph = graph_pb2.GraphDef()
-  output_graph.node.extend(nodes_after_splicing)
   return output_graph
@@ -24,6 +24,7 @@ from tensorflow.core.framework import node_def_pb2
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import graph_util
+from tensorflow.python.framework import graph_util_impl
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.framework import test_util
@@ -185,6 +186,70 @@ class DeviceFunctionsTest(test.TestCase):
     self.assertEqual("n3", sub_graph.node[2].name)
     self.assertEqual("n5", sub_graph.node[3].name)
 
+  def testExtractSubGraphKeepsColocatedNodes(self):
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend([
+        self.create_node_def("Const", "a", []),
+        self.create_node_def("Const", "b", []),
+        self.create_node_def("Identity", "c", ["a"]),
+        self.create_node_def("Const", "d", []),
+    ])
+    graph_def.node[2].attr["_class"].list.s.extend([b"loc:@b"])
+    graph_def.versions.producer = 7
+
+    sub_graph = graph_util.extract_sub_graph(graph_def, ["c"])
+    self.assertEqual(["a", "b", "c"], [node.name for node in sub_graph.node])
+    self.assertEqual(7, sub_graph.versions.producer)
+
+  def testExtractSubGraphWithMissingInput(self):
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend([
+        self.create_node_def("Const", "a", []),
+        self.create_node_def("Identity", "b", ["a", "^missing"]),
+    ])
+
+    sub_graph = graph_util.extract_sub_graph(graph_def, ["a"])
+    self.assertEqual(["a"], [node.name for node in sub_graph.node])
+    with self.assertRaisesRegex(KeyError, "missing"):
+      graph_util.extract_sub_graph(graph_def, ["b"])
+
+  def testGraphDefIndex(self):
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend([
+        self.create_node_def("Mul", "c", ["a:0", "^b"]),
+        self.create_node_def("Const", "a", []),
+        self.create_node_def("Identity", "b", ["a"]),
+        self.create_node_def("Identity", "d", ["missing"]),
+        self.create_node_def("Add", "e", ["c", "c:1"]),
+    ])
+    index = graph_util_impl._GraphDefIndex(graph_def)
+
+    self.assertEqual(2, index.name_to_index["b"])
+    self.assertIs(index.nodes[2], index.name_to_node["b"])
+    self.assertEqual([[1, 2], [], [1], [], [0, 0]], index.inputs)
+    self.assertEqual([[4, 4], [0, 2], [0], [], []], index.consumers)
+    self.assertEqual([(3, "missing")], index.missing_inputs)
+    self.assertEqual([], index.duplicate_names)
+    self.assertEqual([0, 1, 2, 4], index.reachable(["e"]))
+    self.assertEqual([0, 4], index.reachable(["e"], stop_nodes=["c"]))
+    self.assertEqual([1, 3, 2, 0, 4], index.topological_order())
+
+  def testGraphDefIndexWithCyclesAndDuplicates(self):
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend([
+        self.create_node_def("Merge", "x", ["y"]),
+        self.create_node_def("NextIteration", "y", ["x"]),
+        self.create_node_def("Const", "z", []),
+        self.create_node_def("Identity", "w", ["x", "z"]),
+        self.create_node_def("Const", "z", []),
+    ])
+    index = graph_util_impl._GraphDefIndex(graph_def)
+
+    self.assertEqual(["z"], index.duplicate_names)
+    self.assertEqual(4, index.name_to_index["z"])
+    self.assertEqual([0, 1, 3, 4], index.reachable(["w"]))
+    self.assertEqual([2, 4, 0, 1, 3], index.topological_order())
+
   def testExtractSubGraphWithInvalidDestNodes(self):
     graph_def = graph_pb2.GraphDef()
     n1 = graph_def.node.add()
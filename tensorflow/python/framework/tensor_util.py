@@ -49,7 +49,7 @@ def ExtractBitsFromFloat16(x):
 
 def SlowAppendFloat16ArrayToTensorProto(tensor_proto, proto_values):
   tensor_proto.half_val.extend(
-      [ExtractBitsFromFloat16(x) for x in proto_values])
+      np.asarray(proto_values, dtype=np.float16).view(np.uint16).tolist())
 
 
 def _MediumAppendFloat16ArrayToTensorProto(tensor_proto, proto_values):
@@ -66,7 +66,15 @@ def ExtractBitsFromBFloat16(x):
 
 def SlowAppendBFloat16ArrayToTensorProto(tensor_proto, proto_values):
   tensor_proto.half_val.extend(
-      [ExtractBitsFromBFloat16(x) for x in proto_values])
+      np.asarray(proto_values, dtype=dtypes.bfloat16.as_numpy_dtype).view(
+          np.uint16).tolist())
+
+
+def _AppendBytesArrayToTensorProto(tensor_proto, proto_values):
+  """Appends a NumPy array of `bytes` or `str` to `tensor_proto.string_val`."""
+  if proto_values.dtype.kind == "U":
+    proto_values = np.char.encode(proto_values, "utf-8")
+  tensor_proto.string_val.extend(proto_values.tolist())
 
 
 def FastAppendBFloat16ArrayToTensorProto(tensor_proto, proto_values):
@@ -124,39 +132,42 @@ if _FAST_TENSOR_UTIL_AVAILABLE:
 else:
 
   def SlowAppendFloat32ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.float_val.extend([x.item() for x in proto_values])
+    tensor_proto.float_val.extend(proto_values.tolist())
 
   def SlowAppendFloat64ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.double_val.extend([x.item() for x in proto_values])
+    tensor_proto.double_val.extend(proto_values.tolist())
 
   def SlowAppendIntArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.int_val.extend([x.item() for x in proto_values])
+    tensor_proto.int_val.extend(proto_values.tolist())
 
   def SlowAppendInt64ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.int64_val.extend([x.item() for x in proto_values])
+    tensor_proto.int64_val.extend(proto_values.tolist())
 
   def SlowAppendQIntArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.int_val.extend([x.item()[0] for x in proto_values])
+    # Quantized types are structured types with a single integer field.
+    tensor_proto.int_val.extend(
+        proto_values.view(proto_values.dtype[0]).tolist())
 
   def SlowAppendUInt32ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.uint32_val.extend([x.item() for x in proto_values])
+    tensor_proto.uint32_val.extend(proto_values.tolist())
 
   def SlowAppendUInt64ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.uint64_val.extend([x.item() for x in proto_values])
+    tensor_proto.uint64_val.extend(proto_values.tolist())
 
   def SlowAppendComplex64ArrayToTensorProto(tensor_proto, proto_values):
+    # Viewed as reals, complex arrays are real_0, imag_0, real_1, imag_1, ...
     tensor_proto.scomplex_val.extend(
-        [v.item() for x in proto_values for v in [x.real, x.imag]])
+        np.ascontiguousarray(proto_values).view(np.float32).tolist())
 
   def SlowAppendComplex128ArrayToTensorProto(tensor_proto, proto_values):
     tensor_proto.dcomplex_val.extend(
-        [v.item() for x in proto_values for v in [x.real, x.imag]])
+        np.ascontiguousarray(proto_values).view(np.float64).tolist())
 
   def SlowAppendObjectArrayToTensorProto(tensor_proto, proto_values):
     tensor_proto.string_val.extend([compat.as_bytes(x) for x in proto_values])
 
   def SlowAppendBoolArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.bool_val.extend([x.item() for x in proto_values])
+    tensor_proto.bool_val.extend(proto_values.tolist())
 
   _NP_TO_APPEND_FN = {
       dtypes.bfloat16.as_numpy_dtype: SlowAppendBFloat16ArrayToTensorProto,
@@ -198,10 +209,7 @@ def GetNumpyAppendFn(dtype):
   # dtype is a "string" type. We need to compare the dtype.type to be
   # sure it's a string type.
   if dtype.type == np.string_ or dtype.type == np.unicode_:
-    if _FAST_TENSOR_UTIL_AVAILABLE:
-      return fast_tensor_util.AppendObjectArrayToTensorProto
-    else:
-      return SlowAppendObjectArrayToTensorProto
+    return _AppendBytesArrayToTensorProto
   return GetFromNumpyDTypeDict(_NP_TO_APPEND_FN, dtype)
 
 
@@ -227,19 +235,36 @@ def _GetDenseDimensions(list_of_lists):
     return [len(list_of_lists)] + _GetDenseDimensions(list_of_lists[0])
 
 
-def _FlattenToStrings(nested_strings):
+def _IterFlattenedStrings(nested_strings):
   if isinstance(nested_strings, (list, tuple)):
     for inner in nested_strings:
-      for flattened_string in _FlattenToStrings(inner):
+      for flattened_string in _IterFlattenedStrings(inner):
         yield flattened_string
   else:
     yield nested_strings
 
 
+def _FlattenToStrings(nested_strings):
+  """Returns the leaves of a nested list of strings, in row-major order."""
+  if not isinstance(nested_strings, (list, tuple)):
+    return [nested_strings]
+  # Unlike arrays of bytes, arrays of objects keep trailing null characters.
+  try:
+    flat = np.array(nested_strings, dtype=np.object)
+  except ValueError:
+    flat = None
+  if (flat is not None and
+      list(flat.shape) == _GetDenseDimensions(nested_strings)):
+    return flat.ravel().tolist()
+  return list(_IterFlattenedStrings(nested_strings))
+
+
 _TENSOR_CONTENT_TYPES = frozenset([
-    dtypes.float16, dtypes.float32, dtypes.float64, dtypes.int32, dtypes.uint8,
-    dtypes.int16, dtypes.int8, dtypes.int64, dtypes.qint8, dtypes.quint8,
-    dtypes.qint16, dtypes.quint16, dtypes.qint32, dtypes.uint32, dtypes.uint64
+    dtypes.float16, dtypes.bfloat16, dtypes.float32, dtypes.float64,
+    dtypes.int32, dtypes.uint8, dtypes.uint16, dtypes.int16, dtypes.int8,
+    dtypes.int64, dtypes.qint8, dtypes.quint8, dtypes.qint16, dtypes.quint16,
+    dtypes.qint32, dtypes.uint32, dtypes.uint64, dtypes.complex64,
+    dtypes.complex128
 ])
 
 
@@ -535,7 +560,11 @@ def make_tensor_proto(values, dtype=None, shape=None, verify_shape=False,
   # list of lists that might or might not correspond to the given shape,
   # we flatten it conservatively.
   if numpy_dtype == dtypes.string and not isinstance(values, np.ndarray):
-    proto_values = _FlattenToStrings(values)
+    if nparray.dtype == np.object:
+      # The elements of object arrays are the original values.
+      proto_values = nparray.ravel().tolist()
+    else:
+      proto_values = _FlattenToStrings(values)
 
     # At this point, values may be a list of objects that we could not
     # identify a common type for (hence it was inferred as
@@ -545,6 +574,12 @@ def make_tensor_proto(values, dtype=None, shape=None, verify_shape=False,
     # Ideally, we'd be able to convert the elements of the list to a
     # common type, but this type inference requires some thinking and
     # so we defer it for now.
+    try:
+      # Fast path for values which are all `bytes` already.
+      tensor_proto.string_val.extend(proto_values)
+      return tensor_proto
+    except TypeError:
+      del tensor_proto.string_val[:]
     try:
       str_values = [compat.as_bytes(x) for x in proto_values]
     except TypeError:
@@ -628,12 +663,15 @@ def MakeNdarray(tensor):
     values = np.fromiter(tensor.int_val, dtype=dtype)
   elif tensor_dtype == dtypes.int64:
     values = np.fromiter(tensor.int64_val, dtype=dtype)
+  elif tensor_dtype == dtypes.uint32:
+    values = np.fromiter(tensor.uint32_val, dtype=dtype)
+  elif tensor_dtype == dtypes.uint64:
+    values = np.fromiter(tensor.uint64_val, dtype=dtype)
   elif tensor_dtype == dtypes.complex64:
-    it = iter(tensor.scomplex_val)
-    values = np.array([complex(x[0], x[1]) for x in zip(it, it)], dtype=dtype)
+    # scomplex_val are real_0, imag_0, real_1, imag_1, ...
+    values = np.fromiter(tensor.scomplex_val, dtype=np.float32).view(dtype)
   elif tensor_dtype == dtypes.complex128:
-    it = iter(tensor.dcomplex_val)
-    values = np.array([complex(x[0], x[1]) for x in zip(it, it)], dtype=dtype)
+    values = np.fromiter(tensor.dcomplex_val, dtype=np.float64).view(dtype)
   elif tensor_dtype == dtypes.bool:
     values = np.fromiter(tensor.bool_val, dtype=dtype)
   else:
@@ -0,0 +1,109 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+r"""Benchmarks for converting between NumPy arrays and `TensorProto`s.
+
+To run the benchmarks:
+  bazel run -c opt tensor_util_benchmark -- --benchmarks=.
+
+To run a subset of benchmarks using --benchmarks flag.
+--benchmarks: the list of benchmarks to run. The specified value is interpreted
+as a regular expression and any benchmark whose name contains a partial match
+to the regular expression is executed.
+e.g. --benchmarks=".*String.*" will run all string related benchmarks.
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import tensor_util
+from tensorflow.python.platform import test
+
+# Elements of the numeric tensors, i.e. 4MB of float32.
+_NUM_ELEMENTS = 1 << 20
+_NUM_STRINGS = 100000
+
+
+def run_benchmark(func, num_iters):
+  start = time.time()
+  for _ in range(num_iters):
+    func()
+  end = time.time()
+  return end - start
+
+
+class TensorUtilBenchmarks(test.Benchmark):
+  """Benchmarks for `make_tensor_proto` and `MakeNdarray`."""
+
+  def _run_and_report(self, func, num_iters, num_elements):
+    total_time = run_benchmark(func, num_iters)
+    mean_us = total_time * 1e6 / num_iters
+    self.report_benchmark(
+        iters=num_iters,
+        wall_time=mean_us,
+        extras={
+            "elements_per_sec":
+                float("{0:.3f}".format(num_elements * num_iters / total_time)),
+        })
+
+  def _benchmarkNumeric(self, dtype):
+    values = np.random.uniform(size=_NUM_ELEMENTS).astype(dtype.as_numpy_dtype)
+    proto = tensor_util.make_tensor_proto(values)
+    self._run_and_report(
+        lambda: tensor_util.make_tensor_proto(values), 20, _NUM_ELEMENTS)
+    self._run_and_report(
+        lambda: tensor_util.MakeNdarray(proto), 20, _NUM_ELEMENTS)
+
+  def benchmarkFloat32(self):
+    self._benchmarkNumeric(dtypes.float32)
+
+  def benchmarkFloat16(self):
+    self._benchmarkNumeric(dtypes.float16)
+
+  def benchmarkBfloat16(self):
+    self._benchmarkNumeric(dtypes.bfloat16)
+
+  def benchmarkComplex64(self):
+    self._benchmarkNumeric(dtypes.complex64)
+
+  def benchmarkMakeNdarrayRepeatedFloat32(self):
+    # Protos written by other tools may use the repeated fields.
+    proto = tensor_util.make_tensor_proto(0.5, shape=[_NUM_ELEMENTS])
+    proto.float_val.extend(np.ones(_NUM_ELEMENTS - 1, np.float32).tolist())
+    self._run_and_report(
+        lambda: tensor_util.MakeNdarray(proto), 5, _NUM_ELEMENTS)
+
+  def benchmarkStringList(self):
+    values = [[b"string_%d" % i for i in range(100)]
+              for _ in range(_NUM_STRINGS // 100)]
+    proto = tensor_util.make_tensor_proto(values)
+    self._run_and_report(
+        lambda: tensor_util.make_tensor_proto(values), 5, _NUM_STRINGS)
+    self._run_and_report(
+        lambda: tensor_util.MakeNdarray(proto), 5, _NUM_STRINGS)
+
+  def benchmarkStringArray(self):
+    values = np.array([u"string_%d" % i for i in range(_NUM_STRINGS)])
+    self._run_and_report(
+        lambda: tensor_util.make_tensor_proto(values), 5, _NUM_STRINGS)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -23,6 +23,8 @@ import sys
 
 import numpy as np
 
+from tensorflow.core.framework import tensor_pb2
+from tensorflow.core.framework import types_pb2
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import func_graph
@@ -244,20 +246,36 @@ class TensorUtilTest(test.TestCase):
     t = tensor_util.make_tensor_proto(np.array([10.0, 20.0], dtype=test_type))
     # 10.0: 16672 = 010000010(130) 0100000: (1+0/2+1/4) * 2^(130-127)
     # 20.0: 16800 = 010000011(131) 0100000: (1+0/2+1/4) * 2^(131-127)
+    if sys.byteorder == "big":
+      self.assertProtoEquals(r"""
+        dtype: DT_BFLOAT16
+        tensor_shape { dim { size: 2 } }
+        tensor_content: "A A\240"
+        """, t)
+    else:
+      self.assertProtoEquals(r"""
+        dtype: DT_BFLOAT16
+        tensor_shape { dim { size: 2 } }
+        tensor_content: " A\240A"
+        """, t)
+
+    a = tensor_util.MakeNdarray(t)
+    self.assertEqual(test_type, a.dtype)
+    self.assertAllClose(np.array([10.0, 20.0], dtype=test_type), a)
+
+  def testBfloat16HalfVal(self):
+    test_type = dtypes.bfloat16.as_numpy_dtype
+    t = tensor_util.make_tensor_proto(np.array([10.0], dtype=test_type),
+                                      shape=[2])
     self.assertProtoEquals("""
       dtype: DT_BFLOAT16
-      tensor_shape {
-        dim {
-          size: 2
-        }
-      }
+      tensor_shape { dim { size: 2 } }
       half_val: 16672
-      half_val: 16800
       """, t)
 
     a = tensor_util.MakeNdarray(t)
     self.assertEqual(test_type, a.dtype)
-    self.assertAllClose(np.array([10.0, 20.0], dtype=test_type), a)
+    self.assertAllClose(np.array([10.0, 10.0], dtype=test_type), a)
 
   def testInt(self):
     t = tensor_util.make_tensor_proto(10)
@@ -571,6 +589,32 @@ class TensorUtilTest(test.TestCase):
     self.assertEqual(np.object, a.dtype)
     self.assertAllEqual(np.array([[b"foo", b"bar", b"baz"]]), a)
 
+  def testStringTrailingNulls(self):
+    t = tensor_util.make_tensor_proto([[b"a\0", b"b"], [b"\0\0", b"c"]])
+    self.assertProtoEquals(r"""
+      dtype: DT_STRING
+      tensor_shape { dim { size: 2 } dim { size: 2 } }
+      string_val: "a\000"
+      string_val: "b"
+      string_val: "\000\000"
+      string_val: "c"
+      """, t)
+
+  def testStringUnicodeNpArray(self):
+    t = tensor_util.make_tensor_proto(np.array([u"\u00e9", u"ab"]))
+    self.assertProtoEquals(r"""
+      dtype: DT_STRING
+      tensor_shape { dim { size: 2 } }
+      string_val: "\303\251"
+      string_val: "ab"
+      """, t)
+
+  def testStringMixedTypes(self):
+    t = tensor_util.make_tensor_proto([[b"a", u"b"], [u"c", b"d"]],
+                                      dtype=dtypes.string)
+    a = tensor_util.MakeNdarray(t)
+    self.assertAllEqual(np.array([[b"a", b"b"], [b"c", b"d"]]), a)
+
   def testStringTuple(self):
     t = tensor_util.make_tensor_proto((b"a", b"ab", b"abc", b"abcd"))
     self.assertProtoEquals("""
@@ -639,16 +683,19 @@ class TensorUtilTest(test.TestCase):
   def testComplex64N(self):
     t = tensor_util.make_tensor_proto(
         [(1 + 2j), (3 + 4j), (5 + 6j)], shape=[1, 3], dtype=dtypes.complex64)
-    self.assertProtoEquals("""
-      dtype: DT_COMPLEX64
-      tensor_shape { dim { size: 1 } dim { size: 3 } }
-      scomplex_val: 1
-      scomplex_val: 2
-      scomplex_val: 3
-      scomplex_val: 4
-      scomplex_val: 5
-      scomplex_val: 6
-      """, t)
+    # tensor_content is real_0, imag_0, real_1, imag_1, ...
+    if sys.byteorder == "big":
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX64
+        tensor_shape { dim { size: 1 } dim { size: 3 } }
+        tensor_content: "?\200\000\000@\000\000\000@@\000\000@\200\000\000@\240\000\000@\300\000\000"
+        """, t)
+    else:
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX64
+        tensor_shape { dim { size: 1 } dim { size: 3 } }
+        tensor_content: "\000\000\200?\000\000\000@\000\000@@\000\000\200@\000\000\240@\000\000\300@"
+        """, t)
     a = tensor_util.MakeNdarray(t)
     self.assertEqual(np.complex64, a.dtype)
     self.assertAllEqual(np.array([[(1 + 2j), (3 + 4j), (5 + 6j)]]), a)
@@ -656,16 +703,18 @@ class TensorUtilTest(test.TestCase):
   def testComplex128N(self):
     t = tensor_util.make_tensor_proto(
         [(1 + 2j), (3 + 4j), (5 + 6j)], shape=[1, 3], dtype=dtypes.complex128)
-    self.assertProtoEquals("""
-      dtype: DT_COMPLEX128
-      tensor_shape { dim { size: 1 } dim { size: 3 } }
-      dcomplex_val: 1
-      dcomplex_val: 2
-      dcomplex_val: 3
-      dcomplex_val: 4
-      dcomplex_val: 5
-      dcomplex_val: 6
-      """, t)
+    if sys.byteorder == "big":
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX128
+        tensor_shape { dim { size: 1 } dim { size: 3 } }
+        tensor_content: "?\360\000\000\000\000\000\000@\000\000\000\000\000\000\000@\010\000\000\000\000\000\000@\020\000\000\000\000\000\000@\024\000\000\000\000\000\000@\030\000\000\000\000\000\000"
+        """, t)
+    else:
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX128
+        tensor_shape { dim { size: 1 } dim { size: 3 } }
+        tensor_content: "\000\000\000\000\000\000\360?\000\000\000\000\000\000\000@\000\000\000\000\000\000\010@\000\000\000\000\000\000\020@\000\000\000\000\000\000\024@\000\000\000\000\000\000\030@"
+        """, t)
     a = tensor_util.MakeNdarray(t)
     self.assertEqual(np.complex128, a.dtype)
     self.assertAllEqual(np.array([[(1 + 2j), (3 + 4j), (5 + 6j)]]), a)
@@ -674,19 +723,18 @@ class TensorUtilTest(test.TestCase):
     t = tensor_util.make_tensor_proto(
         np.array([[(1 + 2j), (3 + 4j)], [(5 + 6j), (7 + 8j)]]),
         dtype=dtypes.complex64)
-    # scomplex_val are real_0, imag_0, real_1, imag_1, ...
-    self.assertProtoEquals("""
-      dtype: DT_COMPLEX64
-      tensor_shape { dim { size: 2 } dim { size: 2 } }
-      scomplex_val: 1
-      scomplex_val: 2
-      scomplex_val: 3
-      scomplex_val: 4
-      scomplex_val: 5
-      scomplex_val: 6
-      scomplex_val: 7
-      scomplex_val: 8
-      """, t)
+    if sys.byteorder == "big":
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX64
+        tensor_shape { dim { size: 2 } dim { size: 2 } }
+        tensor_content: "?\200\000\000@\000\000\000@@\000\000@\200\000\000@\240\000\000@\300\000\000@\340\000\000A\000\000\000"
+        """, t)
+    else:
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX64
+        tensor_shape { dim { size: 2 } dim { size: 2 } }
+        tensor_content: "\000\000\200?\000\000\000@\000\000@@\000\000\200@\000\000\240@\000\000\300@\000\000\340@\000\000\000A"
+        """, t)
     a = tensor_util.MakeNdarray(t)
     self.assertEqual(np.complex64, a.dtype)
     self.assertAllEqual(
@@ -696,24 +744,47 @@ class TensorUtilTest(test.TestCase):
     t = tensor_util.make_tensor_proto(
         np.array([[(1 + 2j), (3 + 4j)], [(5 + 6j), (7 + 8j)]]),
         dtype=dtypes.complex128)
-    # scomplex_val are real_0, imag_0, real_1, imag_1, ...
-    self.assertProtoEquals("""
-      dtype: DT_COMPLEX128
-      tensor_shape { dim { size: 2 } dim { size: 2 } }
-      dcomplex_val: 1
-      dcomplex_val: 2
-      dcomplex_val: 3
-      dcomplex_val: 4
-      dcomplex_val: 5
-      dcomplex_val: 6
-      dcomplex_val: 7
-      dcomplex_val: 8
-      """, t)
+    if sys.byteorder == "big":
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX128
+        tensor_shape { dim { size: 2 } dim { size: 2 } }
+        tensor_content: "?\360\000\000\000\000\000\000@\000\000\000\000\000\000\000@\010\000\000\000\000\000\000@\020\000\000\000\000\000\000@\024\000\000\000\000\000\000@\030\000\000\000\000\000\000@\034\000\000\000\000\000\000@ \000\000\000\000\000\000"
+        """, t)
+    else:
+      self.assertProtoEquals(r"""
+        dtype: DT_COMPLEX128
+        tensor_shape { dim { size: 2 } dim { size: 2 } }
+        tensor_content: "\000\000\000\000\000\000\360?\000\000\000\000\000\000\000@\000\000\000\000\000\000\010@\000\000\000\000\000\000\020@\000\000\000\000\000\000\024@\000\000\000\000\000\000\030@\000\000\000\000\000\000\034@\000\000\000\000\000\000 @"
+        """, t)
     a = tensor_util.MakeNdarray(t)
     self.assertEqual(np.complex128, a.dtype)
     self.assertAllEqual(
         np.array([[(1 + 2j), (3 + 4j)], [(5 + 6j), (7 + 8j)]]), a)
 
+  def testComplexValuesMakeNdarray(self):
+    # Protos from other writers may use the repeated fields instead of
+    # tensor_content.
+    t = tensor_pb2.TensorProto(
+        dtype=types_pb2.DT_COMPLEX64,
+        tensor_shape=tensor_shape.TensorShape([2]).as_proto(),
+        scomplex_val=[1, 2, 3, 4])
+    self.assertAllEqual(np.array([(1 + 2j), (3 + 4j)], dtype=np.complex64),
+                        tensor_util.MakeNdarray(t))
+    t = tensor_pb2.TensorProto(
+        dtype=types_pb2.DT_COMPLEX128,
+        tensor_shape=tensor_shape.TensorShape([2]).as_proto(),
+        dcomplex_val=[1, 2, 3, 4])
+    self.assertAllEqual(np.array([(1 + 2j), (3 + 4j)], dtype=np.complex128),
+                        tensor_util.MakeNdarray(t))
+
+  def testUnsignedMakeNdarray(self):
+    for dtype, np_dtype in [(dtypes.uint32, np.uint32),
+                            (dtypes.uint64, np.uint64)]:
+      t = tensor_util.make_tensor_proto(7, dtype=dtype)
+      a = tensor_util.MakeNdarray(t)
+      self.assertEqual(np_dtype, a.dtype)
+      self.assertAllEqual(np.array(7, dtype=np_dtype), a)
+
   def testNestedNumpyArrayWithoutDType(self):
     t = tensor_util.make_tensor_proto([10.0, 20.0, np.array(30.0)])
     a = tensor_util.MakeNdarray(t)
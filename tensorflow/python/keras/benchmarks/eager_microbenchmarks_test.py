@@ -146,6 +146,27 @@ class MicroBenchmarksBase(tf.test.Benchmark):
 
     self._run(fn, 10000)
 
+  def benchmark_progbar_update_overhead(self):
+
+    progbar = tf.keras.utils.Progbar(None, interval=3600.)
+    values = [("loss", 0.5), ("accuracy", 0.25), ("mse", 1.5)]
+
+    def fn():
+      progbar.add(1, values)
+
+    self._run(fn, 10000)
+
+  def benchmark_progbar_jsonl_update_overhead(self):
+
+    progbar = tf.keras.utils.Progbar(
+        None, interval=3600., output_format="jsonl")
+    values = [("loss", 0.5), ("accuracy", 0.25), ("mse", 1.5)]
+
+    def fn():
+      progbar.add(1, values)
+
+    self._run(fn, 10000)
+
 
 class KerasLayerCallOverheadBenchmarks(
     six.with_metaclass(benchmark.ParameterizedBenchmark, MicroBenchmarksBase)):
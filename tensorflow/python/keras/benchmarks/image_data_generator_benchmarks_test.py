@@ -0,0 +1,117 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for batches of augmented images from `ImageDataGenerator`."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import tensorflow as tf
+
+from tensorflow.python.platform import benchmark
+from tensorflow.python.platform import test
+
+try:
+  import pandas as pd  # pylint:disable=g-import-not-at-top
+except ImportError:
+  pd = None
+
+
+class ImageDataGeneratorBenchmark(benchmark.TensorFlowBenchmark):
+  """Compares batched augmentation with the per-image loop."""
+
+  def setUp(self):
+    super(ImageDataGeneratorBenchmark, self).setUp()
+    self._temp_dir = tempfile.mkdtemp()
+    self._filenames = []
+    self._classes = []
+    for cl in range(2):
+      class_directory = "class-%s" % cl
+      os.mkdir(os.path.join(self._temp_dir, class_directory))
+      for i in range(64):
+        filename = os.path.join(class_directory, "image-%s.jpg" % i)
+        pixels = np.random.randint(0, 256, size=(256, 256, 3))
+        tf.keras.preprocessing.image.array_to_img(pixels).save(
+            os.path.join(self._temp_dir, filename))
+        self._filenames.append(filename)
+        self._classes.append(class_directory)
+    self._generator = tf.keras.preprocessing.image.ImageDataGenerator(
+        rotation_range=30,
+        width_shift_range=0.2,
+        height_shift_range=0.2,
+        zoom_range=0.2,
+        channel_shift_range=10.,
+        horizontal_flip=True)
+
+  def tearDown(self):
+    shutil.rmtree(self._temp_dir)
+    super(ImageDataGeneratorBenchmark, self).tearDown()
+
+  def _run_iterator(self, iterator, batched):
+    get_batch = iterator._get_batches_of_transformed_samples
+    if not batched:
+      get_batch = super(type(iterator),
+                        iterator)._get_batches_of_transformed_samples
+    index_arrays = [
+        iterator.index_array[i:i + iterator.batch_size]
+        for i in range(0, iterator.n, iterator.batch_size)
+    ]
+    start = time.time()
+    for index_array in index_arrays:
+      get_batch(index_array)
+    return time.time() - start, len(index_arrays)
+
+  def _report(self, name, make_iterator):
+    iterator = make_iterator()
+    iterator._set_index_array()
+    baseline, num_batches = self._run_iterator(iterator, batched=False)
+    wall_time, _ = self._run_iterator(iterator, batched=True)
+    extras = {
+        "per-image baseline": baseline,
+        "delta seconds": (baseline - wall_time),
+        "delta percent": ((baseline - wall_time) / baseline) * 100,
+        "examples_per_sec": iterator.n / wall_time,
+    }
+    self.report_benchmark(
+        iters=num_batches, wall_time=wall_time / num_batches,
+        extras=extras, name=name)
+
+  def benchmark_flow_from_directory(self):
+    self._report(
+        "image_data_generator|flow_from_directory",
+        lambda: self._generator.flow_from_directory(
+            self._temp_dir, target_size=(224, 224), batch_size=32))
+
+  def benchmark_flow_from_dataframe(self):
+    if pd is None:
+      return
+    dataframe = pd.DataFrame({
+        "filename": self._filenames,
+        "class": self._classes,
+    })
+    self._report(
+        "image_data_generator|flow_from_dataframe",
+        lambda: self._generator.flow_from_dataframe(
+            dataframe, self._temp_dir, target_size=(224, 224), batch_size=32))
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,90 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmarks for `keras.utils.Sequence` inputs with multiprocessing workers."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+import tensorflow as tf
+
+from tensorflow.python.keras.engine import data_adapter
+from tensorflow.python.keras.utils import data_utils
+from tensorflow.python.platform import benchmark
+from tensorflow.python.platform import test
+
+
+class ImageSequence(tf.keras.utils.Sequence):
+  """Sequence of random image batches, standing in for a decoding pipeline."""
+
+  def __init__(self, batch_size, image_size, num_batches):
+    self._batch_size = batch_size
+    self._image_size = image_size
+    self._num_batches = num_batches
+
+  def __getitem__(self, index):
+    x = np.random.random(
+        (self._batch_size, self._image_size, self._image_size, 3))
+    y = np.random.randint(0, 10, size=(self._batch_size, 1))
+    return x.astype(np.float32), y
+
+  def __len__(self):
+    return self._num_batches
+
+
+class KerasSequenceAdapterBenchmark(benchmark.TensorFlowBenchmark):
+  """Compares pickled and shared memory batch transport."""
+
+  def _run_adapter(self, sequence, workers, use_shared_memory):
+    adapter = data_adapter.KerasSequenceAdapter(
+        sequence,
+        workers=workers,
+        use_multiprocessing=True,
+        max_queue_size=10,
+        use_shared_memory=use_shared_memory)
+    start = time.time()
+    for _ in adapter.get_dataset():
+      pass
+    wall_time = time.time() - start
+    adapter.on_epoch_end()
+    return wall_time
+
+  def benchmark_image_batches(self):
+    if data_utils.shared_memory is None:
+      return  # `multiprocessing.shared_memory` requires Python 3.8+.
+    num_batches = 100
+    for batch_size, image_size in [(32, 64), (64, 224), (128, 224)]:
+      sequence = ImageSequence(batch_size, image_size, num_batches)
+      for workers in [2, 4]:
+        baseline = self._run_adapter(sequence, workers, False)
+        wall_time = self._run_adapter(sequence, workers, True)
+        name = "keras_sequence_adapter|batch_%s|image_%s|workers_%s" % (
+            batch_size, image_size, workers)
+        extras = {
+            "pickle baseline": baseline,
+            "delta seconds": (baseline - wall_time),
+            "delta percent": ((baseline - wall_time) / baseline) * 100,
+            "examples_per_sec": batch_size * num_batches / wall_time,
+        }
+        self.report_benchmark(
+            iters=num_batches, wall_time=wall_time / num_batches,
+            extras=extras, name=name)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -59,10 +59,12 @@ from tensorflow.python.ops import summary_ops_v2
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.profiler import profiler_v2 as profiler
+from tensorflow.python.profiler import trace
 from tensorflow.python.saved_model import save_options as save_options_lib
 from tensorflow.python.training import checkpoint_management
 from tensorflow.python.training.saving import checkpoint_options as checkpoint_options_lib
 from tensorflow.python.util import nest
+from tensorflow.python.util.compat import collections_abc
 from tensorflow.python.util.tf_export import keras_export
 from tensorflow.tools.docs import doc_controls
 
@@ -208,6 +210,7 @@ class CallbackList(object):
                add_history=False,
                add_progbar=False,
                model=None,
+               profiler=None,
                **params):
     """Container for `Callback` instances.
 
@@ -222,10 +225,13 @@ class CallbackList(object):
       add_progbar: Whether a `ProgbarLogger` callback should be added, if one
         does not already exist in the `callbacks` list.
       model: The `Model` these callbacks are used with.
+      profiler: Optional `CallbackHookProfiler` that records the wall time of
+        every hook call of every callback.
       **params: If provided, parameters will be passed to each `Callback` via
         `Callback.set_params`.
     """
     self.callbacks = nest.flatten(callbacks) if callbacks else []
+    self._profiler = profiler
     self._add_default_callbacks(add_history, add_progbar)
 
     if model:
@@ -252,6 +258,10 @@ class CallbackList(object):
     self._batch_start_time = None
     self._batch_times = []
 
+    # Whether batch hooks of callbacks that don't support TF logs are passed
+    # logs whose values are only converted to NumPy when read.
+    self._lazy_batch_logs = False
+
   def _add_default_callbacks(self, add_history, add_progbar):
     """Adds `Callback`s that are always present."""
     self._progbar = None
@@ -274,6 +284,31 @@ class CallbackList(object):
   def append(self, callback):
     self.callbacks.append(callback)
 
+  def _set_lazy_batch_logs(self, lazy_batch_logs):
+    self._lazy_batch_logs = lazy_batch_logs
+
+  def _can_defer_train_batch_end_hooks(self):
+    """Determines if `on_train_batch_end` hooks may run after later steps.
+
+    Deferring is only safe for the built-in logging callbacks, which read the
+    batch logs but not the model. A callback implementing a train batch begin
+    hook must run before its step, and any other callback implementing a
+    train batch end hook may read weights that later steps have updated.
+
+    Returns:
+      Whether the train batch end hooks of every callback may be deferred.
+    """
+    for cb in self.callbacks:
+      if (not generic_utils.is_default(cb.on_batch_begin) or
+          not generic_utils.is_default(cb.on_train_batch_begin)):
+        return False
+      if isinstance(cb, (BaseLogger, History, ProgbarLogger)):
+        continue
+      if (not generic_utils.is_default(cb.on_batch_end) or
+          not generic_utils.is_default(cb.on_train_batch_end)):
+        return False
+    return True
+
   def set_params(self, params):
     self.params = params
     for callback in self.callbacks:
@@ -352,19 +387,33 @@ class CallbackList(object):
       start_time = time.time()
 
     for callback in self.callbacks:
-      hook = getattr(callback, hook_name)
       if getattr(callback, '_supports_tf_logs', False):
-        hook(batch, logs)
+        self._call_hook(callback, hook_name, batch, logs)
       else:
         if numpy_logs is None:  # Only convert once.
-          numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        hook(batch, numpy_logs)
+          if self._lazy_batch_logs:
+            numpy_logs = _LazyNumpyLogs(logs)
+          else:
+            numpy_logs = tf_utils.to_numpy_or_python_type(logs)
+        self._call_hook(callback, hook_name, batch, numpy_logs)
 
     if self._check_timing:
       if hook_name not in self._hook_times:
         self._hook_times[hook_name] = []
       self._hook_times[hook_name].append(time.time() - start_time)
 
+  def _call_hook(self, callback, hook_name, *args):
+    """Calls a hook of a callback, recording its time if profiling."""
+    hook = getattr(callback, hook_name)
+    if self._profiler is None:
+      hook(*args)
+      return
+    callback_name = callback.__class__.__name__
+    with trace.Trace('{}.{}'.format(callback_name, hook_name)):
+      start_time = time.time()
+      hook(*args)
+      self._profiler.record(callback_name, hook_name, start_time, time.time())
+
   def _call_begin_hook(self, mode):
     """Helper function for on_{train|test|predict}_begin methods."""
     if mode == ModeKeys.TRAIN:
@@ -405,11 +454,11 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_epoch_begin(epoch, logs)
+        self._call_hook(callback, 'on_epoch_begin', epoch, logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_epoch_begin(epoch, numpy_logs)
+        self._call_hook(callback, 'on_epoch_begin', epoch, numpy_logs)
 
   def on_epoch_end(self, epoch, logs=None):
     """Calls the `on_epoch_end` methods of its callbacks.
@@ -426,11 +475,11 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_epoch_end(epoch, logs)
+        self._call_hook(callback, 'on_epoch_end', epoch, logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_epoch_end(epoch, numpy_logs)
+        self._call_hook(callback, 'on_epoch_end', epoch, numpy_logs)
 
   def on_train_batch_begin(self, batch, logs=None):
     """Calls the `on_train_batch_begin` methods of its callbacks.
@@ -509,11 +558,11 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_train_begin(logs)
+        self._call_hook(callback, 'on_train_begin', logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_train_begin(numpy_logs)
+        self._call_hook(callback, 'on_train_begin', numpy_logs)
 
   def on_train_end(self, logs=None):
     """Calls the `on_train_end` methods of its callbacks.
@@ -526,11 +575,11 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_train_end(logs)
+        self._call_hook(callback, 'on_train_end', logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_train_end(numpy_logs)
+        self._call_hook(callback, 'on_train_end', numpy_logs)
 
   def on_test_begin(self, logs=None):
     """Calls the `on_test_begin` methods of its callbacks.
@@ -543,11 +592,11 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_test_begin(logs)
+        self._call_hook(callback, 'on_test_begin', logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_test_begin(numpy_logs)
+        self._call_hook(callback, 'on_test_begin', numpy_logs)
 
   def on_test_end(self, logs=None):
     """Calls the `on_test_end` methods of its callbacks.
@@ -560,11 +609,11 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_test_end(logs)
+        self._call_hook(callback, 'on_test_end', logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_test_end(numpy_logs)
+        self._call_hook(callback, 'on_test_end', numpy_logs)
 
   def on_predict_begin(self, logs=None):
     """Calls the 'on_predict_begin` methods of its callbacks.
@@ -577,11 +626,11 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_predict_begin(logs)
+        self._call_hook(callback, 'on_predict_begin', logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_predict_begin(numpy_logs)
+        self._call_hook(callback, 'on_predict_begin', numpy_logs)
 
   def on_predict_end(self, logs=None):
     """Calls the `on_predict_end` methods of its callbacks.
@@ -594,16 +643,178 @@ class CallbackList(object):
     numpy_logs = None
     for callback in self.callbacks:
       if getattr(callback, '_supports_tf_logs', False):
-        callback.on_predict_end(logs)
+        self._call_hook(callback, 'on_predict_end', logs)
       else:
         if numpy_logs is None:  # Only convert once.
           numpy_logs = tf_utils.to_numpy_or_python_type(logs)
-        callback.on_predict_end(numpy_logs)
+        self._call_hook(callback, 'on_predict_end', numpy_logs)
 
   def __iter__(self):
     return iter(self.callbacks)
 
 
+@keras_export('keras.callbacks.CallbackHookProfiler')
+class CallbackHookProfiler(object):
+  """Records the wall time of each `Callback` hook call.
+
+  Pass an instance as the `profiler` argument of `CallbackList` (and the
+  `CallbackList` to `Model.fit`) to find the callbacks that slow down
+  training. Each hook call is also wrapped in a `tf.profiler.experimental.Trace`
+  named `<callback class>.<hook>`, so it shows up in the TensorFlow profiler
+  when that is running.
+
+  Example:
+
+  ```python
+  profiler = CallbackHookProfiler()
+  callbacks = CallbackList(my_callbacks, add_history=True, model=model,
+                           profiler=profiler)
+  model.fit(x, y, callbacks=callbacks)
+  print(profiler.results()['MyCallback']['on_train_batch_end']['mean_time'])
+  ```
+
+  Arguments:
+    bucket_limits: Increasing upper limits, in seconds, of the buckets of the
+      recorded time histograms. A final bucket without upper limit is always
+      added.
+    max_trace_events: The number of most recent hook calls kept as trace
+      events.
+    max_summary_samples: The number of most recent durations per hook written
+      as a histogram by `write_summaries`.
+  """
+
+  def __init__(self,
+               bucket_limits=(1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1., 10.),
+               max_trace_events=10000,
+               max_summary_samples=1000):
+    self._bucket_limits = np.append(np.sort(bucket_limits), np.inf)
+    self._max_trace_events = max_trace_events
+    self._max_summary_samples = max_summary_samples
+    self.reset()
+
+  def reset(self):
+    """Discards all recorded hook calls."""
+    # Maps (callback name, hook name) to [count, total, min, max, bucket counts,
+    # recent durations].
+    self._stats = collections.OrderedDict()
+    self._trace_events = collections.deque(maxlen=self._max_trace_events)
+
+  def record(self, callback_name, hook_name, start_time, end_time):
+    """Records a hook call that ran from `start_time` to `end_time`."""
+    duration = end_time - start_time
+    key = (callback_name, hook_name)
+    stats = self._stats.get(key)
+    if stats is None:
+      stats = [0, 0., duration, duration,
+               np.zeros(self._bucket_limits.shape, np.int64),
+               collections.deque(maxlen=self._max_summary_samples)]
+      self._stats[key] = stats
+    stats[0] += 1
+    stats[1] += duration
+    stats[2] = min(stats[2], duration)
+    stats[3] = max(stats[3], duration)
+    stats[4][np.searchsorted(self._bucket_limits, duration)] += 1
+    stats[5].append(duration)
+    self._trace_events.append((callback_name, hook_name, start_time, duration))
+
+  def results(self):
+    """Returns the recorded times as a dict.
+
+    Returns:
+      A dict mapping callback class names to dicts mapping hook names to dicts
+      of `count`, `total_time`, `mean_time`, `min_time` and `max_time` (in
+      seconds), and the `bucket_limits` and `bucket_counts` of the histogram of
+      call times.
+    """
+    results = {}
+    for (callback_name, hook_name), stats in self._stats.items():
+      count, total, min_time, max_time, bucket_counts, _ = stats
+      results.setdefault(callback_name, {})[hook_name] = {
+          'count': count,
+          'total_time': total,
+          'mean_time': total / count,
+          'min_time': min_time,
+          'max_time': max_time,
+          'bucket_limits': self._bucket_limits.tolist(),
+          'bucket_counts': bucket_counts.tolist(),
+      }
+    return results
+
+  def trace_events(self):
+    """Returns the most recent hook calls as Chrome trace format events.
+
+    The events can be saved as `{"traceEvents": events}` in a JSON file and
+    opened in `chrome://tracing` or Perfetto.
+    """
+    pid = os.getpid()
+    return [{
+        'name': '{}.{}'.format(callback_name, hook_name),
+        'cat': 'keras_callback',
+        'ph': 'X',
+        'ts': start_time * 1e6,
+        'dur': duration * 1e6,
+        'pid': pid,
+        'tid': 0,
+        'args': {'callback': callback_name, 'hook': hook_name},
+    } for callback_name, hook_name, start_time, duration in self._trace_events]
+
+  def write_summaries(self, writer, step):
+    """Writes the recorded times as TensorBoard summaries.
+
+    For every hook of every callback, the mean time is written as a scalar and
+    the most recent times as a histogram, under `callback_hooks/`.
+
+    Arguments:
+      writer: A summary writer, such as one returned by
+        `tf.summary.create_file_writer`.
+      step: The step to write the summaries at.
+    """
+    with writer.as_default(), summary_ops_v2.record_if(True):
+      for (callback_name, hook_name), stats in self._stats.items():
+        tag = 'callback_hooks/{}.{}'.format(callback_name, hook_name)
+        summary_ops_v2.scalar(tag + '/mean_time', stats[1] / stats[0],
+                              step=step)
+        summary_ops_v2.histogram(tag + '/time', np.array(stats[5]), step=step)
+    writer.flush()
+
+
+class _LazyNumpyLogs(collections_abc.MutableMapping):
+  """A logs dict whose `Tensor` values are converted to NumPy when read.
+
+  Reading a value blocks until it has been computed and copies it to the host,
+  so callbacks that only read some values (or none) don't wait for the others.
+  """
+
+  def __init__(self, logs):
+    self._logs = dict(logs)
+    self._numpy_logs = {}
+
+  def __getitem__(self, key):
+    if key not in self._numpy_logs:
+      self._numpy_logs[key] = tf_utils.to_numpy_or_python_type(self._logs[key])
+    return self._numpy_logs[key]
+
+  def __setitem__(self, key, value):
+    self._logs[key] = value
+    self._numpy_logs[key] = value
+
+  def __delitem__(self, key):
+    del self._logs[key]
+    self._numpy_logs.pop(key, None)
+
+  def __iter__(self):
+    return iter(self._logs)
+
+  def __len__(self):
+    return len(self._logs)
+
+  def __repr__(self):
+    return repr(dict(self))
+
+  def copy(self):
+    return dict(self)
+
+
 @keras_export('keras.callbacks.Callback')
 class Callback(object):
   """Abstract base class used to build new callbacks.
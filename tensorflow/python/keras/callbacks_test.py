@@ -312,6 +312,147 @@ class KerasCallbacksTest(keras_parameterized.TestCase):
                    'to the batch time')
     self.assertIn(warning_msg, '\n'.join(warning_messages))
 
+  @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+  def test_async_logs_lookahead(self):
+
+    class TestBatchRecorder(keras.callbacks.Callback):
+
+      def __init__(self):
+        super(TestBatchRecorder, self).__init__()
+        self.logs_types = []
+
+      def on_test_batch_end(self, batch, logs=None):
+        self.logs_types.append(type(logs))
+
+    def fit_and_record(lookahead):
+      model = sequential.Sequential()
+      model.add(
+          keras.layers.Dense(1, kernel_initializer='ones', use_bias=False))
+      model.compile(
+          'sgd',
+          loss='mse',
+          run_eagerly=testing_utils.should_run_eagerly())
+      model._async_logs_lookahead = lookahead
+      recorder = TestBatchRecorder()
+      callback_list = keras.callbacks.CallbackList(
+          [recorder], add_history=True, add_progbar=True, model=model,
+          verbose=1, epochs=2)
+      self.assertTrue(callback_list._can_defer_train_batch_end_hooks())
+      history = model.fit(
+          np.ones((16, 1), 'float32'),
+          np.zeros((16, 1), 'float32'),
+          batch_size=3,
+          epochs=2,
+          validation_data=(np.ones((4, 1), 'float32'),
+                           np.zeros((4, 1), 'float32')),
+          callbacks=callback_list)
+      self.assertFalse(callback_list._lazy_batch_logs)
+      # Validation runs between epochs and must not receive lazy logs.
+      self.assertTrue(recorder.logs_types)
+      self.assertTrue(all(t is dict for t in recorder.logs_types))
+      return history
+
+    history = fit_and_record(0)
+    async_history = fit_and_record(2)
+    self.assertAllClose(history.history['loss'],
+                        async_history.history['loss'])
+    self.assertAllClose(history.history['val_loss'],
+                        async_history.history['val_loss'])
+
+  @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+  def test_async_logs_lookahead_skipped_for_batch_end_hooks(self):
+
+    class WeightsRecorder(keras.callbacks.Callback):
+
+      def __init__(self):
+        super(WeightsRecorder, self).__init__()
+        self.kernels = []
+        self.logs_types = set()
+
+      def on_train_batch_end(self, batch, logs=None):
+        self.kernels.append(
+            keras.backend.get_value(self.model.layers[0].kernel).item())
+        self.logs_types.add(type(logs))
+
+    def fit_and_record(lookahead):
+      model = sequential.Sequential()
+      model.add(
+          keras.layers.Dense(1, kernel_initializer='ones', use_bias=False))
+      model.compile(
+          'sgd',
+          loss='mse',
+          run_eagerly=testing_utils.should_run_eagerly())
+      model._async_logs_lookahead = lookahead
+      recorder = WeightsRecorder()
+      model.fit(
+          np.ones((16, 1), 'float32'),
+          np.zeros((16, 1), 'float32'),
+          batch_size=3,
+          epochs=2,
+          callbacks=[recorder])
+      return recorder
+
+    recorder = fit_and_record(0)
+    async_recorder = fit_and_record(2)
+    # Each hook must observe the weights as of its own step.
+    self.assertEqual(len(set(recorder.kernels)), len(recorder.kernels))
+    self.assertAllClose(recorder.kernels, async_recorder.kernels)
+    # Logs are still only copied to the host when read.
+    self.assertEqual({dict}, recorder.logs_types)
+    self.assertEqual({keras.callbacks._LazyNumpyLogs},
+                     async_recorder.logs_types)
+
+  @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+  def test_callback_hook_profiler(self):
+
+    class SleepCallback(keras.callbacks.Callback):
+
+      def on_train_batch_end(self, batch, logs=None):
+        time.sleep(0.01)
+
+    model = sequential.Sequential()
+    model.add(keras.layers.Dense(1))
+    model.compile(
+        'sgd',
+        loss='mse',
+        run_eagerly=testing_utils.should_run_eagerly())
+
+    profiler = keras.callbacks.CallbackHookProfiler(max_trace_events=4)
+    callback_list = keras.callbacks.CallbackList(
+        [SleepCallback()], add_history=True, model=model, profiler=profiler)
+    model.fit(
+        np.ones((16, 1), 'float32'),
+        np.ones((16, 1), 'float32'),
+        batch_size=4,
+        epochs=2,
+        callbacks=callback_list)
+
+    results = profiler.results()
+    batch_end = results['SleepCallback']['on_train_batch_end']
+    self.assertEqual(8, batch_end['count'])
+    self.assertGreaterEqual(batch_end['min_time'], 0.01)
+    self.assertEqual(8, sum(batch_end['bucket_counts']))
+    self.assertEqual(2, results['History']['on_epoch_end']['count'])
+
+    trace_events = profiler.trace_events()
+    self.assertLen(trace_events, 4)
+    self.assertEqual('History.on_train_end', trace_events[-1]['name'])
+
+    logdir = self.get_temp_dir()
+    writer = summary_ops_v2.create_file_writer_v2(logdir)
+    profiler.write_summaries(writer, step=0)
+    self.assertNotEmpty(gfile.ListDirectory(logdir))
+
+  def test_lazy_numpy_logs(self):
+    with context.eager_mode():
+      loss = ops.convert_to_tensor_v2_with_dispatch(1.5)
+      logs = keras.callbacks._LazyNumpyLogs({'loss': loss, 'size': 3})
+      self.assertEqual(['loss', 'size'], sorted(logs))
+      self.assertEqual(1.5, logs['loss'])
+      self.assertIsInstance(logs['loss'], float)
+      logs['lr'] = 0.1
+      self.assertEqual({'loss': 1.5, 'size': 3, 'lr': 0.1}, logs.copy())
+
   @keras_parameterized.run_all_keras_modes
   def test_default_callbacks_no_warning(self):
     # Test that without the callback no warning is raised
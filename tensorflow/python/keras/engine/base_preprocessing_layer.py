@@ -19,7 +19,9 @@ from __future__ import print_function
 
 import abc
 import collections
+import multiprocessing
 
+from concurrent import futures
 import numpy as np
 import six
 
@@ -44,6 +46,10 @@ keras_kpl_gauge = monitoring.BoolGauge(
     '/tensorflow/api/keras/layers/preprocessing',
     'keras preprocessing layers usage', 'method')
 
+# The upper bound on the number of threads `adapt()` shards batches across
+# when `_adapt_num_workers` is None.
+_MAX_ADAPT_WORKERS = 8
+
 
 @keras_export('keras.layers.experimental.preprocessing.PreprocessingLayer')
 @six.add_metaclass(abc.ABCMeta)
@@ -78,6 +84,17 @@ class CombinerPreprocessingLayer(PreprocessingLayer):
 
   This class is compatible with Tensorflow 2.0+.
   """
+  # The number of threads `adapt()` shards batches across when executing
+  # eagerly. 1 processes batches serially on the calling thread; None picks a
+  # number based on the number of CPUs. Sharding changes how batches are
+  # grouped before `Combiner.merge`, so it should only be enabled for
+  # combiners whose merge is exact (e.g. the token counts of `IndexLookup`):
+  # approximate combiners (e.g. quantile summaries) would otherwise give
+  # results that depend on the machine.
+  _adapt_num_workers = 1
+  # The number of rows per batch when `adapt()` is passed a Tensor or a NumPy
+  # array instead of a batched Dataset.
+  _adapt_batch_size = 512
 
   def __init__(self, combiner, **kwargs):
     super(CombinerPreprocessingLayer, self).__init__(**kwargs)
@@ -180,16 +197,16 @@ class CombinerPreprocessingLayer(PreprocessingLayer):
       # and otherwise batching it.
     elif isinstance(data, (ops.Tensor, ragged_tensor.RaggedTensor)):
       next_data = self._get_dataset_iterator(
-          dataset_ops.Dataset.from_tensor_slices(data).batch(512))
+          dataset_ops.Dataset.from_tensor_slices(data).batch(
+              self._adapt_batch_size))
     else:
       generator, _ = training_generator_v1.convert_to_generator_like(
-          data, batch_size=512)
+          data, batch_size=self._adapt_batch_size)
       # If the data is not a dataset, we can iterate over it using next(foo);
       # here, we wrap that into a callable.
       next_data = lambda: next(generator)
 
     # TODO(momernick): Some sort of status bar?
-    # TODO(momernick): Implement parallel processing here?
     try:
       data_element = next_data()
 
@@ -216,9 +233,14 @@ class CombinerPreprocessingLayer(PreprocessingLayer):
 
       # Once we have built the Layer, we can process the input data. We do so
       # until we've gotten an exception indicating that we have no more data.
-      while True:
-        accumulator = self._combiner.compute(data_element, accumulator)
-        data_element = next_data()
+      num_workers = self._get_adapt_num_workers()
+      if num_workers > 1:
+        accumulator = self._compute_sharded(
+            data_element, next_data, accumulator, num_workers)
+      else:
+        while True:
+          accumulator = self._combiner.compute(data_element, accumulator)
+          data_element = next_data()
     # Note that this belongs to the outer indentation of 'try' - we need to
     # catch exceptions resulting from the first 'next_data()' invocation as
     # well.
@@ -228,6 +250,61 @@ class CombinerPreprocessingLayer(PreprocessingLayer):
     updates = self._combiner.extract(accumulator)
     self._set_state_variables(updates)
 
+  def _get_adapt_num_workers(self):
+    """Returns the number of threads `adapt()` should shard batches across."""
+    # Computing on a batch outside of eager mode creates ops in the graph, so
+    # sharding is only done eagerly.
+    if not context.executing_eagerly():
+      return 1
+    if self._adapt_num_workers is not None:
+      return self._adapt_num_workers
+    return min(_MAX_ADAPT_WORKERS, multiprocessing.cpu_count())
+
+  def _compute_sharded(self, data_element, next_data, accumulator,
+                       num_workers):
+    """Computes an accumulator over all batches using a pool of threads.
+
+    Batches are dealt round-robin to `num_workers` shards. Each shard owns its
+    own accumulator, so calls to `Combiner.compute` for one shard are chained,
+    while different shards run concurrently (and concurrently with fetching
+    the next batch). The shard accumulators are combined with a single call to
+    `Combiner.merge` at the end.
+
+    Args:
+      data_element: The first batch of data.
+      next_data: A callable returning the next batch, raising `StopIteration`
+        or `OutOfRangeError` once the data is exhausted.
+      accumulator: The accumulator to start from, or None.
+      num_workers: The number of shards.
+
+    Returns:
+      The merged accumulator.
+    """
+    accumulators = [accumulator] + [None] * (num_workers - 1)
+    pending = [None] * num_workers
+    with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+      shard = 0
+      while True:
+        if pending[shard] is not None:
+          accumulators[shard] = pending[shard].result()
+        pending[shard] = executor.submit(
+            self._combiner.compute, data_element, accumulators[shard])
+        shard = (shard + 1) % num_workers
+        try:
+          data_element = next_data()
+        except (StopIteration, errors.OutOfRangeError):
+          break
+      for shard, future in enumerate(pending):
+        if future is not None:
+          accumulators[shard] = future.result()
+
+    accumulators = [acc for acc in accumulators if acc is not None]
+    if not accumulators:
+      return None
+    if len(accumulators) == 1:
+      return accumulators[0]
+    return self._combiner.merge(accumulators)
+
   def _set_state_variables(self, updates):
     """Directly update the internal state of this Layer.
 
@@ -287,6 +364,26 @@ def convert_to_list(values, sparse_default_value=None):
   return values
 
 
+def convert_to_ndarray(values):
+  """Convert a dense TensorLike or ndarray into an ndarray.
+
+  Unlike `convert_to_list`, this does not densify composite tensors or handle
+  nested Python lists; callers should fall back to `convert_to_list` when this
+  returns None.
+
+  Args:
+    values: The values to convert.
+
+  Returns:
+    An ndarray, or None if `values` is not a dense Tensor or ndarray.
+  """
+  if isinstance(values, ops.Tensor):
+    values = K.get_value(values)
+  if isinstance(values, np.ndarray):
+    return values
+  return None
+
+
 class Combiner(object):
   """Functional object that defines a shardable computation.
 
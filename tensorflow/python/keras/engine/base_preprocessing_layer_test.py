@@ -292,6 +292,41 @@ class PreprocessingLayerTest(keras_parameterized.TestCase):
     layer.adapt(np.array([1, 2]), reset_state=False)
     self.assertAllEqual([[19], [20], [21]], model.predict([1., 2., 3.]))
 
+  def test_sharded_adapt(self):
+    """Test that adapt() gives the same result when batches are sharded."""
+    input_dataset = dataset_ops.Dataset.range(100).batch(3)
+
+    layer = get_layer()
+    layer._adapt_num_workers = 4
+    layer.adapt(input_dataset)
+
+    input_data = keras.Input(shape=(1,))
+    output = layer(input_data)
+    model = keras.Model(input_data, output)
+    model._run_eagerly = testing_utils.should_run_eagerly()
+
+    self.assertAllEqual([[4951], [4952]], model.predict([1., 2.]))
+
+  def test_adapt_is_not_sharded_by_default(self):
+    layer = get_layer()
+    with test.mock.patch.object(layer, '_compute_sharded') as compute_sharded:
+      layer.adapt(dataset_ops.Dataset.range(10).batch(2))
+    compute_sharded.assert_not_called()
+
+  def test_sharded_adapt_further_tuning(self):
+    """Test that sharded adapt() starts from the existing state."""
+    layer = get_layer()
+    layer._adapt_num_workers = 4
+    layer.adapt(np.array([1, 2, 3, 4, 5]))
+
+    input_data = keras.Input(shape=(1,))
+    output = layer(input_data)
+    model = keras.Model(input_data, output)
+    model._run_eagerly = testing_utils.should_run_eagerly()
+
+    layer.adapt(dataset_ops.Dataset.range(10).batch(2), reset_state=False)
+    self.assertAllEqual([[61], [62]], model.predict([1., 2.]))
+
   def test_further_tuning_post_injection(self):
     """Test that models can be tuned with multiple calls to 'adapt'."""
 
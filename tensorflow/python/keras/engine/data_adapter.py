@@ -24,7 +24,9 @@ import functools
 import itertools
 import math
 import random
+import weakref
 
+from concurrent import futures
 import numpy as np
 import six
 
@@ -50,6 +52,7 @@ from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import random_ops
 from tensorflow.python.ops import script_ops
+from tensorflow.python.ops import sort_ops
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import nest
 from tensorflow.python.util.tf_export import keras_export
@@ -228,7 +231,16 @@ class DataAdapter(object):
 
 
 class TensorLikeDataAdapter(DataAdapter):
-  """Adapter that handles Tensor-like objects, e.g. EagerTensor and NumPy."""
+  """Adapter that handles Tensor-like objects, e.g. EagerTensor and NumPy.
+
+  By default NumPy arrays are converted to `Tensor`s up front, which copies
+  them into TF memory. With `zero_copy=True` NumPy arrays are instead kept as
+  they are and every batch is sliced out of them in the (parallel, prefetched)
+  input pipeline, so memory usage stays at about the size of the data, e.g.
+  for `np.memmap` inputs. Batches are then sliced by a Python function, which
+  holds the GIL and can not be serialized, so the input pipeline can not be
+  distributed to other workers or hosts.
+  """
 
   @staticmethod
   def can_handle(x, y=None):
@@ -258,9 +270,12 @@ class TensorLikeDataAdapter(DataAdapter):
                epochs=1,
                steps=None,
                shuffle=False,
+               zero_copy=False,
                **kwargs):
     super(TensorLikeDataAdapter, self).__init__(x, y, **kwargs)
-    x, y, sample_weights = _process_tensorlike((x, y, sample_weights))
+    self._zero_copy = zero_copy
+    x, y, sample_weights = _process_tensorlike((x, y, sample_weights),
+                                               keep_numpy=zero_copy)
     sample_weight_modes = broadcast_sample_weight_modes(
         sample_weights, sample_weight_modes)
 
@@ -309,7 +324,7 @@ class TensorLikeDataAdapter(DataAdapter):
       # forwarding.)
       indices = math_ops.range(num_samples, dtype=dtypes.int64)
       if shuffle and shuffle != "batch":
-        indices = random_ops.random_shuffle(indices)
+        indices = self._shuffle_indices(indices)
       return indices
 
     # We prefetch a single element. Computing large permutations can take quite
@@ -361,6 +376,10 @@ class TensorLikeDataAdapter(DataAdapter):
 
     self._dataset = dataset
 
+  def _shuffle_indices(self, indices):
+    """Returns a random permutation of the `indices` of an epoch."""
+    return random_ops.random_shuffle(indices)
+
   def slice_inputs(self, indices_dataset, inputs):
     """Slice inputs into a Dataset of batches.
 
@@ -376,6 +395,10 @@ class TensorLikeDataAdapter(DataAdapter):
     Returns:
       A Dataset of input batches matching the batch indices.
     """
+    if self._zero_copy and any(
+        isinstance(inp, np.ndarray) for inp in nest.flatten(inputs)):
+      return self._slice_numpy_inputs(indices_dataset, inputs)
+
     dataset = dataset_ops.DatasetV2.zip((
         indices_dataset,
         dataset_ops.DatasetV2.from_tensors(inputs).repeat()
@@ -386,7 +409,64 @@ class TensorLikeDataAdapter(DataAdapter):
 
     dataset = dataset.map(
         grab_batch, num_parallel_calls=dataset_ops.AUTOTUNE)
+    return self._with_options(dataset)
+
+  def _slice_numpy_inputs(self, indices_dataset, inputs):
+    """Like `slice_inputs`, but without converting NumPy arrays to `Tensor`s.
+
+    Batches are sliced out of the NumPy arrays in `inputs` by a
+    `py_function`. When the indices of a batch are contiguous (no shuffling,
+    or `shuffle="batch"`), the slice is a view of the array, so only the batch
+    itself is ever copied.
+
+    Args:
+      indices_dataset: A Dataset of batched indices
+      inputs: A python data structure that contains the inputs, targets,
+        and possibly sample weights.
+
+    Returns:
+      A Dataset of input batches matching the batch indices.
+    """
+    flat_inputs = nest.flatten(inputs)
+    is_numpy = [isinstance(inp, np.ndarray) for inp in flat_inputs]
+    numpy_inputs = [inp for inp, n in zip(flat_inputs, is_numpy) if n]
+    tensor_inputs = tuple(inp for inp, n in zip(flat_inputs, is_numpy) if not n)
+    numpy_dtypes = [_lazy_slice_dtype(inp) for inp in numpy_inputs]
+    contiguous = not self._shuffle or self._shuffle == "batch"
+
+    def py_method(indices):
+      indices = indices.numpy()
+      if contiguous:
+        indices = slice(indices[0], indices[-1] + 1)
+      return [
+          inp[indices].astype(dtype.as_numpy_dtype, copy=False)
+          for inp, dtype in zip(numpy_inputs, numpy_dtypes)
+      ]
+
+    def grab_batch(i, data=()):
+      numpy_batch = script_ops.eager_py_func(py_method, [i], numpy_dtypes)
+      for v, inp in zip(numpy_batch, numpy_inputs):
+        v.set_shape((None,) + inp.shape[1:])
+      numpy_batch = iter(numpy_batch)
+      tensor_batch = iter([array_ops.gather(d, i, axis=0) for d in data])
+      flat_out = [
+          next(numpy_batch) if n else next(tensor_batch) for n in is_numpy
+      ]
+      return nest.pack_sequence_as(inputs, flat_out)
+
+    dataset = indices_dataset
+    if tensor_inputs:
+      dataset = dataset_ops.DatasetV2.zip((
+          indices_dataset,
+          dataset_ops.DatasetV2.from_tensors(tensor_inputs).repeat()
+      ))
+
+    dataset = dataset.map(
+        grab_batch, num_parallel_calls=dataset_ops.AUTOTUNE)
+    return self._with_options(dataset)
 
+  def _with_options(self, dataset):
+    """Sets the options of the dataset of input batches."""
     # Default optimizations are disabled to avoid the overhead of (unnecessary)
     # input pipeline graph serialization and deserialization
     options = dataset_ops.Options()
@@ -434,6 +514,15 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
 
   It also does not handle lists/tuples of scalars, because those are handled
   by the ListsOfScalarsDataAdapter.
+
+  Random reads from chunked storage (such as HDF5 or zarr) are slow. With
+  `shuffle="chunk"`, inputs stored in chunks of `shuffle_chunk_size` samples
+  (by default, the first dimension of their `chunks` attribute) are shuffled
+  in two steps: the order of the chunks is shuffled, and then samples are
+  shuffled within consecutive groups of `shuffle_buffer_chunks` chunks. This
+  mixes samples less than `shuffle=True`, but each batch can then be read
+  with one slice per chunk it touches, on a pool of `workers` threads if
+  `workers > 1`. Batches are read ahead of the model.
   """
 
   @staticmethod
@@ -457,14 +546,71 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
     else:
       return False
 
-  def __init__(self, *args, **kwargs):
+  def __init__(self,
+               x,
+               y=None,
+               shuffle_chunk_size=None,
+               shuffle_buffer_chunks=16,
+               **kwargs):
     logging.warn(
         "Keras is training/fitting/evaluating on array-like data. Keras may "
         "not be optimized for this format, so if your input data format is "
         "supported by TensorFlow I/O (https://github.com/tensorflow/io) we "
         "recommend using that to load a Dataset instead.")
 
-    super(GenericArrayLikeDataAdapter, self).__init__(*args, **kwargs)
+    shuffle = kwargs.get("shuffle")
+    if isinstance(shuffle, str) and shuffle.lower() == "chunk":
+      if shuffle_chunk_size is None:
+        shuffle_chunk_size = _infer_chunk_size(
+            (x, y, kwargs.get("sample_weights")))
+      if not shuffle_chunk_size:
+        raise ValueError(
+            "`shuffle='chunk'` requires inputs with a `chunks` attribute, or "
+            "a `shuffle_chunk_size`.")
+    else:
+      shuffle_chunk_size = None
+    self._shuffle_chunk_size = shuffle_chunk_size
+    self._shuffle_buffer_chunks = shuffle_buffer_chunks
+    workers = kwargs.get("workers") or 1
+    self._read_pool = None
+    if shuffle_chunk_size and workers > 1:
+      self._read_pool = futures.ThreadPoolExecutor(max_workers=workers)
+      # The threads of the pool do not reference the adapter, so they can be
+      # stopped once the adapter (and so its dataset) is garbage collected.
+      weakref.finalize(self, self._read_pool.shutdown, wait=False)
+
+    super(GenericArrayLikeDataAdapter, self).__init__(x, y, **kwargs)
+
+  def _shuffle_indices(self, indices):
+    """Shuffles chunks of `indices`, then indices within groups of chunks."""
+    if not self._shuffle_chunk_size:
+      return super(GenericArrayLikeDataAdapter, self)._shuffle_indices(indices)
+
+    num_samples = int(indices.shape[0])
+    chunk_size = self._shuffle_chunk_size
+    buffer_size = chunk_size * self._shuffle_buffer_chunks
+    num_chunks = -(-num_samples // chunk_size)
+    num_buffers = -(-num_chunks // self._shuffle_buffer_chunks)
+
+    # Pad with -1 so that the indices split evenly into chunks and groups of
+    # chunks, and drop the padding at the end.
+    indices = array_ops.pad(
+        indices, [[0, num_chunks * chunk_size - num_samples]],
+        constant_values=-1)
+    chunks = array_ops.reshape(indices, [num_chunks, chunk_size])
+    chunks = array_ops.gather(
+        chunks, random_ops.random_shuffle(math_ops.range(num_chunks)))
+    indices = array_ops.pad(
+        array_ops.reshape(chunks, [-1]),
+        [[0, num_buffers * buffer_size - num_chunks * chunk_size]],
+        constant_values=-1)
+    buffers = array_ops.reshape(indices, [num_buffers, buffer_size])
+    order = sort_ops.argsort(
+        random_ops.random_uniform([num_buffers, buffer_size]), axis=1)
+    indices = array_ops.reshape(
+        array_ops.gather(buffers, order, batch_dims=1), [-1])
+    indices = array_ops.boolean_mask(indices, indices >= 0)
+    return array_ops.reshape(indices, [num_samples])
 
   def slice_inputs(self, indices_dataset, inputs):
     """Slice inputs into a Dataset of batches.
@@ -491,6 +637,7 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
     contiguous = True
     if self._shuffle and self._shuffle != "batch":
       contiguous = False
+    chunked = not contiguous and self._shuffle_chunk_size
 
     def grab_batch(indices):
       """Grab a batch of data from the inputs."""
@@ -498,6 +645,10 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
       # into a Tensor before slicing it, because converting the array-like
       # to a Tensor may force it into memory..
       def py_method(ind):
+        if chunked:
+          return _read_chunked_rows(flat_inputs, ind.numpy(),
+                                    self._shuffle_chunk_size, self._read_pool)
+
         def slice_array(data):
           return training_utils.slice_arrays(data, ind.numpy(),
                                              contiguous=contiguous)
@@ -511,7 +662,8 @@ class GenericArrayLikeDataAdapter(TensorLikeDataAdapter):
     dataset = indices_dataset.map(
         grab_batch, num_parallel_calls=dataset_ops.AUTOTUNE)
 
-    return dataset
+    # Read batches ahead of the model.
+    return dataset.prefetch(dataset_ops.AUTOTUNE)
 
 
 class CompositeTensorDataAdapter(DataAdapter):
@@ -887,6 +1039,7 @@ class KerasSequenceAdapter(GeneratorDataAdapter):
                use_multiprocessing=False,
                max_queue_size=10,
                model=None,
+               use_shared_memory=False,
                **kwargs):
     if not is_none_or_empty(y):
       raise ValueError("`y` argument is not supported when using "
@@ -897,6 +1050,7 @@ class KerasSequenceAdapter(GeneratorDataAdapter):
 
     self._size = len(x)
     self._shuffle_sequence = shuffle
+    self._use_shared_memory = use_shared_memory
     self._keras_sequence = x
     self._enqueuer = None
     super(KerasSequenceAdapter, self).__init__(
@@ -912,13 +1066,30 @@ class KerasSequenceAdapter(GeneratorDataAdapter):
   def _peek_and_restore(x):
     return x[0], x
 
+  def _standardize_batch(self, data):
+    data = super(KerasSequenceAdapter, self)._standardize_batch(data)
+    if not self._use_shared_memory:
+      return data
+
+    # With shared memory, the enqueuer yields views on slots which are
+    # overwritten by later batches. `from_generator` can hold on to aligned
+    # NumPy buffers without copying them, so copy the arrays which do not
+    # own their data (floats were already copied by the `floatx()` cast).
+    def _copy_view(t):
+      if isinstance(t, np.ndarray) and not t.flags.owndata:
+        return np.array(t)
+      return t
+
+    return nest.map_structure(_copy_view, data)
+
   def _handle_multiprocessing(self, x, workers, use_multiprocessing,
                               max_queue_size):
     if workers > 1 or (workers > 0 and use_multiprocessing):
       def generator_fn():
         self._enqueuer = data_utils.OrderedEnqueuer(
             x, use_multiprocessing=use_multiprocessing,
-            shuffle=self._shuffle_sequence)
+            shuffle=self._shuffle_sequence,
+            use_shared_memory=self._use_shared_memory)
         self._enqueuer.start(workers=workers, max_queue_size=max_queue_size)
         return self._enqueuer.get()
     else:
@@ -987,7 +1158,7 @@ def _type_name(x):
   return str(type(x))
 
 
-def _process_tensorlike(inputs):
+def _process_tensorlike(inputs, keep_numpy=False):
   """Process tensor-like inputs.
 
   This function:
@@ -998,12 +1169,16 @@ def _process_tensorlike(inputs):
 
   Args:
     inputs: Structure of `Tensor`s, `NumPy` arrays, or tensor-like.
+    keep_numpy: Whether to leave numeric `NumPy` arrays unconverted, so that
+      batches can be sliced out of them lazily.
 
   Returns:
     Structure of `Tensor`s or tensor-like.
   """
 
   def _convert_numpy_and_scipy(x):
+    if keep_numpy and _can_slice_lazily(x):
+      return x
     if isinstance(x, np.ndarray):
       dtype = None
       if issubclass(x.dtype.type, np.floating):
@@ -1017,6 +1192,69 @@ def _process_tensorlike(inputs):
   return nest.list_to_tuple(inputs)
 
 
+def _can_slice_lazily(x):
+  """Whether `x` is a `NumPy` array that batches can be sliced out of lazily."""
+  return (isinstance(x, np.ndarray) and x.ndim > 0 and
+          x.dtype.kind in "biufc")
+
+
+def _infer_chunk_size(inputs):
+  """Returns the largest number of samples per storage chunk of `inputs`."""
+  chunk_sizes = []
+  for x in nest.flatten(inputs):
+    chunks = getattr(x, "chunks", None)
+    if (isinstance(chunks, tuple) and chunks and
+        isinstance(chunks[0], six.integer_types)):
+      chunk_sizes.append(chunks[0])
+  return max(chunk_sizes) if chunk_sizes else None
+
+
+def _read_chunked_rows(arrays, indices, chunk_size, pool=None):
+  """Reads the rows at `indices` of `arrays`, with one read per chunk.
+
+  Args:
+    arrays: List of array-likes.
+    indices: NumPy array of the indices of the rows to read.
+    chunk_size: Number of rows per storage chunk of `arrays`.
+    pool: Optional `ThreadPoolExecutor` to read the chunks with.
+
+  Returns:
+    List of NumPy arrays of the rows at `indices` of each of `arrays`.
+  """
+  order = np.argsort(indices, kind="stable")
+  sorted_indices = indices[order]
+  splits = np.flatnonzero(np.diff(sorted_indices // chunk_size)) + 1
+  runs = np.split(sorted_indices, splits)
+
+  def read(array_and_run):
+    array, run = array_and_run
+    start = int(run[0])
+    return np.asarray(array[start:int(run[-1]) + 1])[run - start]
+
+  reads = [(array, run) for array in arrays for run in runs]
+  if pool is None:
+    blocks = [read(r) for r in reads]
+  else:
+    blocks = list(pool.map(read, reads))
+
+  # The rows were read in sorted order; put them back in the order of
+  # `indices`.
+  inverse = np.empty_like(order)
+  inverse[order] = np.arange(len(order))
+  num_runs = len(runs)
+  return [
+      np.concatenate(blocks[i * num_runs:(i + 1) * num_runs])[inverse]
+      for i in range(len(arrays))
+  ]
+
+
+def _lazy_slice_dtype(x):
+  """Returns the dtype of the batches sliced out of the `NumPy` array `x`."""
+  if issubclass(x.dtype.type, np.floating):
+    return dtypes.as_dtype(backend.floatx())
+  return dtypes.as_dtype(x.dtype)
+
+
 def is_none_or_empty(inputs):
   # util method to check if the input is a None or a empty list.
   # the python "not" check will raise an error like below if the input is a
@@ -1079,7 +1317,8 @@ class DataHandler(object):
                workers=1,
                use_multiprocessing=False,
                model=None,
-               steps_per_execution=None):
+               steps_per_execution=None,
+               zero_copy=False):
 
     self._initial_epoch = initial_epoch
     self._epochs = epochs
@@ -1109,7 +1348,8 @@ class DataHandler(object):
         workers=workers,
         use_multiprocessing=use_multiprocessing,
         distribution_strategy=ds_context.get_strategy(),
-        model=model)
+        model=model,
+        zero_copy=zero_copy)
 
     strategy = ds_context.get_strategy()
     dataset = self._adapter.get_dataset()
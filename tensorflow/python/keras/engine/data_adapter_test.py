@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import math
+import os
 
 from absl.testing import parameterized
 import numpy as np
@@ -27,6 +28,7 @@ from tensorflow.python import keras
 from tensorflow.python.data.experimental.ops import cardinality
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import sparse_tensor
 from tensorflow.python.keras import keras_parameterized
@@ -60,6 +62,19 @@ class DummyArrayLike(object):
     return self.data.dtype
 
 
+class ChunkedArrayLike(DummyArrayLike):
+  """Dummy array-like object stored in chunks, which records its reads."""
+
+  def __init__(self, data, chunks):
+    super(ChunkedArrayLike, self).__init__(data)
+    self.chunks = chunks
+    self.reads = []
+
+  def __getitem__(self, key):
+    self.reads.append(key)
+    return super(ChunkedArrayLike, self).__getitem__(key)
+
+
 def fail_on_convert(x, **kwargs):
   _ = x
   _ = kwargs
@@ -161,6 +176,70 @@ class TensorLikeDataAdapterTest(DataAdapterTestBase):
                        run_eagerly=testing_utils.should_run_eagerly())
     self.model.fit(self.numpy_input, self.numpy_target, batch_size=5)
 
+  def test_zero_copy_matches_conversion(self):
+    x = np.random.random((23, 3))
+    y = np.arange(23)
+    sample_weights = constant_op.constant(np.random.random((23,)))
+    default_adapter = self.adapter_cls(
+        x, y, sample_weights=sample_weights, batch_size=5)
+    zero_copy_adapter = self.adapter_cls(
+        x, y, sample_weights=sample_weights, batch_size=5, zero_copy=True)
+    self.assertEqual(zero_copy_adapter.get_size(), 5)
+    self.assertEqual(zero_copy_adapter.partial_batch_size(), 3)
+    for expected, actual in zip(default_adapter.get_dataset(),
+                                zero_copy_adapter.get_dataset()):
+      nest.map_structure(lambda e, a: self.assertEqual(e.dtype, a.dtype),
+                         expected, actual)
+      self.assertAllClose(expected, actual)
+
+  def test_zero_copy_shuffle_correctness(self):
+    num_samples = 100
+    x = np.arange(num_samples)
+    adapter = self.adapter_cls(
+        x, batch_size=32, shuffle=True, epochs=2, zero_copy=True)
+    ds_iter = iter(adapter.get_dataset())
+    for _ in range(2):
+      epoch_data = np.concatenate(
+          [next(ds_iter).numpy() for _ in range(4)])
+      self.assertNotAllClose(x, epoch_data)
+      self.assertAllClose(x, np.sort(epoch_data))
+
+  def test_memmap_is_sliced_lazily(self):
+    path = os.path.join(self.get_temp_dir(), 'x.npy')
+    x = np.lib.format.open_memmap(path, mode='w+', dtype='float64',
+                                  shape=(20, 2))
+    x[:] = np.arange(40).reshape((20, 2))
+    self.assertFalse(self.adapter_cls(x, batch_size=8)._zero_copy)
+    adapter = self.adapter_cls(x, batch_size=8, zero_copy=True)
+    batches = list(adapter.get_dataset())
+    self.assertEqual(batches[0].dtype, dtypes.float32)
+    self.assertAllClose(np.concatenate(batches), x)
+
+  @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+  def test_training_zero_copy(self):
+    path = os.path.join(self.get_temp_dir(), 'x.npy')
+    x = np.lib.format.open_memmap(path, mode='w+', dtype='float32',
+                                  shape=(50, 10))
+    x[:] = np.random.random((50, 10))
+    y = np.random.randint(0, 8, size=(50,))
+    self.model.compile(loss='sparse_categorical_crossentropy', optimizer='sgd',
+                       run_eagerly=testing_utils.should_run_eagerly())
+    slice_numpy_inputs = data_adapter.TensorLikeDataAdapter._slice_numpy_inputs
+    with test.mock.patch.object(
+        data_adapter.TensorLikeDataAdapter, '_slice_numpy_inputs',
+        autospec=True, side_effect=slice_numpy_inputs) as mock_slice:
+      history = self.model.fit(x, y, batch_size=5, epochs=2,
+                               validation_data=(x, y), zero_copy=True)
+      # One adapter for training and one, reused across epochs, for validation.
+      self.assertEqual(mock_slice.call_count, 2)
+      zero_copy_loss = self.model.evaluate(x, y, batch_size=5, zero_copy=True)
+      zero_copy_preds = self.model.predict(x, batch_size=5, zero_copy=True)
+      self.assertEqual(mock_slice.call_count, 4)
+    self.assertLen(history.history['loss'], 2)
+    self.assertLen(history.history['val_loss'], 2)
+    self.assertAllClose(zero_copy_loss, self.model.evaluate(x, y, batch_size=5))
+    self.assertAllClose(zero_copy_preds, self.model.predict(x, batch_size=5))
+
   def test_can_handle_pandas(self):
     try:
       import pandas as pd  # pylint: disable=g-import-not-at-top
@@ -534,6 +613,54 @@ class GenericArrayLikeDataAdapterTest(DataAdapterTestBase):
     # Check that each elements appears, and only once.
     self.assertAllClose(x, np.sort(second_epoch_data))
 
+  def test_chunked_shuffle_correctness(self):
+    num_samples = 100
+    batch_size = 8
+    x = ChunkedArrayLike(np.arange(num_samples), chunks=(10,))
+    adapter = self.adapter_cls(
+        x, y=None, batch_size=batch_size, shuffle='chunk', epochs=2,
+        shuffle_buffer_chunks=2)
+    self.assertEqual(adapter._shuffle_chunk_size, 10)
+    ds_iter = iter(adapter.get_dataset())
+
+    for _ in range(2):
+      epoch_batches = [
+          next(ds_iter).numpy()
+          for _ in range(int(math.ceil(num_samples / batch_size)))
+      ]
+      epoch_data = np.concatenate(epoch_batches)
+      self.assertNotAllClose(x, epoch_data)
+      self.assertAllClose(x, np.sort(epoch_data))
+      # Samples are only shuffled within groups of two chunks.
+      for batch in epoch_batches:
+        self.assertLessEqual(len(np.unique(batch // 10)), 4)
+
+    # Every read is a slice within a single chunk.
+    for key in x.reads:
+      self.assertIsInstance(key, slice)
+      self.assertEqual(key.start // 10, (key.stop - 1) // 10)
+
+  def test_chunked_shuffle_with_workers(self):
+    x = ChunkedArrayLike(np.random.random((50, 3)), chunks=(5, 3))
+    y = ChunkedArrayLike(np.arange(50), chunks=(5,))
+    adapter = self.adapter_cls(
+        x, y, batch_size=7, shuffle='chunk', workers=4)
+    xs, ys = zip(*adapter.get_dataset())
+    ys = np.concatenate(ys)
+    self.assertAllClose(np.concatenate(xs), x.data[ys])
+    self.assertAllClose(np.sort(ys), y.data)
+
+  def test_chunked_shuffle_is_opt_in(self):
+    x = ChunkedArrayLike(np.arange(20), chunks=(10,))
+    adapter = self.adapter_cls(x, batch_size=4, shuffle=True)
+    self.assertIsNone(adapter._shuffle_chunk_size)
+    adapter = self.adapter_cls(
+        x, batch_size=4, shuffle='chunk', shuffle_chunk_size=5)
+    self.assertEqual(adapter._shuffle_chunk_size, 5)
+    with self.assertRaisesRegex(ValueError, 'shuffle_chunk_size'):
+      self.adapter_cls(
+          DummyArrayLike(np.arange(20)), batch_size=4, shuffle='chunk')
+
   @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
   def test_batch_shuffle_correctness(self):
     num_samples = 100
@@ -765,6 +892,34 @@ class KerasSequenceAdapterTest(DataAdapterTestBase):
     self.model.fit(self.sequence_input, workers=1, use_multiprocessing=True,
                    max_queue_size=10, steps_per_epoch=10)
 
+  @keras_parameterized.run_all_keras_modes(always_skip_v1=True)
+  @testing_utils.run_v2_only
+  @data_utils.dont_use_multiprocessing_pool
+  def test_shared_memory_integer_batches_are_copied(self):
+    if data_utils.shared_memory is None:
+      self.skipTest('multiprocessing.shared_memory is not available.')
+
+    class IntegerSequence(data_utils.Sequence):
+
+      def __getitem__(self, item):
+        return (np.full((4, 64), item, dtype=np.int32),
+                np.full((4, 1), item, dtype=np.uint8))
+
+      def __len__(self):
+        return 20
+
+    adapter = self.adapter_cls(
+        IntegerSequence(), workers=2, use_multiprocessing=True,
+        max_queue_size=2, use_shared_memory=True)
+    # Keep every batch alive until the end, so that tensors aliasing a
+    # recycled slot would show the values of later batches.
+    batches = list(adapter.get_dataset())
+    adapter.on_epoch_end()
+    self.assertLen(batches, 20)
+    for i, (x, y) in enumerate(batches):
+      self.assertAllEqual(x, np.full((4, 64), i, dtype=np.int32))
+      self.assertAllEqual(y, np.full((4, 1), i, dtype=np.uint8))
+
   def test_size(self):
     adapter = self.adapter_cls(self.sequence_input)
     self.assertEqual(adapter.get_size(), 10)
@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import copy
 import itertools
 import json
@@ -315,6 +316,13 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
         trackable_utils.saver_with_op_caching(self))
 
     self._steps_per_execution = None
+    # The number of `train_function` calls `fit` may dispatch ahead of the
+    # `on_train_batch_end` callbacks of earlier steps. When nonzero, callbacks
+    # that do not support TF logs receive train batch logs whose values are
+    # only copied to the host when read. Hooks are only deferred if every
+    # callback is either one of the built-in logging callbacks or implements
+    # no train batch hooks, since other hooks may read the model's weights.
+    self._async_logs_lookahead = 0
 
     self._init_batch_counters()
     self._base_model_initialized = True
@@ -870,7 +878,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
           validation_freq=1,
           max_queue_size=10,
           workers=1,
-          use_multiprocessing=False):
+          use_multiprocessing=False,
+          zero_copy=False):
     """Trains the model for a fixed number of epochs (iterations on a dataset).
 
     Arguments:
@@ -946,10 +955,15 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             Note that `validation_data` does not support all the data types that
             are supported in `x`, eg, dict, generator or `keras.utils.Sequence`.
         shuffle: Boolean (whether to shuffle the training data
-            before each epoch) or str (for 'batch'). This argument is ignored
-            when `x` is a generator. 'batch' is a special option for dealing
-            with the limitations of HDF5 data; it shuffles in batch-sized
-            chunks. Has no effect when `steps_per_epoch` is not `None`.
+            before each epoch) or str (for 'batch' or 'chunk'). This argument
+            is ignored when `x` is a generator. 'batch' is a special option
+            for dealing with the limitations of HDF5 data; it shuffles in
+            batch-sized chunks. 'chunk' is another option for array-like
+            inputs stored in chunks (such as HDF5 or zarr datasets with a
+            `chunks` attribute); it shuffles the order of the storage chunks,
+            then samples within groups of 16 chunks, so that batches are read
+            with chunk-aligned slices. For other inputs it is the same as
+            `True`. Has no effect when `steps_per_epoch` is not `None`.
         class_weight: Optional dictionary mapping class indices (integers)
             to a weight (float) value, used for weighting the loss function
             (during training only).
@@ -1020,6 +1034,13 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             `False`. Note that because this implementation relies on
             multiprocessing, you should not pass non-picklable arguments to
             the generator as they can't be passed easily to children processes.
+        zero_copy: Boolean. Used for NumPy array input only. If `True`,
+            batches are sliced out of the arrays while the model runs instead
+            of copying the arrays into TensorFlow memory up front, so memory
+            usage stays at about the size of the data (e.g. for `np.memmap`
+            inputs). Slicing then runs in Python, holding the GIL, and the
+            input pipeline can not be distributed to other workers or hosts.
+            Defaults to `False`.
 
     Unpacking behavior for iterator-like inputs:
         A common pattern is to pass a tf.data.Dataset, generator, or
@@ -1093,7 +1114,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
           workers=workers,
           use_multiprocessing=use_multiprocessing,
           model=self,
-          steps_per_execution=self._steps_per_execution)
+          steps_per_execution=self._steps_per_execution,
+          zero_copy=zero_copy)
 
       # Container that configures and calls `tf.keras.Callback`s.
       if not isinstance(callbacks, callbacks_module.CallbackList):
@@ -1109,6 +1131,18 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
       self.stop_training = False
       self.train_function = self.make_train_function()
       self._train_counter.assign(0)
+      lookahead = self._async_logs_lookahead
+      if not callbacks._can_defer_train_batch_end_hooks():  # pylint: disable=protected-access
+        lookahead = 0
+      # Steps whose `on_train_batch_end` hooks are deferred by the lookahead.
+      pending_steps = collections.deque()
+
+      def _flush_pending_steps(max_pending):
+        while len(pending_steps) > max_pending:
+          pending_step, pending_logs = pending_steps.popleft()
+          callbacks.on_train_batch_end(
+              pending_step + data_handler.step_increment, pending_logs)
+
       callbacks.on_train_begin()
       training_logs = None
       # Handle fault-tolerance for multi-worker.
@@ -1120,23 +1154,35 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
       for epoch, iterator in data_handler.enumerate_epochs():
         self.reset_metrics()
         callbacks.on_epoch_begin(epoch)
-        with data_handler.catch_stop_iteration():
-          for step in data_handler.steps():
-            with trace.Trace(
-                'train',
-                epoch_num=epoch,
-                step_num=step,
-                batch_size=batch_size,
-                _r=1):
-              callbacks.on_train_batch_begin(step)
-              tmp_logs = self.train_function(iterator)
-              if data_handler.should_sync:
-                context.async_wait()
-              logs = tmp_logs  # No error, now safe to assign to logs.
-              end_step = step + data_handler.step_increment
-              callbacks.on_train_batch_end(end_step, logs)
-              if self.stop_training:
-                break
+        # Logs are only copied to the host when a callback reads them, so
+        # reading them does not block on steps dispatched after theirs.
+        callbacks._set_lazy_batch_logs(bool(self._async_logs_lookahead))  # pylint: disable=protected-access
+        try:
+          with data_handler.catch_stop_iteration():
+            for step in data_handler.steps():
+              with trace.Trace(
+                  'train',
+                  epoch_num=epoch,
+                  step_num=step,
+                  batch_size=batch_size,
+                  _r=1):
+                callbacks.on_train_batch_begin(step)
+                tmp_logs = self.train_function(iterator)
+                if data_handler.should_sync:
+                  context.async_wait()
+                logs = tmp_logs  # No error, now safe to assign to logs.
+                if lookahead:
+                  # The next step is dispatched before these hooks run.
+                  pending_steps.append((step, logs))
+                  _flush_pending_steps(lookahead)
+                else:
+                  end_step = step + data_handler.step_increment
+                  callbacks.on_train_batch_end(end_step, logs)
+                if self.stop_training:
+                  break
+          _flush_pending_steps(0)
+        finally:
+          callbacks._set_lazy_batch_logs(False)  # pylint: disable=protected-access
 
         if logs is None:
           raise ValueError('Expect x to be a non-empty array or dataset.')
@@ -1159,7 +1205,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
                 workers=workers,
                 use_multiprocessing=use_multiprocessing,
                 model=self,
-                steps_per_execution=self._steps_per_execution)
+                steps_per_execution=self._steps_per_execution,
+                zero_copy=zero_copy)
           val_logs = self.evaluate(
               x=val_x,
               y=val_y,
@@ -1170,7 +1217,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
               max_queue_size=max_queue_size,
               workers=workers,
               use_multiprocessing=use_multiprocessing,
-              return_dict=True)
+              return_dict=True,
+              zero_copy=zero_copy)
           val_logs = {'val_' + name: val for name, val in val_logs.items()}
           epoch_logs.update(val_logs)
 
@@ -1290,7 +1338,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
                max_queue_size=10,
                workers=1,
                use_multiprocessing=False,
-               return_dict=False):
+               return_dict=False,
+               zero_copy=False):
     """Returns the loss value & metrics values for the model in test mode.
 
     Computation is done in batches (see the `batch_size` arg.)
@@ -1355,6 +1404,10 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
         return_dict: If `True`, loss and metric results are returned as a dict,
           with each key being the name of the metric. If `False`, they are
           returned as a list.
+        zero_copy: Boolean. Used for NumPy array input only. If `True`,
+          batches are sliced out of the arrays instead of copying the arrays
+          into TensorFlow memory up front. See `Model.fit`. Defaults to
+          `False`.
 
     See the discussion of `Unpacking behavior for iterator-like inputs` for
     `Model.fit`.
@@ -1395,7 +1448,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             workers=workers,
             use_multiprocessing=use_multiprocessing,
             model=self,
-            steps_per_execution=self._steps_per_execution)
+            steps_per_execution=self._steps_per_execution,
+            zero_copy=zero_copy)
 
       # Container that configures and calls `tf.keras.Callback`s.
       if not isinstance(callbacks, callbacks_module.CallbackList):
@@ -1539,7 +1593,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
               callbacks=None,
               max_queue_size=10,
               workers=1,
-              use_multiprocessing=False):
+              use_multiprocessing=False,
+              zero_copy=False):
     """Generates output predictions for the input samples.
 
     Computation is done in batches. This method is designed for performance in
@@ -1589,6 +1644,10 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
             `False`. Note that because this implementation relies on
             multiprocessing, you should not pass non-picklable arguments to
             the generator as they can't be passed easily to children processes.
+        zero_copy: Boolean. Used for NumPy array input only. If `True`,
+            batches are sliced out of the arrays instead of copying the arrays
+            into TensorFlow memory up front. See `Model.fit`. Defaults to
+            `False`.
 
     See the discussion of `Unpacking behavior for iterator-like inputs` for
     `Model.fit`. Note that Model.predict uses the same interpretation rules as
@@ -1637,7 +1696,8 @@ class Model(base_layer.Layer, version_utils.ModelVersionSelector):
           workers=workers,
           use_multiprocessing=use_multiprocessing,
           model=self,
-          steps_per_execution=self._steps_per_execution)
+          steps_per_execution=self._steps_per_execution,
+          zero_copy=zero_copy)
 
       # Container that configures and calls `tf.keras.Callback`s.
       if not isinstance(callbacks, callbacks_module.CallbackList):
@@ -113,6 +113,52 @@ class BenchmarkAdapt(benchmark.TensorFlowBenchmark):
       for batch in [64 * 2048]:
         self.bm_adapt_implementation(vocab_size, batch)
 
+  def bm_sketch_implementation(self, num_elements, batch_size, sketch_size):
+    """Compare the KLL sketch against the summarizer on NumPy batches."""
+    data = np.random.normal(size=num_elements)
+    batches = np.array_split(data, max(1, num_elements // batch_size))
+    percents = np.linspace(0.01, 0.99, 99)
+    sorted_data = np.sort(data)
+
+    def rank_error(summary):
+      cum_weight_percents = summary[:, 1].cumsum() / summary[:, 1].sum()
+      estimates = np.interp(percents, cum_weight_percents, summary[:, 0])
+      ranks = np.searchsorted(sorted_data, estimates) / float(num_elements)
+      return np.max(np.abs(ranks - percents))
+
+    start = time.time()
+    summary = None
+    for batch in batches:
+      batch_summary = discretization.summarize(batch, 1.0 / sketch_size)
+      summary = batch_summary if summary is None else (
+          discretization.merge_summaries(summary, batch_summary,
+                                         1.0 / sketch_size))
+    summary_time = time.time() - start
+
+    start = time.time()
+    sketch = discretization.KLLSketch(sketch_size)
+    for batch in batches:
+      sketch.update(batch)
+    sketch_summary = sketch.summary()
+    sketch_time = time.time() - start
+
+    name = "discretization_sketch|%s_elements|batch_%s|sketch_%s" % (
+        num_elements, batch_size, sketch_size)
+    extras = {
+        "summarizer seconds": summary_time,
+        "summarizer items": summary.shape[0],
+        "summarizer rank error": rank_error(summary),
+        "sketch items": sketch_summary.shape[0],
+        "sketch rank error": rank_error(sketch_summary),
+    }
+    self.report_benchmark(
+        iters=1, wall_time=sketch_time, extras=extras, name=name)
+
+  def benchmark_sketch_vs_summarizer(self):
+    for num_elements in [100000, 1000000, 10000000]:
+      for sketch_size in [100, 1000]:
+        self.bm_sketch_implementation(num_elements, 2048, sketch_size)
+
 
 if __name__ == "__main__":
   test.main()
@@ -124,6 +124,43 @@ class BenchmarkAdapt(benchmark.TensorFlowBenchmark):
       for batch in [1, 16, 2048]:
         self.bm_adapt_implementation(vocab_size, batch, int(vocab_size / 10))
 
+  def bm_adapt_sketch(self, num_elements, batch_size, k, sketch_size):
+    """Test adapt with a bounded sketch against exact counting."""
+    # Zipf-distributed tokens give the long tail the sketch is meant for.
+    tokens = np.random.zipf(1.2, size=num_elements).astype(np.int64)
+    batched_ds = dataset_ops.Dataset.from_tensor_slices(tokens).batch(
+        batch_size)
+
+    def adapt_vocab(sketch_size):
+      layer = index_lookup.IndexLookup(
+          max_tokens=k,
+          num_oov_indices=0,
+          mask_token=None,
+          oov_token=-1,
+          sketch_size=sketch_size,
+          dtype=dtypes.int64)
+      start = time.time()
+      layer.adapt(batched_ds)
+      return layer.get_vocabulary(), time.time() - start
+
+    exact_vocab, exact_time = adapt_vocab(None)
+    sketch_vocab, sketch_time = adapt_vocab(sketch_size)
+    name = "index_lookup_adapt_sketch|%s_elements|vocab_size_%s|sketch_%s" % (
+        num_elements, k, sketch_size)
+    extras = {
+        "exact wall time": exact_time,
+        "exact distinct tokens": len(np.unique(tokens)),
+        "sketch tokens": sketch_size,
+        "top-k recall":
+            len(set(exact_vocab) & set(sketch_vocab)) / float(len(exact_vocab)),
+    }
+    self.report_benchmark(
+        iters=1, wall_time=sketch_time, extras=extras, name=name)
+
+  def benchmark_sketch_size(self):
+    for sketch_factor in [1, 2, 4, 16]:
+      self.bm_adapt_sketch(1000000, 2048, 1000, 1000 * sketch_factor)
+
 
 if __name__ == "__main__":
   test.main()
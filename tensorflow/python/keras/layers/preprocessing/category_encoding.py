@@ -357,12 +357,15 @@ class _CategoryEncodingCombiner(base_preprocessing_layer.Combiner):
 
   def compute(self, values, accumulator=None):
     """Computes a step in this computation, returning a new accumulator."""
-    values = base_preprocessing_layer.convert_to_list(values)
-
     if accumulator is None:
       accumulator = self._create_accumulator()
 
-    # TODO(momernick): Benchmark improvements to this algorithm.
+    array_values = base_preprocessing_layer.convert_to_ndarray(values)
+    if (array_values is not None and array_values.ndim in (1, 2) and
+        array_values.dtype.kind in "iu"):
+      return self._compute_dense(array_values, accumulator)
+
+    values = base_preprocessing_layer.convert_to_list(values)
     for element in values:
       if not isinstance(element, list):
         element = [element]
@@ -381,6 +384,28 @@ class _CategoryEncodingCombiner(base_preprocessing_layer.Combiner):
 
     return accumulator
 
+  def _compute_dense(self, values, accumulator):
+    """Vectorized `compute` for a 1D or 2D integer ndarray."""
+    # As in `compute`, each row of a 2D batch is a document and each element
+    # of a 1D batch is a document of its own.
+    if values.ndim == 1:
+      values = np.expand_dims(values, 1)
+    if self.max_tokens is None and values.size:
+      accumulator.data[self.MAX_VALUE_IDX] = max(
+          accumulator.data[self.MAX_VALUE_IDX], values.max().item())
+    if self._compute_idf and values.size:
+      # Count each token once per document it appears in. Documents in this
+      # batch all get new ids, so 'last_doc_id' never needs to be consulted.
+      sorted_values = np.sort(values, axis=1)
+      first_in_doc = np.ones(sorted_values.shape, dtype=bool)
+      first_in_doc[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+      tokens, doc_counts = np.unique(
+          sorted_values[first_in_doc], return_counts=True)
+      for token, doc_count in zip(tokens.tolist(), doc_counts.tolist()):
+        accumulator.per_doc_count_dict[token]["count"] += doc_count
+    accumulator.data[self.DOC_ID_IDX] += values.shape[0]
+    return accumulator
+
   def merge(self, accumulators):
     """Merges several accumulators to a single accumulator."""
     if not accumulators:
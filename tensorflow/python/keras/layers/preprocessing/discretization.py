@@ -135,6 +135,106 @@ def get_bucket_boundaries(summary, num_bins):
   return compress(summary, 1.0 / num_bins)[:-1, 0]
 
 
+class KLLSketch(object):
+  """A streaming, mergeable quantile sketch.
+
+  This implements the KLL sketch (Karnin, Lang and Liberty, "Optimal Quantile
+  Approximation in Streams", 2016). Values are kept in a hierarchy of
+  compactors, where an item at level `h` stands for `2**h` input values. When
+  the sketch grows beyond its capacity, the lowest overfull level is sorted
+  and every other item (starting at a random offset) is promoted to the next
+  level. The sketch holds O(k) items regardless of how many values are added,
+  and its rank error is O(1 / k) with high probability.
+
+  Unlike `summarize`, which is applied to each batch separately, batches are
+  inserted directly into the sketch, and sketches of disjoint data can be
+  merged in any order, which makes them suitable for parallel computation.
+
+  Arguments:
+      k: The capacity of the top level of the sketch. Larger values increase
+        accuracy and memory use.
+      seed: Optional seed for the random compaction offsets.
+  """
+
+  def __init__(self, k=200, seed=None):
+    if k < 2:
+      raise ValueError("`k` must be at least 2. You passed %s" % (k,))
+    self.k = k
+    self.levels = [np.empty((0,))]
+    self.seed = seed
+    self._random = np.random.RandomState(seed)
+
+  @property
+  def num_values(self):
+    """The total number of values added to this sketch."""
+    return sum(items.size << level for level, items in enumerate(self.levels))
+
+  def update(self, values):
+    """Adds an array of values to the sketch."""
+    values = np.ravel(values).astype(np.float64)
+    self.levels[0] = np.concatenate((self.levels[0], values))
+    self._compress()
+    return self
+
+  def merge(self, other):
+    """Adds all values summarized by another sketch to this sketch."""
+    for level, items in enumerate(other.levels):
+      if level == len(self.levels):
+        self.levels.append(np.empty((0,)))
+      self.levels[level] = np.concatenate((self.levels[level], items))
+    self._compress()
+    return self
+
+  def summary(self):
+    """Returns the sketch as a summary in the format of `summarize`."""
+    values = np.concatenate(self.levels)
+    weights = np.concatenate([
+        np.full(items.shape, 2.0**level)
+        for level, items in enumerate(self.levels)
+    ])
+    order = values.argsort(kind="mergesort")
+    return np.hstack((np.expand_dims(values[order], 1),
+                      np.expand_dims(weights[order], 1)))
+
+  def quantiles(self, percents):
+    """Returns approximate quantiles, for `percents` in [0, 1]."""
+    summary = self.summary()
+    if not summary.size:
+      raise ValueError("Cannot compute quantiles of an empty sketch.")
+    cum_weight_percents = summary[:, 1].cumsum() / summary[:, 1].sum()
+    return np.interp(percents, cum_weight_percents, summary[:, 0])
+
+  def get_config(self):
+    return {"k": self.k, "seed": self.seed,
+            "levels": [items.tolist() for items in self.levels]}
+
+  @classmethod
+  def from_config(cls, config):
+    sketch = cls(config["k"], seed=config.get("seed"))
+    sketch.levels = [np.array(items, dtype=np.float64).reshape((-1,))
+                     for items in config["levels"]]
+    return sketch
+
+  def _capacity(self, level):
+    depth = len(self.levels) - level - 1
+    return max(2, int(np.ceil(self.k * (2.0 / 3.0)**depth)))
+
+  def _compress(self):
+    while (sum(items.size for items in self.levels) >
+           sum(self._capacity(level) for level in range(len(self.levels)))):
+      level = next(level for level, items in enumerate(self.levels)
+                   if items.size > self._capacity(level))
+      if level + 1 == len(self.levels):
+        self.levels.append(np.empty((0,)))
+      items = np.sort(self.levels[level])
+      # With an odd number of items, the smallest one stays at this level.
+      num_kept = items.size % 2
+      offset = self._random.randint(2)
+      self.levels[level] = items[:num_kept]
+      self.levels[level + 1] = np.concatenate(
+          (self.levels[level + 1], items[num_kept + offset::2]))
+
+
 @keras_export("keras.layers.experimental.preprocessing.Discretization")
 class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
   """Buckets data into discrete ranges.
@@ -159,6 +259,13 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
       0.01). Higher values of epsilon increase the quantile approximation, and
       hence result in more unequal buckets, but could improve performance
       and resource consumption.
+    sketch_size: If set, `adapt()` summarizes the data with a streaming KLL
+      quantile sketch of this capacity instead of per-batch summaries, and
+      `epsilon` is ignored. Memory use stays at a small multiple of
+      `sketch_size` items however much data is adapted on, and the rank error
+      shrinks in proportion to 1 / `sketch_size`.
+    seed: Integer. Used to seed the random compaction offsets of the sketch,
+      so that `adapt()` with `sketch_size` set is reproducible.
 
   Examples:
 
@@ -185,10 +292,12 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
   def __init__(self,
                bins,
                epsilon=0.01,
+               sketch_size=None,
+               seed=None,
                **kwargs):
     super(Discretization, self).__init__(
         combiner=Discretization.DiscretizingCombiner(
-            epsilon, bins if isinstance(bins, int) else 1),
+            epsilon, bins if isinstance(bins, int) else 1, sketch_size, seed),
         **kwargs)
     base_preprocessing_layer.keras_kpl_gauge.get_cell(
         "Discretization").set(True)
@@ -199,6 +308,8 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
     # Need this to return correct config
     self.input_bins = bins
     self.epsilon = epsilon
+    self.sketch_size = sketch_size
+    self.seed = seed
 
   def build(self, input_shape):
     self.bins = self._add_state_variable(
@@ -213,6 +324,8 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
         "bins": None if self.input_bins is None else (
             K.get_value(self.input_bins)),
         "epsilon": self.epsilon,
+        "sketch_size": self.sketch_size,
+        "seed": self.seed,
     }
     base_config = super(Discretization, self).get_config()
     return dict(list(base_config.items()) + list(config.items()))
@@ -274,16 +387,22 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
     This class encapsulates the computations for finding the quantile boundaries
     of a set of data in a stable and numerically correct way. Its associated
     accumulator is a namedtuple('summaries'), representing summarizations of
-    the data used to generate boundaries.
+    the data used to generate boundaries. If `sketch_size` is set, each
+    summarization is a `KLLSketch` instead of a summary array.
 
     Attributes:
       epsilon: Error tolerance.
       num_bins: The desired number of buckets.
+      sketch_size: (Optional) The capacity of the `KLLSketch` to summarize
+        the data with.
+      seed: (Optional) The seed of the `KLLSketch`es.
     """
 
-    def __init__(self, epsilon, num_bins,):
+    def __init__(self, epsilon, num_bins, sketch_size=None, seed=None):
       self.epsilon = epsilon
       self.num_bins = num_bins
+      self.sketch_size = sketch_size
+      self.seed = seed
 
       # TODO(mwunder): Implement elementwise per-column discretization.
 
@@ -296,6 +415,15 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
         values = values.flat_values
       flattened_input = np.reshape(values, newshape=(-1, 1))
 
+      if self.sketch_size is not None:
+        if accumulator is None:
+          accumulator = self._create_accumulator(
+              [KLLSketch(self.sketch_size, seed=self.seed)
+               for _ in flattened_input.T])
+        for sketch, v in zip(accumulator.summaries, flattened_input.T):
+          sketch.update(v)
+        return accumulator
+
       summaries = [summarize(v, self.epsilon) for v in flattened_input.T]
 
       if accumulator is None:
@@ -310,6 +438,12 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
       # Combine accumulators and return the result.
 
       merged = accumulators[0].summaries
+      if self.sketch_size is not None:
+        for accumulator in accumulators[1:]:
+          for sketch, other in zip(merged, accumulator.summaries):
+            sketch.merge(other)
+        return self._create_accumulator(merged)
+
       for accumulator in accumulators[1:]:
         merged = [merge_summaries(prev, summary, self.epsilon)
                   for prev, summary in zip(merged, accumulator.summaries)]
@@ -319,9 +453,12 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
     def extract(self, accumulator):
       """Convert an accumulator into a dict of output values."""
 
+      summaries = accumulator.summaries
+      if self.sketch_size is not None:
+        summaries = [sketch.summary() for sketch in summaries]
       boundaries = [np.append(get_bucket_boundaries(summary, self.num_bins),
                               [np.Inf])
-                    for summary in accumulator.summaries]
+                    for summary in summaries]
       return {
           _BINS_NAME: np.squeeze(np.vstack(boundaries))
       }
@@ -333,6 +470,12 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
 
     def serialize(self, accumulator):
       """Serialize an accumulator for a remote call."""
+      if self.sketch_size is not None:
+        output_dict = {
+            _BINS_NAME: [sketch.get_config()
+                         for sketch in accumulator.summaries]
+        }
+        return compat.as_bytes(json.dumps(output_dict))
       output_dict = {
           _BINS_NAME: [summary.tolist() for summary in accumulator.summaries]
       }
@@ -341,6 +484,10 @@ class Discretization(base_preprocessing_layer.CombinerPreprocessingLayer):
     def deserialize(self, encoded_accumulator):
       """Deserialize an accumulator received from 'serialize()'."""
       value_dict = json.loads(compat.as_text(encoded_accumulator))
+      if self.sketch_size is not None:
+        return self._create_accumulator([
+            KLLSketch.from_config(config) for config in value_dict[_BINS_NAME]
+        ])
       return self._create_accumulator(np.array(value_dict[_BINS_NAME]))
 
     def _create_accumulator(self, summaries):
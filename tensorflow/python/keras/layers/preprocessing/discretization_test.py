@@ -242,5 +242,90 @@ class DiscretizationTest(keras_parameterized.TestCase,
                                                                   num_bins)
     self.validate_accumulator_extract(combiner, data, expected)
 
+  def test_layer_computation_with_sketch(self):
+    adapt_data = np.arange(300)
+    np.random.shuffle(adapt_data)
+    adapt_data = dataset_ops.Dataset.from_tensor_slices(adapt_data).batch(7)
+
+    cls = get_layer_class()
+    layer = cls(bins=3, sketch_size=400)
+    layer.adapt(adapt_data)
+
+    input_data = keras.Input(shape=())
+    output = layer(input_data)
+    model = keras.Model(input_data, output)
+    model._run_eagerly = testing_utils.should_run_eagerly()
+    output_data = model.predict(np.arange(300))
+    expected = np.concatenate([np.zeros(99), np.ones(100), 2 * np.ones(101)])
+    self.assertAllClose(expected, output_data)
+    self.assertEqual(400, layer.get_config()["sketch_size"])
+
+  def test_combiner_serialization_with_sketch(self):
+    combiner = discretization.Discretization.DiscretizingCombiner(
+        0.01, 4, sketch_size=16)
+    data = np.random.uniform(size=(1000, 1))
+    accumulator = combiner.compute(data)
+    restored = combiner.deserialize(combiner.serialize(accumulator))
+    self.assertAllClose(combiner.extract(accumulator),
+                        combiner.extract(restored))
+
+  def test_combiner_with_seeded_sketch_is_reproducible(self):
+    data = np.random.uniform(size=(1000, 1))
+
+    def extract(seed):
+      combiner = discretization.Discretization.DiscretizingCombiner(
+          0.01, 8, sketch_size=16, seed=seed)
+      accumulator = combiner.compute(data)
+      accumulator = combiner.deserialize(combiner.serialize(accumulator))
+      return combiner.extract(accumulator)
+
+    self.assertAllEqual(extract(0), extract(0))
+    layer = get_layer_class()(bins=8, sketch_size=16, seed=0)
+    self.assertEqual(0, layer.get_config()["seed"])
+
+
+class KLLSketchTest(test.TestCase):
+
+  def assertRankErrorLess(self, data, sketch, tolerance):
+    percents = np.linspace(0.01, 0.99, 99)
+    estimates = sketch.quantiles(percents)
+    ranks = np.searchsorted(np.sort(data), estimates) / float(data.size)
+    self.assertLess(np.max(np.abs(ranks - percents)), tolerance)
+
+  def test_exact_below_capacity(self):
+    sketch = discretization.KLLSketch(k=10)
+    sketch.update(np.array([3., 2., 1., 5., 4.]))
+    self.assertAllEqual([[1., 1.], [2., 1.], [3., 1.], [4., 1.], [5., 1.]],
+                        sketch.summary())
+
+  def test_streaming_accuracy(self):
+    data = np.random.RandomState(0).normal(size=100000)
+    sketch = discretization.KLLSketch(k=200, seed=0)
+    for batch in np.array_split(data, 50):
+      sketch.update(batch)
+    self.assertEqual(data.size, sketch.num_values)
+    self.assertLess(sum(items.size for items in sketch.levels), 1000)
+    self.assertRankErrorLess(data, sketch, 0.02)
+
+  def test_merge(self):
+    data = np.random.RandomState(0).uniform(size=100000)
+    sketches = [
+        discretization.KLLSketch(k=200, seed=i).update(batch)
+        for i, batch in enumerate(np.array_split(data, 8))
+    ]
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+      merged.merge(sketch)
+    self.assertEqual(data.size, merged.num_values)
+    self.assertRankErrorLess(data, merged, 0.02)
+
+  def test_config_round_trip(self):
+    sketch = discretization.KLLSketch(k=20, seed=0)
+    sketch.update(np.arange(1000))
+    restored = discretization.KLLSketch.from_config(sketch.get_config())
+    self.assertAllEqual(sketch.summary(), restored.summary())
+    self.assertEqual(0, restored.seed)
+
+
 if __name__ == "__main__":
   test.main()
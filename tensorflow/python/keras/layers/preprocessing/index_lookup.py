@@ -24,6 +24,7 @@ import operator
 
 import numpy as np
 
+from tensorflow.python.eager import context
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import tensor_spec
@@ -33,6 +34,8 @@ from tensorflow.python.keras.layers.preprocessing import table_utils
 from tensorflow.python.keras.utils import layer_utils
 from tensorflow.python.ops import lookup_ops
 from tensorflow.python.ops import math_ops
+from tensorflow.python.ops.ragged import ragged_tensor
+from tensorflow.python.ops.ragged import ragged_tensor_value
 from tensorflow.python.util import compat
 
 INT = "int"
@@ -98,7 +101,17 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
     sparse: Boolean. Only applicable to "binary" and "count" output modes.
       If true, returns a `SparseTensor` instead of a dense `Tensor`.
       Defaults to `False`.
+    sketch_size: If set, `adapt()` tracks token frequencies with a heavy
+      hitters sketch holding at most this many tokens, instead of counting
+      every distinct token exactly. This bounds the memory used by `adapt()` on
+      datasets with a long tail of rare tokens, at the cost of approximate
+      frequencies. Must be at least the number of vocabulary entries implied
+      by `max_tokens`. Defaults to None (exact counting).
   """
+  # Exact token counts merge to the same result however batches are grouped,
+  # so eager `adapt()` counts batches on several threads. Counts pruned to a
+  # `sketch_size` sketch depend on the grouping, and are computed serially.
+  _adapt_num_workers = None
 
   def __init__(self,
                max_tokens,
@@ -109,6 +122,7 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
                invert=False,
                output_mode=INT,
                sparse=False,
+               sketch_size=None,
                **kwargs):
 
     # If max_tokens is set, the value must be greater than 1 - otherwise we
@@ -138,6 +152,7 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
     self.mask_token = mask_token
     self.output_mode = output_mode
     self.sparse = sparse
+    self.sketch_size = sketch_size
 
     # If there is only one OOV bucket, we can determine the OOV value (either 0
     # or 1 depending on whether 0 is reserved) and set that as the default
@@ -156,8 +171,14 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
     else:
       vocab_size = None
 
+    if sketch_size is not None and sketch_size < (vocab_size or 1):
+      raise ValueError("`sketch_size` must be at least the number of "
+                       "non-OOV, non-mask vocabulary entries (%s). You passed "
+                       "%s" % (vocab_size or 1, sketch_size))
+
     super(IndexLookup, self).__init__(
-        combiner=_IndexLookupCombiner(vocab_size, self.mask_token), **kwargs)
+        combiner=_IndexLookupCombiner(vocab_size, self.mask_token, sketch_size),
+        **kwargs)
 
     self._output_dtype = dtypes.int64
 
@@ -225,6 +246,11 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
     super(IndexLookup, self).adapt(data, reset_state)
     self.max_tokens = int(self._table_handler.vocab_size())
 
+  def _get_adapt_num_workers(self):
+    if self.sketch_size is not None:
+      return 1
+    return super(IndexLookup, self)._get_adapt_num_workers()
+
   def get_vocabulary(self):
     if self._table_handler.vocab_size() == 0:
       return []
@@ -248,6 +274,7 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
         "num_oov_indices": self.num_oov_indices,
         "oov_token": self.oov_token,
         "mask_token": self.mask_token,
+        "sketch_size": self.sketch_size,
     }
     base_config = super(IndexLookup, self).get_config()
     return dict(list(base_config.items()) + list(config.items()))
@@ -435,7 +462,7 @@ class IndexLookup(base_preprocessing_layer.CombinerPreprocessingLayer):
 
 
 class _IndexLookupAccumulator(
-    collections.namedtuple("Accumulator", ["count_dict"])):
+    collections.namedtuple("Accumulator", ["count_dict", "sketch_error"])):
   pass
 
 
@@ -450,21 +477,41 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
       frequency across the dataset) are retained in the vocabulary. If None, or
       set to a value greater than the total number of distinct tokens in the
       dataset, all tokens are retained.
+    mask_value: (Optional) A token that is never added to the vocabulary.
+    sketch_size: (Optional) If set, token counts are kept in a Misra-Gries
+      heavy hitters sketch of at most `sketch_size` tokens. Whenever the sketch
+      overflows, the (sketch_size + 1)-th largest count is subtracted from
+      every count and tokens whose count drops to zero are evicted. Each
+      retained count then underestimates the true count by at most
+      `sketch_error`, which is bounded by N / (sketch_size + 1) for N tokens
+      seen, and sketches merge by summing counts and pruning again.
   """
 
-  def __init__(self, vocab_size=None, mask_value=None):
+  def __init__(self, vocab_size=None, mask_value=None, sketch_size=None):
     self._vocab_size = vocab_size
     self._mask_value = mask_value
+    self._sketch_size = sketch_size
 
   def compute(self, values, accumulator=None):
     """Compute a step in this computation, returning a new accumulator."""
-    values = base_preprocessing_layer.convert_to_list(
-        values, sparse_default_value=self._mask_value)
-
     if accumulator is None:
       accumulator = self._create_accumulator()
 
-    # TODO(momernick): Benchmark improvements to this algorithm.
+    # Dense and ragged batches are counted without walking every token in
+    # Python.
+    tokens = _get_flat_tokens(values)
+    if tokens is not None:
+      if tokens.dtype.kind in "iu":
+        unique_tokens, counts = np.unique(tokens, return_counts=True)
+        accumulator.count_dict.update(
+            dict(zip(unique_tokens.tolist(), counts.tolist())))
+      else:
+        accumulator.count_dict.update(tokens.tolist())
+      return self._prune(accumulator)
+
+    values = base_preprocessing_layer.convert_to_list(
+        values, sparse_default_value=self._mask_value)
+
     if isinstance(values, (str, bytes, np.int64)):
       accumulator.count_dict[values] += 1
     else:
@@ -475,7 +522,7 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
           for token in document:
             accumulator.count_dict[token] += 1
 
-    return accumulator
+    return self._prune(accumulator)
 
   def merge(self, accumulators):
     """Merge several accumulators to a single accumulator."""
@@ -483,11 +530,12 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
       return accumulators
 
     base_accumulator = accumulators[0]
+    sketch_error = base_accumulator.sketch_error
     for accumulator in accumulators[1:]:
-      for token, value in accumulator.count_dict.items():
-        base_accumulator.count_dict[token] += value
+      base_accumulator.count_dict.update(accumulator.count_dict)
+      sketch_error += accumulator.sketch_error
 
-    return base_accumulator
+    return self._prune(base_accumulator._replace(sketch_error=sketch_error))
 
   def extract(self, accumulator):
     """Convert an accumulator into a dict of output values.
@@ -519,6 +567,7 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
     output_dict = {}
     output_dict["vocab"] = list(accumulator.count_dict.keys())
     output_dict["vocab_counts"] = list(accumulator.count_dict.values())
+    output_dict["sketch_error"] = accumulator.sketch_error
     return compat.as_bytes(json.dumps(output_dict))
 
   def deserialize(self, encoded_accumulator):
@@ -530,10 +579,57 @@ class _IndexLookupCombiner(base_preprocessing_layer.Combiner):
         zip(accumulator_dict["vocab"], accumulator_dict["vocab_counts"]))
     accumulator.count_dict.update(count_dict)
 
-    return accumulator
+    return accumulator._replace(
+        sketch_error=accumulator_dict.get("sketch_error", 0))
 
   def _create_accumulator(self):
     """Accumulate a sorted array of vocab tokens and corresponding counts."""
 
-    count_dict = collections.defaultdict(int)
-    return _IndexLookupAccumulator(count_dict)
+    count_dict = collections.Counter()
+    return _IndexLookupAccumulator(count_dict, 0)
+
+  def _prune(self, accumulator):
+    """Shrinks an accumulator to at most `sketch_size` tokens, if needed."""
+    count_dict = accumulator.count_dict
+    if self._sketch_size is None or len(count_dict) <= self._sketch_size:
+      return accumulator
+
+    tokens = list(count_dict.keys())
+    counts = np.fromiter(
+        count_dict.values(), dtype=np.int64, count=len(tokens))
+    # Subtract the (sketch_size + 1)-th largest count from every count, which
+    # leaves at most sketch_size positive counts.
+    pivot = len(counts) - self._sketch_size - 1
+    decrement = np.partition(counts, pivot)[pivot]
+    counts -= decrement
+    retained = np.flatnonzero(counts > 0)
+
+    pruned_dict = collections.Counter()
+    for index, count in zip(retained.tolist(), counts[retained].tolist()):
+      pruned_dict[tokens[index]] = count
+    return _IndexLookupAccumulator(
+        pruned_dict, accumulator.sketch_error + int(decrement))
+
+
+def _get_flat_tokens(values):
+  """Returns all tokens in a dense or ragged batch as a 1D ndarray.
+
+  Returns None for inputs that must go through `convert_to_list` instead, such
+  as sparse tensors (whose implicit values are counted as well) and Python
+  lists.
+
+  Args:
+    values: A batch of input values.
+  """
+  if (isinstance(values, ragged_tensor_value.RaggedTensorValue) or
+      (isinstance(values, ragged_tensor.RaggedTensor) and
+       context.executing_eagerly())):
+    values = values.flat_values
+  values = base_preprocessing_layer.convert_to_ndarray(values)
+  if values is None:
+    return None
+  values = values.ravel()
+  # An object array built from ragged Python lists holds the lists themselves.
+  if values.size and isinstance(values[0], (list, np.ndarray)):
+    return None
+  return values
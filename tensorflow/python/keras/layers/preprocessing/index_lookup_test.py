@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import itertools
+import multiprocessing
 import os
 import random
 import string
@@ -31,6 +32,7 @@ from tensorflow.python import tf2
 
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.eager import context
+from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import sparse_tensor
 from tensorflow.python.framework import tensor_shape
@@ -294,6 +296,47 @@ class CategoricalEncodingInputTest(
     self.assertAllEqual(expected_values, output_data.values)
     self.assertAllEqual(expected_dense_shape, output_data.dense_shape)
 
+  def test_sharded_adapt(self):
+    vocab_data = np.array([["earth", "wind", "and", "fire"],
+                           ["fire", "and", "earth", "michigan"],
+                           ["fire", "fire", "earth", "wind"]] * 10)
+    vocab_dataset = dataset_ops.Dataset.from_tensor_slices(vocab_data).batch(2)
+
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        dtype=dtypes.string)
+    compute_sharded = test.mock.patch.object(
+        layer, "_compute_sharded", wraps=layer._compute_sharded)
+    with test.mock.patch.object(multiprocessing, "cpu_count", return_value=4):
+      with compute_sharded as mock_compute_sharded:
+        layer.adapt(vocab_dataset)
+    # Token counts are sharded by default, when executing eagerly.
+    self.assertEqual(context.executing_eagerly(), mock_compute_sharded.called)
+    expected_vocabulary = [
+        "", "[OOV]", "fire", "earth", "wind", "and", "michigan"
+    ]
+    self.assertAllEqual(expected_vocabulary, layer.get_vocabulary())
+
+  def test_adapt_with_sketch_is_not_sharded(self):
+    vocab_data = np.array([["earth", "wind", "and", "fire"],
+                           ["fire", "and", "earth", "michigan"]] * 10)
+    vocab_dataset = dataset_ops.Dataset.from_tensor_slices(vocab_data).batch(2)
+
+    layer = get_layer_class()(
+        max_tokens=None,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        sketch_size=8,
+        dtype=dtypes.string)
+    with test.mock.patch.object(multiprocessing, "cpu_count", return_value=4):
+      with test.mock.patch.object(layer, "_compute_sharded") as compute_sharded:
+        layer.adapt(vocab_dataset)
+    compute_sharded.assert_not_called()
+
   def test_sparse_int_input(self):
     vocab_data = np.array([10, 11, 12, 13], dtype=np.int64)
     input_array = sparse_tensor.SparseTensor(
@@ -1051,6 +1094,32 @@ class IndexLookupErrorTest(keras_parameterized.TestCase,
           oov_token="[OOV]",
           dtype=dtypes.string)
 
+  def test_sketch_size_smaller_than_vocab_fails(self):
+    with self.assertRaisesRegex(ValueError, ".*sketch_size.*"):
+      _ = get_layer_class()(
+          max_tokens=5,
+          num_oov_indices=1,
+          mask_token="",
+          oov_token="[OOV]",
+          sketch_size=2,
+          dtype=dtypes.string)
+
+  def test_adapt_with_sketch(self):
+    vocab_data = np.array([["earth", "earth", "earth", "earth"],
+                           ["wind", "wind", "wind", "and"],
+                           ["fire", "fire", "and", "michigan"]])
+    layer = get_layer_class()(
+        max_tokens=4,
+        num_oov_indices=1,
+        mask_token="",
+        oov_token="[OOV]",
+        sketch_size=3,
+        dtype=dtypes.string)
+    layer.adapt(dataset_ops.Dataset.from_tensor_slices(vocab_data).batch(1))
+    self.assertAllEqual(["", "[OOV]", "earth", "wind"],
+                        layer.get_vocabulary())
+    self.assertEqual(3, layer.get_config()["sketch_size"])
+
 
 @keras_parameterized.run_all_keras_modes
 class IndexLookupSavingTest(keras_parameterized.TestCase,
@@ -1115,6 +1184,60 @@ class IndexLookupStringCombinerTest(
 
     return accumulator
 
+  def test_combiner_computation_on_arrays(self):
+    combiner = index_lookup._IndexLookupCombiner()
+
+    ragged_data = [[b"earth", b"wind"], [b"fire", b"wind"], [b"and"]]
+    self.compare_accumulators(
+        combiner.compute(ragged_data),
+        combiner.compute(ragged_factory_ops.constant(ragged_data)))
+
+    dense_data = [[b"earth", b"wind"], [b"fire", b"wind"], [b"and", b""]]
+    self.compare_accumulators(
+        combiner.compute(dense_data),
+        combiner.compute(np.array(dense_data, dtype=object)))
+    self.compare_accumulators(
+        combiner.compute(dense_data),
+        combiner.compute(constant_op.constant(dense_data)))
+
+  def test_combiner_computation_with_sketch(self):
+    data = np.array([["earth", "earth", "earth", "wind"],
+                     ["wind", "wind", "and", "fire"],
+                     ["fire", "michigan", "earth", "and"]])
+    combiner = index_lookup._IndexLookupCombiner(vocab_size=2, sketch_size=2)
+    # Exact counts are earth: 4, wind: 3, and: 2, fire: 2, michigan: 1. With
+    # room for two tokens, every count is decremented by the third largest.
+    expected_accumulator_output = {
+        "vocab": np.array(["earth", "wind"]),
+        "counts": np.array([2, 1]),
+    }
+    expected_extract_output = {
+        "vocab": np.array(["earth", "wind"]),
+    }
+    expected_accumulator = combiner._create_accumulator()
+    expected_accumulator = self.update_accumulator(expected_accumulator,
+                                                   expected_accumulator_output)
+    accumulator = combiner.compute(data)
+    self.compare_accumulators(expected_accumulator, accumulator)
+    self.assertEqual(2, accumulator.sketch_error)
+    self.validate_accumulator_serialize_and_deserialize(combiner, data,
+                                                        expected_accumulator)
+    self.validate_accumulator_extract(combiner, data, expected_extract_output)
+
+  def test_combiner_merge_with_sketch(self):
+    combiner = index_lookup._IndexLookupCombiner(sketch_size=2)
+    accumulators = [
+        combiner.compute(np.array(["earth", "earth", "wind", "fire"])),
+        combiner.compute(np.array(["earth", "fire", "fire", "and"])),
+    ]
+    merged = combiner.merge(accumulators)
+    self.assertLessEqual(len(merged.count_dict), 2)
+    self.assertEqual(["fire", "earth"], combiner.extract(merged)["vocab"])
+
+    restored = combiner.deserialize(combiner.serialize(merged))
+    self.compare_accumulators(merged, restored)
+    self.assertEqual(merged.sketch_error, restored.sketch_error)
+
   def test_combiner_api_compatibility_int_mode(self):
     data = np.array([["earth", "wind", "and", "fire"],
                      ["earth", "wind", "and", "michigan"]])
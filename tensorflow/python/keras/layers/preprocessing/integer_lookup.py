@@ -76,6 +76,15 @@ class IntegerLookup(index_lookup.IndexLookup):
     sparse: Boolean. Only applicable to "binary" and "count" output modes.
       If true, returns a `SparseTensor` instead of a dense `Tensor`.
       Defaults to `False`.
+    sketch_size: Optional keyword argument. If set, `adapt()` tracks value
+      frequencies with a Misra-Gries heavy hitters sketch holding at most this
+      many values, instead of counting every distinct value exactly. This bounds
+      the memory used by `adapt()` on data with a long tail of rare values.
+      Each count is then underestimated by at most the sketch's
+      `sketch_error`, which is no more than N / (`sketch_size` + 1) after
+      adapting on N values, so every value more frequent than that stays in the
+      sketch. Must be at least the number of vocabulary entries implied by
+      `max_values`. Defaults to None (exact counting).
 
   Examples:
 
@@ -38,6 +38,10 @@ _COUNT_NAME = 'count'
 _MEAN_NAME = 'mean'
 _VARIANCE_NAME = 'variance'
 
+# The maximum number of input elements `_NormalizingCombiner.compute` reduces
+# at once, which bounds the size of its float64 temporaries.
+_COMPUTE_CHUNK_SIZE = 2**22
+
 
 def convert_to_ndarray(values):
   if isinstance(values, np.ndarray):
@@ -103,6 +107,12 @@ class Normalization(base_preprocessing_layer.CombinerPreprocessingLayer):
          [ 0.        ]], dtype=float32)>
   """
 
+  # Tensor and NumPy inputs to `adapt()` are split into batches of this many
+  # rows. NumPy batches are views into the input, so memory-mapped arrays are
+  # not read into memory up front; the combiner reduces each batch in chunks of
+  # bounded size.
+  _adapt_batch_size = 2**16
+
   def __init__(self, axis=-1, mean=None, variance=None, **kwargs):
     # Standardize `axis` to a tuple.
     if axis is None:
@@ -231,6 +241,11 @@ class _NormalizingCombiner(base_preprocessing_layer.Combiner):
   of a set of data in a stable and numerically correct way. Its associated
   accumulator is a namedtuple('count', 'mean', 'variance').
 
+  Batches are reduced in float64, in chunks of at most `_COMPUTE_CHUNK_SIZE`
+  elements, and partial results are combined with the pairwise update of Chan
+  et al., which avoids the cancellation of sum-of-squares formulas on large
+  counts.
+
   Attributes:
     axis: The axis to compute mean and var over.
   """
@@ -243,7 +258,9 @@ class _NormalizingCombiner(base_preprocessing_layer.Combiner):
 
   def compute(self, values, accumulator=None):
     """Compute a step in this computation, returning a new accumulator."""
-    values = np.array(values)
+    # `np.asarray` does not copy ndarrays, so memory-mapped inputs are only
+    # read chunk by chunk below.
+    values = np.asarray(values)
     if values.ndim == 1:
       values = np.expand_dims(values, 1)
 
@@ -251,47 +268,44 @@ class _NormalizingCombiner(base_preprocessing_layer.Combiner):
     axis_mask = np.ones([values.ndim], dtype=bool)
     axis_mask[np.array(self.axis, dtype=np.int32)] = False
 
-    # This is the shape of all reduced axes (not specified in 'axis').
-
-    reduction_counts = np.array(values.shape)[axis_mask]
-    # We get the number of elements that will be reduced by multiplying all
-    # values of 'shape' corresponding to the reduced axes.
-    count = np.prod(reduction_counts, dtype=np.int64)
-
     # We want to reduce across dimensions except those specified in 'axis'
     # when using np.mean or np.variance; create the tuple of axes to reduce
     # over here.
     reduction_axes = tuple(np.arange(values.ndim)[axis_mask])
 
-    mean = np.mean(values, axis=reduction_axes, dtype=np.float64)
-    variance = np.var(values, axis=reduction_axes, dtype=np.float64)
-
-    # Create an accumulator with our new data and either return it or combine
-    # it with the passed accumulator.
-    if accumulator is None:
-      return self._create_accumulator(count, mean, variance)
-    else:
-      return self.add_data_to_accumulator(count, mean, variance, accumulator)
+    # The batch axis is always reduced, so we can split the batch into chunks
+    # along it.
+    num_rows = values.shape[0]
+    row_size = max(1, int(np.prod(values.shape[1:], dtype=np.int64)))
+    rows_per_chunk = max(1, _COMPUTE_CHUNK_SIZE // row_size)
+    for start in range(0, max(num_rows, 1), rows_per_chunk):
+      chunk = values[start:start + rows_per_chunk]
+
+      # We get the number of elements that will be reduced by multiplying all
+      # values of 'shape' corresponding to the reduced axes.
+      count = np.prod(np.array(chunk.shape)[axis_mask], dtype=np.int64)
+
+      mean = np.mean(chunk, axis=reduction_axes, dtype=np.float64,
+                     keepdims=True)
+      squared_deviations = np.subtract(chunk, mean, dtype=np.float64)
+      np.square(squared_deviations, out=squared_deviations)
+      variance = np.mean(squared_deviations, axis=reduction_axes)
+      mean = np.squeeze(mean, axis=reduction_axes)
+
+      # Create an accumulator with our new data or combine it with the
+      # passed accumulator.
+      if accumulator is None:
+        accumulator = self._create_accumulator(count, mean, variance)
+      else:
+        accumulator = self.add_data_to_accumulator(count, mean, variance,
+                                                   accumulator)
+    return accumulator
 
   def add_data_to_accumulator(self, count, mean, variance, accumulator):
     """Add new data to the totals in an accumulator."""
-    # Combine accumulators and return the result.
-    combined_count = count + accumulator[self.COUNT_IDX]
-
-    # To combine accumulator means, we weight each accumulator's mean by the
-    # number of elements that were accumulated, and then divide by the
-    # total number of elements.
-    combined_mean = (mean * count + accumulator[self.MEAN_IDX] *
-                     accumulator[self.COUNT_IDX]) / combined_count
-
-    # The variance is computed using the lack-of-fit sum of squares
-    # formula (see https://en.wikipedia.org/wiki/Lack-of-fit_sum_of_squares).
-    accumulator_var_contribution = accumulator[self.COUNT_IDX] * (
-        accumulator[self.VAR_IDX] +
-        np.square(accumulator[self.MEAN_IDX] - combined_mean))
-    data_var_contribution = count * (variance + np.square(mean - combined_mean))
-    combined_variance = (accumulator_var_contribution +
-                         data_var_contribution) / combined_count
+    combined_count, combined_mean, combined_variance = _combine_moments(
+        accumulator[self.COUNT_IDX], accumulator[self.MEAN_IDX],
+        accumulator[self.VAR_IDX], count, mean, variance)
 
     accumulator[self.COUNT_IDX] = combined_count
     accumulator[self.MEAN_IDX] = np.nan_to_num(combined_mean)
@@ -301,30 +315,18 @@ class _NormalizingCombiner(base_preprocessing_layer.Combiner):
   def merge(self, accumulators):
     """Merge several accumulators to a single accumulator."""
     # Combine accumulators and return the result.
-    combined_count = np.sum(
-        [accumulator[self.COUNT_IDX] for accumulator in accumulators])
-
-    # To combine accumulator means, we weight each accumulator's mean by the
-    # number of elements that were accumulated, and then divide by the
-    # total number of elements.
-    combined_mean = np.add.reduce([
-        accumulator[self.MEAN_IDX] * accumulator[self.COUNT_IDX]
-        for accumulator in accumulators
-    ]) / combined_count
-
-    # The variance is computed using the lack-of-fit sum of squares
-    # formula (see https://en.wikipedia.org/wiki/Lack-of-fit_sum_of_squares).
-    def variance_contribution(accumulator):
-      return accumulator[self.COUNT_IDX] * (
-          accumulator[self.VAR_IDX] +
-          np.square(accumulator[self.MEAN_IDX] - combined_mean))
-
-    combined_variance = np.add.reduce([
-        variance_contribution(accumulator) for accumulator in accumulators
-    ]) / combined_count
-
-    return self._create_accumulator(combined_count, combined_mean,
-                                    combined_variance)
+    combined_count = accumulators[0][self.COUNT_IDX]
+    combined_mean = accumulators[0][self.MEAN_IDX]
+    combined_variance = accumulators[0][self.VAR_IDX]
+    for accumulator in accumulators[1:]:
+      combined_count, combined_mean, combined_variance = _combine_moments(
+          combined_count, combined_mean, combined_variance,
+          accumulator[self.COUNT_IDX], accumulator[self.MEAN_IDX],
+          accumulator[self.VAR_IDX])
+
+    return self._create_accumulator(combined_count,
+                                    np.nan_to_num(combined_mean),
+                                    np.nan_to_num(combined_variance))
 
   def extract(self, accumulator):
     """Convert an accumulator into a dict of output values."""
@@ -369,3 +371,19 @@ class _NormalizingCombiner(base_preprocessing_layer.Combiner):
   def _create_accumulator(self, count, mean, variance):
     """Convert any 'nan' values in the given accumulator to numeric values."""
     return [count, mean, variance]
+
+
+def _combine_moments(count_a, mean_a, variance_a, count_b, mean_b, variance_b):
+  """Combines the count, mean and variance of two disjoint sets of data."""
+  combined_count = count_a + count_b
+  # Weighting the difference of the means (rather than summing mean * count)
+  # keeps the result accurate when the counts are large. See Chan, Golub and
+  # LeVeque, "Algorithms for Computing the Sample Variance", 1979.
+  with np.errstate(divide='ignore', invalid='ignore'):
+    fraction_a = np.true_divide(count_a, combined_count)
+    fraction_b = np.true_divide(count_b, combined_count)
+  delta = np.subtract(mean_b, mean_a, dtype=np.float64)
+  combined_mean = mean_a + delta * fraction_b
+  combined_variance = (fraction_a * variance_a + fraction_b * variance_b +
+                       np.square(delta) * fraction_a * fraction_b)
+  return combined_count, combined_mean, combined_variance
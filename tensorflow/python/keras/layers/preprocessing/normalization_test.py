@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+
 from absl.testing import parameterized
 
 import numpy as np
@@ -369,6 +371,28 @@ class NormalizationTest(keras_parameterized.TestCase,
     layer.adapt(data)
     self.assertAllClose(expect, layer(data))
 
+  def test_combiner_computation_in_chunks(self):
+    data = np.random.RandomState(0).normal(
+        loc=1e4, scale=3., size=(1000, 4, 2))
+    combiner = normalization._NormalizingCombiner(axis=(-1,))
+    expected_accumulator = combiner._create_accumulator(
+        np.array(4000), np.mean(data, axis=(0, 1)), np.var(data, axis=(0, 1)))
+    with test.mock.patch.object(normalization, "_COMPUTE_CHUNK_SIZE", 24):
+      self.validate_accumulator_computation(combiner, data,
+                                            expected_accumulator)
+
+  def test_adapt_memmap(self):
+    data = np.random.RandomState(0).normal(size=(1000, 3)).astype(np.float32)
+    path = os.path.join(self.get_temp_dir(), "data.npy")
+    np.save(path, data)
+    cls = get_layer_class()
+    layer = cls(axis=-1)
+    layer._adapt_batch_size = 64
+    layer.adapt(np.load(path, mmap_mode="r"))
+    weights = layer.get_weights()
+    self.assertAllClose(np.mean(data, axis=0), weights[0])
+    self.assertAllClose(np.var(data, axis=0), weights[1])
+
   def test_model_summary_after_layer_adapt(self):
     data = np.array([[[0., 1., 2.], [0., 2., 6.]],
                      [[2., 3., 4.], [3., 6., 10.]]])
@@ -77,6 +77,15 @@ class StringLookup(index_lookup.IndexLookup):
     sparse: Boolean. Only applicable to "binary" and "count" output modes.
       If true, returns a `SparseTensor` instead of a dense `Tensor`.
       Defaults to `False`.
+    sketch_size: Optional keyword argument. If set, `adapt()` tracks token
+      frequencies with a Misra-Gries heavy hitters sketch holding at most this
+      many tokens, instead of counting every distinct token exactly. This bounds
+      the memory used by `adapt()` on data with a long tail of rare tokens.
+      Each count is then underestimated by at most the sketch's
+      `sketch_error`, which is no more than N / (`sketch_size` + 1) after
+      adapting on N tokens, so every token more frequent than that stays in the
+      sketch. Must be at least the number of vocabulary entries implied by
+      `max_tokens`. Defaults to None (exact counting).
 
   Examples:
 
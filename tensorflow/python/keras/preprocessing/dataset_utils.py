@@ -18,14 +18,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
 import multiprocessing
 import os
+import threading
+import time
 
 import numpy as np
 
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
+from tensorflow.python.platform import tf_logging as logging
 
 
 def index_directory(directory,
@@ -34,7 +38,8 @@ def index_directory(directory,
                     class_names=None,
                     shuffle=True,
                     seed=None,
-                    follow_links=False):
+                    follow_links=False,
+                    index_cache=None):
   """Make list of all files in the subdirs of `directory`, with their labels.
 
   Args:
@@ -54,6 +59,10 @@ def index_directory(directory,
         If set to False, sorts the data in alphanumeric order.
     seed: Optional random seed for shuffling.
     follow_links: Whether to visits subdirectories pointed to by symlinks.
+    index_cache: Optional path to a file in which directory listings are
+        cached across runs (see `DirectoryIndexCache`). Only directories
+        whose modification time changed since the cache was written are
+        listed again.
 
   Returns:
     tuple (file_paths, labels, class_names).
@@ -76,6 +85,9 @@ def index_directory(directory,
           (inferred_class_names, class_names))
   class_indices = dict(zip(class_names, range(len(class_names))))
 
+  if index_cache is not None:
+    index_cache = DirectoryIndexCache(index_cache)
+
   # Build an index of the files
   # in the different class subfolders.
   pool = multiprocessing.pool.ThreadPool()
@@ -84,7 +96,8 @@ def index_directory(directory,
   for dirpath in (os.path.join(directory, subdir) for subdir in class_names):
     results.append(
         pool.apply_async(index_subdirectory,
-                         (dirpath, class_indices, follow_links, formats)))
+                         (dirpath, class_indices, follow_links, formats,
+                          index_cache)))
   labels_list = []
   for res in results:
     partial_filenames, partial_labels = res.get()
@@ -107,6 +120,8 @@ def index_directory(directory,
         (len(filenames), len(class_names)))
   pool.close()
   pool.join()
+  if index_cache is not None:
+    index_cache.save()
   file_paths = [os.path.join(directory, fname) for fname in filenames]
 
   if shuffle:
@@ -120,15 +135,137 @@ def index_directory(directory,
   return file_paths, labels, class_names
 
 
-def iter_valid_files(directory, follow_links, formats):
-  walk = os.walk(directory, followlinks=follow_links)
+class DirectoryIndexCache(object):
+  """Persistent cache of directory listings, validated by modification time.
+
+  Adding, removing or renaming an entry of a directory updates the directory's
+  modification time, so a cached listing can be reused for as long as the
+  modification time of its directory is unchanged. Walking a tree through the
+  cache then costs one `stat` per directory instead of one listing per
+  directory, and only changed directories are listed again.
+
+  The cache is a JSON file mapping absolute directory paths to their
+  modification time, subdirectories and files. It may be shared between
+  several target directories (e.g. training and validation data).
+
+  Arguments:
+    path: Path of the cache file. It is created on the first `save()`.
+  """
+
+  _VERSION = 1
+
+  # Listings of directories modified less than this many seconds before they
+  # were read are not trusted: an entry could be added within the same
+  # timestamp granularity without changing the modification time.
+  _RACY_WINDOW_SECONDS = 2.
+
+  def __init__(self, path):
+    self.path = path
+    self._lock = threading.Lock()
+    self._listings = {}
+    self._visited = set()
+    self._walked = set()
+    self._dirty = False
+    if os.path.exists(path):
+      try:
+        with open(path) as f:
+          contents = json.load(f)
+        if contents.get('version') == self._VERSION:
+          self._listings = contents['listings']
+      except (IOError, ValueError, KeyError) as e:
+        logging.warning('Ignoring unreadable directory index cache %s: %s',
+                        path, e)
+
+  def _list_directory(self, path, mtime):
+    """Lists `path`, returning the `[mtime, dirs, files]` cache entry."""
+    dirs = []
+    files = []
+    for entry in os.scandir(path):
+      if entry.is_dir():
+        dirs.append([entry.name, entry.is_symlink()])
+      else:
+        files.append(entry.name)
+    if time.time() - mtime < self._RACY_WINDOW_SECONDS:
+      mtime = None
+    return [mtime, dirs, files]
+
+  def walk(self, top, follow_links=False):
+    """Walks the tree rooted at `top`, like `os.walk`.
+
+    Arguments:
+      top: string, root directory.
+      follow_links: boolean, whether to walk into subdirectories pointed to by
+        symlinks.
+
+    Yields:
+      tuples `(root, dirs, files)`, where `root` is joined onto `top` as given.
+    """
+    with self._lock:
+      self._walked.add(os.path.abspath(top))
+    stack = [top]
+    while stack:
+      root = stack.pop()
+      key = os.path.abspath(root)
+      try:
+        mtime = os.stat(root).st_mtime
+      except OSError:
+        # `os.walk` ignores directories that cannot be read as well.
+        continue
+      with self._lock:
+        entry = self._listings.get(key)
+      if entry is None or entry[0] != mtime:
+        try:
+          entry = self._list_directory(root, mtime)
+        except OSError:
+          continue
+        with self._lock:
+          self._listings[key] = entry
+          self._dirty = True
+      with self._lock:
+        self._visited.add(key)
+      _, dirs, files = entry
+      yield root, [name for name, _ in dirs], files
+      for name, is_link in reversed(dirs):
+        if follow_links or not is_link:
+          stack.append(os.path.join(root, name))
+
+  def save(self):
+    """Writes the cache back to `path`, if anything changed.
+
+    Listings of directories under a walked root that were not visited (e.g.
+    because they were deleted) are dropped.
+    """
+    with self._lock:
+      for key in list(self._listings):
+        if key in self._visited:
+          continue
+        if any(key == top or key.startswith(os.path.join(top, ''))
+               for top in self._walked):
+          del self._listings[key]
+          self._dirty = True
+      if not self._dirty:
+        return
+      contents = {'version': self._VERSION, 'listings': self._listings}
+      temp_path = '%s.tmp%d' % (self.path, os.getpid())
+      with open(temp_path, 'w') as f:
+        json.dump(contents, f)
+      os.replace(temp_path, self.path)
+      self._dirty = False
+
+
+def iter_valid_files(directory, follow_links, formats, index_cache=None):
+  if index_cache is None:
+    walk = os.walk(directory, followlinks=follow_links)
+  else:
+    walk = index_cache.walk(directory, follow_links)
   for root, _, files in sorted(walk, key=lambda x: x[0]):
     for fname in sorted(files):
       if fname.lower().endswith(formats):
         yield root, fname
 
 
-def index_subdirectory(directory, class_indices, follow_links, formats):
+def index_subdirectory(directory, class_indices, follow_links, formats,
+                       index_cache=None):
   """Recursively walks directory and list image paths and their class index.
 
   Arguments:
@@ -137,6 +274,7 @@ def index_subdirectory(directory, class_indices, follow_links, formats):
     follow_links: boolean, whether to recursively follow subdirectories
       (if False, we only list top-level images in `directory`).
     formats: Allowlist of file extensions to index (e.g. ".jpg", ".txt").
+    index_cache: Optional `DirectoryIndexCache` to walk `directory` through.
 
   Returns:
     tuple `(filenames, labels)`. `filenames` is a list of relative file
@@ -144,7 +282,7 @@ def index_subdirectory(directory, class_indices, follow_links, formats):
       files.
   """
   dirname = os.path.basename(directory)
-  valid_files = iter_valid_files(directory, follow_links, formats)
+  valid_files = iter_valid_files(directory, follow_links, formats, index_cache)
   labels = []
   filenames = []
   for root, fname in valid_files:
@@ -21,13 +21,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import multiprocessing
+import os
+import threading
+
+from concurrent import futures
 from keras_preprocessing import image
 import numpy as np
 try:
   from scipy import linalg  # pylint: disable=unused-import
   from scipy import ndimage  # pylint: disable=unused-import
 except ImportError:
-  pass
+  ndimage = None
 
 from tensorflow.python.framework import ops
 from tensorflow.python.keras import backend
@@ -305,6 +310,234 @@ class Iterator(image.Iterator, data_utils.Sequence):
   pass
 
 
+_thread_pool = None
+_thread_pool_pid = None
+_thread_pool_lock = threading.Lock()
+
+
+def _get_thread_pool():
+  """Returns the thread pool used to load and transform batches of images."""
+  global _thread_pool, _thread_pool_pid
+  with _thread_pool_lock:
+    # Threads do not survive a fork, so child processes need their own pool.
+    if _thread_pool is None or _thread_pool_pid != os.getpid():
+      _thread_pool = futures.ThreadPoolExecutor(
+          max_workers=multiprocessing.cpu_count())
+      _thread_pool_pid = os.getpid()
+  return _thread_pool
+
+
+def _affine_matrices(transform_parameters, h, w):
+  """Returns the matrices of the affine transforms of a batch of images.
+
+  This builds the matrix that `apply_affine_transform` builds for a single
+  image, for every image of the batch at once.
+
+  Arguments:
+      transform_parameters: List of dictionaries of the parameters of the
+        transform of each image, as returned by `get_random_transform`.
+      h: Height of the images.
+      w: Width of the images.
+
+  Returns:
+      Tuple of a `(batch_size, 3, 3)` array of transform matrices and a boolean
+      array of whether each image is transformed at all.
+  """
+  def get(key, default):
+    return np.array([p.get(key, default) for p in transform_parameters],
+                    dtype=np.float64)
+
+  theta = np.deg2rad(get('theta', 0))
+  tx = get('tx', 0)
+  ty = get('ty', 0)
+  shear = np.deg2rad(get('shear', 0))
+  zx = get('zx', 1)
+  zy = get('zy', 1)
+  is_transformed = ((theta != 0) | (tx != 0) | (ty != 0) | (shear != 0) |
+                    (zx != 1) | (zy != 1))
+
+  batch_size = len(transform_parameters)
+  matrices = np.zeros((batch_size, 3, 3))
+  # Rotation, shift, shear and zoom matrices, multiplied in that order.
+  cos, sin = np.cos(theta), np.sin(theta)
+  shear_sin, shear_cos = -np.sin(shear), np.cos(shear)
+  matrices[:, 0, 0] = cos * zx
+  matrices[:, 0, 1] = (cos * shear_sin - sin * shear_cos) * zy
+  matrices[:, 0, 2] = cos * tx - sin * ty
+  matrices[:, 1, 0] = sin * zx
+  matrices[:, 1, 1] = (sin * shear_sin + cos * shear_cos) * zy
+  matrices[:, 1, 2] = sin * tx + cos * ty
+  matrices[:, 2, 2] = 1
+
+  # Transform around the center of the images.
+  o_x = float(h) / 2 + 0.5
+  o_y = float(w) / 2 + 0.5
+  offset_matrix = np.array([[1, 0, o_x], [0, 1, o_y], [0, 0, 1]])
+  reset_matrix = np.array([[1, 0, -o_x], [0, 1, -o_y], [0, 0, 1]])
+  matrices = np.matmul(np.matmul(offset_matrix, matrices), reset_matrix)
+  return matrices, is_transformed
+
+
+def _apply_affine_matrix(x, matrix, channel_axis, fill_mode, cval, order):
+  """Applies an affine transform matrix to every channel of a single image."""
+  if ndimage is None:
+    raise ImportError('Image transformations require SciPy. '
+                      'Install SciPy.')
+  x = np.rollaxis(x, channel_axis, 0)
+  channel_images = [ndimage.interpolation.affine_transform(
+      x_channel,
+      matrix[:2, :2],
+      matrix[:2, 2],
+      order=order,
+      mode=fill_mode,
+      cval=cval) for x_channel in x]
+  x = np.stack(channel_images, axis=0)
+  return np.rollaxis(x, 0, channel_axis + 1)
+
+
+def _apply_transforms(generator, x, transform_parameters, pool):
+  """Applies the transforms of a batch of images in place.
+
+  This is a batched version of `ImageDataGenerator.apply_transform`. The
+  affine transform matrices are built for the whole batch at once, the
+  affine transforms are applied in parallel on `pool`, and channel shifts and
+  flips are applied to the whole batch.
+
+  Arguments:
+      generator: `ImageDataGenerator` the parameters were drawn by.
+      x: 4D array, batch of images.
+      transform_parameters: List of the transform parameters of each image.
+      pool: `ThreadPoolExecutor` to apply the affine transforms on.
+  """
+  img_channel_axis = generator.channel_axis - 1
+  matrices, is_transformed = _affine_matrices(
+      transform_parameters, x.shape[generator.row_axis],
+      x.shape[generator.col_axis])
+
+  def transform(i):
+    x[i] = _apply_affine_matrix(x[i], matrices[i], img_channel_axis,
+                                generator.fill_mode, generator.cval,
+                                generator.interpolation_order)
+
+  list(pool.map(transform, np.flatnonzero(is_transformed)))
+
+  shifted = [
+      i for i, p in enumerate(transform_parameters)
+      if p.get('channel_shift_intensity') is not None
+  ]
+  if shifted:
+    image_axes = tuple(range(1, x.ndim))
+    images = x[shifted]
+    intensity = np.array([
+        transform_parameters[i]['channel_shift_intensity'] for i in shifted
+    ]).reshape((-1,) + (1,) * len(image_axes))
+    x[shifted] = np.clip(images + intensity,
+                         images.min(axis=image_axes, keepdims=True),
+                         images.max(axis=image_axes, keepdims=True))
+
+  for key, axis in (('flip_horizontal', generator.col_axis),
+                    ('flip_vertical', generator.row_axis)):
+    flipped = np.array([bool(p.get(key, False)) for p in transform_parameters])
+    if flipped.any():
+      x[flipped] = np.flip(x[flipped], axis=axis)
+
+  for i, p in enumerate(transform_parameters):
+    if p.get('brightness') is not None:
+      x[i] = apply_brightness_shift(x[i], p['brightness'])
+
+
+def _load_and_transform_batch(iterator, index_array):
+  """Loads and transforms the images of a batch in parallel.
+
+  This replaces the per-image loop of `_get_batches_of_transformed_samples` of
+  iterators that read images from files. Images are loaded on a thread pool,
+  random transforms are drawn for the whole batch (in the same order as the
+  per-image loop), and then applied by `_apply_transforms`.
+
+  Arguments:
+      iterator: A `DirectoryIterator` or `DataFrameIterator`.
+      index_array: Array of sample indices to include in batch.
+
+  Returns:
+      A batch of transformed samples.
+  """
+  pool = _get_thread_pool()
+  filepaths = iterator.filepaths
+
+  def load(j):
+    img = image.load_img(filepaths[j],
+                         color_mode=iterator.color_mode,
+                         target_size=iterator.target_size,
+                         interpolation=iterator.interpolation)
+    x = image.img_to_array(img, data_format=iterator.data_format)
+    # Pillow images should be closed after `load_img`,
+    # but not PIL images.
+    if hasattr(img, 'close'):
+      img.close()
+    return x
+
+  batch_x = np.zeros((len(index_array),) + iterator.image_shape,
+                     dtype=iterator.dtype)
+  for i, x in enumerate(pool.map(load, index_array)):
+    batch_x[i] = x
+
+  generator = iterator.image_data_generator
+  if generator:
+    transform_parameters = [
+        generator.get_random_transform(batch_x.shape[1:])
+        for _ in index_array
+    ]
+    if (type(generator).apply_transform is
+        image.ImageDataGenerator.apply_transform):
+      _apply_transforms(generator, batch_x, transform_parameters, pool)
+    else:
+      for i, params in enumerate(transform_parameters):
+        batch_x[i] = generator.apply_transform(batch_x[i], params)
+
+    def standardize(i):
+      batch_x[i] = generator.standardize(batch_x[i])
+
+    if generator.preprocessing_function is None:
+      list(pool.map(standardize, range(len(batch_x))))
+    else:
+      # `preprocessing_function` may not be thread-safe.
+      for i in range(len(batch_x)):
+        standardize(i)
+
+  # optionally save augmented images to disk for debugging purposes
+  if iterator.save_to_dir:
+    for i, j in enumerate(index_array):
+      img = image.array_to_img(batch_x[i], iterator.data_format, scale=True)
+      fname = '{prefix}_{index}_{hash}.{format}'.format(
+          prefix=iterator.save_prefix,
+          index=j,
+          hash=np.random.randint(1e7),
+          format=iterator.save_format)
+      img.save(os.path.join(iterator.save_to_dir, fname))
+  # build batch of labels
+  if iterator.class_mode == 'input':
+    batch_y = batch_x.copy()
+  elif iterator.class_mode in {'binary', 'sparse'}:
+    batch_y = np.empty(len(batch_x), dtype=iterator.dtype)
+    for i, n_observation in enumerate(index_array):
+      batch_y[i] = iterator.classes[n_observation]
+  elif iterator.class_mode == 'categorical':
+    batch_y = np.zeros((len(batch_x), len(iterator.class_indices)),
+                       dtype=iterator.dtype)
+    for i, n_observation in enumerate(index_array):
+      batch_y[i, iterator.classes[n_observation]] = 1.
+  elif iterator.class_mode == 'multi_output':
+    batch_y = [output[index_array] for output in iterator.labels]
+  elif iterator.class_mode == 'raw':
+    batch_y = iterator.labels[index_array]
+  else:
+    return batch_x
+  if iterator.sample_weight is None:
+    return batch_x, batch_y
+  else:
+    return batch_x, batch_y, iterator.sample_weight[index_array]
+
+
 @keras_export('keras.preprocessing.image.DirectoryIterator')
 class DirectoryIterator(image.DirectoryIterator, Iterator):
   """Iterator capable of reading images from a directory on disk.
@@ -395,6 +628,9 @@ class DirectoryIterator(image.DirectoryIterator, Iterator):
         interpolation=interpolation,
         **kwargs)
 
+  def _get_batches_of_transformed_samples(self, index_array):
+    return _load_and_transform_batch(self, index_array)
+
 
 @keras_export('keras.preprocessing.image.NumpyArrayIterator')
 class NumpyArrayIterator(image.NumpyArrayIterator, Iterator):
@@ -576,6 +812,9 @@ class DataFrameIterator(image.DataFrameIterator, Iterator):
         validate_filenames=validate_filenames
     )
 
+  def _get_batches_of_transformed_samples(self, index_array):
+    return _load_and_transform_batch(self, index_array)
+
 
 @keras_export('keras.preprocessing.image.ImageDataGenerator')
 class ImageDataGenerator(image.ImageDataGenerator):
@@ -44,7 +44,8 @@ def image_dataset_from_directory(directory,
                                  validation_split=None,
                                  subset=None,
                                  interpolation='bilinear',
-                                 follow_links=False):
+                                 follow_links=False,
+                                 index_cache=None):
   """Generates a `tf.data.Dataset` from image files in a directory.
 
   If your directory structure is:
@@ -112,6 +113,10 @@ def image_dataset_from_directory(directory,
       `area`, `lanczos3`, `lanczos5`, `gaussian`, `mitchellcubic`.
     follow_links: Whether to visits subdirectories pointed to by symlinks.
         Defaults to False.
+    index_cache: Optional path to a file in which the directory listings are
+        cached across runs. On subsequent runs, only the subdirectories whose
+        modification time changed are listed again, which speeds up indexing
+        of large directories (e.g. on network file systems).
 
   Returns:
     A `tf.data.Dataset` object.
@@ -179,7 +184,8 @@ def image_dataset_from_directory(directory,
       class_names=class_names,
       shuffle=shuffle,
       seed=seed,
-      follow_links=follow_links)
+      follow_links=follow_links,
+      index_cache=index_cache)
 
   if label_mode == 'binary' and len(class_names) != 2:
     raise ValueError(
@@ -20,12 +20,14 @@ from __future__ import print_function
 
 import os
 import shutil
+import time
 
 import numpy as np
 
 from tensorflow.python.compat import v2_compat
 from tensorflow.python.eager import def_function
 from tensorflow.python.keras import keras_parameterized
+from tensorflow.python.keras.preprocessing import dataset_utils
 from tensorflow.python.keras.preprocessing import image as image_preproc
 from tensorflow.python.keras.preprocessing import image_dataset
 from tensorflow.python.platform import test
@@ -253,6 +255,60 @@ class ImageDatasetFromDirectoryTest(keras_parameterized.TestCase):
       sample_count += batch.shape[0]
     self.assertEqual(sample_count, 25)
 
+  def test_image_dataset_from_directory_index_cache(self):
+    if PIL is None:
+      return  # Skip test if PIL is not available.
+
+    directory = self._prepare_directory(num_classes=2, count=15,
+                                        nested_dirs=True)
+    index_cache = os.path.join(self.get_temp_dir(),
+                               'index_%s.json' % (np.random.randint(1e6),))
+
+    # Listings of recently modified directories are not trusted, so move the
+    # modification times out of the racy window.
+    def backdate(path, seconds):
+      mtime = time.time() - seconds
+      os.utime(path, (mtime, mtime))
+
+    class_dirs = []
+    for root, _, _ in os.walk(directory):
+      backdate(root, 60)
+      if root != directory:
+        class_dirs.append(os.path.abspath(root))
+
+    listed_dirs = []
+    list_directory = dataset_utils.DirectoryIndexCache._list_directory
+
+    def count_samples():
+      del listed_dirs[:]
+
+      def record_listing(cache, path, mtime):
+        listed_dirs.append(os.path.abspath(path))
+        return list_directory(cache, path, mtime)
+
+      with test.mock.patch.object(dataset_utils.DirectoryIndexCache,
+                                  '_list_directory', record_listing):
+        dataset = image_dataset.image_dataset_from_directory(
+            directory, batch_size=8, image_size=(18, 18), label_mode=None,
+            index_cache=index_cache)
+      return sum(batch.shape[0] for batch in dataset)
+
+    self.assertEqual(count_samples(), 15)
+    self.assertTrue(os.path.exists(index_cache))
+    self.assertCountEqual(listed_dirs, class_dirs)
+
+    # Unchanged directories are read from the cached index.
+    self.assertEqual(count_samples(), 15)
+    self.assertEmpty(listed_dirs)
+
+    # Only the directory that changed is listed again.
+    changed_dir = os.path.join(directory, 'class_1', 'subfolder_2')
+    img = self._get_images(count=1)[0]
+    img.save(os.path.join(changed_dir, 'new.jpg'))
+    backdate(changed_dir, 30)
+    self.assertEqual(count_samples(), 16)
+    self.assertEqual(listed_dirs, [os.path.abspath(changed_dir)])
+
   def test_image_dataset_from_directory_errors(self):
     if PIL is None:
       return  # Skip test if PIL is not available.
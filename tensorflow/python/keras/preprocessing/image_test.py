@@ -428,6 +428,62 @@ class TestImage(keras_parameterized.TestCase):
         transformed[i] = generator.random_transform(im)
       transformed = generator.standardize(transformed)
 
+  def test_batched_transforms(self):
+    for data_format, shape in [('channels_last', (20, 24, 3)),
+                               ('channels_first', (3, 20, 24))]:
+      generator = preprocessing_image.ImageDataGenerator(
+          rotation_range=30,
+          width_shift_range=0.2,
+          height_shift_range=3,
+          shear_range=10,
+          zoom_range=0.3,
+          channel_shift_range=20,
+          horizontal_flip=True,
+          vertical_flip=True,
+          fill_mode='constant',
+          data_format=data_format)
+      images = np.random.random((8,) + shape) * 255
+      transform_parameters = [
+          generator.get_random_transform(shape) for _ in images
+      ]
+      transform_parameters[0] = {}
+      expected = np.stack([
+          generator.apply_transform(im, params)
+          for im, params in zip(images, transform_parameters)
+      ])
+      preprocessing_image._apply_transforms(
+          generator, images, transform_parameters,
+          preprocessing_image._get_thread_pool())
+      self.assertAllClose(expected, images)
+
+  def test_directory_iterator_batched_transforms(self):
+    if PIL is None:
+      return  # Skip test if PIL is not available.
+
+    temp_dir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, temp_dir)
+    for cl in range(2):
+      os.mkdir(os.path.join(temp_dir, 'class-{}'.format(cl)))
+    for i, im in enumerate(_generate_test_images()[0]):
+      im.save(os.path.join(temp_dir, 'class-{}'.format(i % 2),
+                           'image-{}.png'.format(i)))
+
+    generator = preprocessing_image.ImageDataGenerator(
+        rotation_range=30, zoom_range=0.3, horizontal_flip=True,
+        rescale=1. / 255)
+    dir_iterator = generator.flow_from_directory(
+        temp_dir, target_size=(16, 16), class_mode='sparse')
+    index_array = np.array([5, 0, 3, 6])
+    np.random.seed(1337)
+    x, y = dir_iterator._get_batches_of_transformed_samples(index_array)
+    # The batch matches the one built image by image.
+    np.random.seed(1337)
+    expected_x, expected_y = super(
+        preprocessing_image.DirectoryIterator,
+        dir_iterator)._get_batches_of_transformed_samples(index_array)
+    self.assertAllClose(expected_x, x)
+    self.assertAllClose(expected_y, y)
+
   def test_img_transforms(self):
     x = np.random.random((3, 200, 200))
     _ = preprocessing_image.random_rotation(x, 20)
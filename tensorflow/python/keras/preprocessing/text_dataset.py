@@ -37,7 +37,8 @@ def text_dataset_from_directory(directory,
                                 seed=None,
                                 validation_split=None,
                                 subset=None,
-                                follow_links=False):
+                                follow_links=False,
+                                index_cache=None):
   """Generates a `tf.data.Dataset` from text files in a directory.
 
   If your directory structure is:
@@ -96,6 +97,10 @@ def text_dataset_from_directory(directory,
         Only used if `validation_split` is set.
     follow_links: Whether to visits subdirectories pointed to by symlinks.
         Defaults to False.
+    index_cache: Optional path to a file in which the directory listings are
+        cached across runs. On subsequent runs, only the subdirectories whose
+        modification time changed are listed again, which speeds up indexing
+        of large directories (e.g. on network file systems).
 
   Returns:
     A `tf.data.Dataset` object.
@@ -143,7 +148,8 @@ def text_dataset_from_directory(directory,
       class_names=class_names,
       shuffle=shuffle,
       seed=seed,
-      follow_links=follow_links)
+      follow_links=follow_links,
+      index_cache=index_cache)
 
   if label_mode == 'binary' and len(class_names) != 2:
     raise ValueError(
@@ -20,6 +20,7 @@ from __future__ import division
 from __future__ import print_function
 
 from abc import abstractmethod
+import collections
 from contextlib import closing
 import errno
 import functools
@@ -47,6 +48,7 @@ from tensorflow.python.keras.utils import tf_inspect
 from tensorflow.python.keras.utils.generic_utils import Progbar
 from tensorflow.python.keras.utils.io_utils import path_to_string
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.util import nest
 from tensorflow.python.util.tf_export import keras_export
 
 
@@ -55,6 +57,16 @@ try:
 except ImportError:
   import Queue as queue
 
+try:
+  # pylint: disable=g-import-not-at-top
+  from multiprocessing import resource_tracker
+  from multiprocessing import shared_memory
+  # pylint: enable=g-import-not-at-top
+except ImportError:
+  # `multiprocessing.shared_memory` is only available from Python 3.8.
+  resource_tracker = None
+  shared_memory = None
+
 try:
   import typing
   is_iterator = lambda x: isinstance(x, typing.Iterator)
@@ -567,6 +579,175 @@ def get_index(uid, i):
   return _SHARED_SEQUENCES[uid][i]
 
 
+# Byte alignment of each array written to a shared memory slot.
+_SHARED_MEMORY_ALIGNMENT = 64
+
+# Shared memory segments attached by the current worker, keyed by
+# `(uid, slot)`. Entries are replaced when the owner reallocates a slot.
+_WORKER_SHARED_MEMORY = {}
+
+# Result of `get_index_shared_memory`. When `specs` is None, `batch` holds the
+# batch itself (it did not fit in the slot and was pickled). Otherwise `batch`
+# is the structure of the batch with `None` leaves, and `specs` holds an
+# `(offset, shape, dtype)` triple per flattened array written to `slot`.
+_SharedMemoryBatch = collections.namedtuple('_SharedMemoryBatch',
+                                            ['slot', 'specs', 'batch'])
+
+
+def _shared_memory_layout(batch):
+  """Computes where each array of `batch` lives in a shared memory slot.
+
+  Arguments:
+      batch: A batch returned by `Sequence.__getitem__`.
+
+  Returns:
+      A tuple `(arrays, specs, nbytes)` with the flattened arrays, their
+      `(offset, shape, dtype)` placement and the total number of bytes needed,
+      or None if the batch contains anything but non-object NumPy arrays.
+  """
+  arrays = nest.flatten(batch)
+  specs = []
+  offset = 0
+  for array in arrays:
+    if not isinstance(array, np.ndarray) or array.dtype.hasobject:
+      return None
+    offset = -(-offset // _SHARED_MEMORY_ALIGNMENT) * _SHARED_MEMORY_ALIGNMENT
+    specs.append((offset, array.shape, array.dtype))
+    offset += array.nbytes
+  return arrays, specs, offset
+
+
+def _attach_shared_memory(uid, slot, name):
+  """Returns the worker's handle on the segment `name` backing `slot`."""
+  key = (uid, slot)
+  segment = _WORKER_SHARED_MEMORY.get(key)
+  if segment is None or segment.name != name:
+    if segment is not None:
+      segment.close()
+    segment = shared_memory.SharedMemory(name=name)
+    _WORKER_SHARED_MEMORY[key] = segment
+  return segment
+
+
+def get_index_shared_memory(uid, i, slot, name, capacity):
+  """Writes the value of the Sequence `uid` at index `i` to shared memory.
+
+  Arguments:
+      uid: int, Sequence identifier
+      i: index
+      slot: int, index of the shared memory slot reserved for this batch.
+      name: Name of the shared memory segment backing `slot`, or None if the
+        slot is not allocated yet.
+      capacity: Size of the segment in bytes.
+
+  Returns:
+      A `_SharedMemoryBatch`. Batches that do not fit in the slot or that
+      contain non-array values are returned as-is.
+  """
+  batch = _SHARED_SEQUENCES[uid][i]
+  layout = _shared_memory_layout(batch)
+  if name is None or layout is None or layout[2] > capacity:
+    return _SharedMemoryBatch(slot, None, batch)
+
+  arrays, specs, _ = layout
+  segment = _attach_shared_memory(uid, slot, name)
+  for array, (offset, shape, dtype) in zip(arrays, specs):
+    np.copyto(np.ndarray(shape, dtype, buffer=segment.buf, offset=offset),
+              array)
+  structure = nest.map_structure(lambda _: None, batch)
+  return _SharedMemoryBatch(slot, specs, structure)
+
+
+class _SharedMemoryRing(object):
+  """Fixed set of shared memory slots that workers write batches into.
+
+  Slots are allocated lazily: until a batch has been seen, workers have nowhere
+  to write and return their batches through the regular pickle path. The size
+  of every batch received that way is recorded, and slots are (re)allocated
+  to the largest size seen the next time they are acquired.
+  """
+
+  def __init__(self, num_slots):
+    # Workers must share our resource tracker. If they started their own, it
+    # would unlink the segments they attached to as soon as they exit.
+    resource_tracker.ensure_running()
+    self._segments = [None] * num_slots
+    self._capacity = 0
+    self._free_slots = queue.Queue()
+    for slot in range(num_slots):
+      self._free_slots.put(slot)
+
+  def acquire(self, stop_signal):
+    """Blocks until a slot is free.
+
+    Arguments:
+        stop_signal: `threading.Event`, acquisition is abandoned once set.
+
+    Returns:
+        A tuple `(slot, name, capacity)` to pass to `get_index_shared_memory`,
+        or None if `stop_signal` was set.
+    """
+    while not stop_signal.is_set():
+      try:
+        slot = self._free_slots.get(block=True, timeout=0.1)
+      except queue.Empty:
+        continue
+      segment = self._segments[slot]
+      if self._capacity and (segment is None or
+                             segment.size < self._capacity):
+        self._free_segment(slot)
+        segment = shared_memory.SharedMemory(create=True, size=self._capacity)
+        self._segments[slot] = segment
+      if segment is None:
+        return slot, None, 0
+      return slot, segment.name, segment.size
+    return None
+
+  def release(self, slot):
+    self._free_slots.put(slot)
+
+  def receive(self, result):
+    """Unpacks a `_SharedMemoryBatch` returned by a worker.
+
+    Arguments:
+        result: `_SharedMemoryBatch`.
+
+    Returns:
+        The batch. Arrays written to shared memory are returned as read-only
+        views on the slot, which stay valid until the slot is released.
+    """
+    if result.specs is None:
+      layout = _shared_memory_layout(result.batch)
+      if layout is not None:
+        self._capacity = max(self._capacity, layout[2])
+      return result.batch
+
+    buf = self._segments[result.slot].buf
+    views = []
+    for offset, shape, dtype in result.specs:
+      view = np.ndarray(shape, dtype, buffer=buf, offset=offset)
+      view.flags.writeable = False
+      views.append(view)
+    return nest.pack_sequence_as(result.batch, views)
+
+  def _free_segment(self, slot):
+    segment = self._segments[slot]
+    self._segments[slot] = None
+    if segment is None:
+      return
+    try:
+      segment.close()
+    except BufferError:
+      # Views handed to the consumer are still alive. The mapping is released
+      # when they are garbage collected.
+      pass
+    segment.unlink()
+
+  def close(self):
+    for slot in range(len(self._segments)):
+      self._free_segment(slot)
+
+
 @keras_export('keras.utils.SequenceEnqueuer')
 class SequenceEnqueuer(object):
   """Base class to enqueue inputs.
@@ -706,11 +887,49 @@ class OrderedEnqueuer(SequenceEnqueuer):
       sequence: A `tf.keras.utils.data_utils.Sequence` object.
       use_multiprocessing: use multiprocessing if True, otherwise threading
       shuffle: whether to shuffle the data at the beginning of each epoch
+      use_shared_memory: When using multiprocessing, have the workers write
+          batches of NumPy arrays into a ring of shared memory buffers instead
+          of pickling them back to the main process. The batches yielded by
+          `get()` are then read-only views on these buffers, which are only
+          valid until the next batch is requested. Requires Python 3.8+.
   """
 
-  def __init__(self, sequence, use_multiprocessing=False, shuffle=False):
+  def __init__(self, sequence, use_multiprocessing=False, shuffle=False,
+               use_shared_memory=False):
     super(OrderedEnqueuer, self).__init__(sequence, use_multiprocessing)
     self.shuffle = shuffle
+    if use_shared_memory and shared_memory is None:
+      logging.warning('`use_shared_memory=True` requires Python 3.8 or later, '
+                      'batches will be pickled instead.')
+      use_shared_memory = False
+    self.use_shared_memory = use_shared_memory
+    self._shared_memory_ring = None
+
+  def start(self, workers=1, max_queue_size=10):
+    """Starts the handler's workers.
+
+    Arguments:
+        workers: Number of workers.
+        max_queue_size: queue size
+            (when full, workers could block on `put()`)
+    """
+    if self.use_multiprocessing and self.use_shared_memory:
+      # One slot per queued batch, plus the one held by the consumer.
+      self._shared_memory_ring = _SharedMemoryRing(max_queue_size + 1)
+    super(OrderedEnqueuer, self).start(workers, max_queue_size)
+
+  def stop(self, timeout=None):
+    """Stops running threads and wait for them to exit, if necessary.
+
+    Should be called by the same thread which called `start()`.
+
+    Arguments:
+        timeout: maximum time to wait on `thread.join()`
+    """
+    super(OrderedEnqueuer, self).stop(timeout)
+    if self._shared_memory_ring is not None:
+      self._shared_memory_ring.close()
+      self._shared_memory_ring = None
 
   def _get_executor_init(self, workers):
     """Gets the Pool initializer for multiprocessing.
@@ -750,8 +969,15 @@ class OrderedEnqueuer(SequenceEnqueuer):
           if self.stop_signal.is_set():
             return
 
-          self.queue.put(
-              executor.apply_async(get_index, (self.uid, i)), block=True)
+          if self._shared_memory_ring is None:
+            future = executor.apply_async(get_index, (self.uid, i))
+          else:
+            slot = self._shared_memory_ring.acquire(self.stop_signal)
+            if slot is None:
+              return
+            future = executor.apply_async(get_index_shared_memory,
+                                          (self.uid, i) + slot)
+          self.queue.put(future, block=True)
 
         # Done with the current epoch, waiting for the final batches
         self._wait_queue()
@@ -774,11 +1000,20 @@ class OrderedEnqueuer(SequenceEnqueuer):
         `(inputs, targets)` or
         `(inputs, targets, sample_weights)`.
     """
+    ring = self._shared_memory_ring
+    slot = None
     while self.is_running():
       try:
+        if slot is not None:
+          # The previous batch has been consumed, its slot can be reused.
+          ring.release(slot)
+          slot = None
         inputs = self.queue.get(block=True, timeout=5).get()
         if self.is_running():
           self.queue.task_done()
+        if ring is not None:
+          slot = inputs.slot
+          inputs = ring.receive(inputs)
         if inputs is not None:
           yield inputs
       except queue.Empty:
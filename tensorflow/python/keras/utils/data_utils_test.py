@@ -194,6 +194,50 @@ class TestEnqueuers(test.TestCase):
     self.assertEqual(acc, list(range(100)))
     enqueuer.stop()
 
+  @data_utils.dont_use_multiprocessing_pool
+  def test_ordered_enqueuer_shared_memory(self):
+    if data_utils.shared_memory is None:
+      self.skipTest('multiprocessing.shared_memory is not available.')
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]), use_multiprocessing=True,
+        use_shared_memory=True)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(200):
+      batch = next(gen_output)
+      self.assertEqual(batch.shape, (3, 200, 200, 3))
+      self.assertEqual(batch.dtype, np.uint32)
+      acc.append(batch[0, 0, 0, 0])
+    self.assertEqual(acc[:100], list(range(100)))
+    self.assertEqual(acc[100:], list([k * 5 for k in range(100)]))
+    # Batches after the first ones are views on the shared memory slots.
+    self.assertFalse(batch.flags.writeable)
+    enqueuer.stop()
+
+  @data_utils.dont_use_multiprocessing_pool
+  def test_ordered_enqueuer_shared_memory_fallback(self):
+    if data_utils.shared_memory is None:
+      self.skipTest('multiprocessing.shared_memory is not available.')
+
+    class MixedSequence(keras.utils.data_utils.Sequence):
+
+      def __getitem__(self, item):
+        return {'x': np.full((2, 3), item), 'name': str(item)}
+
+      def __len__(self):
+        return 10
+
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        MixedSequence(), use_multiprocessing=True, use_shared_memory=True)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    for i in range(10):
+      batch = next(gen_output)
+      self.assertEqual(batch['name'], str(i))
+      self.assertAllEqual(batch['x'], np.full((2, 3), i))
+    enqueuer.stop()
+
   def test_ordered_enqueuer_fail_threads(self):
     enqueuer = keras.utils.data_utils.OrderedEnqueuer(
         FaultSequence(), use_multiprocessing=False)
@@ -20,6 +20,7 @@ from __future__ import print_function
 import binascii
 import codecs
 import importlib
+import json
 import marshal
 import os
 import re
@@ -489,6 +490,10 @@ def has_arg(fn, name, accept_all=False):
   return name in arg_spec.args or name in arg_spec.kwonlyargs
 
 
+# Number of updates buffered by `Progbar` before their values are summed.
+_PROGBAR_PENDING_UPDATES = 256
+
+
 @keras_export('keras.utils.Progbar')
 class Progbar(object):
   """Displays a progress bar.
@@ -502,6 +507,10 @@ class Progbar(object):
         others will be averaged by the progbar before display.
       interval: Minimum visual progress update interval (in seconds).
       unit_name: Display name for step counts (usually "step" or "sample").
+      output_format: One of `"text"` or `"jsonl"`. With `"jsonl"`, every
+        update that would be displayed is instead written as one JSON object
+        per line (with the keys `"current"`, `"target"`, `"elapsed"`,
+        `"finalized"`, `"unit"` and `"values"`), for log collectors.
   """
 
   def __init__(self,
@@ -510,12 +519,16 @@ class Progbar(object):
                verbose=1,
                interval=0.05,
                stateful_metrics=None,
-               unit_name='step'):
+               unit_name='step',
+               output_format='text'):
+    if output_format not in ('text', 'jsonl'):
+      raise ValueError('Unknown `output_format`: ' + str(output_format))
     self.target = target
     self.width = width
     self.verbose = verbose
     self.interval = interval
     self.unit_name = unit_name
+    self.output_format = output_format
     if stateful_metrics:
       self.stateful_metrics = set(stateful_metrics)
     else:
@@ -532,6 +545,25 @@ class Progbar(object):
     # issues found in OrderedDict
     self._values = {}
     self._values_order = []
+    # Scalar values to average are buffered in `self._pending_values`, one
+    # row per update, and only reduced into the running sums and counts
+    # (indexed by `self._value_rows`) when the buffer fills up or the values
+    # are displayed.
+    self._value_rows = {}
+    # Rows are never reused, even after `_accumulate` takes a value out of
+    # the arrays, so the next row is not `len(self._value_rows)`.
+    self._num_value_rows = 0
+    self._value_sums = np.zeros((16,))
+    self._value_counts = np.zeros((16,))
+    # The names of the last update's values, and for that layout, the
+    # positions of the values to average and their rows in the arrays above.
+    self._layout_names = None
+    self._averaged_positions = []
+    self._stateful_positions = []
+    self._averaged_rows = np.zeros((0,), np.int64)
+    self._pending_values = np.zeros((_PROGBAR_PENDING_UPDATES, 0))
+    self._pending_weights = np.zeros((_PROGBAR_PENDING_UPDATES,))
+    self._num_pending = 0
     self._start = time.time()
     self._last_update = 0
 
@@ -555,28 +587,23 @@ class Progbar(object):
         finalize = current >= self.target
 
     values = values or []
-    for k, v in values:
-      if k not in self._values_order:
-        self._values_order.append(k)
-      if k not in self.stateful_metrics:
-        # In the case that progress bar doesn't have a target value in the first
-        # epoch, both on_batch_end and on_epoch_end will be called, which will
-        # cause 'current' and 'self._seen_so_far' to have the same value. Force
-        # the minimal value to 1 here, otherwise stateful_metric will be 0s.
-        value_base = max(current - self._seen_so_far, 1)
-        if k not in self._values:
-          self._values[k] = [v * value_base, value_base]
-        else:
-          self._values[k][0] += v * value_base
-          self._values[k][1] += value_base
-      else:
-        # Stateful metrics output a numeric value. This representation
-        # means "take an average from a single value" but keeps the
-        # numeric formatting.
-        self._values[k] = [v, 1]
+    # In the case that progress bar doesn't have a target value in the first
+    # epoch, both on_batch_end and on_epoch_end will be called, which will
+    # cause 'current' and 'self._seen_so_far' to have the same value. Force
+    # the minimal value to 1 here, otherwise stateful_metric will be 0s.
+    value_base = max(current - self._seen_so_far, 1)
+    if not self._accumulate_scalars(values, value_base):
+      self._accumulate(values, value_base)
     self._seen_so_far = current
 
     now = time.time()
+    if self.output_format == 'jsonl':
+      if self.verbose == 1 or (self.verbose == 2 and finalize):
+        if now - self._last_update >= self.interval or finalize:
+          self._write_json(current, now, finalize)
+          self._last_update = now
+      return
+
     info = ' - %.0fs' % (now - self._start)
     if self.verbose == 1:
       if now - self._last_update < self.interval and not finalize:
@@ -631,8 +658,8 @@ class Progbar(object):
 
       for k in self._values_order:
         info += ' - %s:' % k
-        if isinstance(self._values[k], list):
-          avg = np.mean(self._values[k][0] / max(1, self._values[k][1]))
+        if k in self._value_rows or isinstance(self._values[k], list):
+          avg = self._average(k)
           if abs(avg) > 1e-3:
             info += ' %.4f' % avg
           else:
@@ -657,7 +684,7 @@ class Progbar(object):
         info = count + info
         for k in self._values_order:
           info += ' - %s:' % k
-          avg = np.mean(self._values[k][0] / max(1, self._values[k][1]))
+          avg = self._average(k)
           if avg > 1e-3:
             info += ' %.4f' % avg
           else:
@@ -672,6 +699,129 @@ class Progbar(object):
   def add(self, n, values=None):
     self.update(self._seen_so_far + n, values)
 
+  def _accumulate(self, values, value_base):
+    """Adds `(name, value)` pairs to the totals one at a time."""
+    self._flush_pending()
+    for k, v in values:
+      if k not in self._values_order:
+        self._values_order.append(k)
+      if k not in self.stateful_metrics:
+        row = self._value_rows.pop(k, None)
+        if row is not None:
+          # Move totals accumulated in the arrays back to `self._values`.
+          self._values[k] = [self._value_sums[row], self._value_counts[row]]
+          self._layout_names = None
+        if k not in self._values:
+          self._values[k] = [v * value_base, value_base]
+        else:
+          self._values[k][0] += v * value_base
+          self._values[k][1] += value_base
+      else:
+        # Stateful metrics output a numeric value. This representation
+        # means "take an average from a single value" but keeps the
+        # numeric formatting.
+        self._values[k] = [v, 1]
+
+  def _accumulate_scalars(self, values, value_base):
+    """Buffers `(name, value)` pairs in a row of `self._pending_values`.
+
+    Returns:
+      False, without changing any totals, if a value to average is not a
+      scalar or was previously averaged by `_accumulate`.
+    """
+    names = tuple([k for k, _ in values])
+    if names != self._layout_names:
+      if not self._set_layout(names):
+        return False
+    if self._averaged_positions:
+      n = self._num_pending
+      try:
+        self._pending_values[n] = [
+            values[i][1] for i in self._averaged_positions
+        ]
+      except (TypeError, ValueError):
+        return False
+      self._pending_weights[n] = value_base
+      self._num_pending = n + 1
+      if self._num_pending == _PROGBAR_PENDING_UPDATES:
+        self._flush_pending()
+    for i in self._stateful_positions:
+      k, v = values[i]
+      self._values[k] = [v, 1]
+    return True
+
+  def _set_layout(self, names):
+    """Assigns array rows to the values to average, for `names` in order."""
+    self._flush_pending()
+    averaged_positions = []
+    stateful_positions = []
+    for i, k in enumerate(names):
+      if k in self.stateful_metrics:
+        stateful_positions.append(i)
+      elif k in self._values:
+        # Totals of this value are not scalars.
+        return False
+      else:
+        averaged_positions.append(i)
+    for i in averaged_positions:
+      if names[i] not in self._value_rows:
+        row = self._num_value_rows
+        self._num_value_rows += 1
+        if row == self._value_sums.size:
+          self._value_sums = np.append(self._value_sums,
+                                       np.zeros_like(self._value_sums))
+          self._value_counts = np.append(self._value_counts,
+                                         np.zeros_like(self._value_counts))
+        self._value_rows[names[i]] = row
+    for k in names:
+      if k not in self._values_order:
+        self._values_order.append(k)
+    self._layout_names = names
+    self._averaged_positions = averaged_positions
+    self._stateful_positions = stateful_positions
+    self._averaged_rows = np.array(
+        [self._value_rows[names[i]] for i in averaged_positions], np.int64)
+    if self._pending_values.shape[1] != len(averaged_positions):
+      self._pending_values = np.zeros(
+          (_PROGBAR_PENDING_UPDATES, len(averaged_positions)))
+    return True
+
+  def _flush_pending(self):
+    """Adds the buffered updates to the running sums and counts."""
+    n = self._num_pending
+    if n:
+      weights = self._pending_weights[:n]
+      self._value_sums[self._averaged_rows] += weights.dot(
+          self._pending_values[:n])
+      self._value_counts[self._averaged_rows] += weights.sum()
+      self._num_pending = 0
+
+  def _average(self, k):
+    """Returns the average of the value named `k`."""
+    self._flush_pending()
+    row = self._value_rows.get(k)
+    if row is not None:
+      return self._value_sums[row] / max(1, self._value_counts[row])
+    return np.mean(self._values[k][0] / max(1, self._values[k][1]))
+
+  def _write_json(self, current, now, finalize):
+    """Writes the current progress as a line of JSON."""
+    record = {
+        'current': current,
+        'target': self.target,
+        'elapsed': now - self._start,
+        'finalized': bool(finalize),
+        'unit': self.unit_name,
+        'values': {},
+    }
+    for k in self._values_order:
+      if k in self._value_rows or isinstance(self._values[k], list):
+        record['values'][k] = float(self._average(k))
+      else:
+        record['values'][k] = str(self._values[k])
+    sys.stdout.write(json.dumps(record) + '\n')
+    sys.stdout.flush()
+
   def _estimate_step_duration(self, current, now):
     """Estimate the duration of a single step.
 
@@ -19,8 +19,10 @@ from __future__ import division
 from __future__ import print_function
 
 from functools import partial
+import json
 
 import numpy as np
+import six
 
 from tensorflow.python import keras
 from tensorflow.python.platform import test
@@ -384,5 +386,45 @@ class SliceArraysTest(test.TestCase):
         [None, None, None])
 
 
+class ProgbarTest(test.TestCase):
+
+  def test_averages_mixed_values(self):
+    progbar = keras.utils.generic_utils.Progbar(
+        4, verbose=0, stateful_metrics=['acc'])
+    progbar.update(1, [('loss', 1.), ('acc', 0.5)])
+    progbar.update(2, [('loss', np.array([3., 5.])), ('acc', 0.75)])
+    progbar.update(4, [('loss', 2.), ('mse', 1.)])
+    self.assertAllClose(progbar._average('loss'), 2.25)
+    self.assertAllClose(progbar._average('acc'), 0.75)
+    self.assertAllClose(progbar._average('mse'), 1.)
+    self.assertEqual(progbar._values_order, ['loss', 'acc', 'mse'])
+
+  def test_averages_after_value_becomes_non_scalar(self):
+    progbar = keras.utils.generic_utils.Progbar(3, verbose=0)
+    progbar.update(1, [('a', 1.), ('b', 10.)])
+    progbar.update(2, [('a', np.array([2., 2.]))])
+    progbar.update(3, [('b', 10.), ('c', 100.)])
+    self.assertAllClose(progbar._average('a'), 1.5)
+    self.assertAllClose(progbar._average('b'), 10.)
+    self.assertAllClose(progbar._average('c'), 100.)
+
+  def test_jsonl_output(self):
+    progbar = keras.utils.generic_utils.Progbar(
+        2, interval=3600., output_format='jsonl')
+    with test.mock.patch('sys.stdout', new_callable=six.StringIO) as stdout:
+      progbar.update(1, [('loss', 1.)])
+      progbar.update(2, [('loss', 3.)], finalize=True)
+    records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    self.assertLen(records, 2)
+    self.assertEqual(records[0]['values'], {'loss': 1.})
+    self.assertEqual(records[1]['current'], 2)
+    self.assertTrue(records[1]['finalized'])
+    self.assertEqual(records[1]['values'], {'loss': 2.})
+
+  def test_unknown_output_format(self):
+    with self.assertRaisesRegexp(ValueError, 'output_format'):
+      keras.utils.generic_utils.Progbar(2, output_format='xml')
+
+
 if __name__ == '__main__':
   test.main()
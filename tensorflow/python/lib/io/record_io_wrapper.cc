@@ -15,6 +15,7 @@ limitations under the License.
 
 #include <memory>
 #include <string>
+#include <vector>
 
 #include "absl/memory/memory.h"
 #include "pybind11/pybind11.h"
@@ -64,6 +65,35 @@ class PyRecordReader {
     return reader_->ReadRecord(&offset_, out);
   }
 
+  // Reads records until `max_records` records or at least `max_bytes` bytes
+  // have been read. The records are appended to `data`, and the offset in
+  // `data` of the end of each record to `ends`.
+  //
+  // If reading a record fails after some records were read, those records are
+  // returned and the error is dropped: the read offset is left at the failed
+  // record, so the next call fails again (or succeeds, if the file is being
+  // appended to).
+  tensorflow::Status ReadNextRecords(tensorflow::int64 max_records,
+                                     tensorflow::int64 max_bytes,
+                                     std::string* data,
+                                     std::vector<tensorflow::int64>* ends) {
+    if (IsClosed()) {
+      return tensorflow::errors::FailedPrecondition("Reader is closed.");
+    }
+
+    tensorflow::tstring record;
+    while (static_cast<tensorflow::int64>(ends->size()) < max_records &&
+           static_cast<tensorflow::int64>(data->size()) < max_bytes) {
+      tensorflow::Status status = reader_->ReadRecord(&offset_, &record);
+      if (!status.ok()) {
+        return ends->empty() ? status : tensorflow::Status::OK();
+      }
+      data->append(record.data(), record.size());
+      ends->push_back(data->size());
+    }
+    return tensorflow::Status::OK();
+  }
+
   bool IsClosed() const { return file_ == nullptr && reader_ == nullptr; }
 
   void Close() {
@@ -234,6 +264,30 @@ PYBIND11_MODULE(_pywrap_record_io, m) {
              MaybeRaiseRegisteredFromStatus(status);
              return py::bytes(record);
            })
+      .def("read_batch",
+           [](PyRecordReader* self, tensorflow::int64 max_records,
+              tensorflow::int64 max_bytes) {
+             // Returns the records as a single buffer, and the end offsets of
+             // the records in that buffer as a buffer of int64s.
+             std::string data;
+             std::vector<tensorflow::int64> ends;
+             tensorflow::Status status;
+             if (!self->IsClosed()) {
+               py::gil_scoped_release release;
+               status =
+                   self->ReadNextRecords(max_records, max_bytes, &data, &ends);
+             }
+             // As in __next__, the reader is not closed at the end of the
+             // file, which could be appended to before the next call.
+             if (!tensorflow::errors::IsOutOfRange(status)) {
+               MaybeRaiseRegisteredFromStatus(status);
+             }
+             return py::make_tuple(
+                 py::bytes(data),
+                 py::bytes(reinterpret_cast<const char*>(ends.data()),
+                           ends.size() * sizeof(tensorflow::int64)));
+           },
+           py::arg("max_records"), py::arg("max_bytes"))
       .def("close", [](PyRecordReader* self) { self->Close(); });
 
   py::class_<PyRecordRandomReader>(m, "RandomRecordReader")
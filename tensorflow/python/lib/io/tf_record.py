@@ -19,7 +19,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+from concurrent import futures
+import struct
+
+import numpy as np
+
 from tensorflow.python import _pywrap_record_io
+from tensorflow.python.lib.io import file_io
 from tensorflow.python.util import compat
 from tensorflow.python.util import deprecation
 from tensorflow.python.util.tf_export import tf_export
@@ -212,6 +219,334 @@ def tf_record_random_reader(path):
   return _pywrap_record_io.RandomRecordReader(path)
 
 
+# Bytes of framing around the data of an uncompressed record: the length,
+# the crc of the length and the crc of the data. See
+# tensorflow/core/lib/io/record_writer.h.
+_RECORD_OVERHEAD = 16
+
+_DEFAULT_BATCH_SIZE = 1024
+_DEFAULT_MAX_BATCH_BYTES = 64 << 20
+
+
+class TFRecordBatch(collections.namedtuple("TFRecordBatch",
+                                           ["data", "offsets"])):
+  """A batch of records stored in one contiguous buffer.
+
+  Record `i` is `data[offsets[i]:offsets[i + 1]]`. Indexing a batch returns
+  the record as a `memoryview` on `data`, so that records can be parsed or
+  handed to `np.frombuffer` without copying them.
+
+  Attributes:
+    data: A `bytes` object with the concatenated records.
+    offsets: An int64 `np.ndarray` of length `len(batch) + 1` with the offsets
+      of the records in `data`; `offsets[0]` is 0 and `offsets[-1]` is
+      `len(data)`.
+  """
+
+  __slots__ = ()
+
+  @classmethod
+  def _from_ends(cls, data, ends):
+    offsets = np.zeros(len(ends) // 8 + 1, dtype=np.int64)
+    offsets[1:] = np.frombuffer(ends, dtype=np.int64)
+    return cls(data, offsets)
+
+  def __len__(self):
+    return len(self.offsets) - 1
+
+  def __getitem__(self, index):
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError("Record index %d out of range for a batch of %d "
+                       "records." % (index, len(self)))
+    return memoryview(self.data)[self.offsets[index]:self.offsets[index + 1]]
+
+  def __iter__(self):
+    view = memoryview(self.data)
+    offsets = self.offsets.tolist()
+    for start, end in zip(offsets[:-1], offsets[1:]):
+      yield view[start:end]
+
+  @property
+  def lengths(self):
+    """An int64 `np.ndarray` with the length of each record."""
+    return np.diff(self.offsets)
+
+
+def _check_batch_limits(batch_size, max_batch_bytes):
+  if batch_size <= 0:
+    raise ValueError("batch_size must be positive, got %d." % batch_size)
+  if max_batch_bytes is not None and max_batch_bytes <= 0:
+    raise ValueError(
+        "max_batch_bytes must be positive, got %d." % max_batch_bytes)
+
+
+def tf_record_batch_iterator(path,
+                             options=None,
+                             batch_size=_DEFAULT_BATCH_SIZE,
+                             max_batch_bytes=_DEFAULT_MAX_BATCH_BYTES):
+  """An iterator that reads the records of a TFRecords file in batches.
+
+  Unlike `tf_record_iterator`, which creates a `bytes` object per record and
+  takes the GIL for each of them, each batch is read by a single call that
+  releases the GIL, and its records are returned in one buffer. Each record is
+  still copied twice: from the reader into the batch buffer, which is then
+  copied into the `bytes` object of the batch. Records are not copied again
+  when they are accessed.
+
+  Usage example:
+  ```py
+  for batch in tf_record_batch_iterator(file_path, batch_size=4096):
+    for record in batch:  # `record` is a memoryview.
+      example = tf.train.Example.FromString(record)
+  ```
+
+  Args:
+    path: The path to the TFRecords file.
+    options: (optional) A TFRecordOptions object.
+    batch_size: Maximum number of records in a batch.
+    max_batch_bytes: (optional) Once a batch holds at least this many bytes of
+      records, no more records are added to it. A batch has at least one
+      record, however large.
+
+  Returns:
+    An iterator of non-empty `TFRecordBatch`es, in file order.
+
+  Raises:
+    IOError: If `path` cannot be opened for reading.
+    ValueError: If `batch_size` or `max_batch_bytes` is not positive.
+  """
+  _check_batch_limits(batch_size, max_batch_bytes)
+  compression_type = TFRecordOptions.get_compression_type_string(options)
+  return _read_batches(
+      _pywrap_record_io.RecordIterator(path, compression_type), batch_size,
+      max_batch_bytes or np.iinfo(np.int64).max)
+
+
+def _read_batches(reader, batch_size, max_batch_bytes):
+  """Yields the batches read by `reader` until the end of its file."""
+  try:
+    while True:
+      data, ends = reader.read_batch(batch_size, max_batch_bytes)
+      if not ends:
+        return
+      yield TFRecordBatch._from_ends(data, ends)  # pylint: disable=protected-access
+  finally:
+    reader.close()
+
+
+def tf_record_batches(paths,
+                      options=None,
+                      batch_size=_DEFAULT_BATCH_SIZE,
+                      max_batch_bytes=_DEFAULT_MAX_BATCH_BYTES,
+                      num_threads=None):
+  """An iterator that reads several TFRecords files in batches, in parallel.
+
+  Up to `num_threads` files are read at the same time, each by its own thread
+  which reads one batch ahead. Batches are yielded in a deterministic order:
+  round-robin over the open files, each file being replaced by the next one of
+  `paths` once it is exhausted. With `num_threads=1` this is the batches of
+  the files one after the other.
+
+  Args:
+    paths: An iterable of paths of TFRecords files.
+    options: (optional) A TFRecordOptions object, used for all the files.
+    batch_size: Maximum number of records in a batch.
+    max_batch_bytes: (optional) See `tf_record_batch_iterator`.
+    num_threads: (optional) Number of files read in parallel. Defaults to the
+      number of files, capped at 16.
+
+  Returns:
+    An iterator of tuples `(path, batch)` of the file a batch was read from
+    and the `TFRecordBatch`.
+
+  Raises:
+    IOError: If one of `paths` cannot be opened for reading.
+    ValueError: If `batch_size`, `max_batch_bytes` or `num_threads` is not
+      positive.
+  """
+  _check_batch_limits(batch_size, max_batch_bytes)
+  paths = list(paths)
+  if num_threads is None:
+    num_threads = max(min(len(paths), 16), 1)
+  elif num_threads <= 0:
+    raise ValueError("num_threads must be positive, got %d." % num_threads)
+  return _read_batches_in_parallel(paths, options, batch_size,
+                                   max_batch_bytes, num_threads)
+
+
+def _read_batches_in_parallel(paths, options, batch_size, max_batch_bytes,
+                              num_threads):
+  """Implements `tf_record_batches`."""
+
+  def next_batch(iterator):
+    return next(iterator, None)
+
+  remaining = collections.deque(paths)
+  # (path, iterator, future of its next batch) of each file being read.
+  active = collections.deque()
+  executor = futures.ThreadPoolExecutor(max_workers=num_threads)
+  try:
+    while remaining or active:
+      while remaining and len(active) < num_threads:
+        path = remaining.popleft()
+        iterator = tf_record_batch_iterator(path, options, batch_size,
+                                            max_batch_bytes)
+        active.append((path, iterator, executor.submit(next_batch, iterator)))
+      path, iterator, future = active.popleft()
+      batch = future.result()
+      if batch is None:
+        continue
+      active.append((path, iterator, executor.submit(next_batch, iterator)))
+      yield path, batch
+  finally:
+    # Let the pending reads finish before closing their files.
+    executor.shutdown(wait=True)
+    for _, iterator, _ in active:
+      iterator.close()
+
+
+# Record index sidecar files (see `write_tf_record_index`) are:
+#   - the magic bytes `_INDEX_MAGIC`,
+#   - the size of the indexed file, as a little-endian uint64,
+#   - the offset of each record in the indexed file, as little-endian uint64s.
+_INDEX_MAGIC = b"TFRIDX01"
+_INDEX_HEADER = struct.Struct("<8sQ")
+_INDEX_SUFFIX = ".index"
+
+
+def _index_path(path, index_path):
+  return compat.as_str(index_path or compat.as_str(path) + _INDEX_SUFFIX)
+
+
+def _record_offsets(path):
+  """Returns the offsets of the records of an uncompressed TFRecords file."""
+  chunks = []
+  start = 0
+  for batch in tf_record_batch_iterator(path):
+    num_records = len(batch)
+    chunks.append(batch.offsets[:-1] + start +
+                  np.arange(num_records, dtype=np.int64) * _RECORD_OVERHEAD)
+    start += len(batch.data) + num_records * _RECORD_OVERHEAD
+  return np.concatenate(chunks) if chunks else np.zeros([0], np.int64)
+
+
+def write_tf_record_index(path, index_path=None):
+  """Writes a record index sidecar file for an uncompressed TFRecords file.
+
+  The index holds the offset of every record of `path`, which lets
+  `TFRecordIndexedReader` read records by number. It also records the size of
+  `path`, so that an index is ignored once the file is modified.
+
+  Args:
+    path: The path to an uncompressed TFRecords file.
+    index_path: (optional) Where to write the index. Defaults to `path` with
+      a ".index" suffix.
+
+  Returns:
+    An int64 `np.ndarray` with the offset of each record of `path`.
+
+  Raises:
+    IOError: If `path` cannot be opened for reading.
+    DataLossError: If `path` is corrupted or compressed.
+  """
+  offsets = _record_offsets(path)
+  file_size = file_io.stat(path).length
+  file_io.atomic_write_string_to_file(
+      _index_path(path, index_path),
+      _INDEX_HEADER.pack(_INDEX_MAGIC, file_size) +
+      offsets.astype("<u8").tobytes())
+  return offsets
+
+
+def load_tf_record_index(path, index_path=None):
+  """Reads the record index of `path` written by `write_tf_record_index`.
+
+  Args:
+    path: The path to the indexed TFRecords file.
+    index_path: (optional) The path to the index. Defaults to `path` with a
+      ".index" suffix.
+
+  Returns:
+    An int64 `np.ndarray` with the offset of each record of `path`, or `None`
+    if there is no index or it does not match the current size of `path`.
+  """
+  index_path = _index_path(path, index_path)
+  if not file_io.file_exists(index_path):
+    return None
+  contents = file_io.read_file_to_string(index_path, binary_mode=True)
+  if len(contents) < _INDEX_HEADER.size:
+    return None
+  magic, file_size = _INDEX_HEADER.unpack_from(contents)
+  if (magic != _INDEX_MAGIC or
+      (len(contents) - _INDEX_HEADER.size) % 8 or
+      file_size != file_io.stat(path).length):
+    return None
+  return np.frombuffer(
+      contents, dtype="<u8", offset=_INDEX_HEADER.size).astype(np.int64)
+
+
+class TFRecordIndexedReader(object):
+  """Reads the records of an uncompressed TFRecords file by number.
+
+  The offsets of the records are read from the index sidecar file written by
+  `write_tf_record_index`, which is created first if it is missing or stale.
+
+  Usage example:
+  ```py
+  reader = TFRecordIndexedReader(file_path)
+  num_records = len(reader)
+  last_record = reader[-1]
+  batch = reader.read_batch(np.random.permutation(num_records)[:256])
+  ```
+
+  Args:
+    path: The path to an uncompressed TFRecords file.
+    index_path: (optional) The path to the index. Defaults to `path` with a
+      ".index" suffix.
+    create_index: Whether to write the index if it is missing or stale. If
+      False, the offsets are computed in memory instead.
+
+  Raises:
+    IOError: If `path` cannot be opened for reading.
+  """
+
+  def __init__(self, path, index_path=None, create_index=True):
+    offsets = load_tf_record_index(path, index_path)
+    if offsets is None:
+      if create_index:
+        offsets = write_tf_record_index(path, index_path)
+      else:
+        offsets = _record_offsets(path)
+    self._offsets = offsets
+    self._reader = tf_record_random_reader(path)
+
+  def __len__(self):
+    return len(self._offsets)
+
+  def __getitem__(self, index):
+    """Returns record `index` as `bytes`."""
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError("Record index %d out of range for a file of %d "
+                       "records." % (index, len(self)))
+    record, _ = self._reader.read(int(self._offsets[index]))
+    return record
+
+  def read_batch(self, indices):
+    """Returns the records `indices` as a `TFRecordBatch`, in that order."""
+    records = [self[i] for i in indices]
+    offsets = np.zeros(len(records) + 1, dtype=np.int64)
+    np.cumsum(np.array([len(r) for r in records], dtype=np.int64),
+              out=offsets[1:])
+    return TFRecordBatch(b"".join(records), offsets)
+
+  def close(self):
+    self._reader.close()
+
+
 @tf_export(
     "io.TFRecordWriter", v1=["io.TFRecordWriter", "python_io.TFRecordWriter"])
 @deprecation.deprecated_endpoints("python_io.TFRecordWriter")
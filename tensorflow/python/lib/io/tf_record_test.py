@@ -30,6 +30,7 @@ from tensorflow.python.framework import errors_impl
 from tensorflow.python.lib.io import tf_record
 from tensorflow.python.platform import test
 from tensorflow.python.util import compat
+from tensorflow.python.util import deprecation
 
 TFRecordCompressionType = tf_record.TFRecordCompressionType
 
@@ -515,6 +516,168 @@ class TFRecordRandomReaderTest(TFCompressionTestCase):
       reader.read(0)
 
 
+class TFRecordBatchIteratorTest(TFCompressionTestCase):
+
+  def _AssertBatchesEqual(self, expected, batches):
+    self.assertEqual(expected, [bytes(r) for batch in batches for r in batch])
+
+  def testBatchIterator(self):
+    records = [self._Record(0, i) for i in range(self._num_records)]
+    fn = self._WriteRecordsToFile(records, "uncompressed_records")
+    batches = list(tf_record.tf_record_batch_iterator(fn, batch_size=3))
+    self.assertEqual([3, 3, 1], [len(batch) for batch in batches])
+    self._AssertBatchesEqual(records, batches)
+    batch = batches[0]
+    self.assertIsInstance(batch[0], memoryview)
+    self.assertEqual(records[2], bytes(batch[-1]))
+    self.assertEqual([len(r) for r in records[:3]], batch.lengths.tolist())
+    self.assertEqual(b"".join(records[:3]), batch.data)
+    with self.assertRaises(IndexError):
+      batch[3]  # pylint: disable=pointless-statement
+
+  def testBatchIteratorIsNotDeprecated(self):
+    fn = self._WriteRecordsToFile([b"a"], "uncompressed_records")
+    with test.mock.patch.dict(deprecation._PRINTED_WARNING, clear=True), \
+        test.mock.patch.object(deprecation.logging, "warning") as mock_log:
+      self._AssertBatchesEqual([b"a"], tf_record.tf_record_batch_iterator(fn))
+    self.assertFalse(mock_log.called)
+
+  def testBatchIteratorCompressed(self):
+    records = [self._Record(0, i) for i in range(self._num_records)]
+    for compression_type in (TFRecordCompressionType.ZLIB,
+                             TFRecordCompressionType.GZIP):
+      options = tf_record.TFRecordOptions(compression_type)
+      fn = self._WriteRecordsToFile(records, "compressed_records", options)
+      self._AssertBatchesEqual(
+          list(tf_record.tf_record_iterator(fn, options)),
+          tf_record.tf_record_batch_iterator(fn, options, batch_size=2))
+
+  def testBatchIteratorMaxBytes(self):
+    records = [b"a" * 10, b"b" * 30, b"c" * 25, b"d" * 5, b"e"]
+    fn = self._WriteRecordsToFile(records, "uncompressed_records")
+    batches = list(
+        tf_record.tf_record_batch_iterator(fn, max_batch_bytes=20))
+    self.assertEqual([2, 1, 2], [len(batch) for batch in batches])
+    self._AssertBatchesEqual(records, batches)
+
+  def testBatchIteratorEmptyFile(self):
+    fn = self._WriteRecordsToFile([], "empty_records")
+    self.assertEqual([], list(tf_record.tf_record_batch_iterator(fn)))
+
+  def testBatchIteratorInvalidArguments(self):
+    fn = self._WriteRecordsToFile([b"a"], "uncompressed_records")
+    with self.assertRaisesRegex(ValueError, "batch_size"):
+      tf_record.tf_record_batch_iterator(fn, batch_size=0)
+    with self.assertRaisesRegex(ValueError, "max_batch_bytes"):
+      tf_record.tf_record_batch_iterator(fn, max_batch_bytes=-1)
+    with self.assertRaisesRegex(ValueError, "num_threads"):
+      tf_record.tf_record_batches([fn], num_threads=0)
+
+  def testBatchIteratorTruncatedFile(self):
+    fn = os.path.join(self.get_temp_dir(), "temp_file")
+    with tf_record.TFRecordWriter(fn) as writer:
+      writer.write(b"truncated")
+    with open(fn, "rb") as f:
+      record_bytes = f.read()
+    fn_truncated = os.path.join(self.get_temp_dir(), "truncated_file")
+    with tf_record.TFRecordWriter(fn_truncated) as writer:
+      writer.write(b"good")
+    with open(fn_truncated, "ab") as f:
+      f.write(record_bytes[:-1])
+    batches = tf_record.tf_record_batch_iterator(fn_truncated)
+    # Records read before the corrupted one are returned first.
+    self.assertEqual([b"good"], [bytes(r) for r in next(batches)])
+    with self.assertRaises(errors_impl.DataLossError):
+      next(batches)
+
+  def testParallelBatches(self):
+    self._num_files = 5
+    filenames = self._CreateFiles()
+    for num_threads in (1, 2, None):
+      results = list(
+          tf_record.tf_record_batches(
+              filenames, batch_size=3, num_threads=num_threads))
+      for i, fn in enumerate(filenames):
+        self._AssertBatchesEqual(
+            [self._Record(i, j) for j in range(self._num_records)],
+            [batch for path, batch in results if path == fn])
+    # With a single thread, the files are read one after the other.
+    self.assertEqual(
+        [self._Record(i, j) for i in range(self._num_files)
+         for j in range(self._num_records)],
+        [bytes(r) for _, batch in tf_record.tf_record_batches(
+            filenames, num_threads=1) for r in batch])
+
+  def testParallelBatchesIsDeterministic(self):
+    self._num_files = 4
+    filenames = self._CreateFiles()
+    expected = [(path, list(batch)) for path, batch in
+                tf_record.tf_record_batches(filenames, batch_size=2)]
+    for _ in range(3):
+      self.assertEqual(expected,
+                       [(path, list(batch)) for path, batch in
+                        tf_record.tf_record_batches(filenames, batch_size=2)])
+
+  def testParallelBatchesStopEarly(self):
+    filenames = self._CreateFiles()
+    batches = tf_record.tf_record_batches(filenames, batch_size=1)
+    _, batch = next(batches)
+    self.assertEqual(self._Record(0, 0), bytes(batch[0]))
+    batches.close()
+
+
+class TFRecordIndexTest(TFCompressionTestCase):
+
+  def setUp(self):
+    super(TFRecordIndexTest, self).setUp()
+    self._records = [
+        self._Record(0, i) * (i + 1) for i in range(self._num_records)
+    ]
+    self._fn = self._WriteRecordsToFile(self._records, "uncompressed_records")
+
+  def testWriteAndLoadIndex(self):
+    self.assertIsNone(tf_record.load_tf_record_index(self._fn))
+    offsets = tf_record.write_tf_record_index(self._fn)
+    self.assertAllEqual(offsets, tf_record.load_tf_record_index(self._fn))
+    reader = tf_record.tf_record_random_reader(self._fn)
+    expected_offsets = [0]
+    for _ in self._records[:-1]:
+      expected_offsets.append(reader.read(expected_offsets[-1])[1])
+    self.assertEqual(expected_offsets, offsets.tolist())
+
+  def testStaleIndexIsIgnored(self):
+    tf_record.write_tf_record_index(self._fn)
+    with tf_record.TFRecordWriter(self._fn) as writer:
+      writer.write(b"new record")
+    self.assertIsNone(tf_record.load_tf_record_index(self._fn))
+    reader = tf_record.TFRecordIndexedReader(self._fn)
+    self.assertEqual(1, len(reader))
+    self.assertEqual(b"new record", reader[0])
+    self.assertIsNotNone(tf_record.load_tf_record_index(self._fn))
+
+  def testIndexedReader(self):
+    index_path = os.path.join(self.get_temp_dir(), "custom.idx")
+    reader = tf_record.TFRecordIndexedReader(self._fn, index_path=index_path)
+    self.assertTrue(os.path.exists(index_path))
+    self.assertEqual(self._num_records, len(reader))
+    for i in reversed(range(self._num_records)):
+      self.assertEqual(self._records[i], reader[i])
+    self.assertEqual(self._records[-1], reader[-1])
+    with self.assertRaises(IndexError):
+      reader[self._num_records]  # pylint: disable=pointless-statement
+    indices = [3, 0, 3, 6]
+    batch = reader.read_batch(indices)
+    self.assertEqual([self._records[i] for i in indices],
+                     [bytes(r) for r in batch])
+    self.assertEqual(0, len(reader.read_batch([])))
+    reader.close()
+
+  def testIndexedReaderWithoutIndexFile(self):
+    reader = tf_record.TFRecordIndexedReader(self._fn, create_index=False)
+    self.assertFalse(os.path.exists(self._fn + ".index"))
+    self.assertEqual(self._records, [reader[i] for i in range(len(reader))])
+
+
 class TFRecordWriterCloseAndFlushTests(test.TestCase):
   """TFRecordWriter close and flush tests"""
 
@@ -44,6 +44,7 @@ from tensorflow.python.ops.ragged import ragged_squeeze_op
 from tensorflow.python.ops.ragged import ragged_string_ops
 from tensorflow.python.ops.ragged import ragged_tensor
 from tensorflow.python.ops.ragged import ragged_tensor_shape
+from tensorflow.python.ops.ragged import ragged_tensor_value
 from tensorflow.python.ops.ragged import ragged_util
 from tensorflow.python.ops.ragged import ragged_where_op
 from tensorflow.python.util import deprecation
@@ -104,6 +105,14 @@ def _is_convertible_to_tensor(value):
       return False
 
 
+def _has_ragged_type(arg_types):
+  """Returns true if any of `arg_types` is a ragged tensor or value type."""
+  return any(
+      issubclass(arg_type, (ragged_tensor.RaggedTensor,
+                            ragged_tensor_value.RaggedTensorValue))
+      for arg_type in arg_types)
+
+
 class UnaryRaggedElementwiseDispatcher(dispatch.OpDispatcher):
   """OpDispatcher for unary ops that map a base op across ragged values."""
 
@@ -117,6 +126,9 @@ class UnaryRaggedElementwiseDispatcher(dispatch.OpDispatcher):
           original_op.__doc__.rstrip() + '\n\n' +
           '    `{x}` may be a `tf.RaggedTensor`.\n'.format(x=self._x))
 
+  def may_handle_types(self, arg_types):
+    return _has_ragged_type(arg_types)
+
   def handle(self, args, kwargs):
     if args:
       x, args = args[0], args[1:]
@@ -177,6 +189,9 @@ class BinaryRaggedElementwiseDispatcher(dispatch.OpDispatcher):
           '    `{x}` and `{y}` may be a `tf.RaggedTensor`.\n'.format(
               x=self._x, y=self._y))
 
+  def may_handle_types(self, arg_types):
+    return _has_ragged_type(arg_types)
+
   def handle(self, args, kwargs):
     # Extract the binary args.
     if len(args) > 1:
@@ -254,6 +269,9 @@ class RaggedDispatcher(dispatch.OpDispatcher):
           original_op.__doc__.rstrip() + '\n\n' +
           '    {0} may be a `tf.RaggedTensor`.\n'.format(arg_list))
 
+  def may_handle_types(self, arg_types):
+    return _has_ragged_type(arg_types)
+
   def handle(self, args, kwargs):
     if self.is_supported(args, kwargs):
       return self._ragged_op(*args, **kwargs)
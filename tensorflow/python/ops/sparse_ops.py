@@ -3126,6 +3126,11 @@ class _UnaryMapValueDispatcher(dispatch.OpDispatcher):
          "    `SparseTensor({x}.indices, tf.{func}({x}.values, ...), "
          "{x}.dense_shape)`").format(x=self._x, func=func_name))
 
+  def may_handle_types(self, arg_types):
+    return any(
+        issubclass(arg_type, sparse_tensor.SparseTensor)
+        for arg_type in arg_types)
+
   def handle(self, args, kwargs):
     if args:
       x, args = args[0], args[1:]
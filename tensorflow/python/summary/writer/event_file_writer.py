@@ -31,6 +31,12 @@ from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import compat
 
+# What `add_event` does when the queue of pending events is full.
+BLOCK = "block"  # Wait until the writer thread has made room.
+DROP_NEWEST = "drop_newest"  # Drop the event being added.
+DROP_OLDEST = "drop_oldest"  # Drop the oldest pending events to make room.
+_QUEUE_FULL_POLICIES = (BLOCK, DROP_NEWEST, DROP_OLDEST)
+
 
 class EventFileWriter(object):
   """Writes `Event` protocol buffers to an event file.
@@ -43,7 +49,8 @@ class EventFileWriter(object):
   """
 
   def __init__(self, logdir, max_queue=10, flush_secs=120,
-               filename_suffix=None):
+               filename_suffix=None, max_queue_bytes=None,
+               queue_full_policy=BLOCK):
     """Creates a `EventFileWriter` and an event file to write to.
 
     On construction the summary writer creates a new event file in `logdir`.
@@ -57,6 +64,14 @@ class EventFileWriter(object):
        and events to disk.
     *  `max_queue`: Maximum number of summaries or events pending to be
        written to disk before one of the 'add' calls block.
+    *  `max_queue_bytes`: Maximum serialized size of the pending summaries and
+       events, as an additional bound on the queue.
+    *  `queue_full_policy`: What the 'add' calls do when the queue is full:
+       block (the default), drop the event being added, or drop the oldest
+       pending events.
+
+    The writer thread takes all the pending events from the queue at once, and
+    serializes and writes them with a single call that releases the GIL.
 
     Args:
       logdir: A string. Directory where event file will be written.
@@ -65,11 +80,29 @@ class EventFileWriter(object):
         pending events and summaries to disk.
       filename_suffix: A string. Every event file's name is suffixed with
         `filename_suffix`.
+      max_queue_bytes: Integer. If set, maximum serialized size in bytes of the
+        pending events and summaries. An event larger than this is only queued
+        when the queue is empty.
+      queue_full_policy: One of `BLOCK`, `DROP_NEWEST` or `DROP_OLDEST`. What
+        `add_event` does when the queue is full. Dropped events are counted in
+        `queue_stats()`.
+
+    Raises:
+      ValueError: If `queue_full_policy` is unknown, or `max_queue_bytes` is
+        not positive.
     """
+    if queue_full_policy not in _QUEUE_FULL_POLICIES:
+      raise ValueError("queue_full_policy must be one of %s, got %r." %
+                       (", ".join(_QUEUE_FULL_POLICIES), queue_full_policy))
+    if max_queue_bytes is not None and max_queue_bytes <= 0:
+      raise ValueError(
+          "max_queue_bytes must be positive, got %d." % max_queue_bytes)
     self._logdir = str(logdir)
     if not gfile.IsDirectory(self._logdir):
       gfile.MakeDirs(self._logdir)
     self._max_queue = max_queue
+    self._max_queue_bytes = max_queue_bytes or 0
+    self._queue_full_policy = queue_full_policy
     self._flush_secs = flush_secs
     self._flush_complete = threading.Event()
     self._flush_sentinel = object()
@@ -87,7 +120,7 @@ class EventFileWriter(object):
     The EventsWriter itself does not need to be re-initialized explicitly,
     because it will auto-initialize itself if used after being closed.
     """
-    self._event_queue = CloseableQueue(self._max_queue)
+    self._event_queue = CloseableQueue(self._max_queue, self._max_queue_bytes)
     self._worker = _EventLoggerThread(self._event_queue, self._ev_writer,
                                       self._flush_secs, self._flush_complete,
                                       self._flush_sentinel,
@@ -118,9 +151,11 @@ class EventFileWriter(object):
       event: An `Event` protocol buffer.
     """
     if not self._closed:
-      self._try_put(event)
+      # Sizing an event is only needed, and only paid for, with a byte bound.
+      size = event.ByteSize() if self._max_queue_bytes else 0
+      self._try_put(event, size, self._queue_full_policy)
 
-  def _try_put(self, item):
+  def _try_put(self, item, size=0, full_policy=BLOCK):
     """Attempts to enqueue an item to the event queue.
 
     If the queue is closed, this will close the EventFileWriter and reraise the
@@ -128,9 +163,11 @@ class EventFileWriter(object):
 
     Args:
       item: the item to enqueue
+      size: the size of the item in bytes
+      full_policy: what to do if the queue is full, see `CloseableQueue.put()`
     """
     try:
-      self._event_queue.put(item)
+      self._event_queue.put(item, size, full_policy)
     except QueueClosedError:
       self._internal_close()
       if self._worker.failure_exc_info:
@@ -152,6 +189,21 @@ class EventFileWriter(object):
         self._internal_close()
         six.reraise(*self._worker.failure_exc_info)  # pylint: disable=no-value-for-parameter
 
+  def queue_stats(self):
+    """Returns statistics of the queue of pending events.
+
+    The counts are reset when the writer is reopened.
+
+    Returns:
+      A dict with the number (`pending_events`) and size (`pending_bytes`) of
+      the events waiting to be written, the number of events dropped because
+      the queue was full (`dropped_events`), and the number of `add_event`
+      calls that blocked on a full queue (`blocked_puts`) and the total time
+      they blocked (`blocked_secs`). Sizes are only tracked when
+      `max_queue_bytes` is set.
+    """
+    return self._event_queue.stats()
+
   def close(self):
     """Flushes the event file to disk and close the file.
 
@@ -206,14 +258,21 @@ class _EventLoggerThread(threading.Thread):
   def run(self):
     try:
       while True:
-        event = self._queue.get()
-        if event is self._close_sentinel:
-          return
-        elif event is self._flush_sentinel:
-          self._ev_writer.Flush()
-          self._flush_complete.set()
-        else:
-          self._ev_writer.WriteEvent(event)
+        # Write all the pending events at once, up to the next sentinel.
+        events = []
+        for item in self._queue.get_all():
+          if item is self._close_sentinel or item is self._flush_sentinel:
+            if events:
+              self._ev_writer.WriteEvents(events)
+              events = []
+            if item is self._close_sentinel:
+              return
+            self._ev_writer.Flush()
+            self._flush_complete.set()
+          else:
+            events.append(item)
+        if events:
+          self._ev_writer.WriteEvents(events)
           # Flush the event writer every so often.
           now = time.time()
           if now > self._next_event_flush_time:
@@ -233,17 +292,29 @@ class _EventLoggerThread(threading.Thread):
 
 
 class CloseableQueue(object):
-  """Stripped-down fork of the standard library Queue that is closeable."""
+  """Stripped-down fork of the standard library Queue that is closeable.
+
+  Besides its number of items, the queue can be bounded by the total size of
+  its items, and `put()` can drop items instead of blocking when it is full.
+  """
 
-  def __init__(self, maxsize=0):
+  def __init__(self, maxsize=0, max_bytes=0):
     """Create a queue object with a given maximum size.
 
     Args:
       maxsize: int size of queue. If <= 0, the queue size is infinite.
+      max_bytes: int maximum total size of the items of the queue, as passed
+        to `put()`. If <= 0, the total size is not bounded.
     """
     self._maxsize = maxsize
+    self._max_bytes = max_bytes
+    # (item, size, droppable) tuples.
     self._queue = collections.deque()
+    self._bytes = 0
     self._closed = False
+    self._dropped = 0
+    self._blocked_puts = 0
+    self._blocked_secs = 0.0
     # Mutex must be held whenever queue is mutating; shared by conditions.
     self._mutex = threading.Lock()
     # Notify not_empty whenever an item is added to the queue; a
@@ -253,6 +324,37 @@ class CloseableQueue(object):
     # a thread waiting to put is notified then.
     self._not_full = threading.Condition(self._mutex)
 
+  def _is_full(self, size, num_kept=0):
+    """Whether an item of `size` does not fit.
+
+    Args:
+      size: the size of the item to add.
+      num_kept: number of items which were taken out of the queue, but are
+        still counted against its bounds.
+
+    Returns:
+      Whether the queue is full.
+    """
+    num_items = len(self._queue) + num_kept
+    if self._maxsize > 0 and num_items >= self._maxsize:
+      return True
+    # An item larger than max_bytes still fits in an empty queue.
+    return (self._max_bytes > 0 and num_items > 0 and
+            self._bytes + size > self._max_bytes)
+
+  def _drop_oldest(self, size):
+    """Drops the oldest droppable items until an item of `size` fits."""
+    kept = collections.deque()
+    while self._queue and self._is_full(size, len(kept)):
+      entry = self._queue.popleft()
+      if entry[2]:
+        self._bytes -= entry[1]
+        self._dropped += 1
+      else:
+        kept.append(entry)
+    kept.extend(self._queue)
+    self._queue = kept
+
   def get(self):
     """Remove and return an item from the queue.
 
@@ -264,20 +366,45 @@ class CloseableQueue(object):
     with self._not_empty:
       while not self._queue:
         self._not_empty.wait()
-      item = self._queue.popleft()
+      item, size, _ = self._queue.popleft()
+      self._bytes -= size
       self._not_full.notify()
       return item
 
-  def put(self, item):
+  def get_all(self):
+    """Remove and return all the items of the queue.
+
+    If the queue is empty, blocks until an item is available.
+
+    Returns:
+      a non-empty list of the items of the queue, oldest first
+    """
+    with self._not_empty:
+      while not self._queue:
+        self._not_empty.wait()
+      items = [item for item, _, _ in self._queue]
+      self._queue.clear()
+      self._bytes = 0
+      self._not_full.notify_all()
+      return items
+
+  def put(self, item, size=0, full_policy=BLOCK):
     """Put an item into the queue.
 
     If the queue is closed, fails immediately.
 
     If the queue is full, blocks until space is available or until the queue
-    is closed by a call to close(), at which point this call fails.
+    is closed by a call to close(), at which point this call fails. With a
+    `full_policy` of `DROP_NEWEST` or `DROP_OLDEST`, drops `item` or the
+    oldest items added with a dropping policy instead, respectively.
 
     Args:
       item: an item to add to the queue
+      size: the size of the item, counted against `max_bytes`
+      full_policy: `BLOCK`, `DROP_NEWEST` or `DROP_OLDEST`
+
+    Returns:
+      Whether `item` was added to the queue.
 
     Raises:
       QueueClosedError: if insertion failed because the queue is closed
@@ -285,13 +412,37 @@ class CloseableQueue(object):
     with self._not_full:
       if self._closed:
         raise QueueClosedError()
-      if self._maxsize > 0:
-        while len(self._queue) == self._maxsize:
-          self._not_full.wait()
-          if self._closed:
-            raise QueueClosedError()
-      self._queue.append(item)
+      if self._is_full(size):
+        if full_policy == DROP_NEWEST:
+          self._dropped += 1
+          return False
+        if full_policy == DROP_OLDEST:
+          self._drop_oldest(size)
+        if self._is_full(size):
+          # Only items which may not be dropped are left; wait for them.
+          self._blocked_puts += 1
+          start = time.time()
+          while self._is_full(size):
+            self._not_full.wait()
+            if self._closed:
+              self._blocked_secs += time.time() - start
+              raise QueueClosedError()
+          self._blocked_secs += time.time() - start
+      self._queue.append((item, size, full_policy != BLOCK))
+      self._bytes += size
       self._not_empty.notify()
+      return True
+
+  def stats(self):
+    """Returns a dict of statistics, see `EventFileWriter.queue_stats()`."""
+    with self._mutex:
+      return {
+          "pending_events": len(self._queue),
+          "pending_bytes": self._bytes,
+          "dropped_events": self._dropped,
+          "blocked_puts": self._blocked_puts,
+          "blocked_secs": self._blocked_secs,
+      }
 
   def close(self):
     """Closes the queue, causing any pending or future `put()` calls to fail."""
@@ -42,6 +42,7 @@ from tensorflow.python.platform import gfile
 from tensorflow.python.platform import test
 from tensorflow.python.summary import plugin_asset
 from tensorflow.python.summary import summary_iterator
+from tensorflow.python.summary.writer import event_file_writer
 from tensorflow.python.summary.writer import writer
 from tensorflow.python.summary.writer import writer_cache
 from tensorflow.python.util import compat
@@ -476,11 +477,11 @@ class FileWriterTestCase(FileWriterTestBase, test.TestCase):
       # Coordinate threads to ensure both events are added before the writer
       # thread dies, to avoid the second add_event() failing instead of flush().
       second_event_added = threading.Event()
-      def _FakeWriteEvent(event):
-        del event  # unused
+      def _FakeWriteEvents(events):
+        del events  # unused
         second_event_added.wait()
         raise FakeWriteError()
-      mock_writer.WriteEvent.side_effect = _FakeWriteEvent
+      mock_writer.WriteEvents.side_effect = _FakeWriteEvents
       sw.add_event(event_pb2.Event())
       sw.add_event(event_pb2.Event())
       second_event_added.set()
@@ -494,7 +495,7 @@ class FileWriterTestCase(FileWriterTestBase, test.TestCase):
     writer_thread = sw.event_writer._worker
     with test.mock.patch.object(
         writer_thread, "_ev_writer", autospec=True) as mock_writer:
-      mock_writer.WriteEvent.side_effect = FakeWriteError()
+      mock_writer.WriteEvents.side_effect = FakeWriteError()
       sw.add_event(event_pb2.Event())
       with self.assertRaises(FakeWriteError):
         sw.close()
@@ -506,7 +507,7 @@ class FileWriterTestCase(FileWriterTestBase, test.TestCase):
     writer_thread = sw.event_writer._worker
     with test.mock.patch.object(
         writer_thread, "_ev_writer", autospec=True) as mock_writer:
-      mock_writer.WriteEvent.side_effect = FakeWriteError()
+      mock_writer.WriteEvents.side_effect = FakeWriteError()
       sw.add_event(event_pb2.Event())
       # Wait for writer thread to exit first, then try to add a new event.
       writer_thread.join()
@@ -527,12 +528,12 @@ class FileWriterTestCase(FileWriterTestBase, test.TestCase):
       # that the third add_event() reaches the pending blocked state before the
       # queue closes on writer thread exit, since that's what we want to test.
       second_event_added = threading.Event()
-      def _FakeWriteEvent(event):
-        del event  # unused
+      def _FakeWriteEvents(events):
+        del events  # unused
         second_event_added.wait()
         time.sleep(0.1)
         raise FakeWriteError()
-      mock_writer.WriteEvent.side_effect = _FakeWriteEvent
+      mock_writer.WriteEvents.side_effect = _FakeWriteEvents
       sw.add_event(event_pb2.Event())
       sw.add_event(event_pb2.Event())
       second_event_added.set()
@@ -686,6 +687,167 @@ class SessionBasedFileWriterTestCase(FileWriterTestBase, test.TestCase):
     self.assertRaises(StopIteration, lambda: next(event_paths))
 
 
+class EventFileWriterTest(test.TestCase):
+
+  def _ReadScalarEvents(self, test_dir):
+    events = []
+    for event_file in sorted(glob.glob(os.path.join(test_dir, "event*"))):
+      events.extend(summary_iterator.summary_iterator(event_file))
+    return [e.step for e in events if e.HasField("summary")]
+
+  def _ScalarEvent(self, step, size=0):
+    event = event_pb2.Event(step=step)
+    event.summary.value.add(tag="x" * size, simple_value=1.)
+    return event
+
+  @test_util.run_deprecated_v1
+  def testAllEventsWrittenInOrder(self):
+    test_dir = self.get_temp_dir()
+    ew = event_file_writer.EventFileWriter(test_dir, max_queue=5)
+    for step in range(100):
+      ew.add_event(self._ScalarEvent(step))
+    ew.close()
+    self.assertEqual(list(range(100)), self._ReadScalarEvents(test_dir))
+    self.assertEqual(0, ew.queue_stats()["dropped_events"])
+
+  def _BlockWriter(self, ew):
+    """Blocks the writer thread of `ew` until the returned event is set."""
+    writer_thread = ew._worker
+    real_write_events = writer_thread._ev_writer.WriteEvents
+    unblock = threading.Event()
+    blocked = threading.Event()
+    def _BlockedWriteEvents(events):
+      blocked.set()
+      unblock.wait()
+      real_write_events(events)
+    # Only the first write is blocked: later ones use the real writer again.
+    with test.mock.patch.object(
+        writer_thread, "_ev_writer", autospec=True) as mock_writer:
+      mock_writer.WriteEvents.side_effect = _BlockedWriteEvents
+      ew.add_event(self._ScalarEvent(-1))
+      blocked.wait()
+    return unblock
+
+  @test_util.run_deprecated_v1
+  def testDropNewest(self):
+    test_dir = self.get_temp_dir()
+    ew = event_file_writer.EventFileWriter(
+        test_dir, max_queue=3,
+        queue_full_policy=event_file_writer.DROP_NEWEST)
+    unblock = self._BlockWriter(ew)
+    for step in range(10):
+      ew.add_event(self._ScalarEvent(step))
+    stats = ew.queue_stats()
+    self.assertEqual(3, stats["pending_events"])
+    self.assertEqual(7, stats["dropped_events"])
+    self.assertEqual(0, stats["blocked_puts"])
+    unblock.set()
+    ew.close()
+    self.assertEqual([-1, 0, 1, 2], self._ReadScalarEvents(test_dir))
+
+  @test_util.run_deprecated_v1
+  def testDropOldest(self):
+    test_dir = self.get_temp_dir()
+    ew = event_file_writer.EventFileWriter(
+        test_dir, max_queue=3,
+        queue_full_policy=event_file_writer.DROP_OLDEST)
+    unblock = self._BlockWriter(ew)
+    for step in range(10):
+      ew.add_event(self._ScalarEvent(step))
+    self.assertEqual(7, ew.queue_stats()["dropped_events"])
+    unblock.set()
+    ew.close()
+    self.assertEqual([-1, 7, 8, 9], self._ReadScalarEvents(test_dir))
+
+  @test_util.run_deprecated_v1
+  def testMaxQueueBytes(self):
+    test_dir = self.get_temp_dir()
+    event_size = self._ScalarEvent(1, size=100).ByteSize()
+    ew = event_file_writer.EventFileWriter(
+        test_dir, max_queue=100, max_queue_bytes=int(event_size * 2.5),
+        queue_full_policy=event_file_writer.DROP_OLDEST)
+    unblock = self._BlockWriter(ew)
+    for step in range(5):
+      ew.add_event(self._ScalarEvent(step, size=100))
+    stats = ew.queue_stats()
+    self.assertEqual(2, stats["pending_events"])
+    self.assertEqual(2 * event_size, stats["pending_bytes"])
+    self.assertEqual(3, stats["dropped_events"])
+    unblock.set()
+    ew.close()
+    self.assertEqual([-1, 3, 4], self._ReadScalarEvents(test_dir))
+
+  @test_util.run_deprecated_v1
+  def testBlockedPutsAreCounted(self):
+    test_dir = self.get_temp_dir()
+    ew = event_file_writer.EventFileWriter(test_dir, max_queue=1)
+    unblock = self._BlockWriter(ew)
+    ew.add_event(self._ScalarEvent(0))
+    threading.Timer(0.1, unblock.set).start()
+    ew.add_event(self._ScalarEvent(1))
+    stats = ew.queue_stats()
+    self.assertEqual(1, stats["blocked_puts"])
+    self.assertGreater(stats["blocked_secs"], 0)
+    ew.close()
+    self.assertEqual([-1, 0, 1], self._ReadScalarEvents(test_dir))
+
+  def testInvalidArguments(self):
+    with self.assertRaisesRegex(ValueError, "queue_full_policy"):
+      event_file_writer.EventFileWriter(
+          self.get_temp_dir(), queue_full_policy="drop_all")
+    with self.assertRaisesRegex(ValueError, "max_queue_bytes"):
+      event_file_writer.EventFileWriter(self.get_temp_dir(), max_queue_bytes=0)
+
+
+class CloseableQueueTest(test.TestCase):
+
+  def testGetAll(self):
+    queue = event_file_writer.CloseableQueue()
+    for i in range(3):
+      queue.put(i)
+    self.assertEqual([0, 1, 2], queue.get_all())
+    queue.put(3)
+    self.assertEqual(3, queue.get())
+
+  def testDropOldestKeepsUndroppableItems(self):
+    queue = event_file_writer.CloseableQueue(maxsize=3)
+    sentinel = object()
+    queue.put(0, full_policy=event_file_writer.DROP_OLDEST)
+    queue.put(sentinel)
+    queue.put(1, full_policy=event_file_writer.DROP_OLDEST)
+    self.assertTrue(queue.put(2, full_policy=event_file_writer.DROP_OLDEST))
+    self.assertEqual([sentinel, 1, 2], queue.get_all())
+
+  def testDropOldestSkipsUndroppableHead(self):
+    queue = event_file_writer.CloseableQueue(maxsize=2)
+    sentinel = object()
+    queue.put(sentinel)
+    queue.put(1, full_policy=event_file_writer.DROP_OLDEST)
+    self.assertTrue(queue.put(2, full_policy=event_file_writer.DROP_OLDEST))
+    stats = queue.stats()
+    self.assertEqual(1, stats["dropped_events"])
+    self.assertEqual(0, stats["blocked_puts"])
+    self.assertEqual([sentinel, 2], queue.get_all())
+
+  def testDropOldestSkipsUndroppableHeadWithMaxBytes(self):
+    queue = event_file_writer.CloseableQueue(max_bytes=10)
+    sentinel = object()
+    queue.put(sentinel, 4)
+    queue.put(1, 4, event_file_writer.DROP_OLDEST)
+    self.assertTrue(queue.put(2, 4, event_file_writer.DROP_OLDEST))
+    stats = queue.stats()
+    self.assertEqual(1, stats["dropped_events"])
+    self.assertEqual(8, stats["pending_bytes"])
+    self.assertEqual([sentinel, 2], queue.get_all())
+
+  def testLargeItemFitsInEmptyQueue(self):
+    queue = event_file_writer.CloseableQueue(max_bytes=10)
+    self.assertTrue(queue.put("large", 100, event_file_writer.DROP_NEWEST))
+    self.assertFalse(queue.put("small", 1, event_file_writer.DROP_NEWEST))
+    self.assertEqual(["large"], queue.get_all())
+    self.assertEqual(0, queue.stats()["pending_bytes"])
+
+
 class FileWriterCacheTest(test.TestCase):
   """FileWriterCache tests."""
 
@@ -53,7 +53,8 @@ def gen_api_init_files(
         ],
         output_package = "tensorflow",
         output_dir = "",
-        root_file_name = "__init__.py"):
+        root_file_name = "__init__.py",
+        lazy_submodules = []):
     """Creates API directory structure and __init__.py files.
 
     Creates a genrule that generates a directory structure with __init__.py
@@ -88,6 +89,9 @@ def gen_api_init_files(
       output_dir: Subdirectory to output API to.
         If non-empty, must end with '/'.
       root_file_name: Name of the root file with all the root imports.
+      lazy_submodules: Submodules (e.g. "distribute") that are only imported
+        when they are first accessed instead of when their parent module is
+        imported.
     """
     root_init_template_flag = ""
     if root_init_template:
@@ -126,6 +130,10 @@ def gen_api_init_files(
 
     loading_flag = " --loading=default"
 
+    lazy_submodules_flag = ""
+    if lazy_submodules:
+        lazy_submodules_flag = " --lazy_submodules=" + ",".join(lazy_submodules)
+
     native.genrule(
         name = name,
         outs = all_output_files,
@@ -134,7 +142,8 @@ def gen_api_init_files(
             root_init_template_flag + " --apidir=$(@D)" + output_dir +
             " --apiname=" + api_name + " --apiversion=" + str(api_version) +
             compat_api_version_flags + " " + compat_init_template_flags +
-            loading_flag + " --package=" + ",".join(packages) +
+            loading_flag + lazy_submodules_flag +
+            " --package=" + ",".join(packages) +
             " --output_package=" + output_package +
             " --use_relative_imports=True $(OUTS)"
         ),
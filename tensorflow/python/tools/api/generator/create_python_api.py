@@ -68,6 +68,37 @@ _PUBLIC_APIS = {
 %s
 }
 """
+_LAZY_SUBMODULES_TEXT_TEMPLATE = """
+
+import importlib as _importlib
+
+# Submodules that are only imported when they are first accessed.
+_LAZY_SUBMODULES = {
+%s
+}
+
+
+def __getattr__(name):
+  if name in _LAZY_SUBMODULES:
+    module = _importlib.import_module(_LAZY_SUBMODULES[name], __package__)
+    globals()[name] = module
+    return module
+  raise AttributeError('module %%r has no attribute %%r' %% (__name__, name))
+
+
+def __dir__():
+  return sorted(set(globals()).union(_LAZY_SUBMODULES))
+
+
+# Module level __getattr__ is only supported starting with Python 3.7.
+if _sys.version_info < (3, 7):
+  from importlib import util as _importlib_util
+  from tensorflow.python.util import lazy_loader as _lazy_loader
+  for _name, _module in _LAZY_SUBMODULES.items():
+    globals()[_name] = _lazy_loader.LazyLoader(
+        _name, globals(), _importlib_util.resolve_name(_module, __package__))
+  del _name, _module
+"""
 
 
 class SymbolExposedTwiceError(Exception):
@@ -109,7 +140,8 @@ class _ModuleInitCodeBuilder(object):
                output_package,
                api_version,
                lazy_loading=_LAZY_LOADING,
-               use_relative_imports=False):
+               use_relative_imports=False,
+               lazy_submodules=None):
     self._output_package = output_package
     # Maps API module to API symbol name to set of tuples of the form
     # (module name, priority).
@@ -125,6 +157,13 @@ class _ModuleInitCodeBuilder(object):
     # imported.
     self._lazy_loading = lazy_loading
     self._use_relative_imports = use_relative_imports
+    # Submodules (for e.g. distribute or compat.v1.distribute) that are only
+    # imported on first access. Only applies to statically imported modules
+    # since lazy_loading already defers all imports.
+    self._lazy_submodules = frozenset(lazy_submodules or [])
+    # Maps API module to lazily imported submodule name to the module name
+    # it should be imported from.
+    self._lazy_submodule_imports = collections.defaultdict(dict)
 
   def _check_already_imported(self, symbol_id, api_name):
     if (api_name in self._dest_import_to_id and
@@ -179,6 +218,38 @@ class _ModuleInitCodeBuilder(object):
     self._module_imports[dest_module_name][full_api_name].add(
         (import_str, priority))
 
+  def add_submodule_import(self, source_module_name, source_name,
+                           dest_module_name):
+    """Adds an import of submodule `source_name` to `dest_module_name`.
+
+    The import is deferred until first access if the submodule is one of
+    the lazy submodules.
+
+    Args:
+      source_module_name: (string) Module to import from, or '.' to import
+        relative to the destination module.
+      source_name: (string) Name of the submodule to import.
+      dest_module_name: (string) Module name to add import to.
+    """
+    submodule = _join_modules(dest_module_name, source_name)
+    if (self._lazy_loading or
+        _strip_compat_prefixes(submodule) not in self._lazy_submodules):
+      self.add_import(
+          symbol=None,
+          source_module_name=source_module_name,
+          source_name=source_name,
+          dest_module_name=dest_module_name,
+          dest_name=source_name)
+      return
+    if source_module_name == '.':
+      import_from = '.' + source_name
+    else:
+      import_from = '%s.%s' % (source_module_name, source_name)
+    # Make sure that dest_module_name gets an __init__.py file even if it
+    # only has lazily imported submodules.
+    self._module_imports[dest_module_name]  # pylint: disable=pointless-statement
+    self._lazy_submodule_imports[dest_module_name][source_name] = import_from
+
   def _import_submodules(self):
     """Add imports for all destination modules in self._module_imports."""
     # Import all required modules in their parent modules.
@@ -209,12 +280,10 @@ class _ModuleInitCodeBuilder(object):
             import_from = '.'
           elif submodule_index > 0:
             import_from += '.' + '.'.join(module_split[:submodule_index])
-          self.add_import(
-              symbol=None,
+          self.add_submodule_import(
               source_module_name=import_from,
               source_name=module_split[submodule_index],
-              dest_module_name=parent_module,
-              dest_name=module_split[submodule_index])
+              dest_module_name=parent_module)
 
   def build(self):
     """Get a map from destination module to __init__.py code for that module.
@@ -240,6 +309,11 @@ class _ModuleInitCodeBuilder(object):
                 sorted(imports_list))
       else:
         module_text_map[dest_module] = '\n'.join(sorted(imports_list))
+        if dest_module in self._lazy_submodule_imports:
+          module_text_map[dest_module] += (
+              _LAZY_SUBMODULES_TEXT_TEMPLATE % '\n'.join(
+                  "  '%s': '%s'," % (name, import_from) for name, import_from
+                  in sorted(self._lazy_submodule_imports[dest_module].items())))
 
     # Expose exported symbols with underscores in root module since we import
     # from it using * import. Don't need this for lazy_loading because the
@@ -255,6 +329,11 @@ _names_with_underscore = [%s]
 __all__ = [_s for _s in dir() if not _s.startswith('_')]
 __all__.extend([_s for _s in _names_with_underscore])
 """ % underscore_names_str
+      # Lazily imported submodules are not in dir() until they are loaded.
+      if '' in self._lazy_submodule_imports:
+        root_module_footer += """\
+__all__.extend([_s for _s in sorted(_LAZY_SUBMODULES) if _s not in __all__])
+"""
 
     # Add module wrapper if we need to print deprecation messages
     # or if we use lazy loading.
@@ -363,12 +442,10 @@ def add_nested_compat_imports(module_builder, compat_api_versions,
         continue  # compat.vN.compat.vK.compat is handled separately
 
     for compat_api_version in compat_api_versions:
-      module_builder.add_import(
-          symbol=None,
+      module_builder.add_submodule_import(
           source_module_name='%s.%s' % (output_package, src_module),
           source_name=src_name,
-          dest_module_name='compat.v%d.%s' % (compat_api_version, src_module),
-          dest_name=src_name)
+          dest_module_name='compat.v%d.%s' % (compat_api_version, src_module))
 
 
 def _get_name_and_module(full_name):
@@ -384,6 +461,23 @@ def _get_name_and_module(full_name):
   return '.'.join(name_segments[:-1]), name_segments[-1]
 
 
+def _strip_compat_prefixes(module_name):
+  """Remove leading compat.vN components from module_name.
+
+  Args:
+    module_name: Module name relative to the API root.
+
+  Returns:
+    Given compat.v1.compat.v2.foo.bar, returns foo.bar.
+  """
+  compat_versions = set('v%d' % version for version in _API_VERSIONS)
+  module_split = module_name.split('.')
+  while (len(module_split) > 2 and module_split[0] == 'compat' and
+         module_split[1] in compat_versions):
+    module_split = module_split[2:]
+  return '.'.join(module_split)
+
+
 def _join_modules(module1, module2):
   """Concatenate 2 module components.
 
@@ -453,7 +547,8 @@ def get_api_init_text(packages,
                       api_version,
                       compat_api_versions=None,
                       lazy_loading=_LAZY_LOADING,
-                      use_relative_imports=False):
+                      use_relative_imports=False,
+                      lazy_submodules=None):
   """Get a map from destination module to __init__.py code for that module.
 
   Args:
@@ -469,6 +564,9 @@ def get_api_init_text(packages,
       produced and if `False`, static imports are used.
     use_relative_imports: True if we should use relative imports when importing
       submodules.
+    lazy_submodules: Names of submodules (for e.g. `distribute`) that should
+      only be imported when first accessed. Also applies to the same
+      submodules under compat/.
 
   Returns:
     A dictionary where
@@ -480,7 +578,8 @@ def get_api_init_text(packages,
     compat_api_versions = []
   module_code_builder = _ModuleInitCodeBuilder(output_package, api_version,
                                                lazy_loading,
-                                               use_relative_imports)
+                                               use_relative_imports,
+                                               lazy_submodules)
 
   # Traverse over everything imported above. Specifically,
   # we want to traverse over TensorFlow Python modules.
@@ -593,7 +692,8 @@ def create_api_files(output_files,
                      compat_api_versions,
                      compat_init_templates,
                      lazy_loading=_LAZY_LOADING,
-                     use_relative_imports=False):
+                     use_relative_imports=False,
+                     lazy_submodules=None):
   """Creates __init__.py files for the Python API.
 
   Args:
@@ -614,6 +714,8 @@ def create_api_files(output_files,
       produced and if `False`, static imports are used.
     use_relative_imports: True if we should use relative imports when import
       submodules.
+    lazy_submodules: Names of submodules (for e.g. `distribute`) that should
+      only be imported when first accessed.
 
   Raises:
     ValueError: if output_files list is missing a required file.
@@ -634,7 +736,8 @@ def create_api_files(output_files,
       deprecation_footer_map,
       root_module_footer,
   ) = get_api_init_text(packages, output_package, api_name, api_version,
-                        compat_api_versions, lazy_loading, use_relative_imports)
+                        compat_api_versions, lazy_loading, use_relative_imports,
+                        lazy_submodules)
 
   # Add imports to output files.
   missing_output_files = []
@@ -770,6 +873,13 @@ def main():
       type=bool,
       help='Whether to import submodules using relative imports or absolute '
       'imports')
+  parser.add_argument(
+      '--lazy_submodules',
+      default='',
+      type=str,
+      help='Comma-separated list of submodules (for e.g. distribute,lite) '
+      'that are only imported when they are first accessed. Ignored when '
+      'all symbols are loaded lazily.')
   args = parser.parse_args()
 
   if len(args.outputs) == 1:
@@ -800,7 +910,8 @@ def main():
   create_api_files(outputs, packages, args.root_init_template, args.apidir,
                    args.output_package, args.apiname, args.apiversion,
                    args.compat_apiversions, args.compat_init_templates,
-                   lazy_loading, args.use_relative_imports)
+                   lazy_loading, args.use_relative_imports,
+                   [m for m in args.lazy_submodules.split(',') if m])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,117 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+r"""Benchmarks for importing API packages generated by create_python_api.
+
+Compares the cold start time of a generated API package where every
+submodule is imported statically with one where most submodules are only
+imported on first access.
+
+To run the benchmarks:
+  bazel run -c opt create_python_api_benchmark -- --benchmarks=.
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+from tensorflow.python.platform import test
+from tensorflow.python.tools.api.generator import create_python_api
+from tensorflow.python.util.tf_export import tf_export
+
+_SOURCE_PACKAGE = 'api_gen_benchmark_src'
+_OUTPUT_PACKAGE = 'api_gen_benchmark_api'
+_EAGER_SUBMODULES = ['math']
+_LAZY_SUBMODULES = ['debug', 'distribute', 'lite', 'tpu']
+# Number of exported functions in every submodule.
+_NUM_SYMBOLS = 2000
+
+
+def _write_source_package(source_dir):
+  """Writes a package with one module per API submodule to source_dir."""
+  package_dir = os.path.join(source_dir, _SOURCE_PACKAGE)
+  os.makedirs(package_dir)
+  open(os.path.join(package_dir, '__init__.py'), 'w').close()
+  for submodule in _EAGER_SUBMODULES + _LAZY_SUBMODULES:
+    with open(os.path.join(package_dir, submodule + '.py'), 'w') as f:
+      for i in range(_NUM_SYMBOLS):
+        f.write('def fn_%d(x):\n  return x + %d\n\n\n' % (i, i))
+
+
+def _export_source_symbols():
+  for submodule in _EAGER_SUBMODULES + _LAZY_SUBMODULES:
+    module = importlib.import_module('%s.%s' % (_SOURCE_PACKAGE, submodule))
+    for i in range(_NUM_SYMBOLS):
+      tf_export('%s.fn_%d' % (submodule, i))(getattr(module, 'fn_%d' % i))
+
+
+def _write_api_package(output_dir, lazy_submodules):
+  api_dir = os.path.join(output_dir, _OUTPUT_PACKAGE)
+  output_files = [os.path.join(api_dir, '__init__.py')] + [
+      os.path.join(api_dir, submodule, '__init__.py')
+      for submodule in _EAGER_SUBMODULES + _LAZY_SUBMODULES
+  ]
+  create_python_api.create_api_files(
+      output_files, [_SOURCE_PACKAGE], '', api_dir, _OUTPUT_PACKAGE,
+      'tensorflow', 2, [], [], lazy_loading=False,
+      use_relative_imports=True, lazy_submodules=lazy_submodules)
+
+
+def run_benchmark(func, num_iters):
+  start = time.time()
+  for _ in range(num_iters):
+    func()
+  end = time.time()
+  return end - start
+
+
+class CreatePythonApiBenchmarks(test.Benchmark):
+  """Benchmarks for the import time of generated API packages."""
+
+  def _run_and_report(self, lazy_submodules, name):
+    temp_dir = test.get_temp_dir()
+    source_dir = os.path.join(temp_dir, 'src')
+    if not os.path.isdir(source_dir):
+      _write_source_package(source_dir)
+      sys.path.insert(0, source_dir)
+      _export_source_symbols()
+    output_dir = os.path.join(temp_dir, name)
+    _write_api_package(output_dir, lazy_submodules)
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([output_dir, source_dir])
+    import_api = lambda: subprocess.check_call(  # pylint: disable=g-long-lambda
+        [sys.executable, '-c', 'import %s' % _OUTPUT_PACKAGE], env=env)
+    # Compile the modules before timing the imports.
+    import_api()
+    num_iters = 10
+    total_time = run_benchmark(import_api, num_iters)
+    self.report_benchmark(
+        iters=num_iters, wall_time=total_time * 1e6 / num_iters, name=name)
+
+  def benchmarkStaticImport(self):
+    self._run_and_report([], 'static_import')
+
+  def benchmarkLazySubmoduleImport(self):
+    self._run_and_report(_LAZY_SUBMODULES, 'lazy_submodule_import')
+
+
+if __name__ == '__main__':
+  test.main()
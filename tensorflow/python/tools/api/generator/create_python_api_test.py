@@ -159,6 +159,49 @@ class CreatePythonApiTest(test.TestCase):
     self.assertIn('compat.v2.compat.v2', imports,
                   msg='compat.v2.compat.v2 not in %s' % str(imports.keys()))
 
+  def testLazySubmodulesAreNotImported(self):
+    imports, _, root_footer = create_python_api.get_api_init_text(
+        packages=[create_python_api._DEFAULT_PACKAGE],
+        output_package='tensorflow',
+        api_name='tensorflow',
+        api_version=2,
+        compat_api_versions=[1],
+        lazy_loading=False,
+        lazy_submodules=['test'])
+    self.assertIn('test', imports)
+    self.assertIn('compat.v1.test', imports)
+    self.assertIn('from tensorflow import consts', imports[''])
+    self.assertNotIn('from tensorflow import test\n', imports[''])
+    self.assertIn('\'test\': \'tensorflow.test\',', imports[''])
+    self.assertIn('\'test\': \'tensorflow.compat.v1.test\',',
+                  imports['compat.v1'])
+    self.assertIn('def __getattr__(name):', imports[''])
+    self.assertIn('_LAZY_SUBMODULES', root_footer)
+
+  def testLazySubmodulesUseRelativeImports(self):
+    imports, _, _ = create_python_api.get_api_init_text(
+        packages=[create_python_api._DEFAULT_PACKAGE],
+        output_package='tensorflow',
+        api_name='tensorflow',
+        api_version=2,
+        lazy_loading=False,
+        use_relative_imports=True,
+        lazy_submodules=['test'])
+    self.assertIn('\'test\': \'.test\',', imports[''])
+    self.assertIn('from . import consts', imports[''])
+    self.assertNotIn('_LAZY_SUBMODULES', imports['consts'])
+
+  def testStripCompatPrefixes(self):
+    self.assertEqual(
+        'distribute',
+        create_python_api._strip_compat_prefixes('compat.v1.distribute'))
+    self.assertEqual(
+        'distribute.experimental',
+        create_python_api._strip_compat_prefixes(
+            'compat.v2.compat.v1.distribute.experimental'))
+    self.assertEqual('compat.v1',
+                     create_python_api._strip_compat_prefixes('compat.v1'))
+
 
 if __name__ == '__main__':
   test.main()
@@ -30,6 +30,12 @@ bazel-bin/tensorflow/python/tools/freeze_graph \
 --input_checkpoint=model.ckpt-8361242 \
 --output_graph=/tmp/frozen_graph.pb --output_node_names=softmax
 
+Models too large to be restored into a Session can be frozen with --streaming,
+which reads the variables straight from the checkpoint and writes them to the
+output file a batch at a time. With --external_weights_file, the largest
+constants are stored in a separate file when the frozen graph would not fit in
+a 2GB protobuf; `load_external_weights` puts them back into the GraphDef.
+
 You can also look at freeze_graph_test.py for an example of how to use it.
 
 """
@@ -41,14 +47,21 @@ import argparse
 import re
 import sys
 
+import numpy as np
+
 from google.protobuf import text_format
 
 from tensorflow.core.framework import graph_pb2
+from tensorflow.core.framework import tensor_pb2
 from tensorflow.core.protobuf import saver_pb2
 from tensorflow.core.protobuf.meta_graph_pb2 import MetaGraphDef
 from tensorflow.python.client import session
+from tensorflow.python.framework import convert_to_constants
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import graph_util
 from tensorflow.python.framework import importer
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.framework import tensor_util
 from tensorflow.python.platform import app
 from tensorflow.python.platform import gfile
 from tensorflow.python.saved_model import loader
@@ -58,6 +71,21 @@ from tensorflow.python.training import checkpoint_management
 from tensorflow.python.training import py_checkpoint_reader
 from tensorflow.python.training import saver as saver_lib
 
+# Serialized protos larger than this can not be parsed.
+_MAX_GRAPH_DEF_BYTES = (1 << 31) - 1
+# Upper bound of the bytes a constant adds to a GraphDef on top of its value.
+_CONSTANT_OVERHEAD_BYTES = 32
+# Values read from the checkpoint are written out once they exceed this size.
+_STREAMING_BATCH_BYTES = 64 << 20
+
+# Attributes of the `Const` nodes whose value is in the external weights file.
+_EXTERNAL_WEIGHTS_OFFSET_ATTR = "_external_weights_offset"
+_EXTERNAL_WEIGHTS_LENGTH_ATTR = "_external_weights_length"
+# Values of these types have no raw `tensor_content` encoding, so they always
+# stay in the graph.
+_INLINE_ONLY_DTYPES = frozenset([dtypes.string, dtypes.resource,
+                                 dtypes.variant])
+
 
 def _has_no_variables(sess):
   """Determines if the graph has any variables.
@@ -88,7 +116,9 @@ def freeze_graph_with_def_protos(input_graph_def,
                                  input_meta_graph_def=None,
                                  input_saved_model_dir=None,
                                  saved_model_tags=None,
-                                 checkpoint_version=saver_pb2.SaverDef.V2):
+                                 checkpoint_version=saver_pb2.SaverDef.V2,
+                                 streaming=False,
+                                 external_weights_file=None):
   """Converts all variables in a graph and checkpoint into constants.
 
   Args:
@@ -116,9 +146,17 @@ def freeze_graph_with_def_protos(input_graph_def,
                       load, in string format (optional).
     checkpoint_version: Tensorflow variable file format (saver_pb2.SaverDef.V1
                         or saver_pb2.SaverDef.V2)
+    streaming: A Bool whether to read the variables straight from the
+               checkpoint, by node name, and write the frozen graph to
+               `output_graph` a batch at a time instead of restoring them
+               into a Session.
+    external_weights_file: With `streaming`, where to write the values of the
+                           largest constants if the frozen graph would exceed
+                           the 2GB protobuf limit (optional).
 
   Returns:
-    Location of the output_graph_def.
+    Location of the output_graph_def. With `streaming`, the path of the
+    written frozen graph.
   """
   del restore_op_name, filename_tensor_name  # Unused by updated loading code.
 
@@ -142,6 +180,31 @@ def freeze_graph_with_def_protos(input_graph_def,
       for node in input_graph_def.node:
         node.device = ""
 
+  variable_names_whitelist = (
+      variable_names_whitelist.replace(" ", "").split(",")
+      if variable_names_whitelist else None)
+  variable_names_denylist = (
+      variable_names_denylist.replace(" ", "").split(",")
+      if variable_names_denylist else None)
+
+  if streaming:
+    if input_saved_model_dir or initializer_nodes:
+      raise ValueError(
+          "Streaming freezing reads the variables from the checkpoint and "
+          "does not support input_saved_model_dir or initializer_nodes.")
+    if not output_graph:
+      raise ValueError("Streaming freezing needs an output_graph to write to.")
+    _freeze_graph_streaming(
+        input_meta_graph_def.graph_def
+        if input_meta_graph_def else input_graph_def,
+        input_checkpoint,
+        output_node_names.replace(" ", "").split(","),
+        output_graph,
+        variable_names_whitelist=variable_names_whitelist,
+        variable_names_denylist=variable_names_denylist,
+        external_weights_file=external_weights_file)
+    return output_graph
+
   if input_graph_def:
     _ = importer.import_graph_def(input_graph_def, name="")
   with session.Session() as sess:
@@ -210,13 +273,6 @@ def freeze_graph_with_def_protos(input_graph_def,
       if initializer_nodes:
         sess.run(initializer_nodes.replace(" ", "").split(","))
 
-    variable_names_whitelist = (
-        variable_names_whitelist.replace(" ", "").split(",")
-        if variable_names_whitelist else None)
-    variable_names_denylist = (
-        variable_names_denylist.replace(" ", "").split(",")
-        if variable_names_denylist else None)
-
     if input_meta_graph_def:
       output_graph_def = graph_util.convert_variables_to_constants(
           sess,
@@ -240,6 +296,148 @@ def freeze_graph_with_def_protos(input_graph_def,
   return output_graph_def
 
 
+def _freeze_graph_streaming(input_graph_def,
+                            input_checkpoint,
+                            output_node_names,
+                            output_graph,
+                            variable_names_whitelist=None,
+                            variable_names_denylist=None,
+                            external_weights_file=None):
+  """Writes a frozen graph, reading the variables from the checkpoint.
+
+  Only the structure of the graph is held in memory. The variables are read
+  from the checkpoint in graph order, and written out with the nodes around
+  them in batches of about `_STREAMING_BATCH_BYTES`, so the peak memory is a
+  small multiple of the largest variable rather than of the whole model.
+
+  Args:
+    input_graph_def: A `GraphDef`.
+    input_checkpoint: The prefix of the checkpoint to read the variables from.
+    output_node_names: List of the names of the output nodes.
+    output_graph: String where to write the frozen `GraphDef`.
+    variable_names_whitelist: List of the variables to convert (optional).
+    variable_names_denylist: List of the variables not to convert (optional).
+    external_weights_file: String where to write the values of the largest
+      constants if the frozen graph would not fit in a protobuf (optional).
+
+  Raises:
+    ValueError: If a variable is not in the checkpoint, or if the frozen graph
+      is too large and no `external_weights_file` is given.
+  """
+  output_graph_def, variable_names = (
+      convert_to_constants.convert_variables_to_constants_from_checkpoint_graph(
+          input_graph_def,
+          output_node_names,
+          variable_names_allowlist=variable_names_whitelist,
+          variable_names_denylist=variable_names_denylist))
+  # graph_util.convert_variables_to_constants also leaves the versions empty.
+  output_graph_def.versions.Clear()
+
+  reader = py_checkpoint_reader.NewCheckpointReader(input_checkpoint)
+  var_to_shape_map = reader.get_variable_to_shape_map()
+  var_to_dtype_map = reader.get_variable_to_dtype_map()
+  missing = [name for name in variable_names if name not in var_to_shape_map]
+  if missing:
+    raise ValueError(
+        "Variables %s were not found in checkpoint '%s'. Streaming freezing "
+        "looks variables up by node name, and does not support partitioned "
+        "variables." % (missing, input_checkpoint))
+
+  # Decide up front which values go to the external weights file, so that
+  # nothing is written if the graph can not be frozen. The largest values are
+  # moved out first.
+  value_sizes = {}
+  for name in variable_names:
+    dtype = var_to_dtype_map[name]
+    if dtype not in _INLINE_ONLY_DTYPES:
+      value_sizes[name] = (
+          int(np.prod(var_to_shape_map[name], dtype=np.int64)) * dtype.size)
+  graph_bytes = output_graph_def.ByteSize() + sum(
+      value_sizes.values()) + _CONSTANT_OVERHEAD_BYTES * len(variable_names)
+  external_names = set()
+  for name in sorted(value_sizes, key=value_sizes.get, reverse=True):
+    if graph_bytes <= _MAX_GRAPH_DEF_BYTES:
+      break
+    external_names.add(name)
+    graph_bytes -= value_sizes[name]
+  if external_names and not external_weights_file:
+    raise ValueError(
+        "The frozen graph would be larger than the %d bytes a protobuf can "
+        "hold. Pass an external_weights_file to store the largest constants "
+        "separately." % _MAX_GRAPH_DEF_BYTES)
+
+  variable_names = set(variable_names)
+  weights_file = None
+  if external_names:
+    weights_file = gfile.GFile(external_weights_file, "wb")
+  weights_offset = 0
+  try:
+    with gfile.GFile(output_graph, "wb") as f:
+      # Concatenated GraphDefs parse as one GraphDef holding all their nodes,
+      # so the graph can be written in batches of nodes.
+      batch = graph_pb2.GraphDef()
+      batch_bytes = 0
+      for node in output_graph_def.node:
+        output_node = batch.node.add()
+        output_node.CopyFrom(node)
+        if node.op != "Const" or node.name not in variable_names:
+          continue
+        value = reader.get_tensor(node.name)
+        if node.name in external_names:
+          # Write the raw bytes directly: make_tensor_proto can not hold more
+          # than 2GB, and only uses `tensor_content` for some values.
+          content = np.ascontiguousarray(value).tobytes()
+          del value
+          weights_file.write(content)
+          output_node.attr[_EXTERNAL_WEIGHTS_OFFSET_ATTR].i = weights_offset
+          output_node.attr[_EXTERNAL_WEIGHTS_LENGTH_ATTR].i = len(content)
+          weights_offset += len(content)
+          del content
+          tensor = tensor_pb2.TensorProto(
+              dtype=var_to_dtype_map[node.name].as_datatype_enum,
+              tensor_shape=tensor_shape.as_shape(
+                  var_to_shape_map[node.name]).as_proto())
+        else:
+          tensor = tensor_util.make_tensor_proto(value)
+          del value
+        output_node.attr["value"].tensor.CopyFrom(tensor)
+        batch_bytes += tensor.ByteSize()
+        del tensor
+        if batch_bytes >= _STREAMING_BATCH_BYTES:
+          f.write(batch.SerializeToString())
+          del batch.node[:]
+          batch_bytes = 0
+      if output_graph_def.HasField("library"):
+        batch.library.CopyFrom(output_graph_def.library)
+      f.write(batch.SerializeToString())
+  finally:
+    if weights_file is not None:
+      weights_file.close()
+
+
+def load_external_weights(graph_def, external_weights_file):
+  """Reads the constants stored in an external weights file into a graph.
+
+  Args:
+    graph_def: A `GraphDef` frozen with an `external_weights_file`. It is
+      modified in place.
+    external_weights_file: String of the weights file written with the graph.
+
+  Returns:
+    The `graph_def`, with the values of all its constants.
+  """
+  with gfile.GFile(external_weights_file, "rb") as f:
+    for node in graph_def.node:
+      if _EXTERNAL_WEIGHTS_OFFSET_ATTR not in node.attr:
+        continue
+      f.seek(node.attr[_EXTERNAL_WEIGHTS_OFFSET_ATTR].i)
+      node.attr["value"].tensor.tensor_content = f.read(
+          node.attr[_EXTERNAL_WEIGHTS_LENGTH_ATTR].i)
+      del node.attr[_EXTERNAL_WEIGHTS_OFFSET_ATTR]
+      del node.attr[_EXTERNAL_WEIGHTS_LENGTH_ATTR]
+  return graph_def
+
+
 def _parse_input_graph_proto(input_graph, input_binary):
   """Parses input tensorflow graph into GraphDef proto."""
   if not gfile.Exists(input_graph):
@@ -298,7 +496,9 @@ def freeze_graph(input_graph,
                  input_meta_graph=None,
                  input_saved_model_dir=None,
                  saved_model_tags=tag_constants.SERVING,
-                 checkpoint_version=saver_pb2.SaverDef.V2):
+                 checkpoint_version=saver_pb2.SaverDef.V2,
+                 streaming=False,
+                 external_weights_file=None):
   """Converts all variables in a graph and checkpoint into constants.
 
   Args:
@@ -327,6 +527,11 @@ def freeze_graph(input_graph,
                       load, in string format.
     checkpoint_version: Tensorflow variable file format (saver_pb2.SaverDef.V1
                         or saver_pb2.SaverDef.V2).
+    streaming: A Bool whether to read the variables straight from the
+               checkpoint and write the frozen graph a batch at a time.
+    external_weights_file: With `streaming`, where to write the largest
+                           constants if the frozen graph would exceed the 2GB
+                           protobuf limit (optional).
   Returns:
     String that is the location of frozen GraphDef.
   """
@@ -358,7 +563,9 @@ def freeze_graph(input_graph,
       input_meta_graph_def,
       input_saved_model_dir,
       [tag for tag in saved_model_tags.replace(" ", "").split(",") if tag],
-      checkpoint_version=checkpoint_version)
+      checkpoint_version=checkpoint_version,
+      streaming=streaming,
+      external_weights_file=external_weights_file)
 
 
 def main(unused_args, flags):
@@ -375,7 +582,8 @@ def main(unused_args, flags):
                flags.output_graph, flags.clear_devices, flags.initializer_nodes,
                flags.variable_names_whitelist, flags.variable_names_denylist,
                flags.input_meta_graph, flags.input_saved_model_dir,
-               flags.saved_model_tags, checkpoint_version)
+               flags.saved_model_tags, checkpoint_version, flags.streaming,
+               flags.external_weights_file)
 
 
 def run_main():
@@ -481,6 +689,25 @@ def run_main():
       separated by \',\'. For tag-set contains multiple tags, all tags \
       must be passed in.\
       """)
+  parser.add_argument(
+      "--streaming",
+      nargs="?",
+      const=True,
+      type="bool",
+      default=False,
+      help="""\
+      Whether to read the variables straight from the checkpoint and write \
+      the frozen graph a batch at a time, for models too large to restore \
+      into a Session.\
+      """)
+  parser.add_argument(
+      "--external_weights_file",
+      type=str,
+      default="",
+      help="""\
+      With --streaming, file where to write the largest constants if the \
+      frozen graph would exceed the 2GB protobuf limit.\
+      """)
   flags, unparsed = parser.parse_known_args()
 
   my_main = lambda unused_args: main(unused_args, flags)
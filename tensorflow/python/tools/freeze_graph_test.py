@@ -22,6 +22,7 @@ import os
 import re
 
 from absl.testing import parameterized
+import numpy as np
 
 from tensorflow.core.example import example_pb2
 from tensorflow.core.framework import graph_pb2
@@ -31,12 +32,14 @@ from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import graph_io
 from tensorflow.python.framework import importer
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_util
 from tensorflow.python.framework import test_util
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import nn
 from tensorflow.python.ops import parsing_ops
 from tensorflow.python.ops import partitioned_variables
+from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
@@ -275,6 +278,146 @@ class FreezeGraphTest(test_util.TensorFlowTestCase, parameterized.TestCase):
         output = sess.run(output_node, feed_dict={input_node: [example]})
         self.assertNear(feature_value, output, 0.00001)
 
+  def _writeModelForStreaming(self):
+    """Writes a graph with a reference and a resource variable."""
+    checkpoint_prefix = os.path.join(self.get_temp_dir(), "saved_checkpoint")
+    with ops.Graph().as_default():
+      weights = variables.VariableV1(
+          np.arange(1000, dtype=np.float32).reshape(10, 100), name="weights")
+      bias = resource_variable_ops.ResourceVariable(
+          np.ones(100, dtype=np.float32), name="bias")
+      inputs = array_ops.placeholder(dtypes.float32, [None, 10], name="inputs")
+      math_ops.add(math_ops.matmul(inputs, weights), bias, name="output_node")
+      with session.Session() as sess:
+        sess.run(variables.global_variables_initializer())
+        checkpoint_path = saver_lib.Saver().save(sess, checkpoint_prefix)
+      return ops.get_default_graph().as_graph_def(), checkpoint_path
+
+  def _freezeGraph(self, input_graph_def, checkpoint_path, output_graph,
+                   **kwargs):
+    with ops.Graph().as_default():
+      freeze_graph.freeze_graph_with_def_protos(
+          input_graph_def=input_graph_def,
+          input_saver_def=None,
+          input_checkpoint=checkpoint_path,
+          output_node_names="output_node",
+          restore_op_name="save/restore_all",
+          filename_tensor_name="save/Const:0",
+          output_graph=output_graph,
+          clear_devices=False,
+          initializer_nodes="",
+          **kwargs)
+    output_graph_def = graph_pb2.GraphDef()
+    with open(output_graph, "rb") as f:
+      output_graph_def.ParseFromString(f.read())
+    return output_graph_def
+
+  def testFreezeGraphStreaming(self):
+    input_graph_def, checkpoint_path = self._writeModelForStreaming()
+    expected = self._freezeGraph(
+        input_graph_def, checkpoint_path,
+        os.path.join(self.get_temp_dir(), "expected_graph.pb"))
+
+    with test.mock.patch.object(freeze_graph, "_STREAMING_BATCH_BYTES", 1):
+      output = self._freezeGraph(
+          input_graph_def, checkpoint_path,
+          os.path.join(self.get_temp_dir(), "output_graph.pb"),
+          streaming=True)
+    self.assertProtoEquals(expected, output)
+
+  def testFreezeGraphStreamingExternalWeights(self):
+    input_graph_def, checkpoint_path = self._writeModelForStreaming()
+    expected = self._freezeGraph(
+        input_graph_def, checkpoint_path,
+        os.path.join(self.get_temp_dir(), "expected_graph.pb"))
+    output_graph = os.path.join(self.get_temp_dir(), "output_graph.pb")
+    weights_file = os.path.join(self.get_temp_dir(), "weights.bin")
+
+    with test.mock.patch.object(freeze_graph, "_MAX_GRAPH_DEF_BYTES", 2048):
+      with self.assertRaisesRegex(ValueError, "external_weights_file"):
+        self._freezeGraph(
+            input_graph_def, checkpoint_path, output_graph, streaming=True)
+      output = self._freezeGraph(
+          input_graph_def, checkpoint_path, output_graph, streaming=True,
+          external_weights_file=weights_file)
+
+    # Only the 4000 bytes of weights had to be moved out of the graph.
+    self.assertEqual(4000, os.path.getsize(weights_file))
+    self.assertLess(output.ByteSize(), 2048)
+    self.assertProtoEquals(
+        expected, freeze_graph.load_external_weights(output, weights_file))
+
+  def testFreezeGraphStreamingExternalWeightsAboveProtoLimit(self):
+    checkpoint_prefix = os.path.join(self.get_temp_dir(), "saved_checkpoint")
+    with ops.Graph().as_default():
+      weights = variables.VariableV1(
+          np.arange(1000, dtype=np.float32).reshape(10, 100), name="weights")
+      mask = variables.VariableV1(
+          np.arange(1000).reshape(10, 100) % 3 == 0, name="mask")
+      scale = variables.VariableV1(np.float32(2.), name="scale")
+      inputs = array_ops.placeholder(dtypes.float32, [None, 10], name="inputs")
+      masked_weights = array_ops.where(mask, weights,
+                                       array_ops.zeros_like(weights))
+      math_ops.multiply(
+          math_ops.matmul(inputs, masked_weights), scale, name="output_node")
+      with session.Session() as sess:
+        sess.run(variables.global_variables_initializer())
+        checkpoint_path = saver_lib.Saver().save(sess, checkpoint_prefix)
+      input_graph_def = ops.get_default_graph().as_graph_def()
+    expected = self._freezeGraph(
+        input_graph_def, checkpoint_path,
+        os.path.join(self.get_temp_dir(), "expected_graph.pb"))
+    output_graph = os.path.join(self.get_temp_dir(), "output_graph.pb")
+    weights_file = os.path.join(self.get_temp_dir(), "weights.bin")
+
+    make_tensor_proto = tensor_util.make_tensor_proto
+
+    def make_small_tensor_proto(values, *args, **kwargs):
+      # Scaled down version of the 2GB limit of make_tensor_proto.
+      if np.asarray(values).nbytes > 64:
+        raise ValueError("Cannot create a tensor proto whose content is "
+                         "larger than 64 bytes.")
+      return make_tensor_proto(values, *args, **kwargs)
+
+    # Every value is moved out of the graph, including the bool mask and the
+    # scalar, which make_tensor_proto does not store in `tensor_content`.
+    with test.mock.patch.object(freeze_graph, "_MAX_GRAPH_DEF_BYTES", 64):
+      with test.mock.patch.object(tensor_util, "make_tensor_proto",
+                                  make_small_tensor_proto):
+        output = self._freezeGraph(
+            input_graph_def, checkpoint_path, output_graph, streaming=True,
+            external_weights_file=weights_file)
+
+    self.assertEqual(4000 + 1000 + 4, os.path.getsize(weights_file))
+    freeze_graph.load_external_weights(output, weights_file)
+    expected_values = {
+        node.name: tensor_util.MakeNdarray(node.attr["value"].tensor)
+        for node in expected.node if node.op == "Const"
+    }
+    output_values = {
+        node.name: tensor_util.MakeNdarray(node.attr["value"].tensor)
+        for node in output.node if node.op == "Const"
+    }
+    self.assertCountEqual(expected_values, output_values)
+    for name, value in expected_values.items():
+      self.assertEqual(value.dtype, output_values[name].dtype)
+      self.assertAllEqual(value, output_values[name])
+
+  def testFreezeGraphStreamingMissingVariable(self):
+    input_graph_def, _ = self._writeModelForStreaming()
+    with ops.Graph().as_default():
+      variables.VariableV1(1.0, name="weights")
+      with session.Session() as sess:
+        sess.run(variables.global_variables_initializer())
+        other_checkpoint_path = saver_lib.Saver().save(
+            sess, os.path.join(self.get_temp_dir(), "other_checkpoint"))
+
+    with self.assertRaisesRegex(ValueError, "bias"):
+      self._freezeGraph(
+          input_graph_def, other_checkpoint_path,
+          os.path.join(self.get_temp_dir(), "output_graph.pb"),
+          streaming=True)
+
   def testSinglePartitionedVariable(self):
     """Ensures partitioned variables fail cleanly with freeze graph."""
     checkpoint_prefix = os.path.join(self.get_temp_dir(), "saved_checkpoint")
@@ -23,8 +23,10 @@ import sys
 
 import numpy as np
 
+from tensorflow.python.framework import errors_impl
 from tensorflow.python.platform import app
 from tensorflow.python.platform import flags
+from tensorflow.python.training import mapped_checkpoint_reader
 from tensorflow.python.training import py_checkpoint_reader
 
 FLAGS = None
@@ -54,6 +56,15 @@ def _count_total_params(reader, count_exclude_pattern=""):
   return np.sum(var_sizes, dtype=int)
 
 
+def _get_tensors(file_name, reader, tensor_names):
+  """Gets the values of `tensor_names`, memory-mapping local V2 checkpoints."""
+  try:
+    mapped_reader = mapped_checkpoint_reader.MappedCheckpointReader(file_name)
+  except errors_impl.OpError:
+    return {name: reader.get_tensor(name) for name in tensor_names}
+  return mapped_reader.get_tensors(tensor_names)
+
+
 def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors,
                                      all_tensor_names=False,
                                      count_exclude_pattern=""):
@@ -76,10 +87,12 @@ def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors,
     if all_tensors or all_tensor_names:
       var_to_shape_map = reader.get_variable_to_shape_map()
       var_to_dtype_map = reader.get_variable_to_dtype_map()
+      if all_tensors:
+        tensors = _get_tensors(file_name, reader, var_to_shape_map.keys())
       for key, value in sorted(var_to_shape_map.items()):
         print("tensor: %s (%s) %s" % (key, var_to_dtype_map[key].name, value))
         if all_tensors:
-          print(reader.get_tensor(key))
+          print(tensors[key])
     elif not tensor_name:
       print(reader.debug_string().decode("utf-8", errors="ignore"))
     else:
@@ -49,7 +49,6 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
-import math
 import re
 
 import numpy as np
@@ -59,6 +58,7 @@ from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import node_def_pb2
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import graph_util
+from tensorflow.python.framework import graph_util_impl
 from tensorflow.python.framework import tensor_util
 from tensorflow.python.platform import flags as flags_lib
 from tensorflow.python.platform import tf_logging
@@ -135,17 +135,19 @@ def ensure_graph_is_valid(graph_def):
   Raises:
     ValueError: If the graph is incorrectly constructed.
   """
-  node_map = {}
-  for node in graph_def.node:
-    if node.name not in node_map:
-      node_map[node.name] = node
-    else:
-      raise ValueError("Duplicate node names detected for ", node.name)
-  for node in graph_def.node:
-    for input_name in node.input:
-      input_node_name = node_name_from_input(input_name)
-      if input_node_name not in node_map:
-        raise ValueError("Input for ", node.name, " not found: ", input_name)
+  index = _index_graph(graph_def)
+  for i, input_name in index.missing_inputs:
+    raise ValueError("Input for ", index.nodes[i].name, " not found: ",
+                     input_name)
+
+
+def _index_graph(graph_def):
+  """Indexes `graph_def`, raising a `ValueError` on duplicate node names."""
+  index = graph_util_impl._GraphDefIndex(graph_def)  # pylint: disable=protected-access
+  if index.duplicate_names:
+    raise ValueError("Duplicate node names detected for ",
+                     index.duplicate_names[0])
+  return index
 
 
 def node_name_from_input(node_name):
@@ -228,12 +230,7 @@ def fold_batch_norms(input_graph_def):
   Raises:
     ValueError: If the graph is badly formed with duplicate node names.
   """
-  input_node_map = {}
-  for node in input_graph_def.node:
-    if node.name not in input_node_map:
-      input_node_map[node.name] = node
-    else:
-      raise ValueError("Duplicate node names detected for ", node.name)
+  input_node_map = _index_graph(input_graph_def).name_to_node
 
   nodes_to_skip = {}
   new_ops = []
@@ -345,29 +342,20 @@ def fold_batch_norms(input_graph_def):
     if bias is not None:
       nodes_to_skip[add_op.name] = True
 
+    # The square root and the scaling are computed in double precision, and
+    # the weights rounded back to their own type once. This is what the former
+    # per-element `weight *= scale` loop did too: a 0-d float32 array times a
+    # float64 scalar is computed in float64, and only the result is rounded.
+    scale_value = 1.0 / np.sqrt(
+        np.asarray(var_value + variance_epsilon_value, dtype=np.float64))
     if scale_after_normalization(node):
-      scale_value = (
-          (1.0 / np.vectorize(math.sqrt)(var_value + variance_epsilon_value)) *
-          gamma_value)
-    else:
-      scale_value = (
-          1.0 / np.vectorize(math.sqrt)(var_value + variance_epsilon_value))
+      scale_value = scale_value * gamma_value
     offset_value = (-mean_value * scale_value) + beta_value
-    scaled_weights = np.copy(weights)
-    it = np.nditer(
-        scaled_weights, flags=["multi_index"], op_flags=["readwrite"])
     if conv_op.op == "Conv2D":
-      while not it.finished:
-        current_scale = scale_value[it.multi_index[3]]
-        it[0] *= current_scale
-        it.iternext()
+      channel_scale = scale_value
     elif conv_op.op == "DepthwiseConv2dNative":
-      channel_multiplier = weights.shape[3]
-      while not it.finished:
-        current_scale = scale_value[it.multi_index[2] * channel_multiplier +
-                                    it.multi_index[3]]
-        it[0] *= current_scale
-        it.iternext()
+      channel_scale = scale_value.reshape(weights.shape[2], weights.shape[3])
+    scaled_weights = (weights * channel_scale).astype(weights.dtype)
     scaled_weights_op = node_def_pb2.NodeDef()
     scaled_weights_op.op = "Const"
     scaled_weights_op.name = conv_op.name + "_weights"
@@ -436,18 +424,12 @@ def fuse_resize_and_conv(input_graph_def, output_node_names):
     ValueError: If the graph is badly formed with duplicate node names.
   """
 
-  input_node_map = {}
-  for node in input_graph_def.node:
-    if node.name not in input_node_map:
-      input_node_map[node.name] = node
-    else:
-      raise ValueError("Duplicate node names detected for ", node.name)
+  index = _index_graph(input_graph_def)
+  input_node_map = index.name_to_node
 
   node_reference_count = collections.defaultdict(int)
-  for node in input_graph_def.node:
-    for input_name in node.input:
-      stripped_name = node_name_from_input(input_name)
-      node_reference_count[stripped_name] += 1
+  for name, i in index.name_to_index.items():
+    node_reference_count[name] = len(index.consumers[i])
   for output_name in output_node_names:
     node_reference_count[output_name] += 1
 
@@ -172,6 +172,54 @@ class OptimizeForInferenceTest(test.TestCase):
     for node in optimized_graph_def.node:
       self.assertNotEqual("BatchNormWithGlobalNormalization", node.op)
 
+  def testFoldBatchNormsWeightsRounding(self):
+    rng = np.random.RandomState(0)
+    weights = rng.randn(2, 2, 3, 4).astype(np.float32)
+    mean = rng.randn(4).astype(np.float32)
+    variance = rng.rand(4).astype(np.float32)
+    beta = rng.randn(4).astype(np.float32)
+    gamma = rng.randn(4).astype(np.float32)
+    epsilon = 0.001
+
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend([
+        self.create_node_def("Placeholder", "input", []),
+        self.create_constant_node_def(
+            "weights", weights, dtypes.float32, weights.shape),
+        self.create_node_def("Conv2D", "conv_op", ["input", "weights"]),
+        self.create_constant_node_def("mean", mean, dtypes.float32, [4]),
+        self.create_constant_node_def(
+            "variance", variance, dtypes.float32, [4]),
+        self.create_constant_node_def("beta", beta, dtypes.float32, [4]),
+        self.create_constant_node_def("gamma", gamma, dtypes.float32, [4]),
+    ])
+    bn_node = self.create_node_def(
+        "BatchNormWithGlobalNormalization", "output",
+        ["conv_op", "mean", "variance", "beta", "gamma"])
+    bn_node.attr["variance_epsilon"].CopyFrom(
+        attr_value_pb2.AttrValue(f=epsilon))
+    bn_node.attr["scale_after_normalization"].CopyFrom(
+        attr_value_pb2.AttrValue(b=True))
+    graph_def.node.extend([bn_node])
+
+    optimized_graph_def = optimize_for_inference_lib.fold_batch_norms(
+        graph_def)
+    scaled_weights_node, = [
+        node for node in optimized_graph_def.node
+        if node.name == "conv_op_weights"
+    ]
+    scaled_weights = tensor_util.MakeNdarray(
+        scaled_weights_node.attr["value"].tensor)
+
+    # The weights are scaled one by one in double precision, and rounded once.
+    scale = 1.0 / np.sqrt(
+        (variance + np.float32(epsilon)).astype(np.float64)) * gamma
+    expected = np.copy(weights)
+    for index in np.ndindex(*weights.shape):
+      expected[index] = np.float64(weights[index]) * scale[index[3]]
+    self.assertEqual(np.float32, scaled_weights.dtype)
+    self.assertAllEqual(expected, scaled_weights)
+
   @test_util.run_deprecated_v1
   def testFoldFusedBatchNorms(self):
     for data_format, use_gpu, conv2d_func in [
@@ -18,14 +18,12 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-import copy
 
 from google.protobuf import text_format
 
 from tensorflow.core.framework import attr_value_pb2
 from tensorflow.core.framework import graph_pb2
-from tensorflow.core.framework import node_def_pb2
-from tensorflow.python.framework import graph_util
+from tensorflow.python.framework import graph_util_impl
 from tensorflow.python.platform import gfile
 
 
@@ -46,7 +44,8 @@ def strip_unused(input_graph_def, input_node_names, output_node_names,
   Raises:
     ValueError: If any element in `input_node_names` refers to a tensor instead
       of an operation.
-    KeyError: If any element in `input_node_names` is not found in the graph.
+    KeyError: If any element in `input_node_names` is not found in the graph,
+      or if a node that is kept has an input which is not in the graph.
   """
   for name in input_node_names:
     if ":" in name:
@@ -54,38 +53,45 @@ def strip_unused(input_graph_def, input_node_names, output_node_names,
                        "not a Operation." % name)
 
   # Here we replace the nodes we're going to override as inputs with
-  # placeholders so that any unused nodes that are inputs to them are
-  # automatically stripped out by extract_sub_graph().
-  not_found = {name for name in input_node_names}
-  inputs_replaced_graph_def = graph_pb2.GraphDef()
-  for node in input_graph_def.node:
-    if node.name in input_node_names:
-      not_found.remove(node.name)
-      placeholder_node = node_def_pb2.NodeDef()
-      placeholder_node.op = "Placeholder"
-      placeholder_node.name = node.name
-      if isinstance(placeholder_type_enum, list):
-        input_node_index = input_node_names.index(node.name)
-        placeholder_node.attr["dtype"].CopyFrom(
-            attr_value_pb2.AttrValue(type=placeholder_type_enum[
-                input_node_index]))
-      else:
-        placeholder_node.attr["dtype"].CopyFrom(
-            attr_value_pb2.AttrValue(type=placeholder_type_enum))
-      if "_output_shapes" in node.attr:
-        placeholder_node.attr["_output_shapes"].CopyFrom(node.attr[
-            "_output_shapes"])
-      if "shape" in node.attr:
-        placeholder_node.attr["shape"].CopyFrom(node.attr["shape"])
-      inputs_replaced_graph_def.node.extend([placeholder_node])
-    else:
-      inputs_replaced_graph_def.node.extend([copy.deepcopy(node)])
-
+  # placeholders, and keep the nodes the outputs can be reached from without
+  # going through them.
+  index = graph_util_impl._GraphDefIndex(input_graph_def, colocation_edges=True)  # pylint: disable=protected-access
+  not_found = {name for name in input_node_names
+               if name not in index.name_to_index}
   if not_found:
     raise KeyError("The following input nodes were not found: %s" % not_found)
-
-  output_graph_def = graph_util.extract_sub_graph(inputs_replaced_graph_def,
-                                                  output_node_names)
+  graph_util_impl._assert_nodes_are_present(index.name_to_node,  # pylint: disable=protected-access
+                                            output_node_names)
+
+  input_node_names_set = set(input_node_names)
+  nodes_to_keep = index.reachable(output_node_names,
+                                  stop_nodes=input_node_names)
+  # The inputs of the input nodes are dropped with them.
+  index.assert_inputs_are_present(
+      i for i in nodes_to_keep
+      if index.nodes[i].name not in input_node_names_set)
+  output_graph_def = graph_pb2.GraphDef()
+  for i in nodes_to_keep:
+    node = index.nodes[i]
+    if node.name not in input_node_names_set:
+      output_graph_def.node.add().CopyFrom(node)
+      continue
+    placeholder_node = output_graph_def.node.add()
+    placeholder_node.op = "Placeholder"
+    placeholder_node.name = node.name
+    if isinstance(placeholder_type_enum, list):
+      input_node_index = input_node_names.index(node.name)
+      placeholder_node.attr["dtype"].CopyFrom(
+          attr_value_pb2.AttrValue(type=placeholder_type_enum[
+              input_node_index]))
+    else:
+      placeholder_node.attr["dtype"].CopyFrom(
+          attr_value_pb2.AttrValue(type=placeholder_type_enum))
+    if "_output_shapes" in node.attr:
+      placeholder_node.attr["_output_shapes"].CopyFrom(node.attr[
+          "_output_shapes"])
+    if "shape" in node.attr:
+      placeholder_node.attr["shape"].CopyFrom(node.attr["shape"])
   return output_graph_def
 
 
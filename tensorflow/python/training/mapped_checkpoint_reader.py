@@ -0,0 +1,320 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Memory-mapped reader for V2 (tensor bundle) checkpoints.
+
+`CheckpointReader.get_tensor` copies every tensor out of the checkpoint, one
+tensor at a time. For local V2 checkpoints, `MappedCheckpointReader` instead
+memory-maps the data shards and returns read-only NumPy views on them, so
+that tensors are only paged in when (and if) they are read.
+
+Tensors that cannot be viewed in place (strings, partitioned tensors, or
+checkpoints written on a platform of a different endianness) are read through
+the regular `CheckpointReader`.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+from concurrent import futures
+import mmap
+import os
+import struct
+import threading
+
+import numpy as np
+
+from tensorflow.core.protobuf import tensor_bundle_pb2
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors_impl
+from tensorflow.python.training import py_checkpoint_reader
+from tensorflow.python.util import compat
+
+# See tensorflow/core/lib/io/format.h.
+_TABLE_MAGIC_NUMBER = 0xdb4775248b80fb57
+_FOOTER_LENGTH = 48
+_NO_COMPRESSION = 0
+
+# Dtypes whose bundle encoding is not the raw array bytes.
+_UNMAPPABLE_DTYPES = frozenset([dtypes.string, dtypes.resource, dtypes.variant])
+
+
+def _decode_varint(buf, pos):
+  """Decodes a varint from `buf` at `pos`, returning `(value, new_pos)`."""
+  result = 0
+  shift = 0
+  while True:
+    byte = buf[pos]
+    pos += 1
+    result |= (byte & 0x7f) << shift
+    if not byte & 0x80:
+      return result, pos
+    shift += 7
+
+
+def _iter_block(buf, offset, size):
+  """Yields the `(key, value)` entries of the table block at `offset`."""
+  block_type = buf[offset + size]
+  if block_type != _NO_COMPRESSION:
+    raise errors_impl.UnimplementedError(
+        None, None, "Compressed checkpoint index blocks are not supported.")
+  num_restarts, = struct.unpack_from("<I", buf, offset + size - 4)
+  end = offset + size - 4 * (num_restarts + 1)
+  pos = offset
+  key = b""
+  while pos < end:
+    shared, pos = _decode_varint(buf, pos)
+    non_shared, pos = _decode_varint(buf, pos)
+    value_length, pos = _decode_varint(buf, pos)
+    key = key[:shared] + bytes(buf[pos:pos + non_shared])
+    pos += non_shared
+    yield key, buf[pos:pos + value_length]
+    pos += value_length
+
+
+def _read_bundle_index(index_path):
+  """Reads the header and entries of the bundle index at `index_path`.
+
+  Args:
+    index_path: Path of the `.index` file of a V2 checkpoint.
+
+  Returns:
+    A tuple `(header, entries)` of the `BundleHeaderProto` and a dict mapping
+    tensor names to their `BundleEntryProto`.
+
+  Raises:
+    DataLossError: If `index_path` is not a table file.
+  """
+  with open(index_path, "rb") as f:
+    buf = f.read()
+  if len(buf) < _FOOTER_LENGTH:
+    raise errors_impl.DataLossError(
+        None, None, "%s is too short to be a checkpoint index." % index_path)
+  footer = len(buf) - _FOOTER_LENGTH
+  magic_lo, magic_hi = struct.unpack_from("<II", buf, len(buf) - 8)
+  if (magic_hi << 32) | magic_lo != _TABLE_MAGIC_NUMBER:
+    raise errors_impl.DataLossError(
+        None, None, "%s is not a checkpoint index (bad magic number)." %
+        index_path)
+  buf = memoryview(buf)
+  _, pos = _decode_varint(buf, footer)  # Metaindex offset.
+  _, pos = _decode_varint(buf, pos)  # Metaindex size.
+  index_offset, pos = _decode_varint(buf, pos)
+  index_size, pos = _decode_varint(buf, pos)
+
+  header = tensor_bundle_pb2.BundleHeaderProto()
+  entries = {}
+  for _, handle in _iter_block(buf, index_offset, index_size):
+    block_offset, pos = _decode_varint(handle, 0)
+    block_size, _ = _decode_varint(handle, pos)
+    for key, value in _iter_block(buf, block_offset, block_size):
+      if not key:
+        header.ParseFromString(value.tobytes())
+      elif key.startswith(b"\x00"):
+        # Slice of a partitioned tensor, see EncodeTensorNameSlice in
+        # tensorflow/core/util/saved_tensor_slice_util.cc. These are only read
+        # as part of their full tensor.
+        continue
+      else:
+        entry = tensor_bundle_pb2.BundleEntryProto()
+        entry.ParseFromString(value.tobytes())
+        entries[compat.as_str(key)] = entry
+  return header, entries
+
+
+class MappedCheckpointReader(object):
+  """Reads tensors of a local V2 checkpoint through memory-mapped data shards.
+
+  `get_tensor` returns a read-only NumPy array backed by the checkpoint's data
+  file rather than a copy; pages are loaded lazily by the operating system.
+  Unlike `CheckpointReader`, the CRC32C checksums of the tensors are not
+  verified.
+
+  Example:
+
+  ```python
+  reader = MappedCheckpointReader("/tmp/model/ckpt-10")
+  kernel = reader.get_tensor("layer/kernel/.ATTRIBUTES/VARIABLE_VALUE")
+  values = reader.get_tensors(reader.get_variable_to_shape_map().keys())
+  ```
+
+  Args:
+    prefix: The checkpoint prefix, i.e. the path of the `.index` file without
+      its extension.
+
+  Raises:
+    NotFoundError: If `prefix` is not the prefix of a local V2 checkpoint.
+  """
+
+  def __init__(self, prefix):
+    prefix = compat.as_str(prefix)
+    if prefix.endswith(".index"):
+      prefix = prefix[:-len(".index")]
+    index_path = prefix + ".index"
+    if not os.path.isfile(index_path):
+      raise errors_impl.NotFoundError(
+          None, None,
+          "%s is not the prefix of a local V2 checkpoint." % prefix)
+    self._prefix = prefix
+    self._header, self._entries = _read_bundle_index(index_path)
+    self._shards = {}
+    self._shards_lock = threading.Lock()
+    self._fallback_reader = None
+
+  def _get_shard(self, shard_id):
+    """Returns the memory map of data shard `shard_id`, mapping it if needed."""
+    with self._shards_lock:
+      shard = self._shards.get(shard_id)
+      if shard is None:
+        # See DataFilename in tensorflow/core/util/tensor_bundle/naming.cc.
+        path = "%s.data-%05d-of-%05d" % (self._prefix, shard_id,
+                                         self._header.num_shards)
+        with open(path, "rb") as f:
+          if os.fstat(f.fileno()).st_size:
+            shard = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+          else:
+            shard = b""
+        self._shards[shard_id] = shard
+      return shard
+
+  def _get_fallback_reader(self):
+    if self._fallback_reader is None:
+      self._fallback_reader = py_checkpoint_reader.NewCheckpointReader(
+          self._prefix)
+    return self._fallback_reader
+
+  def _get_entry(self, tensor_str):
+    entry = self._entries.get(compat.as_str(tensor_str))
+    if entry is None:
+      raise errors_impl.NotFoundError(
+          None, None, "Key %s not found in checkpoint" % tensor_str)
+    return entry
+
+  def _is_mappable(self, entry):
+    return (not entry.slices and
+            dtypes.as_dtype(entry.dtype) not in _UNMAPPABLE_DTYPES and
+            self._header.endianness == self._header.LITTLE)
+
+  def has_tensor(self, tensor_str):
+    return compat.as_str(tensor_str) in self._entries
+
+  def get_variable_to_shape_map(self):
+    return {
+        name: [dim.size for dim in entry.shape.dim]
+        for name, entry in self._entries.items()
+    }
+
+  def get_variable_to_dtype_map(self):
+    return {
+        name: dtypes.as_dtype(entry.dtype)
+        for name, entry in self._entries.items()
+    }
+
+  def get_tensor(self, tensor_str):
+    """Returns the value of the tensor `tensor_str`.
+
+    Args:
+      tensor_str: Name of the tensor.
+
+    Returns:
+      A read-only `np.ndarray` backed by the checkpoint data file, or a copy
+      if the tensor cannot be memory-mapped.
+
+    Raises:
+      NotFoundError: If the checkpoint has no tensor `tensor_str`.
+    """
+    entry = self._get_entry(tensor_str)
+    if not self._is_mappable(entry):
+      return self._get_fallback_reader().get_tensor(tensor_str)
+    dtype = dtypes.as_dtype(entry.dtype).as_numpy_dtype
+    shape = [dim.size for dim in entry.shape.dim]
+    shard = self._get_shard(entry.shard_id)
+    value = np.frombuffer(
+        shard, dtype=dtype, count=int(np.prod(shape, dtype=np.int64)),
+        offset=entry.offset)
+    return value.reshape(shape)
+
+  def get_tensors(self, tensor_strs, copy=False, max_workers=None):
+    """Returns the values of several tensors, reading shards concurrently.
+
+    Tensors are grouped by data shard and read in file order. With
+    `copy=False` the tensors are returned as views and the operating system is
+    asked to read their pages ahead; with `copy=True` they are copied into
+    memory by a pool of threads, one task per shard.
+
+    Args:
+      tensor_strs: Iterable of tensor names.
+      copy: Whether to return in-memory copies instead of views on the data
+        files.
+      max_workers: Maximum number of threads used to read the shards. Defaults
+        to the number of shards to read.
+
+    Returns:
+      A dict mapping each name of `tensor_strs` to its value.
+
+    Raises:
+      NotFoundError: If the checkpoint has no tensor with one of the names.
+    """
+    by_shard = collections.defaultdict(list)
+    for name in tensor_strs:
+      name = compat.as_str(name)
+      entry = self._get_entry(name)
+      shard_id = entry.shard_id if self._is_mappable(entry) else None
+      by_shard[shard_id].append((entry.offset, name))
+    if not by_shard:
+      return {}
+
+    def read_shard(shard_id, names):
+      values = {}
+      for _, name in sorted(names):
+        value = self.get_tensor(name)
+        if shard_id is not None:
+          if copy:
+            value = np.array(value)
+          elif hasattr(mmap, "MADV_WILLNEED") and value.nbytes:
+            self._will_need(self._entries[name])
+        values[name] = value
+      return values
+
+    results = {}
+    with futures.ThreadPoolExecutor(
+        max_workers=max_workers or len(by_shard)) as executor:
+      tasks = [executor.submit(read_shard, shard_id, names)
+               for shard_id, names in by_shard.items()]
+      for task in tasks:
+        results.update(task.result())
+    return results
+
+  def _will_need(self, entry):
+    """Advises the kernel that the bytes of `entry` will be read soon."""
+    shard = self._get_shard(entry.shard_id)
+    # madvise ranges must start on a page boundary.
+    start = entry.offset - entry.offset % mmap.PAGESIZE
+    shard.madvise(mmap.MADV_WILLNEED, start, entry.offset + entry.size - start)
+
+  def close(self):
+    """Unmaps the data shards.
+
+    Shards with live views returned by `get_tensor` stay mapped until the views
+    are garbage collected.
+    """
+    with self._shards_lock:
+      for shard in self._shards.values():
+        if isinstance(shard, mmap.mmap):
+          try:
+            shard.close()
+          except BufferError:
+            pass
+      self._shards = {}
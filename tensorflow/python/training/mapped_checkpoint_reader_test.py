@@ -0,0 +1,112 @@
+# Copyright 2020 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for mapped_checkpoint_reader."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import numpy as np
+
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors_impl
+from tensorflow.python.ops import init_ops
+from tensorflow.python.ops import partitioned_variables
+from tensorflow.python.ops import variable_scope
+from tensorflow.python.ops import variables
+from tensorflow.python.platform import test
+from tensorflow.python.training import mapped_checkpoint_reader
+from tensorflow.python.training import py_checkpoint_reader
+from tensorflow.python.training import saver as saver_lib
+
+
+class MappedCheckpointReaderTest(test.TestCase):
+
+  def _create_checkpoint(self):
+    with self.cached_session() as sess:
+      variable_scope.get_variable(
+          "float_var", initializer=np.random.rand(30, 20).astype(np.float32))
+      variable_scope.get_variable(
+          "int_var", initializer=np.arange(10, dtype=np.int64))
+      variable_scope.get_variable(
+          "half_var", initializer=np.ones([3, 3], dtype=np.float16))
+      variable_scope.get_variable(
+          "bfloat16_var", shape=[4], dtype=dtypes.bfloat16,
+          initializer=init_ops.ones_initializer())
+      variable_scope.get_variable("scalar_var", initializer=3.5)
+      variable_scope.get_variable(
+          "string_var", initializer=["a", "bc"], dtype=dtypes.string)
+      variable_scope.get_variable(
+          "partitioned_var", shape=[100, 100],
+          initializer=init_ops.truncated_normal_initializer(0.5),
+          partitioner=partitioned_variables.min_max_variable_partitioner(
+              max_partitions=5, axis=0, min_slice_size=8 << 10))
+      sess.run(variables.global_variables_initializer())
+      return saver_lib.Saver().save(
+          sess, os.path.join(self.get_temp_dir(), "model"))
+
+  def testMatchesCheckpointReader(self):
+    prefix = self._create_checkpoint()
+    reader = mapped_checkpoint_reader.MappedCheckpointReader(prefix)
+    expected_reader = py_checkpoint_reader.NewCheckpointReader(prefix)
+    self.assertEqual(expected_reader.get_variable_to_shape_map(),
+                     reader.get_variable_to_shape_map())
+    self.assertEqual(expected_reader.get_variable_to_dtype_map(),
+                     reader.get_variable_to_dtype_map())
+    for name in expected_reader.get_variable_to_shape_map():
+      self.assertTrue(reader.has_tensor(name))
+      self.assertAllEqual(expected_reader.get_tensor(name),
+                          reader.get_tensor(name))
+    self.assertFalse(reader.has_tensor("missing_var"))
+
+  def testGetTensorReturnsReadOnlyView(self):
+    prefix = self._create_checkpoint()
+    reader = mapped_checkpoint_reader.MappedCheckpointReader(prefix)
+    value = reader.get_tensor("float_var")
+    self.assertEqual((30, 20), value.shape)
+    self.assertEqual(np.float32, value.dtype)
+    self.assertFalse(value.flags.writeable)
+    self.assertFalse(value.flags.owndata)
+
+  def testGetTensors(self):
+    prefix = self._create_checkpoint()
+    reader = mapped_checkpoint_reader.MappedCheckpointReader(prefix)
+    expected_reader = py_checkpoint_reader.NewCheckpointReader(prefix)
+    names = list(expected_reader.get_variable_to_shape_map())
+    for copy in (False, True):
+      values = reader.get_tensors(names, copy=copy)
+      self.assertCountEqual(names, values.keys())
+      for name in names:
+        self.assertAllEqual(expected_reader.get_tensor(name), values[name])
+    self.assertTrue(
+        reader.get_tensors(["float_var"], copy=True)["float_var"].flags.owndata)
+    self.assertEqual({}, reader.get_tensors([]))
+
+  def testErrors(self):
+    prefix = self._create_checkpoint()
+    reader = mapped_checkpoint_reader.MappedCheckpointReader(prefix + ".index")
+    with self.assertRaisesRegex(errors_impl.NotFoundError, "missing_var"):
+      reader.get_tensor("missing_var")
+    with self.assertRaisesRegex(errors_impl.NotFoundError, "missing_var"):
+      reader.get_tensors(["float_var", "missing_var"])
+    with self.assertRaises(errors_impl.NotFoundError):
+      mapped_checkpoint_reader.MappedCheckpointReader(
+          os.path.join(self.get_temp_dir(), "no_checkpoint"))
+
+
+if __name__ == "__main__":
+  test.main()
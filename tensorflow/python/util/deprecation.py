@@ -108,6 +108,44 @@ def _call_location(outer=False):
   return '{}:{}'.format(f.f_code.co_filename, f.f_lineno)
 
 
+def _call_args_getter(func):
+  """Returns a function computing `tf_inspect.getcallargs` for `func`.
+
+  The arg spec of `func` is only inspected once, rather than on every call.
+
+  Args:
+    func: The function whose call arguments are wanted.
+
+  Returns:
+    A function from `(args, kwargs)` to the dict `tf_inspect.getcallargs`
+    returns for `func`, `*args` and `**kwargs`.
+  """
+  arg_spec = tf_inspect.getfullargspec(func)
+  this = getattr(func, 'im_self', None) or getattr(func, '__self__', None)
+  if not (tf_inspect.ismethod(func) and this):
+    this = None
+  defaults = []
+  if arg_spec.defaults:
+    defaults = list(zip(arg_spec.args[-len(arg_spec.defaults):],
+                        arg_spec.defaults))
+  if arg_spec.kwonlydefaults is not None:
+    defaults.extend(arg_spec.kwonlydefaults.items())
+
+  def get_call_args(args, kwargs):
+    call_args = kwargs.copy()
+    if this is not None:
+      args = (this,) + args
+    remaining_positionals = [
+        arg for arg in arg_spec.args if arg not in call_args]
+    call_args.update(zip(remaining_positionals, args))
+    for arg, value in defaults:
+      if arg not in call_args:
+        call_args[arg] = value
+    return call_args
+
+  return get_call_args
+
+
 def _wrap_decorator(wrapped_function):
   """Indicate that one function wraps another.
 
@@ -321,8 +359,8 @@ def deprecated(date, instructions, warn_once=True):
       func = func_or_class
 
     decorator_utils.validate_callable(func, 'deprecated')
-    @functools.wraps(func)
-    def new_func(*args, **kwargs):  # pylint: disable=missing-docstring
+
+    def warn_and_call(*args, **kwargs):
       if _PRINT_DEPRECATION_WARNINGS:
         if func not in _PRINTED_WARNING:
           if warn_once:
@@ -330,12 +368,22 @@ def deprecated(date, instructions, warn_once=True):
           logging.warning(
               'From %s: %s (from %s) is deprecated and will be removed %s.\n'
               'Instructions for updating:\n%s',
-              _call_location(), decorator_utils.get_qualified_name(func),
-              func.__module__,
+              _call_location(outer=True),
+              decorator_utils.get_qualified_name(func), func.__module__,
               'in a future version' if date is None else ('after %s' % date),
               instructions)
+        if func in _PRINTED_WARNING:
+          call[0] = func
       return func(*args, **kwargs)
 
+    # What `new_func` calls: `warn_and_call` until there is nothing left to
+    # warn about, then `func` itself.
+    call = [warn_and_call]
+
+    @functools.wraps(func)
+    def new_func(*args, **kwargs):  # pylint: disable=missing-docstring
+      return call[0](*args, **kwargs)
+
     doc_controls.set_deprecated(new_func)
     new_func = tf_decorator.make_decorator(
         func, new_func, 'deprecated',
@@ -498,14 +546,14 @@ def deprecated_args(date, instructions, *deprecated_arg_names_or_tuples,
         return False
       return False
 
-    @functools.wraps(func)
-    def new_func(*args, **kwargs):
-      """Deprecation wrapper."""
+    get_call_args = _call_args_getter(func)
+
+    def warn_and_call(*args, **kwargs):
       # TODO(apassos) figure out a way to have reasonable performance with
       # deprecation warnings and eager mode.
-      if is_in_graph_mode.IS_IN_GRAPH_MODE() and _PRINT_DEPRECATION_WARNINGS:
+      if _PRINT_DEPRECATION_WARNINGS and is_in_graph_mode.IS_IN_GRAPH_MODE():
         invalid_args = []
-        named_args = tf_inspect.getcallargs(func, *args, **kwargs)
+        named_args = get_call_args(args, kwargs)
         for arg_name, spec in iter(deprecated_positions.items()):
           if (spec.position < len(args) and
               not (spec.has_ok_value and
@@ -528,12 +576,25 @@ def deprecated_args(date, instructions, *deprecated_arg_names_or_tuples,
             logging.warning(
                 'From %s: calling %s (from %s) with %s is deprecated and will '
                 'be removed %s.\nInstructions for updating:\n%s',
-                _call_location(), decorator_utils.get_qualified_name(func),
-                func.__module__, arg_name,
+                _call_location(outer=True),
+                decorator_utils.get_qualified_name(func), func.__module__,
+                arg_name,
                 'in a future version' if date is None else ('after %s' % date),
                 instructions)
+        if invalid_args and all((func, arg_name) in _PRINTED_WARNING
+                                for arg_name in deprecated_arg_names):
+          call[0] = func
       return func(*args, **kwargs)
 
+    # What `new_func` calls: `warn_and_call` until all the deprecated arguments
+    # have been warned about, then `func` itself.
+    call = [warn_and_call]
+
+    @functools.wraps(func)
+    def new_func(*args, **kwargs):
+      """Deprecation wrapper."""
+      return call[0](*args, **kwargs)
+
     doc = _add_deprecated_arg_notice_to_docstring(
         func.__doc__, date, instructions, sorted(deprecated_arg_names.keys()))
     return tf_decorator.make_decorator(func, new_func, 'deprecated', doc)
@@ -583,24 +644,39 @@ def deprecated_arg_values(date, instructions, warn_once=True,
   def deprecated_wrapper(func):
     """Deprecation decorator."""
     decorator_utils.validate_callable(func, 'deprecated_arg_values')
-    @functools.wraps(func)
-    def new_func(*args, **kwargs):
-      """Deprecation wrapper."""
+    get_call_args = _call_args_getter(func)
+
+    def warn_and_call(*args, **kwargs):
       if _PRINT_DEPRECATION_WARNINGS:
-        named_args = tf_inspect.getcallargs(func, *args, **kwargs)
+        named_args = get_call_args(args, kwargs)
+        warned = False
         for arg_name, arg_value in deprecated_kwargs.items():
           if arg_name in named_args and named_args[arg_name] == arg_value:
             if (func, arg_name) not in _PRINTED_WARNING:
               if warn_once:
                 _PRINTED_WARNING[(func, arg_name)] = True
+              warned = True
               logging.warning(
                   'From %s: calling %s (from %s) with %s=%s is deprecated and '
                   'will be removed %s.\nInstructions for updating:\n%s',
-                  _call_location(), decorator_utils.get_qualified_name(func),
-                  func.__module__, arg_name, arg_value, 'in a future version'
+                  _call_location(outer=True),
+                  decorator_utils.get_qualified_name(func), func.__module__,
+                  arg_name, arg_value, 'in a future version'
                   if date is None else ('after %s' % date), instructions)
+        if warned and all((func, arg_name) in _PRINTED_WARNING
+                          for arg_name in deprecated_kwargs):
+          call[0] = func
       return func(*args, **kwargs)
 
+    # What `new_func` calls: `warn_and_call` until all the deprecated values
+    # have been warned about, then `func` itself.
+    call = [warn_and_call]
+
+    @functools.wraps(func)
+    def new_func(*args, **kwargs):
+      """Deprecation wrapper."""
+      return call[0](*args, **kwargs)
+
     doc = _add_deprecated_arg_value_notice_to_docstring(
         func.__doc__, date, instructions, deprecated_kwargs)
     return tf_decorator.make_decorator(func, new_func, 'deprecated', doc)
@@ -21,6 +21,7 @@ from __future__ import print_function
 
 import collections
 import enum
+import time
 
 from tensorflow.python.framework import test_util
 from tensorflow.python.platform import test
@@ -183,6 +184,26 @@ class DeprecationTest(test.TestCase):
     _fn()
     self.assertEqual(2, mock_warning.call_count)
 
+  @test.mock.patch.object(logging, "warning", autospec=True)
+  def test_deprecated_calls_directly_after_warning(self, mock_warning):
+    date = "2016-07-04"
+    instructions = "This is how you update..."
+
+    @deprecation.deprecated(date, instructions, warn_once=True)
+    def _fn(arg):
+      return arg + 1
+
+    with deprecation.silence():
+      self.assertEqual(2, _fn(1))
+    self.assertEqual(0, mock_warning.call_count)
+    self.assertEqual(3, _fn(2))
+    self.assertEqual(1, mock_warning.call_count)
+
+    # The wrapper no longer checks whether the warning was printed.
+    deprecation._PRINTED_WARNING.clear()
+    self.assertEqual(4, _fn(3))
+    self.assertEqual(1, mock_warning.call_count)
+
   def _assert_subset(self, expected_subset, actual_set):
     self.assertTrue(
         actual_set.issuperset(expected_subset),
@@ -992,6 +1013,31 @@ class DeprecatedArgValuesTest(test.TestCase):
     self.assertEqual(2, mock_warning.call_count)
 
 
+  @test.mock.patch.object(logging, "warning", autospec=True)
+  def test_deprecated_arg_values_calls_directly_after_warnings(
+      self, mock_warning):
+    date = "2016-07-04"
+    instructions = "This is how you update..."
+
+    @deprecation.deprecated_arg_values(date, instructions, warn_once=True,
+                                       arg0="forbidden", arg1="disallowed")
+    def _fn(arg0, arg1="allowed"):
+      return arg0 + arg1
+
+    self.assertEqual("forbiddenallowed", _fn("forbidden"))
+    self.assertEqual(1, mock_warning.call_count)
+    deprecation._PRINTED_WARNING.clear()
+    _fn("forbidden")
+    self.assertEqual(2, mock_warning.call_count)
+
+    # Once both values were warned about, the checks are skipped.
+    _fn("allowed", arg1="disallowed")
+    self.assertEqual(3, mock_warning.call_count)
+    deprecation._PRINTED_WARNING.clear()
+    self.assertEqual("forbiddendisallowed", _fn("forbidden", "disallowed"))
+    self.assertEqual(3, mock_warning.call_count)
+
+
 class DeprecationArgumentsTest(test.TestCase):
 
   def testDeprecatedArgumentLookup(self):
@@ -1049,5 +1095,62 @@ class DeprecatedEndpointsTest(test.TestCase):
         pass
 
 
+class DeprecationBenchmark(test.Benchmark):
+  """Benchmarks the per-call overhead of deprecated functions."""
+
+  def _run_and_report(self, fn, name):
+    burn_iter, test_iter = 100, 100000
+
+    for _ in range(burn_iter):
+      fn(1, arg=2)
+
+    t0 = time.time()
+    for _ in range(test_iter):
+      fn(1, arg=2)
+    t1 = time.time()
+
+    self.report_benchmark(iters=test_iter, wall_time=(t1 - t0) / test_iter,
+                          name=name)
+
+  def benchmark_not_deprecated(self):
+
+    def _fn(x, arg=0):
+      return x + arg
+
+    self._run_and_report(_fn, "not_deprecated")
+
+  def benchmark_deprecated(self):
+
+    @deprecation.deprecated("2016-07-04", "Instructions.")
+    def _fn(x, arg=0):
+      return x + arg
+
+    self._run_and_report(_fn, "deprecated")
+
+  def benchmark_deprecated_args(self):
+
+    @deprecation.deprecated_args("2016-07-04", "Instructions.", "arg")
+    def _fn(x, arg=0):
+      return x + arg
+
+    self._run_and_report(_fn, "deprecated_args")
+
+  def benchmark_deprecated_arg_values(self):
+
+    @deprecation.deprecated_arg_values("2016-07-04", "Instructions.", arg=2)
+    def _fn(x, arg=0):
+      return x + arg
+
+    self._run_and_report(_fn, "deprecated_arg_values")
+
+  def benchmark_deprecated_arg_values_not_used(self):
+
+    @deprecation.deprecated_arg_values("2016-07-04", "Instructions.", arg=3)
+    def _fn(x, arg=0):
+      return x + arg
+
+    self._run_and_report(_fn, "deprecated_arg_values_not_used")
+
+
 if __name__ == "__main__":
   test.main()
@@ -24,12 +24,18 @@ Otherwise, the original TypeError is raised.
 By default, dispatch support is added to the generated op wrappers for any
 visible ops by default.  Ops that are implemented in Python can opt in to
 dispatch support using the `add_dispatch_support` decorator.
+
+Dispatchers can tell from the types of the arguments alone that they will not
+handle them, by overriding `may_handle_types`.  `dispatch` caches, for each op
+and set of argument types, the dispatchers that may handle them, so that the
+others are skipped without being called.
 """
 
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import itertools
 
 from tensorflow.python.util import tf_decorator
@@ -44,6 +50,17 @@ DISPATCH_ATTR = "_tf_dispatchers"
 # OpDispatchers which should be used for all operations.
 _GLOBAL_DISPATCHERS = []
 
+# Maps `(op, arg_types)` to the dispatchers which may handle arguments of those
+# types, along with the dispatcher lists they were selected from.  Cleared when
+# a dispatcher is registered, or when it reaches `_DISPATCH_CACHE_MAX_SIZE`.
+_DISPATCH_CACHE = {}
+_DISPATCH_CACHE_MAX_SIZE = 4096
+_dispatch_cache_hits = 0
+_dispatch_cache_misses = 0
+
+DispatchCacheInfo = collections.namedtuple("DispatchCacheInfo",
+                                           ["hits", "misses", "size"])
+
 
 @tf_export("__internal__.dispatch.OpDispatcher", v1=[])
 class OpDispatcher(object):
@@ -75,6 +92,24 @@ class OpDispatcher(object):
     """
     return self.NOT_SUPPORTED
 
+  def may_handle_types(self, arg_types):  # pylint: disable=unused-argument
+    """Returns False if this dispatcher can not handle any args of these types.
+
+    Used to skip dispatchers without calling `handle`.  Must only depend on
+    `arg_types`, and may return True for arguments that `handle` then does not
+    support.
+
+    Args:
+      arg_types: frozenset of the types of the arguments and keyword arguments
+        to the operation, and of the elements of the ones that are lists or
+        tuples.
+
+    Returns:
+      False if `handle` returns `NOT_SUPPORTED` for all arguments of these
+      types.
+    """
+    return True
+
   def register(self, op):
     """Register this dispatcher as a handler for `op`.
 
@@ -87,6 +122,7 @@ class OpDispatcher(object):
     if not hasattr(op, DISPATCH_ATTR):
       raise AssertionError("Dispatching not enabled for %s" % op)
     getattr(op, DISPATCH_ATTR).append(self)
+    _DISPATCH_CACHE.clear()
 
 
 @tf_export("__internal__.dispatch.GlobalOpDispatcher", v1=[])
@@ -98,9 +134,61 @@ class GlobalOpDispatcher(object):
   def handle(self, op, args, kwargs):
     """Handle the specified operation with the specified arguments."""
 
+  def may_handle_types(self, arg_types):  # pylint: disable=unused-argument
+    """Returns False if this dispatcher can not handle any args of these types.
+
+    See `OpDispatcher.may_handle_types`.
+    """
+    return True
+
   def register(self):
     """Register this dispatcher as a handler for all ops."""
     _GLOBAL_DISPATCHERS.append(self)
+    _DISPATCH_CACHE.clear()
+
+
+def _arg_types(args, kwargs):
+  """Returns the types of the args, kwargs and of their list elements."""
+  arg_types = set()
+  for arg in itertools.chain(args, kwargs.values()):
+    arg_types.add(type(arg))
+    if isinstance(arg, (list, tuple)):
+      arg_types.update(map(type, arg))
+  return frozenset(arg_types)
+
+
+def _dispatchers_for(op, args, kwargs):
+  """Returns the op and global dispatchers which may handle the arguments."""
+  global _dispatch_cache_hits, _dispatch_cache_misses
+  op_dispatchers = getattr(op, DISPATCH_ATTR)
+  key = (op, _arg_types(args, kwargs))
+  entry = _DISPATCH_CACHE.get(key)
+  # The dispatcher lists are also compared, in case they were modified without
+  # going through `register`.
+  if (entry is not None and entry[0] is op_dispatchers and
+      entry[1] == len(op_dispatchers) and
+      entry[2] is _GLOBAL_DISPATCHERS and
+      entry[3] == len(_GLOBAL_DISPATCHERS)):
+    _dispatch_cache_hits += 1
+    return entry[4], entry[5]
+
+  _dispatch_cache_misses += 1
+  arg_types = key[1]
+  entry = (op_dispatchers, len(op_dispatchers),
+           _GLOBAL_DISPATCHERS, len(_GLOBAL_DISPATCHERS),
+           tuple(d for d in op_dispatchers if d.may_handle_types(arg_types)),
+           tuple(d for d in _GLOBAL_DISPATCHERS
+                 if d.may_handle_types(arg_types)))
+  if len(_DISPATCH_CACHE) >= _DISPATCH_CACHE_MAX_SIZE:
+    _DISPATCH_CACHE.clear()
+  _DISPATCH_CACHE[key] = entry
+  return entry[4], entry[5]
+
+
+def dispatch_cache_info():
+  """Returns the hits, misses and size of the dispatch cache."""
+  return DispatchCacheInfo(_dispatch_cache_hits, _dispatch_cache_misses,
+                           len(_DISPATCH_CACHE))
 
 
 def dispatch(op, args, kwargs):
@@ -108,6 +196,7 @@ def dispatch(op, args, kwargs):
 
   Calls the `handle` method of each `OpDispatcher` that has been registered
   to handle `op`, and returns the value from the first successful handler.
+  Dispatchers whose `may_handle_types` rejects the argument types are skipped.
 
   Args:
     op: Python function: the operation to dispatch for.
@@ -118,11 +207,12 @@ def dispatch(op, args, kwargs):
     The result of the operation, or `NOT_SUPPORTED` if no registered
     dispatcher can handle the given arguments.
   """
-  for dispatcher in getattr(op, DISPATCH_ATTR):
+  op_dispatchers, global_dispatchers = _dispatchers_for(op, args, kwargs)
+  for dispatcher in op_dispatchers:
     result = dispatcher.handle(args, kwargs)
     if result is not OpDispatcher.NOT_SUPPORTED:
       return result
-  for dispatcher in _GLOBAL_DISPATCHERS:
+  for dispatcher in global_dispatchers:
     result = dispatcher.handle(op, args, kwargs)
     if result is not OpDispatcher.NOT_SUPPORTED:
       return result
@@ -149,6 +239,9 @@ class _TypeBasedDispatcher(OpDispatcher):
         return True
     return False
 
+  def may_handle_types(self, arg_types):
+    return any(issubclass(arg_type, self._types) for arg_type in arg_types)
+
   def handle(self, args, kwargs):
     if self._handles(args, kwargs):
       return self._override_func(*args, **kwargs)
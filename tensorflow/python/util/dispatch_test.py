@@ -178,6 +178,54 @@ class DispatchTest(test_util.TensorFlowTestCase):
     # Clean up
     test_op._tf_dispatchers = original_handlers
 
+  def testDispatchCache(self):
+    original_handlers = test_op._tf_dispatchers[:]
+
+    class CountingDispatcher(dispatch.OpDispatcher):
+
+      def __init__(self, may_handle):
+        self.may_handle = may_handle
+        self.num_calls = 0
+
+      def may_handle_types(self, arg_types):
+        return self.may_handle
+
+      def handle(self, args, kwargs):
+        self.num_calls += 1
+        return self.NOT_SUPPORTED
+
+    try:
+      skipped = CountingDispatcher(False)
+      skipped.register(test_op)
+      called = CountingDispatcher(True)
+      called.register(test_op)
+
+      @dispatch.dispatch_for_types(test_op, CustomTensor)
+      def override_for_test_op(x, y, z):  # pylint: disable=unused-variable
+        return CustomTensor(test_op(x.tensor, y.tensor, z.tensor), x.score)
+
+      self.assertEqual(0, dispatch.dispatch_cache_info().size)
+      x = CustomTensor([1, 2, 3], 0.2)
+      info = dispatch.dispatch_cache_info()
+      for _ in range(3):
+        result = test_op(x, x, x)
+      self.assertAllEqual(self.evaluate(result.tensor), [6, 12, 18])
+      self.assertEqual(0, skipped.num_calls)
+      self.assertEqual(3, called.num_calls)
+      self.assertEqual(info.misses + 1, dispatch.dispatch_cache_info().misses)
+      self.assertEqual(info.hits + 2, dispatch.dispatch_cache_info().hits)
+
+      # Registering a dispatcher invalidates the cache.
+      CountingDispatcher(False).register(test_op)
+      self.assertEqual(0, dispatch.dispatch_cache_info().size)
+
+      # So does replacing the dispatchers of the op.
+      test_op._tf_dispatchers = original_handlers[:]
+      with self.assertRaises((TypeError, ValueError)):
+        test_op(x, x, x)
+    finally:
+      test_op._tf_dispatchers = original_handlers
+
   def testDispatchForTypes_SignatureMismatch(self):
     with self.assertRaisesRegex(
         AssertionError, "The decorated function's "
@@ -43,6 +43,7 @@ from __future__ import division
 from __future__ import print_function
 
 import collections as _collections
+import functools as _functools
 
 import six as _six
 import wrapt as _wrapt
@@ -730,6 +731,173 @@ def pack_sequence_as(structure, flat_sequence, expand_composites=False):
   return _pack_sequence_as(structure, flat_sequence, expand_composites)
 
 
+def _leaf_packer(flat_iter):
+  return next(flat_iter)
+
+
+def _make_sequence_packer(instance):
+  """Returns a function building an instance like `instance` from its values.
+
+  The returned function is equivalent to `functools.partial(_sequence_like,
+  instance)`, but the type of `instance` is only inspected once.
+
+  Args:
+    instance: A nested structure, as accepted by `_sequence_like`.
+  """
+  instance_type = type(instance)
+  if instance_type is list:
+    return list
+  if instance_type is tuple:
+    return tuple
+  if instance_type is dict:
+    keys = list(instance)
+    sorted_keys = _sorted(instance)
+    positions = [sorted_keys.index(key) for key in keys]
+    return lambda args: {key: args[i] for key, i in zip(keys, positions)}
+  if _is_mutable_mapping(instance) and not isinstance(instance,
+                                                      _wrapt.ObjectProxy):
+    keys = list(instance)
+    sorted_keys = _sorted(instance)
+    positions = [sorted_keys.index(key) for key in keys]
+    if instance_type == _collections.defaultdict:
+      factory = _functools.partial(instance_type, instance.default_factory)
+    else:
+      factory = instance_type
+
+    def pack_mutable_mapping(args):
+      d = factory()
+      for key, i in zip(keys, positions):
+        d[key] = args[i]
+      return d
+
+    return pack_mutable_mapping
+  if ((_is_namedtuple(instance) or _is_attrs(instance)) and
+      not isinstance(instance, _wrapt.ObjectProxy)):
+    return lambda args: instance_type(*args)
+  if _is_composite_tensor(instance):
+    spec = instance._type_spec  # pylint: disable=protected-access
+    return lambda args: spec._from_components(args[0])  # pylint: disable=protected-access
+  if _is_type_spec(instance):
+    return lambda args: instance._from_components(args[0])  # pylint: disable=protected-access
+  return _functools.partial(_sequence_like, instance)
+
+
+class StructurePlan(object):
+  """A structure compiled for repeated flattening and packing.
+
+  `pack_sequence_as` re-inspects its `structure` argument on every call:
+  dictionary keys are sorted, and every substructure is tested for being a
+  mapping, a namedtuple, an attrs class, a composite tensor, etc. When the same
+  structure is packed over and over (e.g. the outputs of a function on each
+  call), a `StructurePlan` built once from the structure packs without any of
+  these checks:
+
+  >>> structure = {"b": (1, 2), "a": [3]}
+  >>> plan = StructurePlan(structure)
+  >>> plan.pack([4, 5, 6])
+  {'b': (5, 6), 'a': [4]}
+  >>> plan.flatten({"b": (7, 8), "a": [9]})
+  [9, 7, 8]
+
+  Plans of structures with the same `signature` are interchangeable, so the
+  signature may be used to key a cache of plans.
+
+  Attributes:
+    structure: The structure the plan was built from.
+    expand_composites: Whether composite tensors are expanded.
+    num_leaves: The number of leaves of `structure`.
+    signature: A hashable description of the types, dictionary keys and type
+      specs making up `structure`.
+  """
+
+  __slots__ = ["structure", "expand_composites", "num_leaves", "signature",
+               "_packer"]
+
+  def __init__(self, structure, expand_composites=False):
+    """Builds the plan of `structure`.
+
+    Args:
+      structure: Nested structure, as accepted by `pack_sequence_as`.
+      expand_composites: If true, then composite tensors such as
+        `tf.sparse.SparseTensor` and `tf.RaggedTensor` are expanded into their
+        component tensors.
+
+    Raises:
+      TypeError: `structure` is or contains a dict with non-sortable keys.
+    """
+    self.structure = structure
+    self.expand_composites = expand_composites
+    is_seq = is_sequence_or_composite if expand_composites else is_sequence
+    self.num_leaves = 0
+    self._packer, self.signature = self._compile(structure, is_seq)
+
+  def _compile(self, structure, is_seq):
+    """Returns a `(packer, signature)` pair for `structure`."""
+    if not is_seq(structure):
+      self.num_leaves += 1
+      return _leaf_packer, None
+    children = [self._compile(child, is_seq)
+                for child in _yield_value(structure)]
+    child_packers = tuple(packer for packer, _ in children)
+    make_instance = _make_sequence_packer(structure)
+    if _is_mapping(structure):
+      details = tuple(_sorted(structure))
+    elif _is_composite_tensor(structure):
+      details = structure._type_spec  # pylint: disable=protected-access
+    elif _is_type_spec(structure):
+      details = structure
+    else:
+      details = len(child_packers)
+    signature = (type(structure), details,
+                 tuple(child_signature for _, child_signature in children))
+
+    def pack(flat_iter):
+      return make_instance([packer(flat_iter) for packer in child_packers])
+
+    return pack, signature
+
+  def flatten(self, structure):
+    """Flattens `structure`, which must have the structure of the plan.
+
+    Args:
+      structure: A nested structure matching `self.structure`.
+
+    Returns:
+      A Python list, the flattened version of `structure`.
+
+    Raises:
+      ValueError: If `structure` does not have `num_leaves` leaves.
+    """
+    flat = _pywrap_utils.Flatten(structure, self.expand_composites)
+    if len(flat) != self.num_leaves:
+      raise ValueError(
+          "Structure had %d elements, but the structure of the plan has %d "
+          "elements." % (len(flat), self.num_leaves))
+    return flat
+
+  def pack(self, flat_sequence):
+    """Packs `flat_sequence` into the structure of the plan.
+
+    Equivalent to `pack_sequence_as(self.structure, flat_sequence,
+    self.expand_composites)`.
+
+    Args:
+      flat_sequence: Flat sequence to pack.
+
+    Returns:
+      `flat_sequence` packed into the structure of the plan.
+
+    Raises:
+      ValueError: If `flat_sequence` does not have `num_leaves` elements.
+    """
+    if len(flat_sequence) != self.num_leaves:
+      raise ValueError(
+          "Could not pack sequence. Structure had %d elements, but "
+          "flat_sequence had %d elements.  Structure: %s, flat_sequence: %s." %
+          (self.num_leaves, len(flat_sequence), self.structure, flat_sequence))
+    return self._packer(iter(flat_sequence))
+
+
 @tf_export("nest.map_structure")
 def map_structure(func, *structure, **kwargs):
   """Applies `func` to each entry in `structure` and returns a new structure.
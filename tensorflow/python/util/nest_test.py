@@ -282,6 +282,64 @@ class NestTest(parameterized.TestCase, test.TestCase):
       nest.pack_sequence_as(["hello", "world"],
                             ["and", "goodbye", "again"])
 
+  @parameterized.parameters(
+      {"structure": 1},
+      {"structure": [1, (2, 3), [4]]},
+      {"structure": {"b": 1, "a": (2, {"d": 3, "c": 4})}},
+      {"structure": collections.OrderedDict([("b", 1), ("a", 2)])},
+      {"structure": collections.defaultdict(list, {"b": [1], "a": 2})},
+      {"structure": PointXY(x=(1, 2), y={"z": 3})},
+      {"structure": {"a": 1, "b": 2}.values()},
+      {"structure": [(), {}, [(1,)]]},
+  )
+  @test_util.assert_no_new_pyobjects_executing_eagerly
+  def testStructurePlan(self, structure):
+    plan = nest.StructurePlan(structure)
+    flat = nest.flatten(structure)
+    self.assertLen(flat, plan.num_leaves)
+    self.assertEqual(flat, plan.flatten(structure))
+    new_flat = ["v%d" % i for i in range(len(flat))]
+    expected = nest.pack_sequence_as(structure, new_flat)
+    packed = plan.pack(new_flat)
+    self.assertEqual(type(expected), type(packed))
+    self.assertEqual(expected, packed)
+    if isinstance(expected, dict):
+      self.assertEqual(list(expected.keys()), list(packed.keys()))
+    if isinstance(expected, collections.defaultdict):
+      self.assertEqual(expected.default_factory, packed.default_factory)
+    # Packing twice gives equal, but distinct, structures.
+    self.assertEqual(packed, plan.pack(new_flat))
+
+  def testStructurePlanAttrs(self):
+    if attr is None:
+      self.skipTest("attr module is unavailable.")
+    structure = NestTest.UnsortedSampleAttr(3, (1,), {"a": 2})
+    plan = nest.StructurePlan(structure)
+    self.assertEqual(
+        nest.pack_sequence_as(structure, ["x", "y", "z"]),
+        plan.pack(["x", "y", "z"]))
+
+  def testStructurePlanSignature(self):
+    plan1 = nest.StructurePlan({"a": (1, 2), "b": NestTest.PointXY(3, 4)})
+    plan2 = nest.StructurePlan({"b": NestTest.PointXY("x", "y"), "a": ("z", 0)})
+    plan3 = nest.StructurePlan({"a": [1, 2], "b": NestTest.PointXY(3, 4)})
+    plan4 = nest.StructurePlan({"a": (1, 2), "c": NestTest.PointXY(3, 4)})
+    self.assertEqual(plan1.signature, plan2.signature)
+    self.assertEqual(hash(plan1.signature), hash(plan2.signature))
+    self.assertNotEqual(plan1.signature, plan3.signature)
+    self.assertNotEqual(plan1.signature, plan4.signature)
+
+  def testStructurePlan_wrongLengthsError(self):
+    plan = nest.StructurePlan(["hello", "world"])
+    with self.assertRaisesRegex(
+        ValueError,
+        "Structure had 2 elements, but flat_sequence had 3 elements."):
+      plan.pack(["and", "goodbye", "again"])
+    with self.assertRaisesRegex(
+        ValueError,
+        "Structure had 3 elements, but the structure of the plan has 2"):
+      plan.flatten(["and", "goodbye", "again"])
+
   @test_util.assert_no_new_pyobjects_executing_eagerly
   def testIsNested(self):
     self.assertFalse(nest.is_nested("1234"))
@@ -1256,6 +1314,38 @@ class NestBenchmark(test.Benchmark):
     s2 = ((("foo1", "foo2"), "foo3"), "foo4", ("foo5", "foo6")) * 10
     self.run_and_report(s1, s2, "assert_same_structure_60_elem")
 
+  def _report_pack(self, structure, name):
+    burn_iter, test_iter = 100, 30000
+    flat = nest.flatten(structure)
+    plan = nest.StructurePlan(structure)
+
+    for _ in xrange(burn_iter):
+      nest.pack_sequence_as(structure, flat)
+      plan.pack(flat)
+
+    t0 = time.time()
+    for _ in xrange(test_iter):
+      nest.pack_sequence_as(structure, flat)
+    t1 = time.time()
+    for _ in xrange(test_iter):
+      plan.pack(flat)
+    t2 = time.time()
+
+    self.report_benchmark(iters=test_iter, wall_time=(t1 - t0) / test_iter,
+                          name="pack_sequence_as_" + name)
+    self.report_benchmark(iters=test_iter, wall_time=(t2 - t1) / test_iter,
+                          name="structure_plan_pack_" + name)
+
+  def benchmark_pack(self):
+    point = collections.namedtuple("Point", ["x", "y", "z"])
+    self._report_pack({"feature_%d" % i: i for i in range(20)}, "dict_20_elem")
+    self._report_pack(
+        {"features": {"dense_%d" % i: (i, [i]) for i in range(10)},
+         "labels": point(1, 2, 3), "weights": [4, 5]},
+        "nested_dict_namedtuple_26_elem")
+    self._report_pack([point(i, (i, i), {"w": i}) for i in range(20)],
+                      "namedtuples_80_elem")
+
 
 if __name__ == "__main__":
   test.main()